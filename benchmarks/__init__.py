@@ -0,0 +1 @@
+"""Benchmarks for qBRA (run outside the unit test suite)."""
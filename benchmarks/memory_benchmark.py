@@ -0,0 +1,366 @@
+"""Peak-memory benchmark for batch BRA generation.
+
+Runs the geometry and feature path over a synthetic navaid inventory, one
+stage at a time, and records for each stage:
+
+* the ``tracemalloc`` peak (Python allocations) and its top allocation sites;
+* the growth of the process peak RSS, which also covers allocations made by
+  QGIS in C++ that ``tracemalloc`` cannot see;
+* both normalised per navaid.
+
+The report is written as JSON and compared against per-stage thresholds
+(bytes per navaid); the exit status is 1 when any threshold is exceeded.
+Per-navaid figures include fixed overheads, so compare runs with the
+inventory size recorded in the thresholds file (``navaids``).
+
+Stages
+------
+kernel_directional, kernel_omni   vectorised vertex kernel
+wkb_omni                          kernel + WKB encoding per navaid
+cli_pipeline                      headless CLI chunk processing (no output)
+build_layers, build_layers_omni   full QGIS path into memory layers
+                                  (skipped when QGIS is not importable)
+
+Usage
+-----
+    python -m benchmarks.memory_benchmark --navaids 2000 \\
+        --thresholds benchmarks/memory_thresholds.json --report memory_report.json
+
+    # Record a new baseline (e.g. for the QGIS stages on a QGIS machine)
+    python -m benchmarks.memory_benchmark --navaids 2000 --write-thresholds benchmarks/memory_thresholds.json
+
+The QGIS stages need a QGIS Python environment (``qgis_process``-style
+standalone; a ``QgsApplication`` is initialised when none exists).
+Because the process peak RSS never shrinks, run stages of interest in
+separate invocations (``--stage``) for precise RSS numbers.
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from qBRA.cli import GeoJSONWriter, RunStats, process_chunk
+from qBRA.constants import OMNI_SEGMENTS
+from qBRA.modules.kernel import (
+    directional_columns,
+    directional_row,
+    directional_vertices,
+    omni_columns,
+    omni_row,
+    omni_vertices,
+)
+from qBRA.modules.wkb import WkbEncoder
+from qBRA.services.inventory_service import GEOMETRY_KEY, resolve_directional, resolve_omni
+from qBRA.workers.process_backend import ProcessPoolBackend
+
+HEADLESS_STAGES = ("kernel_directional", "kernel_omni", "wkb_omni", "cli_pipeline")
+QGIS_STAGES = ("build_layers", "build_layers_omni")
+ALL_STAGES = HEADLESS_STAGES + QGIS_STAGES
+
+#: Map CRS reported by the stand-in ``iface`` of the QGIS stages.
+BENCHMARK_CRS = "EPSG:32633"
+
+
+@dataclass
+class StageResult:
+    """Memory figures of one benchmark stage."""
+
+    name: str
+    navaids: int
+    elapsed_s: float = 0.0
+    tracemalloc_peak_bytes: int = 0
+    bytes_per_navaid: float = 0.0
+    rss_peak_growth_bytes: Optional[int] = None
+    rss_bytes_per_navaid: Optional[float] = None
+    top_allocations: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inventory
+# ---------------------------------------------------------------------------
+
+def synthetic_records(count: int, seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """Return directional (GP) and omni (DVOR, turbine mode) navaid records."""
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0.0, 1e6, size=(count, 2))
+    elev = rng.uniform(0.0, 1500.0, size=count)
+    azimuth = rng.uniform(0.0, 360.0, size=count)
+    records: Dict[str, List[Dict[str, Any]]] = {"directional": [], "omni": []}
+    for i in range(count):
+        point = ("Point", (float(xy[i, 0]), float(xy[i, 1])))
+        records["directional"].append({
+            "id": i, "facility": "GP", "azimuth": float(azimuth[i]),
+            "site_elev": float(elev[i]), GEOMETRY_KEY: point,
+        })
+        records["omni"].append({"id": i, "facility": "OMNI_DVOR", "site_elev": float(elev[i]), GEOMETRY_KEY: point})
+    return records
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _max_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def measure(name: str, navaids: int, run: Callable[[], Any], top: int = 10) -> StageResult:
+    """Run ``run`` under ``tracemalloc`` and collect the stage figures.
+
+    Whatever ``run`` returns is kept alive until the snapshot is taken, so
+    stages should return the objects a real run would hold (e.g. layers).
+    """
+    gc.collect()
+    rss_before = _max_rss_bytes()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    try:
+        keep = run()
+        elapsed = time.perf_counter() - started
+        _current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+    finally:
+        tracemalloc.stop()
+    rss_after = _max_rss_bytes()
+    del keep
+
+    allocations = [
+        {
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+    result = StageResult(
+        name=name,
+        navaids=navaids,
+        elapsed_s=round(elapsed, 4),
+        tracemalloc_peak_bytes=peak,
+        bytes_per_navaid=round(peak / navaids, 1) if navaids else 0.0,
+        top_allocations=allocations,
+    )
+    if rss_before is not None and rss_after is not None:
+        result.rss_peak_growth_bytes = rss_after - rss_before
+        result.rss_bytes_per_navaid = round(result.rss_peak_growth_bytes / navaids, 1) if navaids else 0.0
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def _headless_stage(name: str, records: Dict[str, List[Dict[str, Any]]]) -> Callable[[], Any]:
+    directional = [resolve_directional(r, {}) for r in records["directional"]]
+    omni = [resolve_omni(r) for r in records["omni"]]
+
+    if name == "kernel_directional":
+        return lambda: directional_vertices(directional_columns(directional_row(p, *xy) for p, xy in directional))
+    if name == "kernel_omni":
+        return lambda: omni_vertices(omni_columns(omni_row(p, *xy) for p, xy in omni), OMNI_SEGMENTS)
+    if name == "wkb_omni":
+        def run() -> List[bytes]:
+            vertices = omni_vertices(omni_columns(omni_row(p, *xy) for p, xy in omni), OMNI_SEGMENTS)
+            encoder = WkbEncoder()
+            return [wkb for navaid in vertices for wkb in encoder.omni(navaid, OMNI_SEGMENTS)]
+        return run
+
+    def pipeline() -> RunStats:
+        stats = RunStats()
+        with GeoJSONWriter(os.devnull) as writer, ProcessPoolBackend(max_workers=1) as backend:
+            process_chunk(records["directional"] + records["omni"], {}, backend, writer, stats)
+        return stats
+    return pipeline
+
+
+class _Iface:  # pragma: no cover - QGIS only
+    """Stand-in for ``iface``: only the map CRS is read by the builders."""
+
+    class _Crs:
+        def authid(self) -> str:
+            return BENCHMARK_CRS
+
+    def mapCanvas(self) -> "_Iface":
+        return self
+
+    def mapSettings(self) -> "_Iface":
+        return self
+
+    def destinationCrs(self) -> "_Crs":
+        return self._Crs()
+
+
+def _qgis_stage(name: str, records: Dict[str, List[Dict[str, Any]]]) -> Callable[[], Any]:  # pragma: no cover
+    from qgis.core import QgsApplication, QgsFeature, QgsGeometry, QgsPointXY, QgsVectorLayer
+
+    from qBRA.modules.ils_llz_logic import build_layers, build_layers_omni
+
+    if QgsApplication.instance() is None:
+        _qgis_stage.app = QgsApplication([], False)  # type: ignore[attr-defined]
+        _qgis_stage.app.initQgis()  # type: ignore[attr-defined]
+
+    navaids = QgsVectorLayer(f"Point?crs={BENCHMARK_CRS}", "navaids", "memory")
+    features = []
+    for record in records["omni"]:
+        feature = QgsFeature()
+        feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(*record[GEOMETRY_KEY][1])))
+        features.append(feature)
+    _ok, added = navaids.dataProvider().addFeatures(features)
+    fids = [f.id() for f in added]
+    iface = _Iface()
+
+    if name == "build_layers":
+        params = [resolve_directional(r, {})[0] for r in records["directional"]]
+
+        def run() -> List[Any]:
+            from dataclasses import replace
+            return [build_layers(iface, replace(p, active_layer=navaids, navaid_fid=fid)) for p, fid in zip(params, fids)]
+        return run
+
+    omni = [resolve_omni(r)[0] for r in records["omni"]]
+
+    def run_omni() -> List[Any]:
+        return [
+            build_layers_omni(iface, {
+                "active_layer": navaids, "navaid_fid": fid, "site_elev": p.site_elev,
+                "omni_r": p.r, "omni_alpha": p.alpha, "omni_R": p.R, "omni_turbine": p.turbine,
+                "omni_j": p.j, "omni_h": p.h, "facility_key": p.facility_key,
+                "facility_label": p.facility_label, "display_name": p.display_name,
+            })
+            for p, fid in zip(omni, fids)
+        ]
+    return run_omni
+
+
+def qgis_available() -> bool:
+    """Return True if a real QGIS is importable (test-suite mocks do not count)."""
+    try:
+        from qgis.core import Qgis
+    except ImportError:
+        return False
+    return isinstance(getattr(Qgis, "QGIS_VERSION", None), str)
+
+
+def run_benchmark(navaids: int, stages: Sequence[str] = ALL_STAGES, top: int = 10, seed: int = 0) -> Dict[str, Any]:
+    """Run the selected stages and return the report dict."""
+    records = synthetic_records(navaids, seed)
+    results = []
+    for name in stages:
+        if name not in ALL_STAGES:
+            raise ValueError(f"Unknown stage {name!r}; expected one of {ALL_STAGES}")
+        if name in QGIS_STAGES:
+            if not qgis_available():
+                results.append(StageResult(name=name, navaids=navaids, skipped="QGIS not available"))
+                continue
+            run = _qgis_stage(name, records)  # pragma: no cover
+        else:
+            run = _headless_stage(name, records)
+        results.append(measure(name, navaids, run, top))
+    return {
+        "navaids": navaids,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stages": [asdict(r) for r in results],
+    }
+
+
+def check_thresholds(report: Dict[str, Any], thresholds: Dict[str, Dict[str, float]]) -> List[str]:
+    """Compare a report with per-stage thresholds.
+
+    ``thresholds`` maps a stage name to ``max_bytes_per_navaid`` and/or
+    ``max_rss_bytes_per_navaid``.
+
+    Returns:
+        Human-readable failures (empty when all stages pass)
+    """
+    failures = []
+    for stage in report["stages"]:
+        limits = thresholds.get(stage["name"], {})
+        if stage.get("skipped"):
+            continue
+        for key, value_key in (("max_bytes_per_navaid", "bytes_per_navaid"),
+                               ("max_rss_bytes_per_navaid", "rss_bytes_per_navaid")):
+            limit, value = limits.get(key), stage.get(value_key)
+            if limit is not None and value is not None and value > limit:
+                failures.append(f"{stage['name']}: {value_key} {value:.0f} > {limit:.0f}")
+    return failures
+
+
+def baseline_thresholds(report: Dict[str, Any], headroom: float = 1.5) -> Dict[str, Any]:
+    """Derive a thresholds document from a report (measured value × ``headroom``)."""
+    stages = {}
+    for stage in report["stages"]:
+        if stage.get("skipped"):
+            continue
+        limits = {"max_bytes_per_navaid": round(stage["bytes_per_navaid"] * headroom)}
+        if stage.get("rss_bytes_per_navaid"):
+            limits["max_rss_bytes_per_navaid"] = round(stage["rss_bytes_per_navaid"] * headroom)
+        stages[stage["name"]] = limits
+    return {"navaids": report["navaids"], "stages": stages}
+
+
+def main(argv: Optional[Sequence[str]] = None, out: io.TextIOBase = sys.stdout) -> int:
+    """Run the benchmark from the command line; returns the exit status."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory_benchmark", description=__doc__.split("\n")[0])
+    parser.add_argument("--navaids", type=int, default=1000, help="Synthetic navaids per stage (default: %(default)s)")
+    parser.add_argument("--stage", action="append", choices=ALL_STAGES, help="Stage to run (repeatable; default: all)")
+    parser.add_argument("--thresholds", help="JSON file of per-stage thresholds")
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    parser.add_argument("--write-thresholds", help="Write thresholds derived from this run to this file")
+    parser.add_argument("--headroom", type=float, default=1.5,
+                        help="Factor applied by --write-thresholds (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites kept per stage (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.navaids, args.stage or ALL_STAGES, args.top)
+    failures: List[str] = []
+    if args.thresholds:
+        with open(args.thresholds, encoding="utf-8") as handle:
+            failures = check_thresholds(report, json.load(handle)["stages"])
+    report["failures"] = failures
+    report["passed"] = not failures
+    if args.write_thresholds:
+        with open(args.write_thresholds, "w", encoding="utf-8") as handle:
+            json.dump(baseline_thresholds(report, args.headroom), handle, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    for stage in report["stages"]:
+        if stage["skipped"]:
+            print(f"{stage['name']:<20} skipped ({stage['skipped']})", file=out)
+            continue
+        rss = stage["rss_bytes_per_navaid"]
+        print(
+            f"{stage['name']:<20} peak {stage['tracemalloc_peak_bytes'] / 2**20:8.1f} MiB  "
+            f"{stage['bytes_per_navaid']:10.0f} B/navaid  "
+            f"rss {'n/a' if rss is None else f'{rss:.0f}'} B/navaid  {stage['elapsed_s']:.2f} s",
+            file=out,
+        )
+    for failure in failures:
+        print(f"FAIL {failure}", file=out)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
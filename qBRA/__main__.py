@@ -0,0 +1,7 @@
+"""Entry point of ``python -m qBRA`` (see :mod:`qBRA.cli`)."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
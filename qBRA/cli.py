@@ -0,0 +1,457 @@
+"""Command-line BRA generator for whole navaid inventories.
+
+Runs without QGIS: navaid and runway inventories are read with
+:mod:`qBRA.services.inventory_service`, every navaid is resolved and
+validated through :class:`BRAParameters` / :class:`OmniParameters` (facility
+defaults from :mod:`qBRA.config`), and the surfaces are computed by the
+vectorised geometry kernel, optionally across worker processes.  Input is
+consumed in chunks so memory stays bounded by the chunk size rather than the
+inventory size; features are streamed to the output file as they are built.
+
+Usage
+-----
+    python -m qBRA navaids.gpkg --runways runways.csv -o bra.geojson
+    python -m qBRA navaids.csv -o bra.geojsonl --chunk-size 5000 --workers 8
+    python -m qBRA navaids.gpkg -o postgresql://user@host/db --table public.bra --crs EPSG:32633
+    python -m qBRA navaids.gpkg -o bra.mbtiles --crs EPSG:3857 --min-zoom 8 --max-zoom 14
+    python -m qBRA navaids.gpkg -o bra.glb --segments 32 --arc-segments 8
+    python -m qBRA navaids.gpkg -o bra.geojsonl --checkpoint-every 20000 --resume
+    python -m qBRA navaids.csv -o sweep.csv --sweep phi=20:40:5 --sweep L=1500,2300 --obstacles obst.csv
+
+A PostgreSQL connection string as output loads the features into PostGIS
+through :class:`~qBRA.services.postgis_sink.PostGISSink` (batched ``COPY``,
+one transaction, upsert on navaid id + facility).  An ``.mbtiles`` output
+is cut into a vector-tile pyramid by
+:class:`~qBRA.services.mbtiles_sink.MBTilesSink` (``--crs`` must be
+EPSG:3857 or EPSG:4326); re-running into the same file only re-encodes the
+tiles of changed navaids.  A ``.glb``/``.gltf``/``.obj`` output receives
+one indexed triangle mesh of all surfaces for 3D viewers
+(:class:`~qBRA.services.mesh_sink.MeshSink`); ``--segments`` and
+``--arc-segments`` control how finely curves are triangulated.
+
+With ``--sweep`` the run is a sensitivity study (:mod:`qBRA.modules.sweep`):
+every combination of the swept values is evaluated per navaid and ``-o``
+receives a CSV table of footprint area, extent and obstacle counts per
+variant; the variant geometry is only written when ``--sweep-geometry``
+names a GeoJSON file.
+
+With ``--checkpoint-every N`` a GeoJSON run journals its progress to
+``<output>.journal.json`` every N features (:mod:`qBRA.modules.checkpoint`);
+after a crash, rerunning the same command with ``--resume`` truncates the
+partial output to the last checkpoint and continues from there.  The
+journal is removed when the run completes.
+
+Navaids with unknown facilities or invalid parameters are skipped with a
+warning; the exit status is 1 when nothing could be generated.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from itertools import islice
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from .constants import (
+    CHECKPOINT_FEATURES,
+    CHECKPOINT_JOURNAL_SUFFIX,
+    MBTILES_MAX_ZOOM,
+    MBTILES_MIN_ZOOM,
+    OMNI_SEGMENTS,
+    OUTPUT_KIND_DIRECTIONAL,
+    OUTPUT_KIND_OMNI,
+    POSTGIS_BATCH_SIZE,
+    PROCESS_CHUNK_SIZE,
+)
+from .exceptions import BRAError
+from .modules.batch import iter_features, resolve_records
+from .modules.checkpoint import Checkpointer, Journal, file_signature, navaid_key, pending, truncate_output
+from .modules.sweep import METRIC_COLUMNS, Grid, Obstacles, applies_to, parse_sweep, sweep
+from .services.inventory_service import chunked, iter_records, load_obstacles, load_runways
+from .services.mbtiles_sink import MBTilesSink, is_mbtiles_path
+from .services.mesh_sink import MeshSink, is_mesh_path
+from .services.postgis_sink import PostGISSink, is_postgis_dsn
+from .utils.logging_config import setup_logger
+from .workers.process_backend import ProcessPoolBackend
+
+_SEQUENCE_SUFFIXES = (".geojsonl", ".geojsons", ".ndjson")
+
+logger = setup_logger("qBRA.cli", use_qgis=False)
+
+
+@dataclass
+class RunStats:
+    """Counters of one CLI run.
+
+    On resume the counters include the work of the journalled run;
+    ``restored`` is the part of ``navaids`` done before this run.
+    """
+
+    navaids: int = 0
+    features: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+    restored: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Navaids generated per second by this run."""
+        return (self.navaids - self.restored) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        text = (
+            f"{self.navaids} navaids ({self.features} features, {self.skipped} skipped) "
+            f"in {self.elapsed:.2f} s: {self.throughput:.1f} navaids/s"
+        )
+        if self.restored:
+            text += f" ({self.restored} navaids restored from the checkpoint)"
+        return text
+
+
+class GeoJSONWriter:
+    """Stream polygon features to a GeoJSON FeatureCollection or text sequence.
+
+    ``.geojsonl``/``.geojsons``/``.ndjson`` outputs get one feature per
+    line; anything else a FeatureCollection written incrementally.
+
+    :attr:`offset` counts the encoded bytes written; newlines are not
+    translated (``newline=""``), so it matches the file size on every
+    platform.  With ``resume``, an output already truncated to a checkpoint
+    is appended to instead.
+    """
+
+    def __init__(self, path: str, crs: Optional[str] = None, resume: Optional[Tuple[int, int]] = None) -> None:
+        """Initialise the writer.
+
+        Args:
+            path: Output file
+            crs: CRS name written to a FeatureCollection header
+            resume: ``(offset, features)`` of an output to append to
+        """
+        self._path = Path(path)
+        self._crs = crs
+        self._sequence = self._path.suffix.lower() in _SEQUENCE_SUFFIXES
+        self._handle: Optional[TextIO] = None
+        self._resume = resume
+        self._count = resume[1] if resume else 0
+        self.offset = resume[0] if resume else 0
+
+    def __enter__(self) -> "GeoJSONWriter":
+        if self._resume:
+            self._handle = open(self._path, "a", encoding="utf-8", newline="")
+            return self
+        self._handle = open(self._path, "w", encoding="utf-8", newline="")
+        if not self._sequence:
+            header: Dict[str, Any] = {"type": "FeatureCollection"}
+            if self._crs:
+                header["crs"] = {"type": "name", "properties": {"name": self._crs}}
+            self._emit(json.dumps(header)[:-1] + ', "features": [\n')
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        if self._handle is not None:
+            if not self._sequence:
+                self._emit("\n]}\n")
+            self._handle.close()
+            self._handle = None
+
+    def _emit(self, text: str) -> None:
+        self._handle.write(text)
+        self.offset += len(text.encode("utf-8"))
+
+    def sync(self) -> int:
+        """Flush the output to disk; returns its size in bytes."""
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        return self.offset
+
+    def write(self, rings: Sequence[np.ndarray], properties: Dict[str, Any], kind: str = OUTPUT_KIND_DIRECTIONAL) -> None:
+        """Write one polygon (exterior ring first) with its properties.
+
+        ``kind`` is accepted for interface parity with the PostGIS sink; both
+        kinds share one GeoJSON output.
+        """
+        feature = {
+            "type": "Feature",
+            "properties": properties,
+            "geometry": {"type": "Polygon", "coordinates": [ring.tolist() for ring in rings]},
+        }
+        text = json.dumps(feature)
+        if self._sequence:
+            self._emit(text + "\n")
+        else:
+            self._emit((",\n" if self._count else "") + text)
+        self._count += 1
+
+
+def process_chunk(
+    records: Sequence[Dict[str, Any]],
+    runways: Dict[str, Any],
+    backend: ProcessPoolBackend,
+    writer: Any,
+    stats: RunStats,
+    arc_segments: int = OMNI_SEGMENTS // 4,
+    segments: int = OMNI_SEGMENTS,
+    checkpoints: Optional[Checkpointer] = None,
+) -> None:
+    """Resolve, compute and write one chunk of navaid records.
+
+    ``writer`` is a :class:`GeoJSONWriter` or :class:`PostGISSink`.  With
+    ``checkpoints``, navaids already journalled as done are left out and
+    every feature is reported to the checkpointer before it is written.
+    """
+    def skip(navaid_id: Any, error: Exception) -> None:
+        stats.skipped += 1
+        logger.warning("Skipping navaid %s: %s", navaid_id, error)
+
+    directional, omni = resolve_records(records, runways, skip)
+    if checkpoints is not None:
+        done = checkpoints.journal.done_keys
+        directional = pending(directional, OUTPUT_KIND_DIRECTIONAL, done)
+        omni = pending(omni, OUTPUT_KIND_OMNI, done)
+    for rings, properties, kind in iter_features(directional, omni, backend, arc_segments, segments):
+        if checkpoints is not None:
+            checkpoints.feature(navaid_key(kind, properties), stats)
+        writer.write(rings, properties, kind)
+        stats.features += 1
+    stats.navaids += len(directional) + len(omni)
+
+
+class SweepTable:
+    """Stream sweep result rows to a CSV file."""
+
+    def __init__(self, path: str, names: Sequence[str]) -> None:
+        self._path = Path(path)
+        self._columns = ["navaid_id", "facility_key", "kind", "variant", *names, *METRIC_COLUMNS]
+        self._handle: Optional[TextIO] = None
+        self._writer: Any = None
+
+    def __enter__(self) -> "SweepTable":
+        self._handle = open(self._path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._handle, fieldnames=self._columns)
+        self._writer.writeheader()
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def write(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Append result rows."""
+        self._writer.writerows(rows)
+
+
+def sweep_chunk(
+    records: Sequence[Dict[str, Any]],
+    runways: Dict[str, Any],
+    grid: Grid,
+    obstacles: Optional[Obstacles],
+    table: SweepTable,
+    geometry: Optional[GeoJSONWriter],
+    stats: RunStats,
+    arc_segments: int = OMNI_SEGMENTS // 4,
+    segments: int = OMNI_SEGMENTS,
+) -> None:
+    """Sweep one chunk of navaid records and write the table (and geometry)."""
+    def skip(navaid_id: Any, error: Exception) -> None:
+        stats.skipped += 1
+        logger.warning("Skipping navaid %s: %s", navaid_id, error)
+
+    directional, omni = resolve_records(records, runways, skip)
+    for kind, navaids in ((OUTPUT_KIND_DIRECTIONAL, directional), (OUTPUT_KIND_OMNI, omni)):
+        if not navaids:
+            continue
+        if not applies_to(kind, grid):
+            for _params, _xy, navaid_id in navaids:
+                skip(navaid_id, ValueError(f"swept parameters do not apply to {kind} navaids"))
+            continue
+        result = sweep(navaids, kind, grid, obstacles, arc_segments, segments)
+        for navaid_id, values, error in result.invalid:
+            logger.warning("Skipping variant %s of navaid %s: %s", values, navaid_id, error)
+        table.write(result.rows())
+        stats.features += len(result)
+        stats.navaids += len(navaids)
+        if geometry is not None:
+            for rings, properties, feature_kind in result.features(None, None, arc_segments, segments):
+                geometry.write(rings, properties, feature_kind)
+
+
+def run_sweep(args: argparse.Namespace, grid: Grid, stats: RunStats) -> None:
+    """Run a parameter sweep over the inventory (``--sweep``)."""
+    runways = load_runways(args.runways, args.runway_layer) if args.runways else {}
+    obstacles = Obstacles(*load_obstacles(args.obstacles, args.obstacle_layer)) if args.obstacles else None
+    geometry = GeoJSONWriter(args.sweep_geometry, args.crs) if args.sweep_geometry else nullcontext()
+    with SweepTable(args.output, list(grid)) as table, geometry as writer:
+        for records in chunked(iter_records(args.navaids, args.layer), args.chunk_size):
+            sweep_chunk(records, runways, grid, obstacles, table, writer, stats, args.arc_segments, args.segments)
+
+
+def _run_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """Options a resumed run must share with the journalled one."""
+    options: Dict[str, Any] = {
+        "layer": args.layer, "crs": args.crs, "segments": args.segments, "arc_segments": args.arc_segments,
+    }
+    if args.runways:
+        options["runways"] = {"path": args.runways, "layer": args.runway_layer, **file_signature(args.runways)}
+    return options
+
+
+def _open_journal(args: argparse.Namespace, stats: RunStats) -> Tuple[Optional[Journal], bool]:
+    """Start or resume the checkpoint journal of a run.
+
+    Returns:
+        (journal, True if resumed); no journal without checkpointing
+    """
+    if not args.checkpoint_every and not args.resume:
+        return None, False
+    path = args.output + CHECKPOINT_JOURNAL_SUFFIX
+    options = _run_options(args)
+    if not (args.resume and os.path.exists(path)):
+        if args.resume:
+            logger.info("No checkpoint journal at %s; starting from the beginning", path)
+        journal = Journal.start(path, args.navaids, args.output, options)
+        # A stale journal must not survive into this run
+        journal.finish()
+        return journal, False
+    journal = Journal.load(path)
+    journal.check(args.navaids, args.output, options)
+    dropped = truncate_output(args.output, journal.offset)
+    stats.navaids, stats.features, stats.skipped = journal.navaids, journal.features, journal.skipped
+    stats.restored = journal.navaids
+    logger.info(
+        "Resuming after %d records (%d navaids, %d features); dropped %d bytes of partial output",
+        journal.records, journal.navaids, journal.features, dropped,
+    )
+    return journal, True
+
+
+def run_batch(args: argparse.Namespace, stats: RunStats) -> None:
+    """Generate the BRAs of the inventory into ``args.output``."""
+    runways = load_runways(args.runways, args.runway_layer) if args.runways else {}
+    task_size = max(1, -(-args.chunk_size // args.workers))
+    journal, resumed = _open_journal(args, stats)
+    records = iter_records(args.navaids, args.layer)
+    resume = None
+    if resumed:
+        records = islice(records, journal.records, None)
+        resume = (journal.offset, journal.features)
+    with _open_writer(args, resume) as writer, \
+            ProcessPoolBackend(max_workers=args.workers, chunk_size=task_size) as backend:
+        checkpoints = None
+        if journal is not None:
+            checkpoints = Checkpointer(journal, args.checkpoint_every or CHECKPOINT_FEATURES, writer.sync)
+        for chunk in chunked(records, args.chunk_size):
+            if checkpoints is not None:
+                checkpoints.begin_chunk(stats)
+            process_chunk(chunk, runways, backend, writer, stats, args.arc_segments, args.segments, checkpoints)
+            if checkpoints is not None:
+                checkpoints.end_chunk(len(chunk), stats)
+    if journal is not None:
+        journal.finish()
+
+
+def crs_srid(crs: Optional[str]) -> int:
+    """Return the SRID of an ``EPSG:<code>`` CRS name, 0 if there is none."""
+    if crs and crs.upper().startswith("EPSG:") and crs[5:].isdigit():
+        return int(crs[5:])
+    return 0
+
+
+def _resumable(args: argparse.Namespace) -> bool:
+    """Return True if the output supports checkpointing (GeoJSON files)."""
+    return not (is_mbtiles_path(args.output) or is_mesh_path(args.output) or is_postgis_dsn(args.output))
+
+
+def _open_writer(args: argparse.Namespace, resume: Optional[Tuple[int, int]] = None) -> Any:
+    if is_mbtiles_path(args.output):
+        return MBTilesSink(args.output, args.crs, args.min_zoom, args.max_zoom, workers=args.workers)
+    if is_mesh_path(args.output):
+        return MeshSink(args.output)
+    if is_postgis_dsn(args.output):
+        return PostGISSink(args.output, args.table, crs_srid(args.crs), args.batch_size, upsert=not args.append)
+    return GeoJSONWriter(args.output, args.crs, resume)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser of ``python -m qBRA``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m qBRA",
+        description="Generate Building Restriction Areas for a navaid inventory.",
+    )
+    parser.add_argument("navaids", help="Navaid inventory (.csv, .geojson, .geojsonl or .gpkg)")
+    parser.add_argument("-o", "--output", required=True,
+                        help="Output file (.geojson, .geojsonl, .mbtiles, .glb, .gltf or .obj) "
+                             "or PostgreSQL connection string")
+    parser.add_argument("--runways", help="Runway inventory used for azimuth and threshold distance")
+    parser.add_argument("--layer", help="GeoPackage table of the navaid inventory")
+    parser.add_argument("--runway-layer", help="GeoPackage table of the runway inventory")
+    parser.add_argument("--crs", help="CRS name written to the output (e.g. EPSG:32633)")
+    parser.add_argument("--chunk-size", type=int, default=PROCESS_CHUNK_SIZE,
+                        help="Navaids read and computed per chunk (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the geometry kernel (default: %(default)s)")
+    parser.add_argument("--segments", type=int, default=OMNI_SEGMENTS,
+                        help="Segments per omni circle (default: %(default)s)")
+    parser.add_argument("--table", default="bra",
+                        help="PostGIS base table name, '_directional'/'_omni' appended (default: %(default)s)")
+    parser.add_argument("--batch-size", type=int, default=POSTGIS_BATCH_SIZE,
+                        help="Features per PostGIS COPY batch (default: %(default)s)")
+    parser.add_argument("--append", action="store_true",
+                        help="Append to PostGIS tables instead of replacing rows of the same navaid")
+    parser.add_argument("--arc-segments", type=int, default=OMNI_SEGMENTS // 4,
+                        help="Segments per directional slope arc (default: %(default)s)")
+    parser.add_argument("--min-zoom", type=int, default=MBTILES_MIN_ZOOM,
+                        help="Lowest zoom of an .mbtiles output (default: %(default)s)")
+    parser.add_argument("--max-zoom", type=int, default=MBTILES_MAX_ZOOM,
+                        help="Highest zoom of an .mbtiles output (default: %(default)s)")
+    parser.add_argument("--checkpoint-every", type=int, default=0, metavar="N",
+                        help="Journal progress every N features so the run can be resumed "
+                             "(GeoJSON outputs; default: off)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the checkpoint journal of an interrupted run, if there is one "
+                             f"(checkpoints every {CHECKPOINT_FEATURES} features unless --checkpoint-every is given)")
+    parser.add_argument("--sweep", action="append", metavar="NAME=VALUES",
+                        help="Sweep a parameter over a list (20,25,30) or range (start:stop:step); "
+                             "repeat for more parameters. -o then receives a CSV table")
+    parser.add_argument("--obstacles", help="Obstacle point inventory counted per sweep variant")
+    parser.add_argument("--obstacle-layer", help="GeoPackage table of the obstacle inventory")
+    parser.add_argument("--sweep-geometry", help="GeoJSON file receiving the geometry of every sweep variant")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the command line; returns the process exit status."""
+    args = build_parser().parse_args(argv)
+    if (args.chunk_size < 1 or args.workers < 1 or args.segments < 3 or args.arc_segments < 1
+            or args.batch_size < 1):
+        print("chunk-size, workers, arc-segments and batch-size must be >= 1, segments >= 3", file=sys.stderr)
+        return 2
+    if (args.checkpoint_every or args.resume) and (args.sweep or not _resumable(args)):
+        print("--checkpoint-every and --resume need a GeoJSON output and no --sweep", file=sys.stderr)
+        return 2
+    if args.checkpoint_every < 0:
+        print("checkpoint-every must be >= 0", file=sys.stderr)
+        return 2
+
+    stats = RunStats()
+    started = time.perf_counter()
+    try:
+        if args.sweep:
+            run_sweep(args, parse_sweep(args.sweep), stats)
+        else:
+            run_batch(args, stats)
+    except (BRAError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    stats.elapsed = time.perf_counter() - started
+
+    print(stats.summary(), file=sys.stderr)
+    return 0 if stats.navaids or not stats.skipped else 1
@@ -2,7 +2,8 @@
 
 Centralises all FacilityConfig objects that were previously defined inside
 IlsLlzDockWidget._init_facility().  Import FACILITY_REGISTRY wherever you
-need to look up a facility by key.
+need to look up a facility by key, and OMNI_FACILITY_PRESETS for the
+omnidirectional presets.
 """
 
 from qBRA.models.bra_parameters import FacilityConfig, FacilityDefaults
@@ -37,3 +38,24 @@ FACILITY_REGISTRY: dict[str, FacilityConfig] = {
         defaults=FacilityDefaults(b=20, h=70, D=600, H=20, L=1500, phi=40, r_expr="a+6000"),
     ),
 }
+
+# ---------------------------------------------------------------------------
+# Omnidirectional facility presets
+# ---------------------------------------------------------------------------
+
+#: key -> (label, defaults for r, alpha, R and optional turbine j/h)
+OMNI_FACILITY_PRESETS: dict[str, tuple[str, dict[str, float]]] = {
+    "OMNI_DME_N": ("DME N (omnidirectional)", {"r": 300, "alpha": 1.0, "R": 3000}),
+    "OMNI_CVOR": ("CVOR (omnidirectional)", {"r": 600, "alpha": 1.0, "R": 3000, "j": 15000, "h": 52}),
+    "OMNI_DVOR": ("DVOR (omnidirectional)", {"r": 600, "alpha": 1.0, "R": 3000, "j": 10000, "h": 52}),
+    "OMNI_DF": ("Direction Finder (omnidirectional)", {"r": 500, "alpha": 1.0, "R": 3000, "j": 10000, "h": 52}),
+    "OMNI_MARKERS": ("Markers (omnidirectional)", {"r": 50, "alpha": 20.0, "R": 200}),
+    "OMNI_NDB": ("NDB (omnidirectional)", {"r": 200, "alpha": 5.0, "R": 1000}),
+    "OMNI_GBAS_REF": ("GBAS ground Reference receiver", {"r": 400, "alpha": 3.0, "R": 3000}),
+    "OMNI_GBAS_VDB": ("GBAS VDB station", {"r": 300, "alpha": 0.9, "R": 3000}),
+    "OMNI_VDB_MON": ("VDB station monitoring station", {"r": 400, "alpha": 3.0, "R": 3000}),
+    "OMNI_VHF_TX": ("VHF Communication Tx", {"r": 300, "alpha": 1.0, "R": 2000}),
+    "OMNI_VHF_RX": ("VHF Communication Rx", {"r": 300, "alpha": 1.0, "R": 2000}),
+    "OMNI_PSR": ("PSR (surveillance)", {"r": 500, "alpha": 0.25, "R": 15000}),
+    "OMNI_SSR": ("SSR (surveillance)", {"r": 500, "alpha": 0.25, "R": 15000}),
+}
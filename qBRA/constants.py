@@ -12,6 +12,9 @@ Import from here rather than repeating literal values.
 #: line–circle / segment–segment intersections are always computable.
 PROJECTION_DISTANCE: int = 10_000
 
+#: Vertices per full circle of the omnidirectional BRA rings.
+OMNI_SEGMENTS: int = 128
+
 # ---------------------------------------------------------------------------
 # Memory layer creation
 # ---------------------------------------------------------------------------
@@ -22,3 +25,225 @@ CRS_TEMPLATE_PREFIX: str = "PolygonZ?crs="
 
 #: Suffix appended to the display name when naming BRA output layers.
 LAYER_NAME_SUFFIX: str = "BRA_areas"
+
+#: Suffix appended to the display name when naming omnidirectional BRA layers.
+OMNI_LAYER_NAME_SUFFIX: str = "BRA_omni"
+
+#: Suffix appended to the remark when naming directional scenario layers.
+SCENARIO_LAYER_NAME_SUFFIX: str = "BRA_scenarios"
+
+# ---------------------------------------------------------------------------
+# Persistent output layers
+# ---------------------------------------------------------------------------
+
+#: Layer custom property marking a layer as the persistent BRA target.  The
+#: value is the output kind (``"directional"`` or ``"omni"``).
+PERSISTENT_LAYER_PROPERTY: str = "qbra/persistent_kind"
+
+#: Layer custom property holding the JSON recipe (parameters + navaid
+#: reference) a BRA memory layer is regenerated from after a project load.
+RECIPE_PROPERTY: str = "qbra/recipe"
+
+#: Upsert key fields added to persistent output layers.  Feature ids are
+#: only unique within one navaid layer, so the navaid layer id is part of
+#: the key.
+NAVAID_LAYER_FIELD: str = "navaid_layer"
+NAVAID_FID_FIELD: str = "navaid_fid"
+FACILITY_KEY_FIELD: str = "facility_key"
+
+#: Output kinds — one persistent layer exists per kind since the schemas differ.
+OUTPUT_KIND_DIRECTIONAL: str = "directional"
+OUTPUT_KIND_OMNI: str = "omni"
+
+# ---------------------------------------------------------------------------
+# Linked mode
+# ---------------------------------------------------------------------------
+
+#: Quiet period (milliseconds) after the last source edit before linked BRAs
+#: are recomputed.  Rapid edits within this window are coalesced.
+LINK_DEBOUNCE_MS: int = 500
+
+# ---------------------------------------------------------------------------
+# Layer materialisation
+# ---------------------------------------------------------------------------
+
+#: Time slice (milliseconds) spent per event-loop turn adding computed BRA
+#: features to their layers, and the features added per provider call.
+MATERIALISE_BUDGET_MS: int = 15
+MATERIALISE_CHUNK: int = 200
+
+# ---------------------------------------------------------------------------
+# 2D footprint companion layers
+# ---------------------------------------------------------------------------
+
+#: WKT geometry type + CRS prefix for the flat display footprint layers.
+FOOTPRINT_CRS_TEMPLATE_PREFIX: str = "Polygon?crs="
+
+#: Suffix appended to the source layer name / output kind for footprints.
+FOOTPRINT_SUFFIX: str = "footprint"
+
+#: Douglas–Peucker tolerance (metres) applied to footprint rings.
+FOOTPRINT_SIMPLIFY_TOLERANCE_M: float = 1.0
+
+#: Approximate metres per degree, used to express metre tolerances in
+#: geographic CRSs.
+METRES_PER_DEGREE: float = 111_320.0
+
+# ---------------------------------------------------------------------------
+# Aerodrome envelopes
+# ---------------------------------------------------------------------------
+
+#: Name of the aggregated "lowest limiting surface" layer.
+ENVELOPE_LAYER_NAME: str = "BRA aerodrome envelopes"
+
+#: Extra distance (metres) by which BRA extents are grown before grouping,
+#: so BRAs that nearly touch still end up in the same aerodrome group.
+ENVELOPE_GROUP_MARGIN_M: float = 0.0
+
+#: ``limit_basis`` of envelope regions limited by a horizontal surface: the
+#: region's ``limit_elev`` is the limiting height everywhere in it.
+ENVELOPE_BASIS_EXACT: str = "exact"
+
+#: ``limit_basis`` of envelope regions limited by a sloping surface (the
+#: directional slope, the omni cone): ``limit_elev`` is the surface's lowest
+#: height, a lower bound of the limiting height that rises across the region.
+ENVELOPE_BASIS_LOWER_BOUND: str = "lower bound"
+
+# ---------------------------------------------------------------------------
+# Terrain check
+# ---------------------------------------------------------------------------
+
+#: Edge length (cells) of the DEM blocks read and cached by the terrain check.
+DEM_BLOCK_SIZE: int = 256
+
+#: Maximum number of DEM blocks kept in memory (256² float64 ≈ 0.5 MB each).
+DEM_CACHE_BLOCKS: int = 64
+
+#: Maximum vertex residual (metres) accepted when fitting a surface model.
+SURFACE_FIT_TOLERANCE_M: float = 0.01
+
+#: Name of the terrain penetration report layer.
+TERRAIN_LAYER_NAME: str = "BRA terrain penetrations"
+
+#: Name of the layer with the merged penetrating DEM cells per surface.
+TERRAIN_AREA_LAYER_NAME: str = "BRA terrain penetration areas"
+
+# ---------------------------------------------------------------------------
+# Wind-turbine screening
+# ---------------------------------------------------------------------------
+
+#: Turbine height fields (metres above ground), in order of preference.
+TURBINE_TIP_FIELDS: tuple = ("tip_height", "tip_h", "total_height", "height")
+TURBINE_HUB_FIELDS: tuple = ("hub_height", "hub_h")
+
+#: Rotor size fields (metres); hub height plus rotor radius gives the tip height.
+TURBINE_ROTOR_RADIUS_FIELDS: tuple = ("rotor_radius", "rotor_r", "blade_length")
+TURBINE_ROTOR_DIAMETER_FIELDS: tuple = ("rotor_diameter", "rotor_d")
+
+#: Ground elevation fields of turbines / omni sites, in order of preference.
+TURBINE_BASE_FIELDS: tuple = ("ground_elev", "base_elev", "elevation", "elev")
+SITE_ELEV_FIELDS: tuple = ("site_elev", "elevation", "elev")
+
+#: Names of the screening report layers.
+TURBINE_SCREENING_LAYER_NAME: str = "Turbine screening"
+TURBINE_SITE_LAYER_NAME: str = "Omni site screening"
+
+# ---------------------------------------------------------------------------
+# Process-pool geometry backend
+# ---------------------------------------------------------------------------
+
+#: Navaids per task sent to a worker process.  Large enough that the
+#: vectorised kernel dominates the task overhead.
+PROCESS_CHUNK_SIZE: int = 2048
+
+#: Directional calculations running at the same time; further Calculate
+#: clicks wait in the queue.  Workers read the navaid layer, so one at a
+#: time keeps those reads off concurrent threads.
+CALCULATION_MAX_WORKERS: int = 1
+
+#: Features per kind buffered by the PostGIS sink before each ``COPY``.
+POSTGIS_BATCH_SIZE: int = 5000
+
+#: Features between checkpoints of a resumable run (``--resume`` default).
+CHECKPOINT_FEATURES: int = 10_000
+
+#: Appended to the output path to name the checkpoint journal.
+CHECKPOINT_JOURNAL_SUFFIX: str = ".journal.json"
+
+# ---------------------------------------------------------------------------
+# Viewport-driven materialisation
+# ---------------------------------------------------------------------------
+
+#: Name of the memory layer showing the BRAs around the current view.
+VIEWPORT_LAYER_NAME: str = "BRA_viewport"
+
+#: Tile edge length (layer units, metres in projected CRSs) navaids are
+#: bucketed into.
+VIEWPORT_TILE_SIZE_M: float = 10_000.0
+
+#: Computed tiles kept in the cache; visible tiles are never evicted.
+VIEWPORT_CACHE_TILES: int = 64
+
+#: Views needing more navaids than this are not materialised (zoom in).
+VIEWPORT_MAX_NAVAIDS: int = 2000
+
+#: Quiet period (milliseconds) after the last canvas extent change before the
+#: viewport BRAs are updated.
+VIEWPORT_DEBOUNCE_MS: int = 250
+
+# ---------------------------------------------------------------------------
+# Parameter sweeps
+# ---------------------------------------------------------------------------
+
+#: Maximum number of parameter combinations evaluated per navaid.
+SWEEP_MAX_VARIANTS: int = 10_000
+
+#: Absolute obstacle top elevation fields, in order of preference; without
+#: one the top is ground elevation plus height (see the turbine fields).
+OBSTACLE_TOP_FIELDS: tuple = ("top_elev", "top_elevation", "top")
+
+# ---------------------------------------------------------------------------
+# Vector-tile (MBTiles) export
+# ---------------------------------------------------------------------------
+
+#: Tile units per tile edge and buffer kept around each tile (tile units).
+MVT_EXTENT: int = 4096
+MVT_BUFFER: int = 64
+
+#: Default zoom range of the exported tile pyramid.
+MBTILES_MIN_ZOOM: int = 6
+MBTILES_MAX_ZOOM: int = 14
+
+#: Douglas–Peucker tolerance in tile units, applied at every zoom.
+MBTILES_SIMPLIFY_TOLERANCE: float = 2.0
+
+#: Below this zoom only :data:`MBTILES_COARSE_ATTRIBUTES` are kept.
+MBTILES_DETAIL_ZOOM: int = 12
+MBTILES_COARSE_ATTRIBUTES: tuple = ("navaid_id", "facility_key", "area", "max_elev", "type")
+
+#: Tiles encoded per worker task.
+MBTILES_TASK_TILES: int = 256
+
+# ---------------------------------------------------------------------------
+# Point query
+# ---------------------------------------------------------------------------
+
+#: Children per node of the point-query R-tree.
+QUERY_NODE_CAPACITY: int = 16
+
+# ---------------------------------------------------------------------------
+# Profiling capture
+# ---------------------------------------------------------------------------
+
+#: Directory (under the system temp dir) used when no profile directory is set.
+PROFILE_DIR_NAME: str = "qbra_profiles"
+
+#: Functions listed in the text summary of a profile.
+PROFILE_TOP_N: int = 30
+
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
+
+#: Maximum log records forwarded to the QGIS log per batch.
+LOG_BATCH_SIZE: int = 100
@@ -1,19 +1,23 @@
-from typing import Any, Optional, Dict, Tuple
+from typing import Any, List, Optional, Dict, Sequence, Set, Tuple
 
 from qgis.PyQt import uic
 from qgis.PyQt.QtCore import Qt, pyqtSignal
 from qgis.PyQt.QtWidgets import QDockWidget
 from ...utils.qt_compat import LeftDockWidgetArea, RightDockWidgetArea, MsgWarning, MsgCritical
-from qgis.core import QgsWkbTypes, QgsPoint, QgsVectorLayer, QgsProject
+from qgis.core import QgsWkbTypes, QgsVectorLayer, QgsRasterLayer, QgsProject
 
 import os
 import re
 
+from ...config import OMNI_FACILITY_PRESETS
 from ...models.bra_parameters import BRAParameters
 from ...services.validation_service import ValidationService, ValidationError
 from ...services.layer_service import LayerService
 from ...exceptions import BRACalculationError
+from ...modules.kernel import routing_azimuth
 from ...utils.logging_config import get_logger
+from ...utils.profiling import default_profile_dir
+from ...workers.layer_worker import LayerTypeWorker
 
 # Module logger
 logger = get_logger(__name__)
@@ -23,6 +27,11 @@ UI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__)
 class IlsLlzDockWidget(QDockWidget):
     calculateRequested = pyqtSignal()
     closedRequested = pyqtSignal()
+    envelopesRequested = pyqtSignal()
+    terrainRequested = pyqtSignal()
+    turbinesRequested = pyqtSignal()
+    scenariosRequested = pyqtSignal()
+    cancelQueuedRequested = pyqtSignal()
     
     _facility_defs_dir: Dict[str, Tuple]
     _facility_defs_omni: Dict[str, Tuple]
@@ -46,6 +55,12 @@ class IlsLlzDockWidget(QDockWidget):
         self.setObjectName("IlsLlzDockWidget")
         self._widget = uic.loadUi(UI_PATH)
         self.setWidget(self._widget)
+        # Layers of unknown geometry type are resolved on worker threads
+        # after the combos are shown, so remote providers never block the dock
+        self._pending_layers: Set[str] = set()
+        self._layer_selection: Dict[str, Any] = {}
+        self._type_workers: List[LayerTypeWorker] = []
+        QgsProject.instance().layersRemoved.connect(self._on_layers_removed)
         self._wire()
         self._init_mode_and_facilities()
         self.refresh_layers()
@@ -62,10 +77,30 @@ class IlsLlzDockWidget(QDockWidget):
         """Wire up UI signal connections."""
         self._widget.btnClose.clicked.connect(lambda: self.closedRequested.emit())
         self._widget.btnCalculate.clicked.connect(lambda: self.calculateRequested.emit())
+        self._widget.btnEnvelopes.clicked.connect(lambda: self.envelopesRequested.emit())
+        self._widget.btnTerrain.clicked.connect(lambda: self.terrainRequested.emit())
+        self._widget.btnTurbines.clicked.connect(lambda: self.turbinesRequested.emit())
+        self._widget.btnScenarios.clicked.connect(lambda: self.scenariosRequested.emit())
+        self._widget.btnCancelQueued.clicked.connect(lambda: self.cancelQueuedRequested.emit())
         self._widget.btnDirection.clicked.connect(self._toggle_direction)
+        self._widget.chkPersistentOutput.toggled.connect(self._on_persistent_toggled)
+        self._widget.chkLinkedMode.toggled.connect(self._on_linked_toggled)
         # Default direction: start to end
         self._widget.btnDirection.setProperty("direction", "forward")
         self._widget.btnDirection.setText("Direction: Start to End")
+        self._widget.txtProfileDir.setPlaceholderText(default_profile_dir())
+        self._queued_ids: List[int] = []
+
+    def _on_persistent_toggled(self, checked: bool) -> None:
+        """Enable the target combo; linked mode needs a persistent target."""
+        self._widget.cboOutputLayer.setEnabled(checked)
+        if not checked:
+            self._widget.chkLinkedMode.setChecked(False)
+
+    def _on_linked_toggled(self, checked: bool) -> None:
+        """Linked BRAs are upserted on recompute, so force persistent output."""
+        if checked:
+            self._widget.chkPersistentOutput.setChecked(True)
 
     def _init_mode_and_facilities(self):
         # Directional facilities
@@ -76,23 +111,13 @@ class IlsLlzDockWidget(QDockWidget):
             "GP": ("ILS GP M-Type (dual)", False, {"a": 800, "b": 50, "h": 70, "D": 250, "H": 5, "L": 325, "phi": 10, "r": 6000}),
             "DME": ("DME (directional)", True, {"b": 20, "h": 70, "D": 600, "H": 20, "L": 1500, "phi": 40, "r_expr": "a+6000"}),
         }
-        # Omnidirectional facilities presets (initial set)
-        self._facility_defs_omni = {
-            # key: (label, defaults for r, alpha, R, optional j/h)
-            "OMNI_DME_N": ("DME N (omnidirectional)", {"r": 300, "alpha": 1.0, "R": 3000}),
-            "OMNI_CVOR": ("CVOR (omnidirectional)", {"r": 600, "alpha": 1.0, "R": 3000, "j": 15000, "h": 52}),
-            "OMNI_DVOR": ("DVOR (omnidirectional)", {"r": 600, "alpha": 1.0, "R": 3000, "j": 10000, "h": 52}),
-            "OMNI_DF": ("Direction Finder (omnidirectional)", {"r": 500, "alpha": 1.0, "R": 3000, "j": 10000, "h": 52}),
-            "OMNI_MARKERS": ("Markers (omnidirectional)", {"r": 50, "alpha": 20.0, "R": 200}),
-            "OMNI_NDB": ("NDB (omnidirectional)", {"r": 200, "alpha": 5.0, "R": 1000}),
-            "OMNI_GBAS_REF": ("GBAS ground Reference receiver", {"r": 400, "alpha": 3.0, "R": 3000}),
-            "OMNI_GBAS_VDB": ("GBAS VDB station", {"r": 300, "alpha": 0.9, "R": 3000}),
-            "OMNI_VDB_MON": ("VDB station monitoring station", {"r": 400, "alpha": 3.0, "R": 3000}),
-            "OMNI_VHF_TX": ("VHF Communication Tx", {"r": 300, "alpha": 1.0, "R": 2000}),
-            "OMNI_VHF_RX": ("VHF Communication Rx", {"r": 300, "alpha": 1.0, "R": 2000}),
-            "OMNI_PSR": ("PSR (surveillance)", {"r": 500, "alpha": 0.25, "R": 15000}),
-            "OMNI_SSR": ("SSR (surveillance)", {"r": 500, "alpha": 0.25, "R": 15000}),
-        }
+        # Omnidirectional facilities presets (shared with headless tools)
+        self._facility_defs_omni = dict(OMNI_FACILITY_PRESETS)
+        # Scenario comparison: one list row per directional facility
+        self._scenario_keys = list(self._facility_defs_dir)
+        self._widget.lstScenarioFacilities.clear()
+        for label, _dep, _defs in self._facility_defs_dir.values():
+            self._widget.lstScenarioFacilities.addItem(label)
 
         # connect handlers
         self._widget.cboMode.currentIndexChanged.connect(self._on_mode_changed)
@@ -249,44 +274,233 @@ class IlsLlzDockWidget(QDockWidget):
         self._widget.btnDirection.setText(label)
 
     def refresh_layers(self) -> None:
-        """Fill navaid (point) and routing (line) combos from layers in the canvas.
+        """Fill the layer combos from the layers in the canvas.
 
-        Uses LayerService to discover layers from the project.
+        Layers whose geometry type is already in the layer catalog are listed
+        immediately; the others are resolved by a :class:`LayerTypeWorker`
+        and added by :meth:`_on_layer_type` as their types arrive.  Previous
+        output/DEM/turbine selections and the active point layer (as default
+        navaid) are re-selected as soon as their entries appear.
         """
         self._widget.cboNavaidLayer.clear()
         self._widget.cboRoutingLayer.clear()
-        # Collect layers via the layer tree to include layers inside groups
-        root = QgsProject.instance().layerTreeRoot()
-        def visit(node):
-            for child in node.children():
-                if child.nodeType() == child.NodeLayer:
-                    layer = child.layer()
-                    if not isinstance(layer, QgsVectorLayer):
-                        continue
-                    name = layer.name()
-                    gtype = QgsWkbTypes.geometryType(layer.wkbType())
-                    if gtype == QgsWkbTypes.LineGeometry:
-                        self._widget.cboRoutingLayer.addItem(name, layer.id())
-                    if gtype == QgsWkbTypes.PointGeometry:
-                        self._widget.cboNavaidLayer.addItem(name, layer.id())
-                elif child.nodeType() == child.NodeGroup:
-                    visit(child)
-        visit(root)
-
-        # Default navaid: current active layer if it is a point layer
+        previous_output = self._widget.cboOutputLayer.currentData()
+        self._widget.cboOutputLayer.clear()
+        # First entry: let the plugin create/reuse its own persistent memory layer
+        self._widget.cboOutputLayer.addItem("<plugin BRA layer>", None)
+        previous_dem = self._widget.cboDemLayer.currentData()
+        self._widget.cboDemLayer.clear()
+        previous_turbines = self._widget.cboTurbineLayer.currentData()
+        self._widget.cboTurbineLayer.clear()
+
+        # Default navaid: current active layer (only listed if it is a point layer)
         al = self.iface.activeLayer()
-        if al and isinstance(al, QgsVectorLayer):
-            gtype = QgsWkbTypes.geometryType(al.wkbType())
-            if gtype == QgsWkbTypes.PointGeometry:
-                idx = self._widget.cboNavaidLayer.findText(al.name())
-                if idx >= 0:
-                    self._widget.cboNavaidLayer.setCurrentIndex(idx)
+        selection = {
+            "cboOutputLayer": previous_output,
+            "cboDemLayer": previous_dem,
+            "cboTurbineLayer": previous_turbines,
+            "cboNavaidLayer": al.id() if al and isinstance(al, QgsVectorLayer) else None,
+        }
+        self._layer_selection = {name: layer_id for name, layer_id in selection.items() if layer_id}
+
+        # Walking the layer tree is cheap; only geometry types may block
+        catalog = self._layer_service.catalog
+        self._pending_layers.clear()
+        sources = []
+        for layer in self._layer_service.iter_layers():
+            if isinstance(layer, QgsRasterLayer):
+                self._widget.cboDemLayer.addItem(layer.name(), layer.id())
+            elif isinstance(layer, QgsVectorLayer):
+                gtype = catalog.cached(layer.id())
+                if gtype is None:
+                    self._pending_layers.add(layer.id())
+                    sources.append((layer.id(), layer.providerType(), layer.source()))
+                else:
+                    self._add_vector_layer(layer, gtype)
+        self._restore_layer_selection()
+
+        if sources:
+            worker = LayerTypeWorker(sources, parent=self)
+            worker.resolved.connect(self._on_layer_type)
+            worker.finished.connect(lambda worker=worker: self._on_type_worker_finished(worker))
+            self._type_workers.append(worker)
+            worker.start()
+        else:
+            self._layer_selection.clear()
+
+    def _add_vector_layer(self, layer: QgsVectorLayer, gtype: int) -> None:
+        """Add a vector layer to the combos matching its geometry type."""
+        name = layer.name()
+        if gtype == QgsWkbTypes.LineGeometry:
+            self._widget.cboRoutingLayer.addItem(name, layer.id())
+        if gtype == QgsWkbTypes.PointGeometry:
+            self._widget.cboNavaidLayer.addItem(name, layer.id())
+            self._widget.cboTurbineLayer.addItem(name, layer.id())
+        if gtype == QgsWkbTypes.PolygonGeometry:
+            self._widget.cboOutputLayer.addItem(name, layer.id())
+
+    def _restore_layer_selection(self) -> None:
+        """Select remembered layers whose combo entries exist by now."""
+        for combo_name, layer_id in list(self._layer_selection.items()):
+            combo = getattr(self._widget, combo_name)
+            idx = combo.findData(layer_id)
+            if idx >= 0:
+                combo.setCurrentIndex(idx)
+                del self._layer_selection[combo_name]
+
+    def _on_layer_type(self, layer_id: str, gtype: Optional[int]) -> None:
+        """Cache a geometry type resolved by a worker and list the layer if still pending.
+
+        Sources that cannot be opened on their own (``gtype`` None) fall
+        back to the layer's own type.
+        """
+        catalog = self._layer_service.catalog
+        if gtype is not None:
+            catalog.store(layer_id, gtype)
+        if layer_id not in self._pending_layers:
+            return
+        self._pending_layers.discard(layer_id)
+        layer = QgsProject.instance().mapLayer(layer_id)
+        if isinstance(layer, QgsVectorLayer):
+            self._add_vector_layer(layer, gtype if gtype is not None else catalog.geometry_type(layer))
+        self._restore_layer_selection()
+        if not self._pending_layers:
+            self._layer_selection.clear()
+
+    def _on_type_worker_finished(self, worker: LayerTypeWorker) -> None:
+        """Forget a finished layer type worker."""
+        if worker in self._type_workers:
+            self._type_workers.remove(worker)
+        worker.deleteLater()
+
+    def release(self) -> None:
+        """Stop layer resolution and disconnect from the project before the dock is deleted."""
+        for worker in self._type_workers:
+            try:
+                worker.resolved.disconnect(self._on_layer_type)
+            except (TypeError, RuntimeError):
+                pass
+            worker.wait()
+        self._type_workers.clear()
+        self._pending_layers.clear()
+        try:
+            QgsProject.instance().layersRemoved.disconnect(self._on_layers_removed)
+        except (TypeError, RuntimeError):
+            pass
+
+    def _on_layers_removed(self, layer_ids: Any) -> None:
+        """Forget removed layers in the catalog and the resolution queue."""
+        self._layer_service.catalog.forget(layer_ids)
+        self._pending_layers.difference_update(layer_ids)
 
+    def set_queue(self, running: Sequence[str], pending: Sequence[Tuple[int, str]]) -> None:
+        """Show the calculation queue.
 
-    def set_calculating(self, calculating: bool) -> None:
-        """Enable/disable the Calculate button during background calculation."""
-        self._widget.btnCalculate.setEnabled(not calculating)
-        self._widget.btnCalculate.setText("Calculating\u2026" if calculating else "Calculate")
+        Calculate stays enabled: while a calculation runs, further clicks
+        are queued.
+
+        Args:
+            running: Labels of the running calculations
+            pending: (job id, label) of the queued calculations, in order
+        """
+        if running:
+            status = f"Running: {', '.join(running)}; queued: {len(pending)}"
+        else:
+            status = "No calculation running"
+        self._widget.lblQueueStatus.setText(status)
+        self._widget.btnCalculate.setText("Queue calculation" if running else "Calculate")
+        self._queued_ids = [job_id for job_id, _label in pending]
+        queue = self._widget.lstQueue
+        queue.clear()
+        for _job_id, label in pending:
+            queue.addItem(label)
+        self._widget.btnCancelQueued.setEnabled(bool(pending))
+
+    def queued_selection(self) -> Optional[List[int]]:
+        """Return the ids of the selected queued calculations, None if none is selected."""
+        queue = self._widget.lstQueue
+        selected = [job_id for row, job_id in enumerate(self._queued_ids) if queue.item(row).isSelected()]
+        return selected or None
+
+    def is_persistent_output(self) -> bool:
+        """Return True if results should be upserted into a persistent layer."""
+        return bool(self._widget.chkPersistentOutput.isChecked())
+
+    def persistent_layer_id(self) -> Optional[str]:
+        """Return the id of the user-chosen persistent layer.
+
+        Returns:
+            Layer id, or None to let the plugin create/reuse its own layer.
+        """
+        return self._widget.cboOutputLayer.currentData() or None
+
+    def is_footprint_output(self) -> bool:
+        """Return True if a 2D display footprint layer should be emitted too."""
+        return bool(self._widget.chkFootprint.isChecked())
+
+    def take_profile_request(self) -> Optional[str]:
+        """Return the profile directory if the next calculation is to be profiled.
+
+        The request covers one calculation: the checkbox is cleared.
+
+        Returns:
+            Directory ("" for the default one), or None to not profile.
+        """
+        if not self._widget.chkProfileNext.isChecked():
+            return None
+        self._widget.chkProfileNext.setChecked(False)
+        return self._widget.txtProfileDir.text().strip()
+
+    def scenario_request(self) -> Tuple[List[str], List[str]]:
+        """Return the facility keys and routing directions to compare.
+
+        Without a selected facility the dock's facility is compared; the
+        dock's direction is used unless both directions are requested.
+
+        Returns:
+            (facility keys, directions)
+        """
+        facilities = self._widget.lstScenarioFacilities
+        keys = [key for row, key in enumerate(self._scenario_keys) if facilities.item(row).isSelected()]
+        if not keys:
+            keys = [self._widget.cboFacility.currentData()]
+        if self._widget.chkScenarioBothDirections.isChecked():
+            directions = ["forward", "backward"]
+        else:
+            directions = [self._widget.btnDirection.property("direction") or "forward"]
+        return keys, directions
+
+    def navaid_layer_id(self) -> Optional[str]:
+        """Return the id of the chosen navaid layer."""
+        return self._widget.cboNavaidLayer.currentData() or None
+
+    def routing_layer_id(self) -> Optional[str]:
+        """Return the id of the chosen routing/runway layer."""
+        return self._widget.cboRoutingLayer.currentData() or None
+
+    def dem_layer_id(self) -> Optional[str]:
+        """Return the id of the DEM layer chosen for the terrain check."""
+        return self._widget.cboDemLayer.currentData() or None
+
+    def turbine_layer_id(self) -> Optional[str]:
+        """Return the id of the turbine layer chosen for screening."""
+        return self._widget.cboTurbineLayer.currentData() or None
+
+    def is_linked_mode(self) -> bool:
+        """Return True if results should stay linked to their source features."""
+        return bool(self._widget.chkLinkedMode.isChecked())
+
+    def routing_source(self) -> Optional[Tuple[str, int]]:
+        """Return (layer id, feature id) of the selected routing feature.
+
+        Returns:
+            The routing source, or None if no routing feature is selected.
+        """
+        layer_id = self._widget.cboRoutingLayer.currentData()
+        layer = QgsProject.instance().mapLayer(layer_id) if layer_id else None
+        if not layer or not layer.selectedFeatureCount():
+            return None
+        return (layer_id, layer.selectedFeatures()[0].id())
 
     def is_omni_mode(self) -> bool:
         """Return True if the current mode is omnidirectional."""
@@ -320,10 +534,17 @@ class IlsLlzDockWidget(QDockWidget):
 
         return {
             "active_layer": navaid_layer,
+            "navaid_fid": navaid_layer.selectedFeatures()[0].id(),
             "site_elev": site_elev,
             "facility_key": facility_key,
             "facility_label": facility_label,
             "display_name": display_name,
+            **self._omni_values(),
+        }
+
+    def _omni_values(self) -> dict:
+        """Return the omni surface parameters (r, alpha, R, turbine j/h) from the UI."""
+        return {
             "omni_r": float(self._widget.spnOmni_r.value()),
             "omni_alpha": float(self._widget.spnOmni_alpha.value()),
             "omni_R": float(self._widget.spnOmni_R.value()),
@@ -332,6 +553,36 @@ class IlsLlzDockWidget(QDockWidget):
             "omni_h": float(self._widget.spnOmni_h.value()),
         }
 
+    def get_screening_parameters(self) -> Optional[dict]:
+        """Extract wind-turbine screening inputs from the UI.
+
+        All features of the navaid layer are screened with the current omni
+        parameters; no selection is needed.
+
+        Returns:
+            Dict with ``site_layer``, ``turbine_layer``, ``site_elev`` and the
+            omni values, or None if a layer is missing or turbine mode is off.
+        """
+        project = QgsProject.instance()
+        site_id = self._widget.cboNavaidLayer.currentData()
+        turbine_id = self.turbine_layer_id()
+        site_layer = project.mapLayer(site_id) if site_id else None
+        turbine_layer = project.mapLayer(turbine_id) if turbine_id else None
+        if not self.is_omni_mode() or not self._widget.chkOmniTurbine.isChecked():
+            self.iface.messageBar().pushMessage(
+                "QBRA", "Select an omni facility with the turbine cylinder enabled", level=MsgWarning
+            )
+            return None
+        if not site_layer or not turbine_layer:
+            self.iface.messageBar().pushMessage("QBRA", "Select navaid and turbine layers", level=MsgWarning)
+            return None
+        return {
+            "site_layer": site_layer,
+            "turbine_layer": turbine_layer,
+            "site_elev": float(self._widget.spnSiteElev.value()),
+            **self._omni_values(),
+        }
+
     def get_parameters(self) -> Optional[BRAParameters]:
         """Extract and validate all parameters from the UI.
 
@@ -398,14 +649,7 @@ class IlsLlzDockWidget(QDockWidget):
 
             # Apply direction setting to routing points
             direction = self._widget.btnDirection.property("direction") or "forward"
-            ordered_pts = pts if direction == "forward" else list(reversed(pts))
-            # QgsPoint(x, y) is required for azimuth(); QgsPointXY does not have azimuth()
-            p0 = ordered_pts[0]
-            p1 = ordered_pts[-1]
-            start_point = QgsPoint(p0.x(), p0.y())
-            end_point = QgsPoint(p1.x(), p1.y())
-            # QgsPoint.azimuth() returns [-180, 180]; normalize to [0, 360)
-            azimuth = start_point.azimuth(end_point) % 360
+            azimuth = routing_azimuth(pts, direction)
 
             logger.debug(
                 "Calculated azimuth from routing geometry: direction=%s, azimuth=%.2f, distance=%.2f",
@@ -449,6 +693,7 @@ class IlsLlzDockWidget(QDockWidget):
                 facility_key=facility_key,
                 facility_label=facility_label,
                 display_name=display_name,
+                navaid_fid=feat.id(),
             )
 
         except (ValidationError, ValueError) as e:
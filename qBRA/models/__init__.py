@@ -5,9 +5,13 @@ Imports are wrapped in try/except to allow testing without QGIS installed.
 
 __all__ = [
     "BRAParameters",
+    "BRALayerData",
+    "BRARecipe",
     "FacilityConfig",
     "FacilityDefaults",
     "FeatureDefinition",
+    "LinkedBRA",
+    "OmniParameters",
 ]
 
 # Lazy imports to avoid QGIS dependency during test discovery
@@ -16,6 +20,12 @@ def __getattr__(name: str):
     if name == "BRAParameters":
         from .bra_parameters import BRAParameters
         return BRAParameters
+    elif name == "BRALayerData":
+        from .layer_data import BRALayerData
+        return BRALayerData
+    elif name == "BRARecipe":
+        from .bra_recipe import BRARecipe
+        return BRARecipe
     elif name == "FacilityConfig":
         from .bra_parameters import FacilityConfig
         return FacilityConfig
@@ -25,4 +35,10 @@ def __getattr__(name: str):
     elif name == "FeatureDefinition":
         from .feature_definition import FeatureDefinition
         return FeatureDefinition
+    elif name == "LinkedBRA":
+        from .linked_bra import LinkedBRA
+        return LinkedBRA
+    elif name == "OmniParameters":
+        from .omni_parameters import OmniParameters
+        return OmniParameters
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
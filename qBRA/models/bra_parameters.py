@@ -5,8 +5,13 @@ ILS/LLZ BRA calculations, replacing Dict[str, Any] with strongly-typed models.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, Union
-from qgis.core import QgsVectorLayer
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+if TYPE_CHECKING:
+    from qgis.core import QgsVectorLayer
+else:
+    # Annotation only: keeps the models importable by headless tools without QGIS
+    QgsVectorLayer = Any
 
 
 @dataclass(frozen=True)
@@ -95,6 +100,21 @@ class FacilityConfig:
                 f"defaults must specify 'a'"
             )
 
+    def derived_r(self, a: float, r: Optional[float] = None) -> Optional[float]:
+        """Return the radius ``r`` implied by the facility for a given ``a``.
+
+        Args:
+            a: Navaid-to-threshold distance (meters)
+            r: Value to keep when the facility has no ``r_expr``
+
+        Returns:
+            ``a + 6000`` for facilities with ``r_expr == "a+6000"``, otherwise ``r``
+            (or the fixed default radius if ``r`` is None)
+        """
+        if self.defaults.r_expr == "a+6000":
+            return a + 6000.0
+        return r if r is not None else self.defaults.r
+
 
 @dataclass
 class BRAParameters:
@@ -120,6 +140,8 @@ class BRAParameters:
         facility_key: Facility type identifier (e.g., "LOC", "LOCII")
         facility_label: Human-readable facility name
         display_name: Full display name for output layer (optional, computed from remark if None)
+        navaid_fid: Feature id of the navaid on ``active_layer`` (optional). Used as
+            the upsert key for persistent output layers.
     """
     active_layer: QgsVectorLayer
     azimuth: float
@@ -137,6 +159,7 @@ class BRAParameters:
     facility_key: str
     facility_label: str
     display_name: Optional[str] = None
+    navaid_fid: Optional[int] = None
     
     def __post_init__(self) -> None:
         """Validate BRA parameters and compute derived values."""
@@ -205,4 +228,5 @@ class BRAParameters:
             "facility_key": self.facility_key,
             "facility_label": self.facility_label,
             "display_name": self.display_name,
+            "navaid_fid": self.navaid_fid,
         }
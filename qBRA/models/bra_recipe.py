@@ -0,0 +1,104 @@
+"""Data model for BRA layers that can be regenerated from stored parameters.
+
+A :class:`BRARecipe` is the compact, JSON-serialisable description of one
+BRA calculation: the output kind, the navaid reference (layer id + feature
+id) and the parameter values.  It is stored as a layer custom property, so
+a project only keeps the recipe of a BRA memory layer and the geometry is
+recomputed when the layer is needed again.
+"""
+
+import json
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Union
+
+from ..constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from ..exceptions import BRAValidationError
+from .bra_parameters import BRAParameters
+
+#: Bumped when the stored layout changes incompatibly.
+RECIPE_VERSION: int = 1
+
+_NON_SERIALISED = ("active_layer", "navaid_fid")
+
+
+@dataclass(frozen=True)
+class BRARecipe:
+    """Stored parameters of one BRA layer.
+
+    Attributes:
+        kind: Output kind (``"directional"`` or ``"omni"``)
+        navaid_layer_id: Id of the navaid point layer
+        navaid_fid: Feature id of the navaid
+        params: Parameter values without the layer object and feature id
+    """
+
+    kind: str
+    navaid_layer_id: str
+    navaid_fid: int
+    params: Dict[str, Any]
+
+    def __post_init__(self) -> None:
+        """Validate recipe."""
+        if self.kind not in (OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI):
+            raise ValueError(f"Unknown output kind {self.kind!r}")
+        if not self.navaid_layer_id:
+            raise ValueError("navaid_layer_id cannot be empty")
+
+    @classmethod
+    def from_params(cls, kind: str, params: Union[BRAParameters, Dict[str, Any]]) -> "BRARecipe":
+        """Capture the parameters of a finished calculation.
+
+        Args:
+            kind: Output kind
+            params: BRAParameters (directional) or omni parameter dict, with
+                ``active_layer`` and ``navaid_fid`` set
+        """
+        if isinstance(params, BRAParameters):
+            values = {f.name: getattr(params, f.name) for f in fields(params)}
+        else:
+            values = dict(params)
+        layer, navaid_fid = values.get("active_layer"), values.get("navaid_fid")
+        if layer is None or navaid_fid is None:
+            raise ValueError("Parameters carry no navaid reference")
+        return cls(
+            kind=kind,
+            navaid_layer_id=layer.id(),
+            navaid_fid=int(navaid_fid),
+            params={k: v for k, v in values.items() if k not in _NON_SERIALISED},
+        )
+
+    def build_params(self, navaid_layer: Any) -> Union[BRAParameters, Dict[str, Any]]:
+        """Rebuild the calculation parameters against the loaded navaid layer."""
+        if self.kind == OUTPUT_KIND_OMNI:
+            return {**self.params, "active_layer": navaid_layer, "navaid_fid": self.navaid_fid}
+        return BRAParameters(active_layer=navaid_layer, navaid_fid=self.navaid_fid, **self.params)
+
+    def to_json(self) -> str:
+        """Serialise the recipe for a layer custom property."""
+        return json.dumps({
+            "version": RECIPE_VERSION,
+            "kind": self.kind,
+            "navaid_layer_id": self.navaid_layer_id,
+            "navaid_fid": self.navaid_fid,
+            "params": self.params,
+        }, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text: str) -> "BRARecipe":
+        """Parse a stored recipe.
+
+        Raises:
+            BRAValidationError: If the text is not a recipe of a known version
+        """
+        try:
+            data = json.loads(text)
+            if data.get("version") != RECIPE_VERSION:
+                raise ValueError(f"unsupported version {data.get('version')!r}")
+            return cls(
+                kind=data["kind"],
+                navaid_layer_id=data["navaid_layer_id"],
+                navaid_fid=int(data["navaid_fid"]),
+                params=dict(data["params"]),
+            )
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise BRAValidationError("Invalid stored BRA recipe", str(e)) from e
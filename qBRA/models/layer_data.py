@@ -0,0 +1,47 @@
+"""Plain-data result of a BRA calculation.
+
+A :class:`BRALayerData` holds what a worker thread computes for one navaid:
+the layer name and CRS, the shared attribute values and, per surface, the
+per-surface attribute values with the polygon as WKB.  It holds no QGIS
+objects, so it can cross threads (or processes) freely; the main thread
+turns it into a memory layer (see ``ils_llz_logic.materialise_layer`` and
+:class:`~qBRA.services.materialise_service.LayerMaterialiser`).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+from ..constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+
+
+@dataclass(frozen=True)
+class BRALayerData:
+    """Surfaces of one BRA calculation, ready to be materialised.
+
+    Attributes:
+        kind: Output kind (``"directional"`` or ``"omni"``)
+        name: Layer name
+        crs_authid: CRS of the geometries (e.g. ``"EPSG:32633"``)
+        shared: Attribute values shared by every surface (after the leading ones)
+        surfaces: ``(leading values, WKB bytes)`` per surface, in feature order
+        scenarios: Scenario layer (directional only): every surface carries
+            its whole :data:`~qBRA.modules.attributes.SCENARIO_FIELDS` row
+            and ``shared`` is empty
+    """
+
+    kind: str
+    name: str
+    crs_authid: str
+    shared: Tuple[Any, ...]
+    surfaces: Tuple[Tuple[Tuple[Any, ...], bytes], ...]
+    scenarios: bool = False
+
+    def __post_init__(self) -> None:
+        """Validate the result."""
+        if self.kind not in (OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI):
+            raise ValueError(f"Unknown output kind: {self.kind!r}")
+        if self.scenarios and (self.kind != OUTPUT_KIND_DIRECTIONAL or self.shared):
+            raise ValueError("Scenario layers are directional and carry no shared values")
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
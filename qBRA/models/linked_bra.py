@@ -0,0 +1,61 @@
+"""Data model for BRAs kept linked to their source features.
+
+A :class:`LinkedBRA` records everything needed to recompute one navaid's BRA
+when its navaid point or routing line is edited: the parameter snapshot used
+for the last run plus the layer ids / feature ids it was derived from.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .bra_parameters import BRAParameters
+
+
+@dataclass(frozen=True)
+class LinkedBRA:
+    """Snapshot of a BRA calculation linked to its source features.
+
+    Attributes:
+        kind: Output kind (``"directional"`` or ``"omni"``)
+        params: BRAParameters (directional) or omni parameter dict
+        navaid_layer_id: Id of the navaid point layer
+        navaid_fid: Feature id of the navaid
+        facility_key: Facility key (e.g. ``"LOC"``, ``"OMNI_DVOR"``)
+        routing_layer_id: Id of the routing/runway line layer (directional only)
+        routing_fid: Feature id of the routing/runway line (directional only)
+    """
+
+    kind: str
+    params: Union[BRAParameters, Dict[str, Any]]
+    navaid_layer_id: str
+    navaid_fid: int
+    facility_key: str
+    routing_layer_id: Optional[str] = None
+    routing_fid: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        """Validate linked BRA."""
+        if not self.navaid_layer_id:
+            raise ValueError("navaid_layer_id cannot be empty")
+        if not self.facility_key:
+            raise ValueError("facility_key cannot be empty")
+        if (self.routing_layer_id is None) != (self.routing_fid is None):
+            raise ValueError("routing_layer_id and routing_fid must be given together")
+
+    @property
+    def key(self) -> Tuple[str, int, str]:
+        """Identity of the link: (navaid layer id, navaid fid, facility key)."""
+        return (self.navaid_layer_id, self.navaid_fid, self.facility_key)
+
+    def sources(self) -> Tuple[Tuple[str, int], ...]:
+        """Return the (layer id, feature id) pairs this BRA depends on."""
+        if self.routing_layer_id is None or self.routing_fid is None:
+            return ((self.navaid_layer_id, self.navaid_fid),)
+        return (
+            (self.navaid_layer_id, self.navaid_fid),
+            (self.routing_layer_id, self.routing_fid),
+        )
+
+    def with_params(self, params: Union[BRAParameters, Dict[str, Any]]) -> "LinkedBRA":
+        """Return a copy carrying refreshed parameters."""
+        return replace(self, params=params)
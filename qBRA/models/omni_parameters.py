@@ -0,0 +1,85 @@
+"""Data model for omnidirectional BRA calculations.
+
+The dock widget and linked mode pass omni parameters around as a plain dict
+(``omni_r``, ``omni_alpha``, ...).  :class:`OmniParameters` is the validated,
+typed view of that dict shared by :func:`build_layers_omni` and headless
+tools, so the rules live in one place.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+
+@dataclass(frozen=True)
+class OmniParameters:
+    """Parameters of one omnidirectional BRA.
+
+    Attributes:
+        site_elev: Site elevation (meters)
+        r: Inner cylinder radius (meters)
+        alpha: Cone angle (degrees)
+        R: Outer cone radius (meters)
+        turbine: Whether the turbine analysis cylinder is produced
+        j: Turbine cylinder radius (meters, 0 unless ``turbine``)
+        h: Turbine cylinder height above site (meters, 0 unless ``turbine``)
+        facility_key: Facility key (e.g. ``"OMNI_DVOR"``)
+        facility_label: Human-readable facility name
+        display_name: Name used for the output layer / ``area_name``
+        navaid_fid: Feature id of the navaid (optional)
+    """
+
+    site_elev: float
+    r: float
+    alpha: float
+    R: float
+    turbine: bool = False
+    j: float = 0.0
+    h: float = 0.0
+    facility_key: str = ""
+    facility_label: str = ""
+    display_name: str = "BRA"
+    navaid_fid: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        """Validate omni parameters (same rules and messages as the legacy checks)."""
+        if self.r <= 0 or self.R <= 0:
+            raise ValueError("Omni parameters invalid: r and R must be > 0")
+        if self.R < self.r:
+            raise ValueError("Omni parameter invalid: R must be >= r")
+        if self.alpha <= 0 or self.alpha > 90:
+            raise ValueError("Omni parameter invalid: alpha must be in (0, 90]")
+        if self.turbine:
+            if self.j <= 0 or self.h <= 0:
+                raise ValueError("Omni turbine parameters invalid: j and h must be > 0")
+            if self.j < self.r:
+                raise ValueError("Omni turbine parameter invalid: j must be >= r")
+
+    @classmethod
+    def from_dict(cls, params: Mapping[str, Any]) -> "OmniParameters":
+        """Build from the dock widget's omni parameter dict.
+
+        ``j``/``h`` are forced to 0 when turbine mode is off, as in
+        :func:`build_layers_omni`.
+
+        Raises:
+            ValueError: If the parameters are invalid
+        """
+        turbine = bool(params.get("omni_turbine", False))
+        return cls(
+            site_elev=float(params.get("site_elev", 0.0)),
+            r=float(params.get("omni_r", 0.0)),
+            alpha=float(params.get("omni_alpha", 1.0)),
+            R=float(params.get("omni_R", 0.0)),
+            turbine=turbine,
+            j=float(params.get("omni_j", 0.0)) if turbine else 0.0,
+            h=float(params.get("omni_h", 0.0)) if turbine else 0.0,
+            facility_key=params.get("facility_key") or "",
+            facility_label=params.get("facility_label") or "",
+            display_name=params.get("display_name") or params.get("remark") or "BRA",
+            navaid_fid=params.get("navaid_fid"),
+        )
+
+    @property
+    def type_value(self) -> str:
+        """Value of the ``type`` attribute (label preferred over key)."""
+        return self.facility_label or self.facility_key or ""
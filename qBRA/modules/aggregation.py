@@ -0,0 +1,251 @@
+"""Aggregation of overlapping BRAs into per-aerodrome envelopes.
+
+An aerodrome carries many navaids whose BRAs overlap heavily.  Planners want
+one "lowest limiting surface" per aerodrome instead of dozens of overlapping
+polygons.  The aggregation runs in two stages:
+
+1. **Grouping** — BRA extents are bucketed in a uniform grid (a spatial hash)
+   and extents sharing a bucket are tested and merged with union–find, so
+   only nearby pairs are ever compared instead of all n² pairs.
+2. **Banding** — inside a group, footprints are processed from the lowest
+   level upwards.  Each level is merged with one cascaded union and only the
+   part not already covered by a lower level is kept, so every point of the
+   envelope carries the minimum level of the surfaces covering it.
+
+Banding works on one height per surface, its lowest vertex.  That is the
+limiting height of a horizontal surface, but only a lower bound for a
+sloping one (the directional slope rises from the site elevation, the omni
+cone from its inner height).  Levels are therefore (height, sloping) pairs:
+at equal heights horizontal surfaces claim their area first, and every
+envelope region is tagged ``exact`` or ``lower bound`` (``limit_basis``).
+
+Public API
+----------
+group_overlapping(extents, margin) -> List[List[int]]
+lowest_surface_bands(items, union, difference, is_empty) -> List[Tuple[L, G]]
+build_aerodrome_envelopes(layers, margin) -> QgsVectorLayer   # requires live QGIS
+"""
+
+from math import floor
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+from qgis.core import QgsFeature, QgsField, QgsGeometry, QgsVectorLayer
+from qgis.PyQt.QtGui import QColor
+
+from ..constants import (
+    ENVELOPE_BASIS_EXACT,
+    ENVELOPE_BASIS_LOWER_BOUND,
+    ENVELOPE_GROUP_MARGIN_M,
+    ENVELOPE_LAYER_NAME,
+    FOOTPRINT_CRS_TEMPLATE_PREFIX,
+    SURFACE_FIT_TOLERANCE_M,
+)
+from ..exceptions import BRACalculationError
+from ..utils.qt_compat import QVariantDouble, QVariantInt, QVariantString
+from .footprint import footprint_geometry
+
+G = TypeVar("G")
+L = TypeVar("L")
+
+#: (xmin, ymin, xmax, ymax)
+Extent = Tuple[float, float, float, float]
+
+
+class _UnionFind:
+    """Disjoint-set forest with path halving and union by size."""
+
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj:
+            return
+        if self.size[ri] < self.size[rj]:
+            ri, rj = rj, ri
+        self.parent[rj] = ri
+        self.size[ri] += self.size[rj]
+
+
+def _extents_intersect(a: Extent, b: Extent) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def group_overlapping(extents: Sequence[Extent], margin: float = 0.0) -> List[List[int]]:
+    """Group extents into connected components of pairwise overlaps.
+
+    The grid cell size is the median extent size, so each extent touches a
+    handful of cells and candidate pairs stay local.
+
+    Args:
+        extents: Bounding boxes as (xmin, ymin, xmax, ymax)
+        margin: Distance by which every extent is grown before testing
+
+    Returns:
+        Groups of indices into ``extents``, each sorted, ordered by first index
+    """
+    n = len(extents)
+    if n == 0:
+        return []
+    grown = [(x0 - margin, y0 - margin, x1 + margin, y1 + margin) for x0, y0, x1, y1 in extents]
+    sizes = sorted(max(e[2] - e[0], e[3] - e[1]) for e in grown)
+    cell = sizes[n // 2] or 1.0
+
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    uf = _UnionFind(n)
+    for i, (x0, y0, x1, y1) in enumerate(grown):
+        seen = set()
+        for cx in range(floor(x0 / cell), floor(x1 / cell) + 1):
+            for cy in range(floor(y0 / cell), floor(y1 / cell) + 1):
+                bucket = buckets.setdefault((cx, cy), [])
+                for j in bucket:
+                    if j not in seen and uf.find(i) != uf.find(j):
+                        seen.add(j)
+                        if _extents_intersect(grown[i], grown[j]):
+                            uf.union(i, j)
+                bucket.append(i)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(uf.find(i), []).append(i)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def lowest_surface_bands(
+    items: Iterable[Tuple[L, G]],
+    union: Callable[[List[G]], G],
+    difference: Callable[[G, G], G],
+    is_empty: Callable[[G], bool],
+) -> List[Tuple[L, G]]:
+    """Split overlapping surfaces into regions keyed by their minimum level.
+
+    Args:
+        items: (level, footprint) pairs of one group; levels are ordered with
+            ``<`` — limiting heights, or (height, sloping) pairs
+        union: Cascaded union of a list of footprints
+        difference: ``a`` minus ``b``
+        is_empty: Emptiness test for a footprint
+
+    Returns:
+        (level, region) pairs in ascending level; regions do not overlap
+        and together cover the union of all footprints
+    """
+    levels: Dict[L, List[G]] = {}
+    for key, footprint in items:
+        levels.setdefault(key, []).append(footprint)
+
+    bands: List[Tuple[L, G]] = []
+    covered = None
+    for key in sorted(levels):
+        level = union(levels[key])
+        region = level if covered is None else difference(level, covered)
+        if not is_empty(region):
+            bands.append((key, region))
+        covered = level if covered is None else union([covered, level])
+    return bands
+
+
+def surface_level(heights: Iterable[float], tolerance: float = SURFACE_FIT_TOLERANCE_M) -> Tuple[float, bool]:
+    """Banding level of a surface from its vertex heights.
+
+    Returns:
+        (lowest height, sloping) — ``sloping`` is True when the heights span
+        more than ``tolerance``, i.e. the lowest height only bounds the
+        surface from below
+    """
+    values = list(heights)
+    low = min(values)
+    return low, max(values) - low > tolerance
+
+
+def band_basis(sloping: bool) -> str:
+    """``limit_basis`` value of an envelope region."""
+    return ENVELOPE_BASIS_LOWER_BOUND if sloping else ENVELOPE_BASIS_EXACT
+
+
+def build_aerodrome_envelopes(
+    layers: Sequence[QgsVectorLayer],
+    margin: float = ENVELOPE_GROUP_MARGIN_M,
+) -> QgsVectorLayer:  # pragma: no cover
+    """Aggregate BRA layers into per-aerodrome lowest-limiting-surface envelopes.
+
+    Each BRA surface contributes its 2D footprint with its lowest vertex
+    height.  Regions limited by a sloping surface get that height as a lower
+    bound (``limit_basis`` "lower bound"); the true limiting height rises
+    across them.  Vertical walls have no footprint and are ignored.
+
+    Args:
+        layers: BRA output layers (directional and/or omni), same CRS
+        margin: Grouping margin in layer units
+
+    Returns:
+        Memory layer with one feature per (aerodrome group, height band, basis)
+
+    Raises:
+        BRACalculationError: If no layer is given or the CRSs differ
+    """
+    if not layers:
+        raise BRACalculationError("No BRA layers to aggregate")
+    crs = layers[0].crs()
+    if any(layer.crs() != crs for layer in layers[1:]):
+        raise BRACalculationError(
+            "BRA layers must share one CRS to be aggregated",
+            ", ".join(f"{layer.name()}: {layer.crs().authid()}" for layer in layers),
+        )
+
+    surfaces: List[Tuple[Tuple[float, bool], QgsGeometry, str]] = []
+    for layer in layers:
+        name_idx = layer.fields().indexFromName("area_name")
+        for feature in layer.getFeatures():
+            geometry = feature.geometry()
+            footprint = footprint_geometry(geometry, 0.0)
+            if footprint is None:
+                continue
+            name = str(feature.attributes()[name_idx]) if name_idx >= 0 else layer.name()
+            level = surface_level(vertex.z() for vertex in geometry.vertices())
+            surfaces.append((level, footprint, name))
+
+    extents = []
+    for _height, footprint, _name in surfaces:
+        box = footprint.boundingBox()
+        extents.append((box.xMinimum(), box.yMinimum(), box.xMaximum(), box.yMaximum()))
+
+    out = QgsVectorLayer(FOOTPRINT_CRS_TEMPLATE_PREFIX + crs.authid(), ENVELOPE_LAYER_NAME, "memory")
+    provider = out.dataProvider()
+    provider.addAttributes([
+        QgsField("group_id", QVariantInt),
+        QgsField("limit_elev", QVariantDouble),
+        QgsField("limit_basis", QVariantString),
+        QgsField("sources", QVariantString),
+    ])
+    out.updateFields()
+
+    features = []
+    for group_id, group in enumerate(group_overlapping(extents, margin), start=1):
+        sources = ", ".join(sorted({surfaces[i][2] for i in group}))
+        bands = lowest_surface_bands(
+            ((surfaces[i][0], surfaces[i][1]) for i in group),
+            union=QgsGeometry.unaryUnion,
+            difference=lambda a, b: a.difference(b),
+            is_empty=lambda g: g.isEmpty() or g.area() <= 0,
+        )
+        for (height, sloping), region in bands:
+            feature = QgsFeature()
+            feature.setGeometry(region)
+            feature.setAttributes([group_id, round(height, 2), band_basis(sloping), sources])
+            features.append(feature)
+    if features:
+        provider.addFeatures(features)
+
+    symbol = out.renderer().symbol()
+    symbol.setOpacity(0.5)
+    symbol.setColor(QColor("orange"))
+    out.updateExtents()
+    return out
@@ -0,0 +1,125 @@
+"""Attribute schema of the BRA output layers.
+
+Every feature of one navaid shares all attribute values except the leading
+per-surface ones (``id``, ``area`` and, for directional BRAs,
+``max_elev``).  The schema and the shared values are defined here, QGIS-free,
+so the plugin's feature factory and headless writers produce identical
+attribute tables.
+
+Public API
+----------
+DIRECTIONAL_FIELDS, DIRECTIONAL_LEADING
+OMNI_FIELDS, OMNI_LEADING
+SCENARIO_FIELDS
+directional_values(params, area_name) -> tuple
+omni_values(params) -> tuple
+scenario_tag(params) -> str
+scenario_values(params, area_name) -> tuple
+"""
+
+from typing import Any, Optional, Tuple
+
+#: (name, type) of the directional BRA fields; ``type`` stays last.
+DIRECTIONAL_FIELDS: Tuple[Tuple[str, type], ...] = (
+    ("id", int),
+    ("area", str),
+    ("max_elev", str),
+    ("area_name", str),
+    ("a", str),
+    ("b", str),
+    ("h", str),
+    ("r", str),
+    ("D", str),
+    ("H", str),
+    ("L", str),
+    ("phi", str),
+    ("type", str),
+)
+#: Number of per-surface fields at the start of :data:`DIRECTIONAL_FIELDS`.
+DIRECTIONAL_LEADING: int = 3
+
+#: (name, type) of the omnidirectional BRA fields; ``type`` stays last.
+OMNI_FIELDS: Tuple[Tuple[str, type], ...] = (
+    ("id", int),
+    ("area", str),
+    ("area_name", str),
+    ("r", str),
+    ("alpha", str),
+    ("R", str),
+    ("j", str),
+    ("h", str),
+    ("type", str),
+)
+#: Number of per-surface fields at the start of :data:`OMNI_FIELDS`.
+OMNI_LEADING: int = 2
+
+#: Directional fields of scenario layers: tagged with the scenario and routing
+#: direction (before ``type``).  Every value is per surface, since one layer
+#: holds the surfaces of several scenarios.
+SCENARIO_FIELDS: Tuple[Tuple[str, type], ...] = (
+    DIRECTIONAL_FIELDS[:-1] + (("scenario", str), ("direction", str)) + DIRECTIONAL_FIELDS[-1:]
+)
+
+
+def directional_values(params: Any, area_name: Optional[str] = None) -> Tuple[Any, ...]:
+    """Return the shared (non-leading) directional attribute values of a navaid.
+
+    Args:
+        params: BRAParameters
+        area_name: Overrides the display name / remark
+
+    Returns:
+        Values for ``area_name`` .. ``type``
+    """
+    return (
+        area_name or params.display_name or params.remark,
+        str(round(params.a, 2)),
+        str(params.b),
+        str(params.h),
+        str(round(params.r, 2)),
+        str(params.D),
+        str(params.H),
+        str(params.L),
+        str(params.phi),
+        # Facility label preferred for 'type' (falls back to key)
+        params.facility_label or params.facility_key or "",
+    )
+
+
+def omni_values(params: Any) -> Tuple[Any, ...]:
+    """Return the shared (non-leading) omni attribute values of a navaid.
+
+    Args:
+        params: OmniParameters (``j``/``h`` are already 0 without turbine)
+
+    Returns:
+        Values for ``area_name`` .. ``type``
+    """
+    return (
+        params.display_name,
+        str(params.r),
+        str(params.alpha),
+        str(params.R),
+        str(params.j),
+        str(params.h),
+        params.type_value,
+    )
+
+
+def scenario_tag(params: Any) -> str:
+    """Return the scenario tag of directional parameters, e.g. ``"LOC forward"``."""
+    return f"{params.facility_key} {params.direction}"
+
+
+def scenario_values(params: Any, area_name: Optional[str] = None) -> Tuple[Any, ...]:
+    """Return the non-leading :data:`SCENARIO_FIELDS` values of a scenario.
+
+    Args:
+        params: BRAParameters of the scenario
+        area_name: Overrides the display name / remark
+
+    Returns:
+        Values for ``area_name`` .. ``type``
+    """
+    values = directional_values(params, area_name)
+    return values[:-1] + (scenario_tag(params), params.direction) + values[-1:]
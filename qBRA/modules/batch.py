@@ -0,0 +1,139 @@
+"""Headless batch pipeline shared by the command line and the viewport engine.
+
+Navaid records (see :mod:`qBRA.services.inventory_service`) are resolved
+into validated parameters, computed in one vectorised kernel call per kind
+and turned into ``(rings, properties, kind)`` features with the attribute
+schema of the plugin's BRA layers.  The module is QGIS-free.
+
+Public API
+----------
+resolve_records(records, runways, on_skip) -> (directional, omni)
+iter_features(directional, omni, backend, arc_segments, segments) -> iterator
+directional_properties(params, navaid_id) -> List[dict]
+omni_properties(params, navaid_id) -> List[dict]
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..constants import OMNI_SEGMENTS, OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from ..exceptions import BRAError
+from ..services.inventory_service import is_omni_record, record_id, resolve_directional, resolve_omni
+from .attributes import DIRECTIONAL_FIELDS, OMNI_FIELDS, directional_values, omni_values
+from .kernel import (
+    DIRECTIONAL_TEMPLATES,
+    LEVEL_SIDE,
+    LEVEL_SITE,
+    LEVEL_TOP,
+    OMNI_SURFACES,
+    directional_columns,
+    directional_rings,
+    directional_row,
+    omni_columns,
+    omni_rings,
+    omni_row,
+)
+
+#: (validated parameters, navaid position, navaid id)
+Navaid = Tuple[Any, Tuple[float, float], Any]
+#: (rings with the exterior first, attribute properties, output kind)
+Feature = Tuple[List[np.ndarray], Dict[str, Any], str]
+
+
+def resolve_records(
+    records: Sequence[Mapping[str, Any]],
+    runways: Mapping[str, Any],
+    on_skip: Optional[Callable[[Any, Exception], None]] = None,
+) -> Tuple[List[Navaid], List[Navaid]]:
+    """Resolve navaid records into directional and omni navaids.
+
+    Args:
+        records: Navaid records
+        runways: Runway polylines (see ``load_runways``)
+        on_skip: Called with (navaid id, error) for every invalid record
+
+    Returns:
+        (directional navaids, omni navaids)
+    """
+    directional: List[Navaid] = []
+    omni: List[Navaid] = []
+    for record in records:
+        navaid_id = record_id(record)
+        try:
+            if is_omni_record(record):
+                params, xy = resolve_omni(record)
+                omni.append((params, xy, navaid_id))
+            else:
+                params, xy = resolve_directional(record, runways)
+                directional.append((params, xy, navaid_id))
+        except (BRAError, ValueError) as e:
+            if on_skip is not None:
+                on_skip(navaid_id, e)
+    return directional, omni
+
+
+def directional_properties(params: Any, navaid_id: Any) -> List[Dict[str, Any]]:
+    """Attribute dicts of the seven directional surfaces (as in ``build_layers``)."""
+    levels = {
+        LEVEL_SITE: params.site_elev,
+        LEVEL_SIDE: params.site_elev + params.H,
+        LEVEL_TOP: params.site_elev + params.h,
+    }
+    shared = directional_values(params)
+    return [
+        _properties(
+            DIRECTIONAL_FIELDS, navaid_id, params.facility_key, (t.id, t.area, str(levels[t.level])) + shared
+        )
+        for t in DIRECTIONAL_TEMPLATES
+    ]
+
+
+def omni_properties(params: Any, navaid_id: Any) -> List[Dict[str, Any]]:
+    """Attribute dicts of the omni surfaces (as in ``build_layers_omni``)."""
+    shared = omni_values(params)
+    return [
+        _properties(OMNI_FIELDS, navaid_id, params.facility_key, (surface_id, area) + shared)
+        for surface_id, area, _rings in OMNI_SURFACES
+    ]
+
+
+def _properties(
+    fields: Sequence[Tuple[str, type]], navaid_id: Any, facility_key: str, values: Sequence[Any]
+) -> Dict[str, Any]:
+    properties = {"navaid_id": navaid_id, "facility_key": facility_key}
+    properties.update(zip((name for name, _kind in fields), values))
+    return properties
+
+
+def iter_features(
+    directional: Sequence[Navaid],
+    omni: Sequence[Navaid],
+    backend: Any,
+    arc_segments: int = OMNI_SEGMENTS // 4,
+    segments: int = OMNI_SEGMENTS,
+) -> Iterator[Feature]:
+    """Compute the BRA features of resolved navaids, one kernel call per kind.
+
+    Args:
+        directional: Directional navaids
+        omni: Omni navaids
+        backend: Kernel backend with ``compute(kind, columns[, segments])``
+            (e.g. :class:`~qBRA.workers.process_backend.ProcessPoolBackend`)
+        arc_segments: Segments per directional slope arc
+        segments: Segments per omni circle
+    """
+    if directional:
+        columns = directional_columns(directional_row(p, *xy) for p, xy, _ in directional)
+        vertices = backend.compute(OUTPUT_KIND_DIRECTIONAL, columns)
+        for (params, _xy, navaid_id), navaid_vertices in zip(directional, vertices):
+            rings = directional_rings(navaid_vertices, arc_segments)
+            for ring, properties in zip(rings, directional_properties(params, navaid_id)):
+                yield [ring], properties, OUTPUT_KIND_DIRECTIONAL
+    if omni:
+        columns = omni_columns(omni_row(p, *xy) for p, xy, _ in omni)
+        vertices = backend.compute(OUTPUT_KIND_OMNI, columns, segments)
+        for (params, _xy, navaid_id), navaid_vertices in zip(omni, vertices):
+            # Polygons come back in OMNI_SURFACES order, turbine last (if present)
+            for rings, properties in zip(omni_rings(navaid_vertices, segments), omni_properties(params, navaid_id)):
+                yield rings, properties, OUTPUT_KIND_OMNI
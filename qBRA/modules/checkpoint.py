@@ -0,0 +1,249 @@
+"""Checkpoint journal of resumable batch runs.
+
+A long batch run keeps a small JSON journal next to its output.  The
+journal records how far the run got:
+
+* ``records`` — input records of fully written chunks;
+* ``done`` — navaids of the current chunk whose features are all written,
+  as ``[kind, navaid id, facility key]``;
+* ``offset`` — output size (bytes) covering exactly those features;
+* the run counters at that point.
+
+It is rewritten atomically (temporary file, ``fsync``, ``os.replace``) every
+``every`` features, always at a navaid boundary and after the output was
+synced, so the journal never claims more than is on disk.  A rerun with
+the same input and options skips the ``records`` already processed and the
+``done`` navaids, truncates whatever the output holds beyond ``offset``
+(partial output of the crashed run) and carries on.  The journal is
+removed once the run completes.  The module is QGIS-free.
+
+Usage
+-----
+    journal = Journal.start(path, navaids, output, options)   # or Journal.load(path)
+    checkpoints = Checkpointer(journal, every=10000, sync=writer.sync)
+    for records in chunks:
+        checkpoints.begin_chunk(stats)
+        for rings, properties, kind in features:
+            checkpoints.feature(navaid_key(kind, properties), stats)
+            writer.write(rings, properties, kind)
+        checkpoints.end_chunk(len(records), stats)
+    journal.finish()
+
+Public API
+----------
+Journal.start(path, input_path, output, options) / Journal.load(path)
+Journal.check(input_path, output, options) / save() / finish()
+navaid_key(kind, properties) -> NavaidKey
+pending(navaids, kind, done) -> list
+truncate_output(path, offset) -> int
+Checkpointer.begin_chunk(stats) / feature(key, stats) / end_chunk(records, stats)
+"""
+
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..exceptions import BRAError
+
+#: Version of the journal layout.
+JOURNAL_VERSION = 1
+
+#: (output kind, navaid id, facility key) identifying a navaid of a chunk.
+NavaidKey = Tuple[str, str, str]
+
+
+def navaid_key(kind: str, properties: Dict[str, Any]) -> NavaidKey:
+    """Return the journal key of the navaid a feature belongs to."""
+    return kind, str(properties.get("navaid_id")), str(properties.get("facility_key"))
+
+
+def pending(navaids: Sequence[Any], kind: str, done: Set[NavaidKey]) -> List[Any]:
+    """Drop the navaids (``(params, xy, navaid id)``) already journalled as done."""
+    if not done:
+        return list(navaids)
+    return [navaid for navaid in navaids if (kind, str(navaid[2]), str(navaid[0].facility_key)) not in done]
+
+
+def truncate_output(path: str, offset: int) -> int:
+    """Cut partial output written after the last checkpoint.
+
+    Returns:
+        Number of bytes dropped
+
+    Raises:
+        BRAError: If the output is missing or shorter than the checkpoint
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError as e:
+        raise BRAError("Cannot resume: output missing", f"{path}: {e}") from e
+    if size < offset:
+        raise BRAError("Cannot resume: output is shorter than the checkpoint", f"{path}: {size} < {offset} bytes")
+    if size > offset:
+        os.truncate(path, offset)
+    return size - offset
+
+
+def file_signature(path: str) -> Dict[str, int]:
+    """Size and modification time of an input file, to detect a changed inventory."""
+    status = os.stat(path)
+    return {"size": status.st_size, "mtime_ns": status.st_mtime_ns}
+
+
+def atomic_write_json(path: str, data: Dict[str, Any]) -> None:
+    """Replace ``path`` with ``data`` as JSON so readers see the old or the new file, never a mix."""
+    target = Path(path)
+    handle, temporary = tempfile.mkstemp(prefix=target.name + ".", suffix=".tmp", dir=str(target.parent))
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as stream:
+            json.dump(data, stream)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temporary, target)
+    except BaseException:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass
+class Journal:
+    """Progress of one resumable batch run.
+
+    Attributes:
+        path: Journal file
+        input: Inventory path and :func:`file_signature`
+        output: Output path
+        options: Run options that change the output (segments, CRS, ...)
+        records: Input records of fully written chunks
+        done: Completed navaids of the current chunk
+        offset: Output bytes covering the journalled features
+        navaids, features, skipped: Run counters at the checkpoint
+    """
+
+    path: str
+    input: Dict[str, Any]
+    output: str
+    options: Dict[str, Any]
+    records: int = 0
+    done: List[List[str]] = field(default_factory=list)
+    offset: int = 0
+    navaids: int = 0
+    features: int = 0
+    skipped: int = 0
+
+    @classmethod
+    def start(cls, path: str, input_path: str, output: str, options: Dict[str, Any]) -> "Journal":
+        """Create the journal of a fresh run (written at the first checkpoint)."""
+        return cls(path, {"path": str(input_path), **file_signature(input_path)}, str(output), dict(options))
+
+    @classmethod
+    def load(cls, path: str) -> "Journal":
+        """Read a journal.
+
+        Raises:
+            BRAError: If the journal is missing, unreadable or of another version
+        """
+        try:
+            with open(path, encoding="utf-8") as stream:
+                data = json.load(stream)
+        except (OSError, ValueError) as e:
+            raise BRAError("Cannot read checkpoint journal", f"{path}: {e}") from e
+        if data.pop("version", None) != JOURNAL_VERSION:
+            raise BRAError("Unsupported checkpoint journal", f"{path}: expected version {JOURNAL_VERSION}")
+        try:
+            return cls(path=path, **data)
+        except TypeError as e:
+            raise BRAError("Invalid checkpoint journal", f"{path}: {e}") from e
+
+    @property
+    def done_keys(self) -> Set[NavaidKey]:
+        """Completed navaids of the current chunk, as :data:`NavaidKey` tuples."""
+        return {tuple(key) for key in self.done}
+
+    def check(self, input_path: str, output: str, options: Dict[str, Any]) -> None:
+        """Verify that a rerun continues the journalled run.
+
+        Raises:
+            BRAError: If the inventory, output or options differ
+        """
+        expected = {"path": str(input_path), **file_signature(input_path)}
+        if self.input != expected:
+            raise BRAError("Cannot resume: the navaid inventory changed since the checkpoint", str(input_path))
+        if self.output != str(output):
+            raise BRAError("Cannot resume: the journal belongs to another output", self.output)
+        if self.options != dict(options):
+            changed = sorted(k for k in set(self.options) | set(options) if self.options.get(k) != options.get(k))
+            raise BRAError("Cannot resume: run options changed since the checkpoint", ", ".join(changed))
+
+    def save(self) -> None:
+        """Write the journal atomically."""
+        data = asdict(self)
+        del data["path"]
+        atomic_write_json(self.path, {"version": JOURNAL_VERSION, **data})
+
+    def finish(self) -> None:
+        """Remove the journal of a completed run."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class Checkpointer:
+    """Write journal checkpoints every ``every`` features at navaid boundaries."""
+
+    def __init__(self, journal: Journal, every: int, sync: Callable[[], int]) -> None:
+        """Initialise the checkpointer.
+
+        Args:
+            journal: Journal to update
+            every: Features between checkpoints
+            sync: Flushes the output to disk and returns its size in bytes
+        """
+        self.journal = journal
+        self._every = max(1, every)
+        self._sync = sync
+        self._current: Optional[NavaidKey] = None
+        self._since = 0
+        self._base: Tuple[int, int] = (journal.navaids - len(journal.done), journal.skipped)
+        self.checkpoints = 0
+
+    def begin_chunk(self, stats: Any) -> None:
+        """Remember the counters at the start of a chunk (before its records are resolved)."""
+        self._base = (stats.navaids - len(self.journal.done), stats.skipped)
+
+    def feature(self, key: NavaidKey, stats: Any) -> None:
+        """Call before writing each feature; ``key`` is its :func:`navaid_key`."""
+        if key != self._current:
+            if self._current is not None:
+                self.journal.done.append(list(self._current))
+                if self._since >= self._every:
+                    self._checkpoint(stats, within_chunk=True)
+            self._current = key
+        self._since += 1
+
+    def end_chunk(self, records: int, stats: Any) -> None:
+        """Journal a fully written chunk of ``records`` input records."""
+        self._current = None
+        self.journal.records += records
+        self.journal.done = []
+        self._checkpoint(stats, within_chunk=False)
+
+    def _checkpoint(self, stats: Any, within_chunk: bool) -> None:
+        journal = self.journal
+        journal.offset = self._sync()
+        journal.features = stats.features
+        if within_chunk:
+            # Skips of the open chunk are counted again when it is resumed
+            journal.navaids, journal.skipped = self._base[0] + len(journal.done), self._base[1]
+        else:
+            journal.navaids, journal.skipped = stats.navaids, stats.skipped
+        journal.save()
+        self._since = 0
+        self.checkpoints += 1
@@ -0,0 +1,96 @@
+"""Feature factory for the BRA output layers.
+
+A :class:`FeatureFactory` owns the prebuilt ``QgsFields`` schema of one
+output kind.  Per navaid it hands out a :class:`NavaidTemplate` holding the
+shared attribute values (computed once), which stamps out the 7 directional
+or up to 3 omni features by filling only the leading per-surface fields.
+
+Usage
+-----
+    factory = directional_factory()
+    provider.addAttributes(factory.field_list())
+    template = factory.navaid(directional_values(params))
+    provider.addFeatures([
+        template.feature(base_geom, 1, "base", str(site_elev)),
+        ...
+    ])
+"""
+
+from functools import lru_cache
+from typing import Any, List, Sequence, Tuple
+
+from qgis.core import QgsFeature, QgsField, QgsFields
+
+from ..utils.qt_compat import QVariantInt, QVariantString
+from .attributes import DIRECTIONAL_FIELDS, DIRECTIONAL_LEADING, OMNI_FIELDS, OMNI_LEADING, SCENARIO_FIELDS
+
+
+class NavaidTemplate:
+    """Attribute template of one navaid: shared values plus the schema."""
+
+    __slots__ = ("_fields", "_leading", "_shared")
+
+    def __init__(self, fields: QgsFields, leading: int, shared: Sequence[Any]) -> None:
+        self._fields = fields
+        self._leading = leading
+        self._shared = list(shared)
+
+    def feature(self, geometry: Any, *leading: Any) -> QgsFeature:
+        """Create one feature.
+
+        Args:
+            geometry: QgsGeometry of the surface
+            *leading: Per-surface values (``id``, ``area`` [, ``max_elev``])
+
+        Returns:
+            QgsFeature with the schema, geometry and attributes set
+        """
+        if len(leading) != self._leading:
+            raise ValueError(f"Expected {self._leading} leading attribute values, got {len(leading)}")
+        feature = QgsFeature(self._fields)
+        feature.setGeometry(geometry)
+        feature.setAttributes([*leading, *self._shared])
+        return feature
+
+
+class FeatureFactory:
+    """Prebuilt field schema of one BRA output kind."""
+
+    def __init__(self, spec: Sequence[Tuple[str, type]], leading: int) -> None:
+        """Build the schema.
+
+        Args:
+            spec: (name, type) per field, ``int`` or ``str``
+            leading: Number of per-surface fields at the start of ``spec``
+        """
+        self.fields = QgsFields()
+        self._field_list = [QgsField(name, QVariantInt if kind is int else QVariantString) for name, kind in spec]
+        for field in self._field_list:
+            self.fields.append(field)
+        self._leading = leading
+
+    def field_list(self) -> List[QgsField]:
+        """Fields as a list, for ``QgsVectorDataProvider.addAttributes``."""
+        return list(self._field_list)
+
+    def navaid(self, shared: Sequence[Any]) -> NavaidTemplate:
+        """Return the attribute template of a navaid from its shared values."""
+        return NavaidTemplate(self.fields, self._leading, shared)
+
+
+@lru_cache(maxsize=None)
+def directional_factory() -> FeatureFactory:
+    """Shared factory of the directional BRA layers."""
+    return FeatureFactory(DIRECTIONAL_FIELDS, DIRECTIONAL_LEADING)
+
+
+@lru_cache(maxsize=None)
+def omni_factory() -> FeatureFactory:
+    """Shared factory of the omnidirectional BRA layers."""
+    return FeatureFactory(OMNI_FIELDS, OMNI_LEADING)
+
+
+@lru_cache(maxsize=None)
+def scenario_factory() -> FeatureFactory:
+    """Shared factory of the directional scenario layers (no shared values)."""
+    return FeatureFactory(SCENARIO_FIELDS, len(SCENARIO_FIELDS))
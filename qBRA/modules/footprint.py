@@ -0,0 +1,131 @@
+"""2D display footprints for BRA layers.
+
+BRA outputs are ``PolygonZ`` layers whose slope ring contains a circular arc
+and whose omni rings carry 128 vertices.  Drawing thousands of them means the
+renderer segmentises curves and handles Z on every redraw.  The functions
+here derive a flat, pre-segmentised and simplified companion layer meant for
+canvas display only — the exact 3D layer remains the one to analyse.
+
+Public API
+----------
+footprint_tolerance(tolerance_m, is_geographic) -> float
+    Express a metre tolerance in layer units.
+
+footprint_geometry(geometry, tolerance) -> Optional[QgsGeometry]
+    Flatten one BRA geometry; None for degenerate footprints (walls).
+
+build_footprint_layer(source, tolerance_m) -> QgsVectorLayer
+    Build the companion memory layer for a BRA output layer.
+
+footprint_kind(kind) -> str
+    Persistent-output kind used for the footprint of ``kind`` outputs.
+"""
+
+from typing import Any, Optional
+
+from qgis.core import QgsFeature, QgsGeometry, QgsVectorLayer
+from qgis.PyQt.QtGui import QColor
+
+from ..constants import (
+    FOOTPRINT_CRS_TEMPLATE_PREFIX,
+    FOOTPRINT_SIMPLIFY_TOLERANCE_M,
+    FOOTPRINT_SUFFIX,
+    METRES_PER_DEGREE,
+)
+
+
+def footprint_kind(kind: str) -> str:
+    """Return the persistent-output kind for footprints of ``kind`` outputs.
+
+    Args:
+        kind: Output kind (``"directional"`` or ``"omni"``)
+
+    Returns:
+        E.g. ``"directional_footprint"``
+    """
+    return f"{kind}_{FOOTPRINT_SUFFIX}"
+
+
+def footprint_tolerance(tolerance_m: float, is_geographic: bool) -> float:
+    """Convert a simplification tolerance from metres to layer units.
+
+    Args:
+        tolerance_m: Tolerance in metres
+        is_geographic: True if the layer CRS uses degrees
+
+    Returns:
+        Tolerance in layer units
+    """
+    return tolerance_m / METRES_PER_DEGREE if is_geographic else tolerance_m
+
+
+def footprint_geometry(geometry: QgsGeometry, tolerance: float) -> Optional[QgsGeometry]:
+    """Flatten a BRA geometry for display.
+
+    Curves are segmentised, Z is dropped and the rings are simplified with
+    ``tolerance`` (layer units, 0 disables simplification).
+
+    Args:
+        geometry: Source PolygonZ / CurvePolygonZ geometry
+        tolerance: Simplification tolerance in layer units
+
+    Returns:
+        Linear 2D polygon, or None when the footprint has no area (vertical
+        walls collapse to a line in plan view)
+    """
+    flat = geometry.constGet().segmentize()
+    flat.dropZValue()
+    result = QgsGeometry(flat)
+    if tolerance > 0:
+        result = result.simplify(tolerance)
+    if result.isEmpty() or result.area() <= 0:
+        return None
+    return result
+
+
+def build_footprint_layer(
+    source: QgsVectorLayer,
+    tolerance_m: float = FOOTPRINT_SIMPLIFY_TOLERANCE_M,
+) -> QgsVectorLayer:
+    """Build the 2D display companion of a BRA output layer.
+
+    Args:
+        source: BRA layer produced by ``build_layers``/``build_layers_omni``
+        tolerance_m: Simplification tolerance in metres
+
+    Returns:
+        Memory layer with the same fields and flat, simplified polygons
+    """
+    crs = source.crs()
+    tolerance = footprint_tolerance(tolerance_m, crs.isGeographic())
+    layer = QgsVectorLayer(
+        FOOTPRINT_CRS_TEMPLATE_PREFIX + crs.authid(),
+        f"{source.name()} {FOOTPRINT_SUFFIX}",
+        "memory",
+    )
+    provider = layer.dataProvider()
+    provider.addAttributes(list(source.fields()))
+    layer.updateFields()
+
+    features = []
+    for src_feature in source.getFeatures():
+        geometry = footprint_geometry(src_feature.geometry(), tolerance)
+        if geometry is None:
+            continue
+        feature = QgsFeature()
+        feature.setGeometry(geometry)
+        feature.setAttributes(src_feature.attributes())
+        features.append(feature)
+    if features:
+        provider.addFeatures(features)
+
+    _style_footprint(layer)
+    layer.updateExtents()
+    return layer
+
+
+def _style_footprint(layer: Any) -> None:
+    """Apply the same look as the 3D BRA layers."""
+    symbol = layer.renderer().symbol()
+    symbol.setOpacity(0.5)
+    symbol.setColor(QColor("green"))
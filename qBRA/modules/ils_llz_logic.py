@@ -15,34 +15,85 @@ create_feature(definition, params, geometry) -> QgsFeature
 build_layers(iface, params) -> QgsVectorLayer   # requires live QGIS
     Runs the full BRA calculation and returns a memory layer with all
     polygon features added to the QGIS project.
+
+directional_layer_data(iface, params) -> BRALayerData
+omni_layer_data(iface, params) -> BRALayerData
+    Compute phase only: surfaces as WKB plus attribute values, without any
+    layer objects.  They read the navaid and map CRS (main thread) and call
+    the entry points below.
+
+directional_surfaces(params, navaid_xy, crs_authid) -> BRALayerData
+omni_surfaces(omni, navaid_xy, crs_authid) -> BRALayerData
+    Thread-safe compute entry points: plain values in, plain data out, no
+    ``iface`` or layer access, so worker threads never touch QObjects.
+
+navaid_point(layer, navaid_fid) -> (x, y)
+map_crs_authid(iface) -> str
+    Main-thread reads snapshotted into a job before it goes to a worker.
+
+scenario_layer_data(iface, params, routing_points, facility_keys, directions) -> BRALayerData
+    Every (facility key × direction) scenario of the navaid in one layer,
+    each surface tagged with its scenario.
+
+materialise_layer(data) -> QgsVectorLayer
+    Materialise phase: memory layer holding the surfaces of ``data`` (main
+    thread; see ``LayerMaterialiser`` for time-sliced batches).
+
+wkb_geometry(wkb) -> QgsGeometry
+    Wraps WKB from :class:`~qBRA.modules.wkb.WkbEncoder` in a geometry.
 """
 
-from typing import Any, Union
+from typing import Any, List, Optional, Sequence, Tuple
 
 from qgis.core import (
     QgsVectorLayer,
-    QgsField,
     QgsFeature,
     QgsGeometry,
     QgsGeometryUtils,
     QgsProject,
     QgsPoint,
     QgsPointXY,
-    QgsPolygon,
-    QgsLineString,
 )
-from math import tan, radians, cos, sin, pi
 from qgis.PyQt.QtGui import QColor
 
 from ..models.bra_parameters import BRAParameters
 from ..models.feature_definition import FeatureDefinition
+from ..models.layer_data import BRALayerData
+from ..models.omni_parameters import OmniParameters
 from ..exceptions import BRACalculationError
-from ..constants import PROJECTION_DISTANCE, CRS_TEMPLATE_PREFIX, LAYER_NAME_SUFFIX
-from ..utils.qt_compat import QVariantInt, QVariantString
+from ..constants import (
+    PROJECTION_DISTANCE,
+    CRS_TEMPLATE_PREFIX,
+    LAYER_NAME_SUFFIX,
+    OMNI_LAYER_NAME_SUFFIX,
+    OMNI_SEGMENTS,
+    SCENARIO_LAYER_NAME_SUFFIX,
+    OUTPUT_KIND_DIRECTIONAL,
+    OUTPUT_KIND_OMNI,
+)
+from .attributes import directional_values, omni_values
+from .feature_factory import directional_factory, omni_factory, scenario_factory
+from .kernel import OMNI_SURFACES, omni_columns, omni_rings, omni_row, omni_vertices
+from .scenarios import expand_scenarios, scenario_surfaces
+from .wkb import WkbEncoder
 
 # Keep formulas and geometry construction identical to legacy script.
 
 
+def wkb_geometry(wkb: Any) -> QgsGeometry:
+    """Create a QgsGeometry from WKB produced by :class:`WkbEncoder`.
+
+    Args:
+        wkb: WKB bytes or memoryview
+
+    Returns:
+        QgsGeometry owning a copy of the WKB
+    """
+    geometry = QgsGeometry()
+    geometry.fromWkb(bytes(wkb))
+    return geometry
+
+
 def create_feature(
     definition: FeatureDefinition,
     params: BRAParameters,
@@ -61,28 +112,52 @@ def create_feature(
     Returns:
         QgsFeature with geometry and attributes set
     """
-    # Facility label preferred for 'type' attribute (falls back to key)
-    type_value = params.facility_label or params.facility_key or ""
-    
-    feature = QgsFeature()
-    feature.setGeometry(geometry)
-    feature.setAttributes([
-        definition.id,
-        definition.area,
-        definition.max_elev,
-        definition.area_name,
-        str(round(params.a, 2)),
-        str(params.b),
-        str(params.h),
-        str(round(params.r, 2)),
-        str(params.D),
-        str(params.H),
-        str(params.L),
-        str(params.phi),
-        type_value,
-    ])
-    
-    return feature
+    template = directional_factory().navaid(directional_values(params, definition.area_name))
+    return template.feature(geometry, definition.id, definition.area, definition.max_elev)
+
+
+def materialise_layer(data: BRALayerData) -> QgsVectorLayer:
+    """Create the memory layer of a computed BRA (main thread).
+
+    Args:
+        data: Result of :func:`directional_layer_data` / :func:`omni_layer_data`
+
+    Returns:
+        Styled QgsVectorLayer with one feature per surface
+    """
+    layer = create_output_layer(data)
+    layer.dataProvider().addFeatures(surface_features(data, 0, len(data)))
+    finish_output_layer(layer, data.kind)
+    return layer
+
+
+def create_output_layer(data: BRALayerData) -> QgsVectorLayer:
+    """Create the empty memory layer (schema only) for ``data``."""
+    layer = QgsVectorLayer(CRS_TEMPLATE_PREFIX + data.crs_authid, data.name, "memory")
+    layer.dataProvider().addAttributes(_factory(data.kind, data.scenarios).field_list())
+    layer.updateFields()
+    return layer
+
+
+def surface_features(data: BRALayerData, start: int, stop: int) -> List[QgsFeature]:
+    """Create the features of surfaces ``start:stop`` of ``data``."""
+    template = _factory(data.kind, data.scenarios).navaid(data.shared)
+    return [template.feature(wkb_geometry(wkb), *leading) for leading, wkb in data.surfaces[start:stop]]
+
+
+def _factory(kind: str, scenarios: bool = False) -> Any:
+    if scenarios:
+        return scenario_factory()
+    return directional_factory() if kind == OUTPUT_KIND_DIRECTIONAL else omni_factory()
+
+
+def finish_output_layer(layer: QgsVectorLayer, kind: str) -> None:
+    """Style a filled output layer and refresh its extent."""
+    if kind == OUTPUT_KIND_DIRECTIONAL:
+        layer.renderer().symbol().setOpacity(0.5)
+        layer.renderer().symbol().setColor(QColor("green"))
+    layer.triggerRepaint()
+    layer.updateExtents()
 
 
 def build_layers(iface: Any, params: BRAParameters) -> QgsVectorLayer:  # pragma: no cover
@@ -98,34 +173,99 @@ def build_layers(iface: Any, params: BRAParameters) -> QgsVectorLayer:  # pragma
     Raises:
         BRACalculationError: If feature selection or geometry calculation fails
     """
-    # Extract parameters from dataclass
-    layer = params.active_layer
-    selection = layer.selectedFeatures()
-    if not selection:
-        raise BRACalculationError(
-            "No feature selected on active layer",
-            "Layer must have at least one selected feature for BRA calculation"
-        )
-    feat = selection[0]
-    p_geom = feat.geometry().asPoint()
+    return materialise_layer(directional_layer_data(iface, params))
+
+
+def map_crs_authid(iface: Any) -> str:
+    """Return the authid of the map canvas CRS (main thread)."""
+    return iface.mapCanvas().mapSettings().destinationCrs().authid()
+
+
+def navaid_point(layer: QgsVectorLayer, navaid_fid: Optional[int]) -> Tuple[float, float]:
+    """Read the navaid position from its layer (main thread).
+
+    Args:
+        layer: Navaid point layer
+        navaid_fid: Feature id of the navaid; None for the first selected feature
 
-    map_srid = iface.mapCanvas().mapSettings().destinationCrs().authid()
+    Returns:
+        (x, y) of the navaid in the layer CRS
+
+    Raises:
+        BRACalculationError: If the feature does not exist or nothing is selected
+    """
+    if navaid_fid is not None:
+        # Linked/persistent runs address the navaid directly, not via selection
+        feat = layer.getFeature(navaid_fid)
+        if not feat.isValid():
+            raise BRACalculationError(
+                "Navaid feature not found on active layer",
+                f"Feature id: {navaid_fid}"
+            )
+    else:
+        selection = layer.selectedFeatures()
+        if not selection:
+            raise BRACalculationError(
+                "No feature selected on active layer",
+                "Layer must have at least one selected feature for BRA calculation"
+            )
+        feat = selection[0]
+    point = feat.geometry().asPoint()
+    return point.x(), point.y()
+
+
+def directional_layer_data(iface: Any, params: BRAParameters) -> BRALayerData:  # pragma: no cover
+    """Compute the directional BRA surfaces of a navaid without creating layers.
+
+    Args:
+        iface: QGIS interface object (map CRS)
+        params: BRAParameters dataclass with all calculation parameters
+
+    Returns:
+        BRALayerData with the 7 surfaces
+
+    Raises:
+        BRACalculationError: If feature selection or geometry calculation fails
+    """
+    navaid_xy = navaid_point(params.active_layer, params.navaid_fid)
+    return directional_surfaces(params, navaid_xy, map_crs_authid(iface))
 
-    # Helper to add Z
-    def pz(point: Union[QgsPoint, QgsPointXY], z: float) -> QgsPoint:
-        """Add Z coordinate to a point.
+
+def directional_surfaces(
+    params: BRAParameters, navaid_xy: Tuple[float, float], crs_authid: str
+) -> BRALayerData:  # pragma: no cover
+    """Compute the directional BRA surfaces at a navaid position (any thread).
+
+    ``params.active_layer`` is not used.
+
+    Args:
+        params: BRAParameters dataclass with all calculation parameters
+        navaid_xy: Navaid position in the map CRS
+        crs_authid: Map CRS of the output
+
+    Returns:
+        BRALayerData with the 7 surfaces
+
+    Raises:
+        BRACalculationError: If the geometry calculation fails
+    """
+    p_geom = QgsPointXY(*navaid_xy)
+    map_srid = crs_authid
+
+    # Helper to add Z: plain XYZ tuples, encoded to WKB without QgsPoint objects
+    def pz(point: QgsPointXY, z: float) -> Tuple[float, float, float]:
+        """Return the XYZ coordinates of a point at elevation ``z``.
         
         Args:
-            point: 2D or 3D point
+            point: 2D point
             z: Z elevation value
             
         Returns:
-            QgsPoint with Z coordinate set
+            (x, y, z) tuple
         """
-        cPoint = QgsPoint(point)
-        cPoint.addZValue()
-        cPoint.setZ(z)
-        return cPoint
+        return (point.x(), point.y(), z)
+
+    encoder = WkbEncoder()
 
     a = params.a
     b = params.b
@@ -191,149 +331,62 @@ def build_layers(iface: Any, params: BRAParameters) -> QgsVectorLayer:  # pragma
             QgsPoint(pt_lateral_right), QgsPoint(pt_lateral_right_projected))[1]
     )
 
-    # Memory layer for polygons
-    z_layer = QgsVectorLayer(CRS_TEMPLATE_PREFIX + map_srid, f"{display_name} {LAYER_NAME_SUFFIX}", "memory")
-    fields = [
-        QgsField("id", QVariantInt),
-        QgsField("area", QVariantString),
-        QgsField("max_elev", QVariantString),
-        QgsField("area_name", QVariantString),
-        QgsField("a", QVariantString),
-        QgsField("b", QVariantString),
-        QgsField("h", QVariantString),
-        QgsField("r", QVariantString),
-        QgsField("D", QVariantString),
-        QgsField("H", QVariantString),
-        QgsField("L", QVariantString),
-        QgsField("phi", QVariantString),
-        # Place 'type' as the last attribute per user request
-        QgsField("type", QVariantString),
-    ]
-    z_layer.dataProvider().addAttributes(fields)
-    z_layer.updateFields()
-    pr = z_layer.dataProvider()
+    # Shared attribute values computed once; features only add id/area/max_elev
+    shared = directional_values(params, display_name)
 
     # Build all feature geometries (preserving exact calculations from legacy script)
     
     # Base geometry
     base_points = [pz(pt_back_left, site_elev), pz(pt_back_right, site_elev), pz(pt_ahead_right, site_elev), pz(pt_ahead_left, site_elev), pz(pt_back_left, site_elev)]
-    base_geom = QgsGeometry(QgsPolygon(QgsLineString(base_points), rings=[]))
+    base_wkb = bytes(encoder.polygon_z([base_points]))
 
     # Left level geometry
     llevel_points = [pz(pt_lateral_left, side_elev), pz(pt_back_left, side_elev), pz(pt_ahead_left, side_elev), pz(pt_diverge_left, side_elev), pz(pt_lateral_left, side_elev)]
-    llevel_geom = QgsGeometry(QgsPolygon(QgsLineString(llevel_points), rings=[]))
+    llevel_wkb = bytes(encoder.polygon_z([llevel_points]))
 
     # Right level geometry
     rlevel_points = [pz(pt_back_right, side_elev), pz(pt_lateral_right, side_elev), pz(pt_diverge_right, side_elev), pz(pt_ahead_right, side_elev), pz(pt_back_right, side_elev)]
-    rlevel_geom = QgsGeometry(QgsPolygon(QgsLineString(rlevel_points), rings=[]))
-
-    # Slope geometry (with curve + arc)
-    from qgis.core import QgsCircularString
-
-    arc = QgsCircularString.fromTwoPointsAndCenter(
-        pz(pt_arc_left, site_elev + h),
-        pz(pt_arc_right, site_elev + h),
-        pz(p_geom, site_elev + h),
+    rlevel_wkb = bytes(encoder.polygon_z([rlevel_points]))
+
+    # Slope geometry (with curve + arc): shortest arc from arc_left to
+    # arc_right around the navaid, as QgsCircularString.fromTwoPointsAndCenter
+    arc_z = site_elev + h
+    arc_mid = QgsGeometryUtils.segmentMidPointFromCenter(
+        QgsPoint(pt_arc_left.x(), pt_arc_left.y(), arc_z),
+        QgsPoint(pt_arc_right.x(), pt_arc_right.y(), arc_z),
+        QgsPoint(p_geom.x(), p_geom.y(), arc_z),
+        True,
     )
     slope_points = [
-        pz(pt_arc_right, site_elev + h),
+        pz(pt_arc_right, arc_z),
         pz(pt_ahead_right, site_elev),
         pz(pt_ahead_left, site_elev),
-        pz(pt_arc_left, site_elev + h),
+        pz(pt_arc_left, arc_z),
     ]
-    line_start = QgsLineString(slope_points)
-    curve = line_start.toCurveType()
-    curve.addCurve(arc)
-    polygon = QgsPolygon()
-    polygon.setExteriorRing(curve)
-    geom = QgsGeometry(polygon)
-    seg = QgsFeature()
-    seg.setGeometry(geom)
-    seg.setAttributes([
-        4,
-        "slope",
-        str(site_elev + h),
-        display_name,
-        str(round(a, 2)),
-        str(b),
-        str(h),
-        str(round(r, 2)),
-        str(D),
-        str(H),
-        str(L),
-        str(phi),
-        _type_value,
-    ])
-    pr.addFeatures([seg])
+    arc_points = [pz(pt_arc_left, arc_z), (arc_mid.x(), arc_mid.y(), arc_z), pz(pt_arc_right, arc_z)]
+    curved = wkb_geometry(encoder.curve_polygon_z(slope_points, arc_points))
+    # QgsPolygon.setExteriorRing segmentised the arc in the legacy script; keep that output
+    slope_wkb = bytes(QgsGeometry(curved.constGet().segmentize()).asWkb())
 
     # Walls
-    wall1 = [pz(pt_bl, site_elev), pz(pt_bl, side_elev), pz(pt_br, side_elev), pz(pt_br, site_elev)]
-    seg = QgsFeature()
-    seg.setGeometry(QgsPolygon(QgsLineString(wall1), rings=[]))
-    seg.setAttributes([
-        5,
-        "wall",
-        str(side_elev),
-        display_name,
-        str(round(a, 2)),
-        str(b),
-        str(h),
-        str(round(r, 2)),
-        str(D),
-        str(H),
-        str(L),
-        str(phi),
-        _type_value,
-    ])
-    pr.addFeatures([seg])
-
+    pt_bl, pt_br = pt_back_left, pt_back_right
+    pt_al, pt_ar = pt_ahead_left, pt_ahead_right
+    wall1 = [pz(pt_bl, site_elev), pz(pt_bl, side_elev), pz(pt_br, side_elev), pz(pt_br, site_elev), pz(pt_bl, site_elev)]
     wall2 = [pz(pt_al, site_elev), pz(pt_al, side_elev), pz(pt_bl, side_elev), pz(pt_bl, site_elev), pz(pt_al, site_elev)]
-    seg = QgsFeature()
-    seg.setGeometry(QgsPolygon(QgsLineString(wall2), rings=[]))
-    seg.setAttributes([
-        6,
-        "wall",
-        str(side_elev),
-        display_name,
-        str(round(a, 2)),
-        str(b),
-        str(h),
-        str(round(r, 2)),
-        str(D),
-        str(H),
-        str(L),
-        str(phi),
-        _type_value,
-    ])
-    pr.addFeatures([seg])
-
     wall3 = [pz(pt_ar, site_elev), pz(pt_ar, side_elev), pz(pt_br, side_elev), pz(pt_br, site_elev), pz(pt_ar, site_elev)]
-    seg = QgsFeature()
-    seg.setGeometry(QgsPolygon(QgsLineString(wall3), rings=[]))
-    seg.setAttributes([
-        7,
-        "wall",
-        str(side_elev),
-        display_name,
-        str(round(a, 2)),
-        str(b),
-        str(h),
-        str(round(r, 2)),
-        str(D),
-        str(H),
-        str(L),
-        str(phi),
-        _type_value,
-    ])
-    pr.addFeatures([seg])
-
-    # Styling
-    z_layer.renderer().symbol().setOpacity(0.5)
-    z_layer.renderer().symbol().setColor(QColor("green"))
-    z_layer.triggerRepaint()
-    z_layer.updateExtents()
-
-    return z_layer
+
+    surfaces = (
+        ((1, "base", str(site_elev)), base_wkb),
+        ((2, "left level", str(side_elev)), llevel_wkb),
+        ((3, "right level", str(side_elev)), rlevel_wkb),
+        ((4, "slope", str(site_elev + h)), slope_wkb),
+        ((5, "wall", str(side_elev)), bytes(encoder.polygon_z([wall1]))),
+        ((6, "wall", str(side_elev)), bytes(encoder.polygon_z([wall2]))),
+        ((7, "wall", str(side_elev)), bytes(encoder.polygon_z([wall3]))),
+    )
+    return BRALayerData(
+        OUTPUT_KIND_DIRECTIONAL, f"{display_name} {LAYER_NAME_SUFFIX}", map_srid, shared, surfaces
+    )
 
 
 def build_layers_omni(iface, params):
@@ -344,127 +397,110 @@ def build_layers_omni(iface, params):
     - Optional turbine analysis cylinder: circle of radius j
     Attributes include r, alpha, R, j, h and type (last column).
     """
+    return materialise_layer(omni_layer_data(iface, params))
+
+
+def omni_layer_data(iface: Any, params: dict) -> BRALayerData:
+    """Compute the omni BRA surfaces of a navaid without creating layers.
+
+    Args:
+        iface: QGIS interface object (map CRS)
+        params: Omni parameter dict from the dock (or a recipe)
+
+    Returns:
+        BRALayerData with up to 3 surfaces
+
+    Raises:
+        ValueError: If the navaid is missing or the parameters are invalid
+    """
     layer = params["active_layer"]
-    selection = layer.selectedFeatures()
-    if not selection:
-        raise ValueError("Select one feature on the active layer")
-    feat = selection[0]
+    navaid_fid = params.get("navaid_fid")
+    if navaid_fid is not None:
+        feat = layer.getFeature(navaid_fid)
+        if not feat.isValid():
+            raise ValueError(f"Navaid feature {navaid_fid} not found on the active layer")
+    else:
+        selection = layer.selectedFeatures()
+        if not selection:
+            raise ValueError("Select one feature on the active layer")
+        feat = selection[0]
     p_geom = feat.geometry().asPoint()
+    return omni_surfaces(OmniParameters.from_dict(params), (p_geom.x(), p_geom.y()), map_crs_authid(iface))
 
-    map_srid = iface.mapCanvas().mapSettings().destinationCrs().authid()
-
-    display_name = params.get("display_name") or params.get("remark") or "BRA"
-    r = float(params.get("omni_r", 0.0))
-    alpha = float(params.get("omni_alpha", 1.0))
-    R = float(params.get("omni_R", 0.0))
-    turbine = bool(params.get("omni_turbine", False))
-    j = float(params.get("omni_j", 0.0)) if turbine else 0.0
-    h = float(params.get("omni_h", 0.0)) if turbine else 0.0
-    base_z = float(params.get("site_elev", 0.0))
-
-    if r <= 0 or R <= 0:
-        raise ValueError("Omni parameters invalid: r and R must be > 0")
-    if R < r:
-        raise ValueError("Omni parameter invalid: R must be >= r")
-    if alpha <= 0 or alpha > 90:
-        raise ValueError("Omni parameter invalid: alpha must be in (0, 90]")
-    if turbine:
-        if j <= 0 or h <= 0:
-            raise ValueError("Omni turbine parameters invalid: j and h must be > 0")
-        if j < r:
-            raise ValueError("Omni turbine parameter invalid: j must be >= r")
-
-    # Heights from cone geometry (Figure 2.1/2.2): z = radius * tan(alpha)
-    alpha_rad = radians(alpha)
-    h_cone_outer = R * tan(alpha_rad)
-    h_cone_inner = r * tan(alpha_rad)
-
-    segments = 128
-
-    # Create memory layer for 3D polygons
-    layer_out = QgsVectorLayer("PolygonZ?crs=" + map_srid, f"{display_name} BRA_omni", "memory")
-    fields = [
-        QgsField("id", QVariantInt),
-        QgsField("area", QVariantString),
-        QgsField("area_name", QVariantString),
-        QgsField("r", QVariantString),
-        QgsField("alpha", QVariantString),
-        QgsField("R", QVariantString),
-        QgsField("j", QVariantString),
-        QgsField("h", QVariantString),
-        QgsField("type", QVariantString),
-    ]
-    pr = layer_out.dataProvider()
-    pr.addAttributes(fields)
-    layer_out.updateFields()
-
-    _type_value = params.get("facility_label") or params.get("facility_key") or ""
-
-    def circle_points(center_pt, radius, z_value):
-        pts = []
-        cx = center_pt.x()
-        cy = center_pt.y()
-        for i in range(segments):
-            ang = 2.0 * pi * i / segments
-            x = cx + radius * cos(ang)
-            y = cy + radius * sin(ang)
-            pts.append(QgsPoint(x, y, z_value + base_z))
-        pts.append(pts[0])
-        return pts
-
-    # Inner cylinder top (flat disk at z = h_cone_inner)
-    inner_ring = circle_points(p_geom, r, h_cone_inner)
-    f1 = QgsFeature()
-    f1.setGeometry(QgsGeometry(QgsPolygon(QgsLineString(inner_ring), rings=[])))
-    f1.setAttributes([
-        1,
-        "inner cylinder top",
-        display_name,
-        str(r),
-        str(alpha),
-        str(R),
-        str(j if turbine else 0.0),
-        str(h if turbine else 0.0),
-        _type_value,
-    ])
-    pr.addFeatures([f1])
-
-    # Cone mantle approximated as polygon with outer ring at z=h_cone_outer and inner ring at z=h_cone_inner
-    outer_ring = circle_points(p_geom, R, h_cone_outer)
-    inner_ring_cone = circle_points(p_geom, r, h_cone_inner)[::-1]  # reverse for hole
-    f2 = QgsFeature()
-    f2.setGeometry(QgsGeometry(QgsPolygon(QgsLineString(outer_ring), rings=[QgsLineString(inner_ring_cone)])))
-    f2.setAttributes([
-        2,
-        "cone mantle",
-        display_name,
-        str(r),
-        str(alpha),
-        str(R),
-        str(j if turbine else 0.0),
-        str(h if turbine else 0.0),
-        _type_value,
-    ])
-    pr.addFeatures([f2])
-
-    # Optional turbine cylinder top at height h
-    if turbine and j > 0:
-        turbine_ring = circle_points(p_geom, j, h)
-        f3 = QgsFeature()
-        f3.setGeometry(QgsGeometry(QgsPolygon(QgsLineString(turbine_ring), rings=[])))
-        f3.setAttributes([
-            3,
-            "turbine cylinder top",
-            display_name,
-            str(r),
-            str(alpha),
-            str(R),
-            str(j),
-            str(h),
-            _type_value,
-        ])
-        pr.addFeatures([f3])
-
-    layer_out.triggerRepaint()
-    layer_out.updateExtents()
-    return layer_out
+
+def omni_surfaces(omni: OmniParameters, navaid_xy: Tuple[float, float], crs_authid: str) -> BRALayerData:
+    """Compute the omni BRA surfaces at a navaid position (any thread).
+
+    Args:
+        omni: Validated omni parameters
+        navaid_xy: Navaid position in the map CRS
+        crs_authid: Map CRS of the output
+
+    Returns:
+        BRALayerData with up to 3 surfaces
+    """
+    display_name = omni.display_name
+
+    # Rings from the kernel (heights from cone geometry, Figure 2.1/2.2:
+    # z = radius * tan(alpha)), encoded straight to WKB
+    segments = OMNI_SEGMENTS
+    vertices = omni_vertices(omni_columns([omni_row(omni, *navaid_xy)]), segments)[0]
+    polygons = omni_rings(vertices, segments)
+    encoder = WkbEncoder()
+
+    # Inner cylinder top (flat disk at z = r * tan(alpha)), cone mantle (outer
+    # ring at R, hole at r reversed) and, in turbine mode only, the turbine
+    # cylinder top at h (omni_rings leaves it out otherwise)
+    surfaces = tuple(
+        ((surface_id, area), bytes(encoder.polygon_z(rings)))
+        for (surface_id, area, _ring_ids), rings in zip(OMNI_SURFACES, polygons)
+    )
+    return BRALayerData(
+        OUTPUT_KIND_OMNI, f"{display_name} {OMNI_LAYER_NAME_SUFFIX}", crs_authid, omni_values(omni), surfaces
+    )
+
+
+def scenario_layer_data(
+    iface: Any,
+    params: BRAParameters,
+    routing_points: Sequence[Any],
+    facility_keys: Sequence[str],
+    directions: Sequence[str],
+) -> BRALayerData:
+    """Compute every (facility key × direction) scenario of a navaid at once.
+
+    The navaid and routing feature are read once; the scenarios share the
+    azimuth and threshold distance of each direction and go through one
+    kernel call (see :mod:`qBRA.modules.scenarios`).
+
+    Args:
+        iface: QGIS interface object (map CRS)
+        params: Parameters of the current dock calculation
+        routing_points: Vertices of the selected routing line
+        facility_keys: Directional facility keys to compare
+        directions: Routing directions to compare
+
+    Returns:
+        BRALayerData of a scenario layer (seven surfaces per scenario)
+
+    Raises:
+        BRACalculationError: If the navaid feature cannot be found
+        BRAValidationError: If no valid scenario is requested
+    """
+    layer = params.active_layer
+    feat = layer.getFeature(params.navaid_fid) if params.navaid_fid is not None else None
+    if feat is None or not feat.isValid():
+        raise BRACalculationError(
+            "Navaid feature not found on active layer", f"Feature id: {params.navaid_fid}"
+        )
+    point = feat.geometry().asPoint()
+    navaid_xy = (point.x(), point.y())
+    scenarios = expand_scenarios(params, navaid_xy, routing_points, facility_keys, directions)
+    return BRALayerData(
+        OUTPUT_KIND_DIRECTIONAL,
+        f"{params.remark} {SCENARIO_LAYER_NAME_SUFFIX}",
+        map_crs_authid(iface),
+        (),
+        scenario_surfaces(scenarios, navaid_xy),
+        scenarios=True,
+    )
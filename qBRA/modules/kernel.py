@@ -0,0 +1,402 @@
+"""Headless BRA geometry kernel.
+
+Pure-numpy re-statement of the vertex math in :func:`build_layers` and
+:func:`build_layers_omni`, vectorised over many navaids at once and free of
+QGIS objects, so it can run in worker processes and batch tools.  The
+formulas mirror the legacy script exactly:
+
+* ``QgsPointXY.project(d, bearing)`` is ``(x + d sin b, y + d cos b)``;
+* the diverging-line / circle intersection keeps the root closest to the
+  arc reference point (navaid projected by ``r`` along the azimuth), as
+  ``QgsGeometryUtils.lineCircleIntersection`` does;
+* the slope arc runs along the shortest arc around the navaid, as
+  ``QgsCircularString.fromTwoPointsAndCenter`` does by default.
+
+Outputs are fixed-size vertex arrays ``(n, V, 3)`` laid out by
+:data:`DIRECTIONAL_TEMPLATES` / :data:`OMNI_SURFACES`, so they can be written
+straight into shared memory or encoded without per-vertex objects.
+
+Public API
+----------
+routing_azimuth(points, direction) -> float
+directional_row(params, x, y) / omni_row(params, x, y) -> tuple
+DIRECTIONAL_COLUMNS, directional_columns(rows) -> ndarray (n, 12)
+directional_points(columns) -> Dict[str, ndarray (n, 2)]
+directional_vertices(columns) -> ndarray (n, DIRECTIONAL_VERTEX_COUNT, 3)
+OMNI_COLUMNS, omni_columns(rows) -> ndarray (n, 9)
+omni_vertices(columns, segments) -> ndarray (n, 4 * (segments + 1), 3)
+directional_rings(vertices, arc_segments) -> List[ndarray]
+omni_rings(vertices, segments) -> List[List[ndarray]]
+"""
+
+from dataclasses import dataclass
+from math import atan2, degrees
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..constants import OMNI_SEGMENTS
+from ..exceptions import BRACalculationError
+
+#: Column order of the directional parameter matrix.
+DIRECTIONAL_COLUMNS: Tuple[str, ...] = ("x", "y", "azimuth", "a", "b", "r", "D", "L", "phi", "site_elev", "H", "h")
+
+#: Column order of the omni parameter matrix (``turbine`` is 0/1).
+OMNI_COLUMNS: Tuple[str, ...] = ("x", "y", "site_elev", "r", "alpha", "R", "j", "h", "turbine")
+
+#: Vertex height levels: ``site_elev``, ``site_elev + H``, ``site_elev + h``.
+LEVEL_SITE, LEVEL_SIDE, LEVEL_TOP = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class SurfaceTemplate:
+    """Vertex layout of one directional BRA surface.
+
+    Attributes:
+        id: Feature id (matches ``build_layers``)
+        area: ``area`` attribute
+        level: Height level reported as ``max_elev``
+        vertices: (point name, height level) per vertex, closed ring
+        arc_start: Index of the first vertex of a trailing circular arc
+            (three control points), or None for straight rings
+    """
+
+    id: int
+    area: str
+    level: int
+    vertices: Tuple[Tuple[str, int], ...]
+    arc_start: Optional[int] = None
+
+
+def _ring(level: int, *names: str) -> Tuple[Tuple[str, int], ...]:
+    return tuple((name, level) for name in names)
+
+
+DIRECTIONAL_TEMPLATES: Tuple[SurfaceTemplate, ...] = (
+    SurfaceTemplate(1, "base", LEVEL_SITE, _ring(
+        LEVEL_SITE, "back_left", "back_right", "ahead_right", "ahead_left", "back_left")),
+    SurfaceTemplate(2, "left level", LEVEL_SIDE, _ring(
+        LEVEL_SIDE, "lateral_left", "back_left", "ahead_left", "diverge_left", "lateral_left")),
+    SurfaceTemplate(3, "right level", LEVEL_SIDE, _ring(
+        LEVEL_SIDE, "back_right", "lateral_right", "diverge_right", "ahead_right", "back_right")),
+    SurfaceTemplate(4, "slope", LEVEL_TOP, (
+        ("arc_right", LEVEL_TOP), ("ahead_right", LEVEL_SITE), ("ahead_left", LEVEL_SITE),
+        ("arc_left", LEVEL_TOP), ("arc_mid", LEVEL_TOP), ("arc_right", LEVEL_TOP),
+    ), arc_start=3),
+    SurfaceTemplate(5, "wall", LEVEL_SIDE, (
+        ("back_left", LEVEL_SITE), ("back_left", LEVEL_SIDE), ("back_right", LEVEL_SIDE),
+        ("back_right", LEVEL_SITE), ("back_left", LEVEL_SITE),
+    )),
+    SurfaceTemplate(6, "wall", LEVEL_SIDE, (
+        ("ahead_left", LEVEL_SITE), ("ahead_left", LEVEL_SIDE), ("back_left", LEVEL_SIDE),
+        ("back_left", LEVEL_SITE), ("ahead_left", LEVEL_SITE),
+    )),
+    SurfaceTemplate(7, "wall", LEVEL_SIDE, (
+        ("ahead_right", LEVEL_SITE), ("ahead_right", LEVEL_SIDE), ("back_right", LEVEL_SIDE),
+        ("back_right", LEVEL_SITE), ("ahead_right", LEVEL_SITE),
+    )),
+)
+
+
+def _template_offsets(templates: Sequence[SurfaceTemplate]) -> Tuple[Tuple[int, int], ...]:
+    offsets, start = [], 0
+    for template in templates:
+        offsets.append((start, start + len(template.vertices)))
+        start += len(template.vertices)
+    return tuple(offsets)
+
+
+#: (start, stop) of each template's vertices in the directional vertex axis.
+DIRECTIONAL_OFFSETS: Tuple[Tuple[int, int], ...] = _template_offsets(DIRECTIONAL_TEMPLATES)
+DIRECTIONAL_VERTEX_COUNT: int = DIRECTIONAL_OFFSETS[-1][1]
+
+#: Omni surfaces as (id, area, ring indices); ring 3 only exists in turbine mode.
+OMNI_SURFACES: Tuple[Tuple[int, str, Tuple[int, ...]], ...] = (
+    (1, "inner cylinder top", (0,)),
+    (2, "cone mantle", (1, 2)),
+    (3, "turbine cylinder top", (3,)),
+)
+OMNI_RING_COUNT: int = 4
+
+
+def routing_azimuth(points: Sequence[Any], direction: str = "forward") -> float:
+    """Compute the azimuth of a routing polyline from its first to last vertex.
+
+    Matches ``QgsPoint.azimuth()`` (clockwise from north) normalised to [0, 360).
+
+    Args:
+        points: Polyline vertices (objects with ``x()``/``y()``)
+        direction: ``"forward"`` (start to end) or ``"backward"`` (end to start)
+
+    Returns:
+        Azimuth in degrees
+
+    Raises:
+        BRACalculationError: If the polyline has fewer than 2 vertices
+    """
+    if not points or len(points) < 2:
+        raise BRACalculationError(
+            "Routing geometry has insufficient vertices",
+            f"Need at least 2 points, got {len(points) if points else 0}",
+        )
+    p0, p1 = (points[0], points[-1]) if direction == "forward" else (points[-1], points[0])
+    return degrees(atan2(p1.x() - p0.x(), p1.y() - p0.y())) % 360
+
+
+def directional_row(params: Any, x: float, y: float) -> Tuple[float, ...]:
+    """Return one :data:`DIRECTIONAL_COLUMNS` row for a navaid.
+
+    Args:
+        params: BRAParameters (or any object with the same attributes)
+        x, y: Navaid position
+    """
+    return (x, y, params.azimuth, params.a, params.b, params.r, params.D, params.L,
+            params.phi, params.site_elev, params.H, params.h)
+
+
+def omni_row(params: Any, x: float, y: float) -> Tuple[float, ...]:
+    """Return one :data:`OMNI_COLUMNS` row for a navaid.
+
+    Args:
+        params: OmniParameters (or any object with the same attributes)
+        x, y: Navaid position
+    """
+    return (x, y, params.site_elev, params.r, params.alpha, params.R, params.j,
+            params.h, 1.0 if params.turbine else 0.0)
+
+
+def directional_columns(rows: Iterable[Sequence[float]]) -> np.ndarray:
+    """Stack parameter rows (in :data:`DIRECTIONAL_COLUMNS` order) into a matrix."""
+    matrix = np.array(list(rows), dtype=np.float64)
+    return matrix.reshape(-1, len(DIRECTIONAL_COLUMNS))
+
+
+def omni_columns(rows: Iterable[Sequence[float]]) -> np.ndarray:
+    """Stack parameter rows (in :data:`OMNI_COLUMNS` order) into a matrix."""
+    matrix = np.array(list(rows), dtype=np.float64)
+    return matrix.reshape(-1, len(OMNI_COLUMNS))
+
+
+def _project(origin: np.ndarray, distance: np.ndarray, bearing_deg: np.ndarray) -> np.ndarray:
+    bearing = np.radians(bearing_deg)
+    return origin + np.stack([distance * np.sin(bearing), distance * np.cos(bearing)], axis=-1)
+
+
+def _unit(bearing_deg: np.ndarray) -> np.ndarray:
+    bearing = np.radians(bearing_deg)
+    return np.stack([np.sin(bearing), np.cos(bearing)], axis=-1)
+
+
+def _dot(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return np.einsum("ij,ij->i", u, v)
+
+
+def _line_circle(point: np.ndarray, direction: np.ndarray, centre: np.ndarray,
+                 radius: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """Intersection of a line with a circle, closest to ``reference``."""
+    w = point - centre
+    half_b = _dot(w, direction)
+    disc = np.sqrt(np.maximum(half_b ** 2 - (_dot(w, w) - radius ** 2), 0.0))
+    near = point + (-half_b - disc)[:, None] * direction
+    far = point + (-half_b + disc)[:, None] * direction
+    pick_far = _dot(far - reference, far - reference) <= _dot(near - reference, near - reference)
+    return np.where(pick_far[:, None], far, near)
+
+
+def _line_line(p: np.ndarray, u: np.ndarray, q: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Intersection of lines ``p + t u`` and ``q + s v``."""
+    cross = u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0]
+    d = q - p
+    t = (d[:, 0] * v[:, 1] - d[:, 1] * v[:, 0]) / cross
+    return p + t[:, None] * u
+
+
+def directional_points(columns: np.ndarray) -> Dict[str, np.ndarray]:
+    """Compute the named construction points of directional BRAs.
+
+    Args:
+        columns: Parameter matrix ``(n, 12)`` in :data:`DIRECTIONAL_COLUMNS` order
+
+    Returns:
+        Point name -> ``(n, 2)`` XY array (names as in ``build_layers``)
+    """
+    c = np.asarray(columns, dtype=np.float64).reshape(-1, len(DIRECTIONAL_COLUMNS))
+    navaid = c[:, 0:2]
+    azimuth, a, b, r, D, L, phi = (c[:, i] for i in range(2, 9))
+
+    threshold = _project(navaid, a, azimuth)
+    back = _project(navaid, b, azimuth - 180)
+    pts = {
+        "navaid": navaid,
+        "threshold": threshold,
+        "back": back,
+        "ahead_left": _project(threshold, D, azimuth - 90),
+        "ahead_right": _project(threshold, D, azimuth + 90),
+        "back_left": _project(back, D, azimuth - 90),
+        "back_right": _project(back, D, azimuth + 90),
+        "lateral_left": _project(back, L, azimuth - 90),
+        "lateral_right": _project(back, L, azimuth + 90),
+    }
+    arc_ref = _project(navaid, r, azimuth)
+    for side, sign in (("left", -1.0), ("right", 1.0)):
+        ahead = pts[f"ahead_{side}"]
+        diverging = _unit(azimuth + sign * phi)
+        pts[f"arc_{side}"] = _line_circle(ahead, diverging, navaid, r, arc_ref)
+        pts[f"diverge_{side}"] = _line_line(ahead, diverging, pts[f"lateral_{side}"], _unit(azimuth))
+
+    # Shortest-arc midpoint between the two arc ends around the navaid
+    bisector = (pts["arc_left"] - navaid) + (pts["arc_right"] - navaid)
+    norm = np.hypot(bisector[:, 0], bisector[:, 1])
+    pts["arc_mid"] = navaid + bisector * (r / np.where(norm > 0, norm, 1.0))[:, None]
+    return pts
+
+
+def directional_vertices(columns: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Compute all directional BRA vertices, laid out by :data:`DIRECTIONAL_TEMPLATES`.
+
+    Args:
+        columns: Parameter matrix ``(n, 12)``
+        out: Optional preallocated ``(n, DIRECTIONAL_VERTEX_COUNT, 3)`` array
+            (e.g. a view on shared memory) written in place
+
+    Returns:
+        XYZ vertex array ``(n, DIRECTIONAL_VERTEX_COUNT, 3)``
+    """
+    c = np.asarray(columns, dtype=np.float64).reshape(-1, len(DIRECTIONAL_COLUMNS))
+    pts = directional_points(c)
+    site_elev, H, h = c[:, 9], c[:, 10], c[:, 11]
+    levels = (site_elev, site_elev + H, site_elev + h)
+    if out is None:
+        out = np.empty((len(c), DIRECTIONAL_VERTEX_COUNT, 3), dtype=np.float64)
+    i = 0
+    for template in DIRECTIONAL_TEMPLATES:
+        for name, level in template.vertices:
+            out[:, i, 0:2] = pts[name]
+            out[:, i, 2] = levels[level]
+            i += 1
+    return out
+
+
+def omni_vertices(columns: np.ndarray, segments: int = OMNI_SEGMENTS,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Compute omni BRA rings as in ``build_layers_omni``.
+
+    Rings (each ``segments + 1`` closed vertices): inner cylinder top at
+    ``r``, cone mantle outer at ``R``, cone mantle hole at ``r`` (reversed),
+    turbine cylinder top at ``j`` (NaN unless ``turbine`` is set).
+
+    Args:
+        columns: Parameter matrix ``(n, 9)`` in :data:`OMNI_COLUMNS` order
+        segments: Vertices per full circle
+        out: Optional preallocated ``(n, 4 * (segments + 1), 3)`` array
+
+    Returns:
+        XYZ vertex array ``(n, 4 * (segments + 1), 3)``
+    """
+    c = np.asarray(columns, dtype=np.float64).reshape(-1, len(OMNI_COLUMNS))
+    n, ring = len(c), segments + 1
+    x, y, site_elev, r, alpha, R, j, h, turbine = (c[:, i] for i in range(9))
+    tan_alpha = np.tan(np.radians(alpha))
+
+    angles = 2.0 * np.pi * (np.arange(ring) % segments) / segments
+    cos_a, sin_a = np.cos(angles), np.sin(angles)
+    if out is None:
+        out = np.empty((n, OMNI_RING_COUNT * ring, 3), dtype=np.float64)
+
+    def circle(slot: int, radius: np.ndarray, z: np.ndarray, reverse: bool = False) -> None:
+        block = out[:, slot * ring:(slot + 1) * ring]
+        cs, sn = (cos_a[::-1], sin_a[::-1]) if reverse else (cos_a, sin_a)
+        block[:, :, 0] = x[:, None] + radius[:, None] * cs
+        block[:, :, 1] = y[:, None] + radius[:, None] * sn
+        block[:, :, 2] = z[:, None]
+
+    circle(0, r, site_elev + r * tan_alpha)
+    circle(1, R, site_elev + R * tan_alpha)
+    circle(2, r, site_elev + r * tan_alpha, reverse=True)
+    circle(3, j, site_elev + h)
+    out[turbine == 0, 3 * ring:] = np.nan
+    return out
+
+
+def linearize_arc(start: np.ndarray, mid: np.ndarray, end: np.ndarray, segments: int) -> np.ndarray:
+    """Densify a circular arc given by three points into ``segments + 1`` vertices.
+
+    Z is interpolated linearly along the arc.  Collinear control points
+    yield the straight polyline through them.
+
+    Args:
+        start, mid, end: XYZ control points of the arc
+        segments: Number of straight segments
+
+    Returns:
+        ``(segments + 1, 3)`` array from ``start`` to ``end``
+    """
+    (x1, y1), (x2, y2), (x3, y3) = start[:2], mid[:2], end[:2]
+    d = 2.0 * (x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2))
+    t = np.linspace(0.0, 1.0, segments + 1)
+    z = start[2] + (end[2] - start[2]) * t
+    if abs(d) < 1e-12:
+        half = segments // 2 or 1
+        xy = np.concatenate([
+            np.linspace(start[:2], mid[:2], half + 1)[:-1],
+            np.linspace(mid[:2], end[:2], segments - half + 1),
+        ])
+        return np.column_stack([xy, z])
+    s1, s2, s3 = x1 * x1 + y1 * y1, x2 * x2 + y2 * y2, x3 * x3 + y3 * y3
+    cx = (s1 * (y2 - y3) + s2 * (y3 - y1) + s3 * (y1 - y2)) / d
+    cy = (s1 * (x3 - x2) + s2 * (x1 - x3) + s3 * (x2 - x1)) / d
+    radius = np.hypot(x1 - cx, y1 - cy)
+    a1, a2, a3 = (np.arctan2(py - cy, px - cx) for px, py in ((x1, y1), (x2, y2), (x3, y3)))
+    # Sweep from a1 to a3 in the direction that passes through a2
+    sweep = (a3 - a1) % (2 * np.pi)
+    if (a2 - a1) % (2 * np.pi) > sweep:
+        sweep -= 2 * np.pi
+    angles = a1 + sweep * t
+    arc = np.column_stack([cx + radius * np.cos(angles), cy + radius * np.sin(angles), z])
+    # Pin the end points exactly so rings stay closed
+    arc[0, :2], arc[-1, :2] = start[:2], end[:2]
+    return arc
+
+
+def directional_rings(vertices: np.ndarray, arc_segments: int = OMNI_SEGMENTS // 4) -> List[np.ndarray]:
+    """Split one navaid's directional vertices into linear rings.
+
+    The slope's circular arc is densified with ``arc_segments`` segments.
+
+    Args:
+        vertices: ``(DIRECTIONAL_VERTEX_COUNT, 3)`` array of one navaid
+        arc_segments: Segments used for the slope arc
+
+    Returns:
+        One closed XYZ ring per template, in :data:`DIRECTIONAL_TEMPLATES` order
+    """
+    rings = []
+    for template, (start, stop) in zip(DIRECTIONAL_TEMPLATES, DIRECTIONAL_OFFSETS):
+        ring = vertices[start:stop]
+        if template.arc_start is not None:
+            i = template.arc_start
+            arc = linearize_arc(ring[i], ring[i + 1], ring[i + 2], arc_segments)
+            ring = np.concatenate([ring[:i], arc])
+        rings.append(ring)
+    return rings
+
+
+def omni_rings(vertices: np.ndarray, segments: int = OMNI_SEGMENTS) -> List[List[np.ndarray]]:
+    """Split one navaid's omni vertices into polygons (lists of rings).
+
+    Args:
+        vertices: ``(4 * (segments + 1), 3)`` array of one navaid
+        segments: Circle segmentation used for ``vertices``
+
+    Returns:
+        Rings per surface in :data:`OMNI_SURFACES` order; the turbine surface
+        is omitted when its ring is NaN (turbine mode off)
+    """
+    ring = segments + 1
+    polygons = []
+    for _id, _area, ring_ids in OMNI_SURFACES:
+        rings = [vertices[i * ring:(i + 1) * ring] for i in ring_ids]
+        if np.isnan(rings[0]).any():
+            continue
+        polygons.append(rings)
+    return polygons
@@ -0,0 +1,323 @@
+"""Triangulation of BRA surfaces into indexed meshes.
+
+QGIS-free helpers used by :mod:`qBRA.services.mesh_sink` to turn the XYZ
+rings of the geometry kernel (the ``(rings, properties, kind)`` features of
+:func:`qBRA.modules.batch.iter_features`) into one indexed triangle mesh:
+
+* every surface is triangulated once, in its own plane (the Newell normal
+  picks the projection, so vertical walls work like horizontal levels);
+  convex rings — all directional surfaces and omni circles — become a fan,
+  anything else is ear-clipped;
+* a polygon with a hole (the omni cone mantle) becomes a strip between the
+  outer ring and the hole, which must have the same vertex count;
+* vertices are shared by the triangles of a surface and stored once in a
+  ``float32`` buffer relative to a rounded origin (so projected metre
+  coordinates keep centimetre precision), indices in a ``uint32`` buffer.
+
+Curve segmentisation is decided where the rings are built
+(``arc_segments``/``segments`` of the kernel), not here.
+
+The plan-view helpers evaluate surfaces as height fields, for the terrain
+check, point queries and sweeps: triangles without plan area (vertical
+walls) are dropped, and a point is covered by a triangle when its
+barycentric weights in the XY plane are within ``[0, 1]`` (with a small
+tolerance, so points on shared edges are covered).
+
+Public API
+----------
+triangulate(rings) -> (vertices, triangles)
+plan_triangles(polygons) -> (t, 3, 3) XYZ triangles with plan area
+plan_frames(triangles) -> (origin, inverse, gradient)
+covers(weights) -> bool mask
+mesh_height(triangles, xs, ys) -> lowest covering height (NaN if uncovered)
+MeshBuilder.add(rings, properties, kind)
+MeshBuilder.build() -> Mesh
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from ..exceptions import BRAError
+
+#: Area (twice the signed area) below which a triangle is dropped as degenerate.
+_DEGENERATE = 1e-9
+
+#: Twice the plan area below which a triangle is treated as vertical.
+_FLAT = 1e-6
+
+#: Tolerance of the barycentric covering test (points on edges are covered).
+_EDGE = 1e-9
+
+
+@dataclass(frozen=True)
+class MeshPart:
+    """Triangle range of one BRA surface.
+
+    Attributes:
+        kind: Output kind (``"directional"`` or ``"omni"``)
+        properties: Attribute properties of the surface
+        first: Index of the first triangle of the surface
+        count: Number of triangles
+    """
+
+    kind: str
+    properties: Dict[str, Any]
+    first: int
+    count: int
+
+
+@dataclass
+class Mesh:
+    """Indexed triangle mesh of BRA surfaces.
+
+    Attributes:
+        origin: ``(3,)`` float64 offset added to every vertex
+        vertices: ``(V, 3)`` float32 XYZ relative to ``origin``
+        triangles: ``(T, 3)`` uint32 vertex indices
+        parts: Triangle range per surface, in insertion order
+    """
+
+    origin: np.ndarray
+    vertices: np.ndarray
+    triangles: np.ndarray
+    parts: List[MeshPart] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+
+def _open(ring: np.ndarray) -> np.ndarray:
+    """Drop the closing vertex of a closed ring."""
+    ring = np.asarray(ring, dtype=np.float64)
+    if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+        return ring[:-1]
+    return ring
+
+
+def _plane(points: np.ndarray) -> np.ndarray:
+    """Project a ring onto 2D by dropping the dominant axis of its Newell normal.
+
+    Returns an empty array when the ring has no area.
+    """
+    nxt = np.roll(points, -1, axis=0)
+    normal = np.array([
+        np.sum((points[:, 1] - nxt[:, 1]) * (points[:, 2] + nxt[:, 2])),
+        np.sum((points[:, 2] - nxt[:, 2]) * (points[:, 0] + nxt[:, 0])),
+        np.sum((points[:, 0] - nxt[:, 0]) * (points[:, 1] + nxt[:, 1])),
+    ])
+    if not np.any(np.abs(normal) > _DEGENERATE):
+        return np.empty((0, 2))
+    keep = [axis for axis in range(3) if axis != int(np.argmax(np.abs(normal)))]
+    return points[:, keep]
+
+
+def _cross(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Twice the signed area of the 2D triangles ``a, b, c``."""
+    return (b[..., 0] - a[..., 0]) * (c[..., 1] - a[..., 1]) - (b[..., 1] - a[..., 1]) * (c[..., 0] - a[..., 0])
+
+
+def _fan(count: int) -> np.ndarray:
+    i = np.arange(1, count - 1)
+    return np.column_stack([np.zeros_like(i), i, i + 1])
+
+
+def _ear_clip(xy: np.ndarray) -> np.ndarray:
+    """Triangulate a simple (possibly concave) 2D polygon by ear clipping."""
+    sign = 1.0 if np.sum(_cross(xy[0], xy[1:-1], xy[2:])) >= 0 else -1.0
+    remaining = list(range(len(xy)))
+    triangles = []
+    while len(remaining) > 3:
+        for k in range(len(remaining)):
+            a, b, c = remaining[k - 1], remaining[k], remaining[(k + 1) % len(remaining)]
+            if sign * _cross(xy[a], xy[b], xy[c]) <= _DEGENERATE:
+                continue
+            others = [i for i in remaining if i not in (a, b, c)]
+            if others:
+                p = xy[others]
+                inside = ((sign * _cross(xy[a], xy[b], p) >= 0)
+                          & (sign * _cross(xy[b], xy[c], p) >= 0)
+                          & (sign * _cross(xy[c], xy[a], p) >= 0))
+                if inside.any():
+                    continue
+            triangles.append((a, b, c))
+            del remaining[k]
+            break
+        else:
+            break  # no ear left: the rest is degenerate
+    if len(remaining) == 3:
+        triangles.append(tuple(remaining))
+    return np.array(triangles, dtype=np.int64).reshape(-1, 3)
+
+
+def _polygon(ring: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    points = _open(ring)
+    if len(points) < 3:
+        return points, np.empty((0, 3), dtype=np.int64)
+    xy = _plane(points)
+    if not len(xy):
+        return points, np.empty((0, 3), dtype=np.int64)
+    turns = _cross(np.roll(xy, 1, axis=0), xy, np.roll(xy, -1, axis=0))
+    if np.all(turns >= -_DEGENERATE) or np.all(turns <= _DEGENERATE):
+        triangles = _fan(len(points))
+    else:
+        triangles = _ear_clip(xy)
+    area = _cross(xy[triangles[:, 0]], xy[triangles[:, 1]], xy[triangles[:, 2]])
+    return points, triangles[np.abs(area) > _DEGENERATE]
+
+
+def _strip(outer: np.ndarray, hole: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    outer, inner = _open(outer), _open(np.asarray(hole)[::-1])
+    count = len(outer)
+    if len(inner) != count:
+        raise BRAError(
+            "Cannot triangulate polygon hole",
+            f"the hole needs as many vertices as the exterior ({len(inner)} != {count})",
+        )
+    i = np.arange(count)
+    j = (i + 1) % count
+    triangles = np.concatenate([
+        np.column_stack([i, j, j + count]),
+        np.column_stack([i, j + count, i + count]),
+    ])
+    return np.concatenate([outer, inner]), triangles
+
+
+def triangulate(rings: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Triangulate one BRA surface.
+
+    Args:
+        rings: Closed XYZ rings, exterior first; at most one hole, with as
+            many vertices as the exterior (as the kernel builds the cone mantle)
+
+    Returns:
+        ``(vertices (k, 3) float64, triangles (t, 3) int64)``; degenerate
+        triangles (e.g. walls of zero height) are dropped
+
+    Raises:
+        BRAError: More than one hole or a hole of a different vertex count
+    """
+    if len(rings) == 1:
+        return _polygon(rings[0])
+    if len(rings) == 2:
+        return _strip(rings[0], rings[1])
+    raise BRAError("Cannot triangulate polygon", f"{len(rings) - 1} holes (at most one is supported)")
+
+
+def plan_triangles(polygons: Iterable[Sequence[np.ndarray]]) -> np.ndarray:
+    """Triangulate the polygons of one surface and keep the triangles with plan area.
+
+    Polygons with NaN vertices are skipped.
+
+    Args:
+        polygons: Rings of each polygon, exterior first (see :func:`triangulate`)
+
+    Returns:
+        ``(t, 3, 3)`` XYZ corners of the triangles
+
+    Raises:
+        BRAError: If a polygon cannot be triangulated
+    """
+    parts = []
+    for rings in polygons:
+        rings = [np.asarray(ring, dtype=np.float64) for ring in rings]
+        if any(np.isnan(ring).any() for ring in rings):
+            continue
+        vertices, triangles = triangulate(rings)
+        parts.append(vertices[triangles])
+    tri = np.concatenate(parts) if parts else np.empty((0, 3, 3))
+    u, v = tri[:, 1, :2] - tri[:, 0, :2], tri[:, 2, :2] - tri[:, 0, :2]
+    return tri[np.abs(u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0]) > _FLAT]
+
+
+def plan_frames(triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Precompute the plan-view frame of each triangle.
+
+    The barycentric weights of a point ``p`` are ``inverse @ (p - origin[:2])``
+    and its height on the triangle ``origin[2] + gradient @ weights``.
+
+    Args:
+        triangles: ``(t, 3, 3)`` XYZ corners with plan area
+
+    Returns:
+        ``(origin (t, 3), inverse (t, 2, 2), gradient (t, 2))``
+    """
+    tri = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    edges = np.swapaxes(tri[:, 1:, :2] - tri[:, :1, :2], 1, 2)
+    inverse = np.linalg.inv(edges) if len(tri) else np.empty((0, 2, 2))
+    return tri[:, 0], inverse, tri[:, 1:, 2] - tri[:, :1, 2]
+
+
+def covers(weights: np.ndarray) -> np.ndarray:
+    """Covering test on barycentric weights ``(..., 2)`` (edges included)."""
+    return (weights >= -_EDGE).all(axis=-1) & (weights.sum(axis=-1) <= 1.0 + _EDGE)
+
+
+def mesh_height(triangles: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Lowest height of the covering triangles at broadcastable coordinates.
+
+    Args:
+        triangles: ``(t, 3, 3)`` XYZ corners with plan area
+        xs: X coordinates
+        ys: Y coordinates
+
+    Returns:
+        Heights, NaN where no triangle covers the point
+    """
+    gx, gy = np.broadcast_arrays(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64))
+    out = np.full(gx.shape, np.inf)
+    for origin, inverse, gradient in zip(*plan_frames(triangles)):
+        dx, dy = gx - origin[0], gy - origin[1]
+        weights = np.stack(
+            [inverse[0, 0] * dx + inverse[0, 1] * dy, inverse[1, 0] * dx + inverse[1, 1] * dy], axis=-1
+        )
+        heights = origin[2] + weights @ gradient
+        np.minimum(out, np.where(covers(weights), heights, np.inf), out=out)
+    out[np.isinf(out)] = np.nan
+    return out
+
+
+class MeshBuilder:
+    """Collect triangulated BRA surfaces into one indexed mesh."""
+
+    def __init__(self) -> None:
+        self._vertices: List[np.ndarray] = []
+        self._triangles: List[np.ndarray] = []
+        self._parts: List[MeshPart] = []
+        self._vertex_count = 0
+        self._triangle_count = 0
+
+    def __len__(self) -> int:
+        """Number of surfaces added."""
+        return len(self._parts)
+
+    def add(self, rings: Sequence[np.ndarray], properties: Dict[str, Any], kind: str) -> None:
+        """Triangulate and add one surface (rings containing NaN are skipped).
+
+        Args:
+            rings: Closed XYZ rings, exterior first (see :func:`triangulate`)
+            properties: Attribute properties of the surface
+            kind: Output kind
+        """
+        if any(np.isnan(ring).any() for ring in rings):
+            return
+        vertices, triangles = triangulate(rings)
+        self._vertices.append(vertices)
+        self._triangles.append(triangles + self._vertex_count)
+        self._parts.append(MeshPart(kind, dict(properties), self._triangle_count, len(triangles)))
+        self._vertex_count += len(vertices)
+        self._triangle_count += len(triangles)
+
+    def build(self) -> Mesh:
+        """Return the mesh of all surfaces added so far."""
+        if not self._parts:
+            return Mesh(np.zeros(3), np.empty((0, 3), np.float32), np.empty((0, 3), np.uint32))
+        vertices = np.concatenate(self._vertices)
+        origin = np.round((vertices.min(axis=0) + vertices.max(axis=0)) / 2.0)
+        return Mesh(
+            origin=origin,
+            vertices=(vertices - origin).astype(np.float32),
+            triangles=np.concatenate(self._triangles).astype(np.uint32),
+            parts=list(self._parts),
+        )
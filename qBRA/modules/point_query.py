@@ -0,0 +1,275 @@
+"""Point queries over BRA surfaces: which BRAs cover a point, and how high.
+
+A :class:`SurfaceIndex` holds the BRA surfaces of any number of groups
+(the plugin uses one group per BRA layer) as XY triangles with their
+heights:
+
+* every surface is triangulated once with
+  :func:`~qBRA.modules.mesh.plan_triangles`; triangles without plan area
+  (the vertical walls of directional BRAs) are dropped, as they cannot
+  cover a point;
+* per triangle, the inverse of its XY edge matrix and the height gradient
+  are precomputed (:func:`~qBRA.modules.mesh.plan_frames`), so the
+  covering test and the interpolated height of a point are one vectorised
+  step over the candidate triangles;
+* the triangle boxes are bulk-loaded into a :class:`PackedRTree`, rebuilt
+  lazily on the first query after groups were added or removed.
+
+The limiting height at a point is the lowest height of the covering
+surfaces.  The module is QGIS-free.
+
+Usage
+-----
+    index = SurfaceIndex()
+    index.add("layer-id", [(("layer-id", fid), properties, rings), ...])
+    result = index.query(x, y)
+    result.limit, [hit.properties["area"] for hit in result.hits]
+
+Public API
+----------
+PackedRTree(boxes, capacity).query_point(x, y) -> ndarray
+SurfaceHit, PointQueryResult
+SurfaceIndex.add(group, surfaces) / remove(group) / query(x, y) -> PointQueryResult
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..constants import QUERY_NODE_CAPACITY
+from .mesh import covers, plan_frames, plan_triangles
+
+Surface = Tuple[Hashable, Dict[str, Any], Sequence[Sequence[np.ndarray]]]
+
+
+class PackedRTree:
+    """Static R-tree over 2D boxes, bulk-loaded by Sort-Tile-Recursive.
+
+    Leaves hold the boxes in STR order (vertical slabs by x, sorted by y
+    within a slab); every upper level groups ``capacity`` consecutive nodes
+    of the level below, so children are found by index arithmetic and each
+    level is searched in one vectorised step.
+    """
+
+    def __init__(self, boxes: np.ndarray, capacity: int = QUERY_NODE_CAPACITY) -> None:
+        """Build the tree.
+
+        Args:
+            boxes: ``(n, 4)`` array of ``(xmin, ymin, xmax, ymax)``
+            capacity: Children per node
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self._capacity = capacity
+        self._order = self._str_order(boxes)
+        level = boxes[self._order]
+        levels = [level]
+        while len(level) > 1:
+            starts = np.arange(0, len(level), capacity)
+            level = np.column_stack([
+                np.minimum.reduceat(level[:, 0], starts),
+                np.minimum.reduceat(level[:, 1], starts),
+                np.maximum.reduceat(level[:, 2], starts),
+                np.maximum.reduceat(level[:, 3], starts),
+            ])
+            levels.append(level)
+        self._levels = levels[::-1]
+
+    def __len__(self) -> int:
+        """Return the number of indexed boxes."""
+        return len(self._order)
+
+    def _str_order(self, boxes: np.ndarray) -> np.ndarray:
+        count = len(boxes)
+        if not count:
+            return np.empty(0, dtype=np.int64)
+        cx = boxes[:, 0] + boxes[:, 2]
+        cy = boxes[:, 1] + boxes[:, 3]
+        slab = self._capacity * int(np.ceil(np.sqrt(count / self._capacity)))
+        by_x = np.argsort(cx, kind="stable")
+        slabs = np.arange(count) // slab
+        # Within each x slab, order by y
+        return by_x[np.lexsort((cy[by_x], slabs))]
+
+    def query_point(self, x: float, y: float) -> np.ndarray:
+        """Return the indices (into ``boxes``) of the boxes containing a point."""
+        if not len(self._order):
+            return np.empty(0, dtype=np.int64)
+        nodes = np.arange(len(self._levels[0]))
+        last = len(self._levels) - 1
+        for depth, level in enumerate(self._levels):
+            b = level[nodes]
+            nodes = nodes[(b[:, 0] <= x) & (b[:, 1] <= y) & (b[:, 2] >= x) & (b[:, 3] >= y)]
+            if depth == last or not len(nodes):
+                break
+            children = (nodes[:, None] * self._capacity + np.arange(self._capacity)).ravel()
+            nodes = children[children < len(self._levels[depth + 1])]
+        return self._order[nodes]
+
+
+@dataclass(frozen=True)
+class SurfaceHit:
+    """One BRA surface covering the queried point.
+
+    Attributes:
+        key: Surface key given to :meth:`SurfaceIndex.add` (e.g. ``(layer id, fid)``)
+        properties: Attribute properties of the surface
+        height: Surface height at the point
+    """
+
+    key: Hashable
+    properties: Dict[str, Any]
+    height: float
+
+
+@dataclass
+class PointQueryResult:
+    """Covering BRA surfaces of a point, lowest first."""
+
+    x: float
+    y: float
+    hits: List[SurfaceHit] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.hits)
+
+    @property
+    def limit(self) -> Optional[float]:
+        """Limiting (lowest) surface height at the point, or None if uncovered."""
+        return self.hits[0].height if self.hits else None
+
+
+@dataclass
+class _Triangles:
+    """Plan triangles of the surfaces of one group."""
+
+    keys: List[Hashable]
+    properties: List[Dict[str, Any]]
+    surface: np.ndarray   # (t,) surface index within the group
+    origin: np.ndarray    # (t, 3) first vertex
+    inverse: np.ndarray   # (t, 2, 2) inverse XY edge matrix
+    gradient: np.ndarray  # (t, 2) height change along both edges
+    boxes: np.ndarray     # (t, 4)
+
+
+def _triangles(surfaces: Iterable[Surface]) -> _Triangles:
+    keys: List[Hashable] = []
+    properties: List[Dict[str, Any]] = []
+    corners: List[np.ndarray] = []
+    owners: List[np.ndarray] = []
+    for key, props, polygons in surfaces:
+        tri = plan_triangles(polygons)
+        if not len(tri):
+            continue
+        corners.append(tri)
+        owners.append(np.full(len(tri), len(keys)))
+        keys.append(key)
+        properties.append(dict(props))
+    tri = np.concatenate(corners) if corners else np.empty((0, 3, 3))
+    origin, inverse, gradient = plan_frames(tri)
+    return _Triangles(
+        keys=keys,
+        properties=properties,
+        surface=np.concatenate(owners) if owners else np.empty(0, dtype=np.int64),
+        origin=origin,
+        inverse=inverse,
+        gradient=gradient,
+        boxes=np.column_stack([tri[:, :, :2].min(axis=1), tri[:, :, :2].max(axis=1)]),
+    )
+
+
+class SurfaceIndex:
+    """BRA surfaces of several groups, searchable by point."""
+
+    def __init__(self, capacity: int = QUERY_NODE_CAPACITY) -> None:
+        """Initialise an empty index.
+
+        Args:
+            capacity: Children per R-tree node
+        """
+        self._capacity = capacity
+        self._groups: Dict[Hashable, _Triangles] = {}
+        self._merged: Optional[_Triangles] = None
+        self._tree: Optional[PackedRTree] = None
+
+    def __len__(self) -> int:
+        """Return the number of indexed surfaces."""
+        return sum(len(group.keys) for group in self._groups.values())
+
+    def __contains__(self, group: object) -> bool:
+        return group in self._groups
+
+    @property
+    def groups(self) -> List[Hashable]:
+        """Indexed groups, in insertion order."""
+        return list(self._groups)
+
+    def add(self, group: Hashable, surfaces: Iterable[Surface]) -> int:
+        """Index the surfaces of a group, replacing any earlier ones.
+
+        Args:
+            group: Group key (e.g. a layer id)
+            surfaces: ``(key, properties, polygons)`` per surface; ``polygons``
+                is a list of polygons, each a list of closed XYZ rings
+                (exterior first)
+
+        Returns:
+            Number of surfaces indexed (surfaces without plan area are skipped)
+        """
+        self._groups[group] = _triangles(surfaces)
+        self._tree = None
+        return len(self._groups[group].keys)
+
+    def remove(self, group: Hashable) -> bool:
+        """Drop the surfaces of a group; returns False if it was not indexed."""
+        if self._groups.pop(group, None) is None:
+            return False
+        self._tree = None
+        return True
+
+    def clear(self) -> None:
+        """Drop every group."""
+        self._groups.clear()
+        self._tree = None
+
+    def _build(self) -> None:
+        groups = [_triangles([])] + list(self._groups.values())
+        offsets = np.cumsum([0] + [len(g.keys) for g in groups])
+        self._merged = _Triangles(
+            keys=[key for g in groups for key in g.keys],
+            properties=[props for g in groups for props in g.properties],
+            surface=np.concatenate([g.surface + offset for g, offset in zip(groups, offsets)]),
+            origin=np.concatenate([g.origin for g in groups]),
+            inverse=np.concatenate([g.inverse for g in groups]),
+            gradient=np.concatenate([g.gradient for g in groups]),
+            boxes=np.concatenate([g.boxes for g in groups]),
+        )
+        self._tree = PackedRTree(self._merged.boxes, self._capacity)
+
+    def query(self, x: float, y: float) -> PointQueryResult:
+        """Return the surfaces covering ``(x, y)`` and their heights there.
+
+        A surface is reported once, at the lowest height of its triangles
+        containing the point; hits are sorted by height.
+        """
+        if self._tree is None:
+            self._build()
+        merged = self._merged
+        candidates = self._tree.query_point(x, y)
+        result = PointQueryResult(x, y)
+        if not len(candidates):
+            return result
+        offset = np.array([x, y]) - merged.origin[candidates, :2]
+        weights = np.einsum("tij,tj->ti", merged.inverse[candidates], offset)
+        inside = covers(weights)
+        candidates, weights = candidates[inside], weights[inside]
+        heights = merged.origin[candidates, 2] + np.einsum("ti,ti->t", merged.gradient[candidates], weights)
+        lowest: Dict[int, float] = {}
+        for surface, height in zip(merged.surface[candidates].tolist(), heights.tolist()):
+            if surface not in lowest or height < lowest[surface]:
+                lowest[surface] = height
+        result.hits = sorted(
+            (SurfaceHit(merged.keys[s], merged.properties[s], h) for s, h in lowest.items()),
+            key=lambda hit: hit.height,
+        )
+        return result
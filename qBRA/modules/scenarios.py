@@ -0,0 +1,154 @@
+"""Multi-scenario directional BRAs of one navaid.
+
+A scenario is one (facility key × routing direction) combination.  For a
+selected navaid and routing line, :func:`expand_scenarios` derives the
+parameters of every requested scenario:
+
+* the azimuth and the navaid-to-threshold distance are computed once per
+  direction and shared by every facility;
+* the facility of the base parameters keeps the values entered in the dock
+  (``a``/``r`` re-derived for the other direction where the facility
+  measures ``a`` from the threshold); other facilities take their
+  :data:`FACILITY_REGISTRY` defaults.
+
+:func:`scenario_surfaces` computes all scenarios in one vectorised kernel
+call and encodes every surface as WKB with its attribute row tagged with
+the scenario (:data:`~qBRA.modules.attributes.SCENARIO_FIELDS`).  The module
+is QGIS-free.
+
+Public API
+----------
+SCENARIO_DIRECTIONS
+expand_scenarios(params, navaid_xy, routing_points, facility_keys, directions) -> List[BRAParameters]
+scenario_surfaces(scenarios, navaid_xy, arc_segments) -> tuple
+"""
+
+from dataclasses import replace
+from math import hypot
+from typing import Any, Dict, List, Sequence, Tuple
+
+from ..config import FACILITY_REGISTRY
+from ..constants import OMNI_SEGMENTS
+from ..exceptions import BRAValidationError
+from ..models.bra_parameters import BRAParameters
+from .attributes import scenario_values
+from .kernel import (
+    DIRECTIONAL_TEMPLATES,
+    LEVEL_SIDE,
+    LEVEL_SITE,
+    LEVEL_TOP,
+    directional_columns,
+    directional_rings,
+    directional_row,
+    directional_vertices,
+    routing_azimuth,
+)
+from .wkb import WkbEncoder
+
+#: Routing directions, in output order.
+SCENARIO_DIRECTIONS: Tuple[str, ...] = ("forward", "backward")
+
+
+def expand_scenarios(
+    params: BRAParameters,
+    navaid_xy: Tuple[float, float],
+    routing_points: Sequence[Any],
+    facility_keys: Sequence[str],
+    directions: Sequence[str],
+) -> List[BRAParameters]:
+    """Derive the parameters of every (facility key × direction) scenario.
+
+    Args:
+        params: Parameters of the current dock calculation (base scenario)
+        navaid_xy: Navaid position
+        routing_points: Routing polyline vertices (objects with ``x()``/``y()``)
+        facility_keys: Directional facility keys, in output order
+        directions: Routing directions (``"forward"``/``"backward"``)
+
+    Returns:
+        Validated parameters per scenario, grouped by facility
+
+    Raises:
+        BRAValidationError: If no scenario is requested or a key/direction is unknown
+        BRACalculationError: If the routing line has fewer than 2 vertices
+    """
+    keys = list(dict.fromkeys(facility_keys))
+    directions = [d for d in SCENARIO_DIRECTIONS if d in directions]
+    if not keys or not directions:
+        raise BRAValidationError("No scenario selected", "Pick at least one facility and one direction")
+    unknown = [key for key in keys if key not in FACILITY_REGISTRY]
+    if unknown:
+        raise BRAValidationError("Unknown directional facility", f"facility={unknown[0]!r}")
+
+    # Shared by every facility: azimuth and threshold distance per direction
+    x, y = navaid_xy
+    geometry: Dict[str, Tuple[float, float]] = {}
+    for direction in directions:
+        pick = routing_points[0] if direction == "forward" else routing_points[-1]
+        geometry[direction] = (routing_azimuth(routing_points, direction), hypot(pick.x() - x, pick.y() - y))
+
+    scenarios = []
+    for key in keys:
+        facility = FACILITY_REGISTRY[key]
+        for direction in directions:
+            azimuth, threshold = geometry[direction]
+            if key == params.facility_key:
+                if direction == params.direction:
+                    scenarios.append(params)
+                    continue
+                a, r = params.a, params.r
+                if facility.a_depends_on_threshold:
+                    a, r = threshold, facility.derived_r(threshold, r)
+                scenarios.append(replace(params, azimuth=azimuth, direction=direction, a=a, r=r))
+                continue
+            defaults = facility.defaults
+            a = threshold if facility.a_depends_on_threshold else defaults.a
+            scenarios.append(replace(
+                params,
+                azimuth=azimuth,
+                direction=direction,
+                a=a,
+                r=defaults.r if defaults.r is not None else facility.derived_r(a),
+                b=defaults.b,
+                h=defaults.h,
+                D=defaults.D,
+                H=defaults.H,
+                L=defaults.L,
+                phi=defaults.phi,
+                facility_key=key,
+                facility_label=facility.label,
+                display_name=f"{params.remark} - {facility.label}",
+            ))
+    return scenarios
+
+
+def scenario_surfaces(
+    scenarios: Sequence[BRAParameters],
+    navaid_xy: Tuple[float, float],
+    arc_segments: int = OMNI_SEGMENTS // 4,
+) -> Tuple[Tuple[Tuple[Any, ...], bytes], ...]:
+    """Compute the surfaces of every scenario in one kernel call.
+
+    Args:
+        scenarios: Parameters per scenario (see :func:`expand_scenarios`)
+        navaid_xy: Navaid position
+        arc_segments: Segments per slope arc
+
+    Returns:
+        ``(SCENARIO_FIELDS values, WKB bytes)`` per surface, seven per scenario
+    """
+    x, y = navaid_xy
+    vertices = directional_vertices(directional_columns(directional_row(p, x, y) for p in scenarios))
+    encoder = WkbEncoder()
+    surfaces = []
+    for params, navaid_vertices in zip(scenarios, vertices):
+        levels = {
+            LEVEL_SITE: params.site_elev,
+            LEVEL_SIDE: params.site_elev + params.H,
+            LEVEL_TOP: params.site_elev + params.h,
+        }
+        values = scenario_values(params)
+        for template, ring in zip(DIRECTIONAL_TEMPLATES, directional_rings(navaid_vertices, arc_segments)):
+            leading = (template.id, template.area, str(levels[template.level]))
+            surfaces.append((leading + values, bytes(encoder.polygon_z([ring]))))
+    return tuple(surfaces)
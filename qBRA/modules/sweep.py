@@ -0,0 +1,467 @@
+"""Parameter sweeps (sensitivity studies) over BRA parameters.
+
+A sweep takes a list of values for one or more parameters, e.g.
+``{"phi": (20, 25, 30), "L": (1500, 1900, 2300)}``, and evaluates every
+combination for every navaid.  All variants of one output kind go through a
+single vectorised kernel call; the per-variant metrics are computed on the
+resulting arrays without building rings or features:
+
+* ``area`` — horizontal footprint area (walls have none; the slope arc and
+  omni circles are segmented as in the materialised geometry);
+* ``xmin``/``ymin``/``xmax``/``ymax`` — footprint extent;
+* ``obstacles`` — obstacle points inside the footprint;
+* ``penetrations`` — obstacles whose top exceeds the surface above them.
+
+Directional surface heights: base at site level, level surfaces at
+``site_elev + H``, slope on the triangulated kernel ring
+(:func:`~qBRA.modules.mesh.mesh_height`, as in point queries and the
+terrain check), rising from the threshold edge to ``site_elev + h`` on the
+arc.  Omni checks follow
+:mod:`qBRA.modules.turbine_screening` (inner cylinder, cone, turbine
+cylinder).  Geometry is only built on request via
+:meth:`SweepResult.features`.  The module is QGIS-free.
+
+Public API
+----------
+SWEEP_PARAMETERS, parse_values(text), parse_sweep(items) -> grid
+Obstacles, SweepResult
+sweep(navaids, kind, grid, obstacles, arc_segments, segments) -> SweepResult
+"""
+
+import itertools
+import math
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..constants import OMNI_SEGMENTS, OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI, SWEEP_MAX_VARIANTS
+from ..exceptions import BRAValidationError
+from ..workers.process_backend import ProcessPoolBackend
+from .batch import Feature, Navaid, iter_features
+from .kernel import (
+    DIRECTIONAL_TEMPLATES,
+    LEVEL_SIDE,
+    LEVEL_SITE,
+    directional_columns,
+    directional_points,
+    directional_rings,
+    directional_row,
+    directional_vertices,
+)
+from .mesh import mesh_height, plan_triangles
+
+#: Parameters that can be swept, per output kind.
+SWEEP_PARAMETERS: Dict[str, Tuple[str, ...]] = {
+    OUTPUT_KIND_DIRECTIONAL: ("a", "b", "h", "r", "D", "H", "L", "phi"),
+    OUTPUT_KIND_OMNI: ("r", "alpha", "R", "j", "h"),
+}
+
+#: Sweep values per parameter name.
+Grid = Dict[str, Tuple[float, ...]]
+
+#: Function of (variant rows, x ``(1, m)``, y ``(1, m)``) -> ``(rows, m)`` array.
+PointFunction = Callable[[slice, np.ndarray, np.ndarray], np.ndarray]
+
+#: Metric columns of :meth:`SweepResult.rows`, after the swept parameters.
+METRIC_COLUMNS: Tuple[str, ...] = ("area", "xmin", "ymin", "xmax", "ymax", "obstacles", "penetrations")
+
+# Directional surfaces with a horizontal footprint (the walls are vertical)
+_FOOTPRINT_TEMPLATES = tuple(t for t in DIRECTIONAL_TEMPLATES if t.area != "wall")
+
+
+def parse_values(text: str) -> Tuple[float, ...]:
+    """Parse sweep values: ``"20,25,30"`` (list) or ``"1500:2300:200"`` (inclusive range).
+
+    Raises:
+        ValueError: If the text is not a list of numbers or a valid range
+    """
+    text = text.strip()
+    if ":" in text:
+        parts = [float(p) for p in text.split(":")]
+        if len(parts) != 3:
+            raise ValueError(f"Range must be start:stop:step, got {text!r}")
+        start, stop, step = parts
+        if step <= 0 or stop < start:
+            raise ValueError(f"Range needs step > 0 and stop >= start, got {text!r}")
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        return tuple(float(v) for v in np.round(start + step * np.arange(count), 9))
+    values = tuple(float(p) for p in text.split(",") if p.strip())
+    if not values:
+        raise ValueError("Sweep needs at least one value")
+    return values
+
+
+def parse_sweep(items: Sequence[str]) -> Grid:
+    """Parse ``NAME=VALUES`` items (see :func:`parse_values`) into a grid.
+
+    Raises:
+        BRAValidationError: If an item is malformed or names an unknown parameter
+    """
+    known = set(itertools.chain.from_iterable(SWEEP_PARAMETERS.values()))
+    grid: Grid = {}
+    for item in items:
+        name, sep, values = item.partition("=")
+        name = name.strip()
+        if not sep or name not in known:
+            raise BRAValidationError(
+                "Invalid sweep parameter", f"{item!r} (expected NAME=VALUES, NAME one of {sorted(known)})"
+            )
+        try:
+            grid[name] = parse_values(values)
+        except ValueError as e:
+            raise BRAValidationError("Invalid sweep values", f"{name}: {e}") from e
+    return grid
+
+
+def applies_to(kind: str, grid: Mapping[str, Any]) -> bool:
+    """Return True if every swept parameter exists for the output kind."""
+    return bool(grid) and set(grid) <= set(SWEEP_PARAMETERS[kind])
+
+
+@dataclass(frozen=True)
+class Obstacles:
+    """Obstacle points as parallel arrays.
+
+    ``top`` is the elevation of the obstacle top on the datum of
+    ``site_elev``; NaN (or no array at all) counts the obstacle as inside
+    the footprint but never as a penetration.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+    top: Optional[np.ndarray] = None
+
+    def __post_init__(self) -> None:
+        """Coerce to float arrays and check lengths."""
+        x, y = np.asarray(self.x, dtype=np.float64), np.asarray(self.y, dtype=np.float64)
+        top = np.full(len(x), np.nan) if self.top is None else np.asarray(self.top, dtype=np.float64)
+        if not (len(x) == len(y) == len(top)):
+            raise ValueError("Obstacle arrays must have equal length")
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "top", top)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+
+@dataclass
+class SweepResult:
+    """Metrics of every valid variant of one output kind.
+
+    Attributes:
+        kind: Output kind
+        names: Swept parameter names, in grid order
+        variants: (parameters, position, navaid id) per valid variant,
+            grouped by navaid
+        values: Swept values per variant ``(n, len(names))``
+        combination: Grid combination index per variant
+        area: Footprint area per variant
+        extent: (xmin, ymin, xmax, ymax) per variant ``(n, 4)``
+        obstacles: Obstacles inside the footprint per variant
+        penetrations: Obstacles above the surface per variant
+        invalid: (navaid id, values, error) of rejected combinations
+    """
+
+    kind: str
+    names: Tuple[str, ...]
+    variants: List[Navaid]
+    values: np.ndarray
+    combination: np.ndarray
+    area: np.ndarray
+    extent: np.ndarray
+    obstacles: np.ndarray
+    penetrations: np.ndarray
+    invalid: List[Tuple[Any, Dict[str, float], str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.variants)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Return the result table, one dict per variant.
+
+        ``variant`` is the index of the combination in the grid, so rows of
+        different navaids with equal values share it.
+        """
+        rows = []
+        for i, (params, _xy, navaid_id) in enumerate(self.variants):
+            row: Dict[str, Any] = {
+                "navaid_id": navaid_id,
+                "facility_key": params.facility_key,
+                "kind": self.kind,
+                "variant": int(self.combination[i]),
+            }
+            row.update(zip(self.names, self.values[i].tolist()))
+            row["area"] = float(self.area[i])
+            row.update(zip(("xmin", "ymin", "xmax", "ymax"), self.extent[i].tolist()))
+            row["obstacles"] = int(self.obstacles[i])
+            row["penetrations"] = int(self.penetrations[i])
+            rows.append(row)
+        return rows
+
+    def features(
+        self,
+        indices: Optional[Sequence[int]] = None,
+        backend: Any = None,
+        arc_segments: int = OMNI_SEGMENTS // 4,
+        segments: int = OMNI_SEGMENTS,
+    ) -> Iterator[Feature]:
+        """Materialise the geometry of selected variants.
+
+        Args:
+            indices: Variant indices (all variants if None)
+            backend: Kernel backend (defaults to an in-process ProcessPoolBackend)
+            arc_segments: Segments per directional slope arc
+            segments: Segments per omni circle
+
+        Yields:
+            ``(rings, properties, kind)`` with the combination index as ``variant``
+        """
+        picked = list(range(len(self.variants))) if indices is None else list(indices)
+        backend = backend if backend is not None else ProcessPoolBackend(max_workers=1)
+        # Navaid ids of the features are replaced by variant indices so every
+        # feature can be traced back to its row
+        navaids = [(self.variants[i][0], self.variants[i][1], i) for i in picked]
+        directional = navaids if self.kind == OUTPUT_KIND_DIRECTIONAL else []
+        omni = navaids if self.kind == OUTPUT_KIND_OMNI else []
+        for rings, properties, kind in iter_features(directional, omni, backend, arc_segments, segments):
+            index = properties["navaid_id"]
+            properties["navaid_id"] = self.variants[index][2]
+            properties["variant"] = int(self.combination[index])
+            yield rings, properties, kind
+
+
+def expand(navaids: Sequence[Navaid], grid: Mapping[str, Sequence[float]]) -> Tuple[
+    List[Navaid], List[int], List[Tuple[Any, Dict[str, float], str]]
+]:
+    """Build the validated parameters of every combination for every navaid.
+
+    Returns:
+        (valid variants, their combination indices, rejected combinations)
+
+    Raises:
+        BRAValidationError: If the grid has more than ``SWEEP_MAX_VARIANTS`` combinations
+    """
+    names = tuple(grid)
+    combinations = list(itertools.product(*(grid[name] for name in names)))
+    if len(combinations) > SWEEP_MAX_VARIANTS:
+        raise BRAValidationError(
+            "Too many sweep variants", f"{len(combinations)} per navaid (limit {SWEEP_MAX_VARIANTS})"
+        )
+    variants: List[Navaid] = []
+    indices: List[int] = []
+    invalid: List[Tuple[Any, Dict[str, float], str]] = []
+    for params, xy, navaid_id in navaids:
+        turbine = getattr(params, "turbine", True)
+        for index, combination in enumerate(combinations):
+            changes = dict(zip(names, combination))
+            try:
+                if not turbine and ("j" in changes or "h" in changes):
+                    raise ValueError("j and h only apply with the turbine cylinder")
+                variants.append((replace(params, **changes), xy, navaid_id))
+                indices.append(index)
+            except ValueError as e:
+                invalid.append((navaid_id, changes, str(e)))
+    return variants, indices, invalid
+
+
+def sweep(
+    navaids: Sequence[Navaid],
+    kind: str,
+    grid: Mapping[str, Sequence[float]],
+    obstacles: Optional[Obstacles] = None,
+    arc_segments: int = OMNI_SEGMENTS // 4,
+    segments: int = OMNI_SEGMENTS,
+) -> SweepResult:
+    """Evaluate every grid combination for navaids of one output kind.
+
+    Args:
+        navaids: Resolved navaids of ``kind`` (see ``resolve_records``)
+        kind: Output kind
+        grid: Values per swept parameter
+        obstacles: Obstacles to count (none if None)
+        arc_segments: Segments per directional slope arc (area and extent)
+        segments: Segments per omni circle (area)
+
+    Raises:
+        BRAValidationError: If a swept parameter does not exist for ``kind``
+    """
+    if not applies_to(kind, grid):
+        raise BRAValidationError(
+            "Sweep parameters do not apply to this output kind",
+            f"{kind}: {sorted(grid)} (allowed {list(SWEEP_PARAMETERS[kind])})",
+        )
+    names = tuple(grid)
+    variants, indices, invalid = expand(navaids, grid)
+    n = len(variants)
+    combination = np.array(indices, dtype=np.int64)
+    values = np.array(list(itertools.product(*(grid[name] for name in names))), dtype=np.float64)
+    values = values.reshape(-1, len(names))[combination]
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return SweepResult(kind, names, [], values, combination, np.empty(0), np.empty((0, 4)),
+                           empty, empty, invalid)
+
+    if kind == OUTPUT_KIND_DIRECTIONAL:
+        surfaces = _directional_surfaces(variants, arc_segments)
+    else:
+        surfaces = _omni_surfaces(variants, segments)
+    area = sum((_polygon_area(surface.ring) for surface in surfaces), np.zeros(n))
+    stacked = np.concatenate([surface.ring for surface in surfaces], axis=1)
+    extent = np.column_stack([stacked[:, :, 0].min(axis=1), stacked[:, :, 1].min(axis=1),
+                              stacked[:, :, 0].max(axis=1), stacked[:, :, 1].max(axis=1)])
+
+    inside = np.zeros(n, dtype=np.int64)
+    above = np.zeros(n, dtype=np.int64)
+    if obstacles is not None and len(obstacles):
+        for group in _navaid_groups(variants):
+            inside[group], above[group] = _count_obstacles(surfaces, extent, group, obstacles)
+    return SweepResult(kind, names, variants, values, combination, area, extent, inside, above, invalid)
+
+
+def _navaid_groups(variants: Sequence[Navaid]) -> List[slice]:
+    """Slices of consecutive variants belonging to the same navaid."""
+    groups, start = [], 0
+    for i in range(1, len(variants) + 1):
+        if i == len(variants) or variants[i][2] != variants[start][2] or variants[i][1] != variants[start][1]:
+            groups.append(slice(start, i))
+            start = i
+    return groups
+
+
+class _Surface(NamedTuple):
+    """Footprint part of all variants.
+
+    Attributes:
+        ring: Open XY ring per variant ``(n, k, 2)``
+        covers: Point coverage test
+        limit: Surface height at the points
+    """
+
+    ring: np.ndarray
+    covers: PointFunction
+    limit: PointFunction
+
+
+def _polygon_test(ring: np.ndarray) -> PointFunction:
+    return lambda rows, x, y: _inside(ring[rows], x, y)
+
+
+def _directional_surfaces(variants: Sequence[Navaid], arc_segments: int) -> List[_Surface]:
+    """Horizontal surfaces (base, level surfaces, slope) of directional variants."""
+    columns = directional_columns(directional_row(p, *xy) for p, xy, _ in variants)
+    pts = directional_points(columns)
+    site_elev = columns[:, 9]
+    level = {LEVEL_SITE: site_elev, LEVEL_SIDE: site_elev + columns[:, 10]}
+    surfaces = []
+    for template in _FOOTPRINT_TEMPLATES:
+        names = [name for name, _level in template.vertices]
+        if template.arc_start is None:
+            ring = np.stack([pts[name] for name in names[:-1]], axis=1)
+            z = level[template.level][:, None]
+            surfaces.append(_Surface(ring, _polygon_test(ring), lambda rows, _x, _y, z=z: z[rows]))
+            continue
+        i = template.arc_start
+        arc = _arc(pts["navaid"], pts[names[i]], pts[names[i + 2]], columns[:, 5], arc_segments)
+        ring = np.concatenate([np.stack([pts[name] for name in names[:i]], axis=1), arc[:, :-1]], axis=1)
+        limit = _slope_limit(columns, DIRECTIONAL_TEMPLATES.index(template), arc_segments)
+        surfaces.append(_Surface(ring, _polygon_test(ring), limit))
+    return surfaces
+
+
+def _arc(centre: np.ndarray, start: np.ndarray, end: np.ndarray, radius: np.ndarray, segments: int) -> np.ndarray:
+    """Shortest arcs around ``centre`` from ``start`` to ``end``, ``(n, segments + 1, 2)``."""
+    a1 = np.arctan2(start[:, 1] - centre[:, 1], start[:, 0] - centre[:, 0])
+    a3 = np.arctan2(end[:, 1] - centre[:, 1], end[:, 0] - centre[:, 0])
+    sweep_angle = (a3 - a1 + np.pi) % (2 * np.pi) - np.pi
+    angles = a1[:, None] + sweep_angle[:, None] * np.linspace(0.0, 1.0, segments + 1)
+    return np.stack([centre[:, 0:1] + radius[:, None] * np.cos(angles),
+                     centre[:, 1:2] + radius[:, None] * np.sin(angles)], axis=2)
+
+
+def _slope_limit(columns: np.ndarray, index: int, arc_segments: int) -> PointFunction:
+    """Slope height on the triangulated slope ring of every variant.
+
+    Points the mesh does not cover (only possible on the footprint edge)
+    get no limit from the slope.
+    """
+    triangles = [plan_triangles([[directional_rings(vertices, arc_segments)[index]]])
+                 for vertices in directional_vertices(columns)]
+
+    def limit(rows: slice, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        z = np.stack([mesh_height(tri, x[0], y[0]) for tri in triangles[rows]])
+        return np.where(np.isnan(z), np.inf, z)
+
+    return limit
+
+
+def _omni_surfaces(variants: Sequence[Navaid], segments: int) -> List[_Surface]:
+    """Outer circle of omni variants (``R``, or ``j`` when the turbine cylinder reaches further).
+
+    Coverage is a distance test; the limit applies the omni screening rules.
+    """
+    x = np.array([xy[0] for _p, xy, _id in variants])[:, None]
+    y = np.array([xy[1] for _p, xy, _id in variants])[:, None]
+    params = [p for p, _xy, _id in variants]
+    site_elev, r, R, j, h = (np.array([getattr(p, name) for p in params], dtype=np.float64)[:, None]
+                             for name in ("site_elev", "r", "R", "j", "h"))
+    tan_alpha = np.tan(np.radians([p.alpha for p in params]))[:, None]
+    turbine = np.array([p.turbine for p in params])[:, None]
+    reach = np.where(turbine, np.maximum(R, j), R)
+    angles = 2.0 * np.pi * np.arange(segments) / segments
+    circle = np.stack([x + reach * np.cos(angles), y + reach * np.sin(angles)], axis=2)
+
+    def covers(rows: slice, px: np.ndarray, py: np.ndarray) -> np.ndarray:
+        return np.hypot(px - x[rows], py - y[rows]) <= reach[rows]
+
+    def limit(rows: slice, px: np.ndarray, py: np.ndarray) -> np.ndarray:
+        d = np.hypot(px - x[rows], py - y[rows])
+        z = np.where(d <= R[rows], site_elev[rows] + d * tan_alpha[rows], np.inf)
+        z = np.where(turbine[rows] & (d <= j[rows]), np.minimum(z, site_elev[rows] + h[rows]), z)
+        return np.where(d < r[rows], -np.inf, z)
+
+    return [_Surface(circle, covers, limit)]
+
+
+def _polygon_area(xy: np.ndarray) -> np.ndarray:
+    """Shoelace area of open rings ``(n, k, 2)``."""
+    x, y = xy[:, :, 0], xy[:, :, 1]
+    return 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=1) - y * np.roll(x, -1, axis=1), axis=1))
+
+
+def _inside(xy: np.ndarray, px: np.ndarray, py: np.ndarray) -> np.ndarray:
+    """Even–odd test of points ``(1, m)`` against open rings ``(n, k, 2)``, ``(n, m)``."""
+    inside = np.zeros((len(xy), px.shape[1]), dtype=bool)
+    nxt = np.roll(xy, -1, axis=1)
+    for k in range(xy.shape[1]):
+        x1, y1 = xy[:, k, 0:1], xy[:, k, 1:2]
+        x2, y2 = nxt[:, k, 0:1], nxt[:, k, 1:2]
+        crosses = (y1 > py) != (y2 > py)
+        dy = np.where(y2 == y1, 1.0, y2 - y1)
+        inside ^= crosses & (px < x1 + (py - y1) * (x2 - x1) / dy)
+    return inside
+
+
+def _count_obstacles(
+    surfaces: Sequence[_Surface],
+    extent: np.ndarray,
+    group: slice,
+    obstacles: Obstacles,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Count obstacles inside / above the footprints of one navaid's variants."""
+    xmin, ymin = extent[group, 0].min(), extent[group, 1].min()
+    xmax, ymax = extent[group, 2].max(), extent[group, 3].max()
+    near = (obstacles.x >= xmin) & (obstacles.x <= xmax) & (obstacles.y >= ymin) & (obstacles.y <= ymax)
+    count = group.stop - group.start
+    if not near.any():
+        return np.zeros(count, dtype=np.int64), np.zeros(count, dtype=np.int64)
+    px, py, top = obstacles.x[near][None, :], obstacles.y[near][None, :], obstacles.top[near][None, :]
+
+    covered = np.zeros((count, px.shape[1]), dtype=bool)
+    lowest = np.full(covered.shape, np.inf)
+    for surface in surfaces:
+        mask = surface.covers(group, px, py)
+        covered |= mask
+        lowest = np.where(mask, np.minimum(lowest, surface.limit(group, px, py)), lowest)
+    return covered.sum(axis=1), (covered & (top > lowest)).sum(axis=1)
@@ -0,0 +1,586 @@
+"""Terrain-aware evaluation of BRA surfaces against a DEM raster.
+
+BRA heights are referenced to ``site_elev``; this module checks whether the
+terrain itself rises above a surface.  For every BRA polygon the DEM cells
+under its footprint are sampled and compared against the surface height at
+each cell centre; cells where terrain is higher are counted as penetrations.
+
+Raster access never loads the whole DEM.  The grid is split into fixed-size
+blocks which are read on demand through a ``read_block`` callable and kept in
+a small LRU cache, so overlapping BRAs around one aerodrome share the blocks
+they have in common.  A reader can slice a ``numpy.memmap`` (raw DEM files) or
+call ``QgsRasterDataProvider.block`` restricted to the block extent.
+
+Surface heights come from the BRA vertices, which are derived exactly from
+the BRA parameters: flat and planar surfaces are planes, the omni cone mantle
+is ``z = site_elev + radius * tan(alpha)`` around the site, and the
+directional slope (rising from the ahead line at ``site_elev`` to the arc at
+``site_elev + h``, so not coplanar) is modelled piecewise by the planes of its
+triangulated mesh.  Vertical walls have no footprint and are skipped.
+
+Penetrating cells are reported as rectangles: runs of cells along a row are
+joined, and equal runs in consecutive rows are stacked, so a block of
+penetrating terrain becomes a few rectangles instead of one square per cell.
+
+Public API
+----------
+GridSpec, BlockCache, array_reader(array)
+surface_model(rings) -> Optional[SurfaceModel]
+points_in_polygon(xs, ys, rings) -> ndarray[bool]
+cell_boxes(hits) -> ndarray (k, 4)
+evaluate_surface(cache, rings) -> Optional[SurfacePenetration]
+analyse_terrain(dem_layer, bra_layers, band) -> (List[TerrainPenetration], QgsVectorLayer, QgsVectorLayer)
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from math import ceil, floor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from qgis.core import (
+    Qgis,
+    QgsFeature,
+    QgsField,
+    QgsGeometry,
+    QgsPointXY,
+    QgsRectangle,
+    QgsVectorLayer,
+)
+from qgis.PyQt.QtGui import QColor
+
+from ..constants import (
+    DEM_BLOCK_SIZE,
+    DEM_CACHE_BLOCKS,
+    SURFACE_FIT_TOLERANCE_M,
+    TERRAIN_AREA_LAYER_NAME,
+    TERRAIN_LAYER_NAME,
+)
+from ..exceptions import BRACalculationError, BRAError, BRAValidationError
+from ..utils.qt_compat import QVariantDouble, QVariantInt, QVariantString
+from .mesh import mesh_height, plan_triangles
+
+#: (col, row, width, height) -> 2D array of shape (height, width)
+BlockReader = Callable[[int, int, int, int], np.ndarray]
+
+#: One polygon ring as a sequence of (x, y, z) vertices.
+Ring = Sequence[Tuple[float, float, float]]
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    """Georeferencing of a north-up DEM grid.
+
+    Attributes:
+        x_origin: X of the top-left corner of the grid
+        y_origin: Y of the top-left corner of the grid
+        pixel_width: Cell size along X (positive)
+        pixel_height: Cell size along Y (positive)
+        columns: Number of columns
+        rows: Number of rows
+        nodata: Source no-data value, or None
+    """
+
+    x_origin: float
+    y_origin: float
+    pixel_width: float
+    pixel_height: float
+    columns: int
+    rows: int
+    nodata: Optional[float] = None
+
+    @property
+    def cell_area(self) -> float:
+        """Area of one cell in squared map units."""
+        return self.pixel_width * self.pixel_height
+
+    def cell_window(self, xmin: float, ymin: float, xmax: float, ymax: float) -> Tuple[int, int, int, int]:
+        """Return the cell window ``(col0, row0, col1, row1)`` covering an extent.
+
+        The window is clipped to the grid; ``col1``/``row1`` are exclusive, so
+        an extent outside the grid yields an empty window.
+        """
+        col0 = max(0, floor((xmin - self.x_origin) / self.pixel_width))
+        col1 = min(self.columns, ceil((xmax - self.x_origin) / self.pixel_width))
+        row0 = max(0, floor((self.y_origin - ymax) / self.pixel_height))
+        row1 = min(self.rows, ceil((self.y_origin - ymin) / self.pixel_height))
+        return col0, row0, max(col0, col1), max(row0, row1)
+
+    def cell_centres(self, col0: int, row0: int, col1: int, row1: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the X coordinates of the window columns and Y of its rows."""
+        xs = self.x_origin + (np.arange(col0, col1) + 0.5) * self.pixel_width
+        ys = self.y_origin - (np.arange(row0, row1) + 0.5) * self.pixel_height
+        return xs, ys
+
+
+class BlockCache:
+    """LRU cache of fixed-size DEM blocks.
+
+    Blocks are aligned to multiples of ``block_size`` cells so that any two
+    windows overlapping the same area hit the same cache entries.  No-data
+    cells are converted to NaN once, when the block is read.
+    """
+
+    def __init__(
+        self,
+        grid: GridSpec,
+        read_block: BlockReader,
+        block_size: int = DEM_BLOCK_SIZE,
+        max_blocks: int = DEM_CACHE_BLOCKS,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            grid: Georeferencing of the DEM
+            read_block: Callable reading a cell window from the source
+            block_size: Block edge length in cells
+            max_blocks: Maximum number of blocks kept in memory
+        """
+        if block_size < 1 or max_blocks < 1:
+            raise ValueError("block_size and max_blocks must be positive")
+        self.grid = grid
+        self._read_block = read_block
+        self._block_size = block_size
+        self._max_blocks = max_blocks
+        self._blocks: "OrderedDict[Tuple[int, int], np.ndarray]" = OrderedDict()
+        self.reads = 0
+        self.hits = 0
+
+    def _block(self, bx: int, by: int) -> np.ndarray:
+        key = (bx, by)
+        block = self._blocks.get(key)
+        if block is not None:
+            self._blocks.move_to_end(key)
+            self.hits += 1
+            return block
+        size = self._block_size
+        col, row = bx * size, by * size
+        width = min(size, self.grid.columns - col)
+        height = min(size, self.grid.rows - row)
+        block = np.array(self._read_block(col, row, width, height), dtype=np.float64)
+        if self.grid.nodata is not None:
+            block[block == self.grid.nodata] = np.nan
+        self.reads += 1
+        self._blocks[key] = block
+        if len(self._blocks) > self._max_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+    def window(self, col0: int, row0: int, col1: int, row1: int) -> np.ndarray:
+        """Assemble the cell window ``[row0:row1, col0:col1]`` from cached blocks.
+
+        Returns:
+            Float64 array with NaN for no-data cells
+        """
+        out = np.empty((row1 - row0, col1 - col0), dtype=np.float64)
+        if out.size == 0:
+            return out
+        size = self._block_size
+        for by in range(row0 // size, (row1 - 1) // size + 1):
+            for bx in range(col0 // size, (col1 - 1) // size + 1):
+                block = self._block(bx, by)
+                r0, c0 = max(row0, by * size), max(col0, bx * size)
+                r1 = min(row1, by * size + block.shape[0])
+                c1 = min(col1, bx * size + block.shape[1])
+                out[r0 - row0:r1 - row0, c0 - col0:c1 - col0] = block[
+                    r0 - by * size:r1 - by * size, c0 - bx * size:c1 - bx * size
+                ]
+        return out
+
+
+def array_reader(array: np.ndarray) -> BlockReader:
+    """Return a block reader slicing a 2D array (e.g. a ``numpy.memmap``).
+
+    Only the requested window is touched, so a memory-mapped DEM is paged in
+    block by block.
+    """
+    return lambda col, row, width, height: array[row:row + height, col:col + width]
+
+
+@dataclass(frozen=True)
+class SurfaceModel:
+    """Height of a BRA surface as a function of map position.
+
+    ``kind == "plane"``: ``z = a * x + b * y + c``.
+    ``kind == "radial"``: ``z = c + b * hypot(x - cx, y - cy)`` (``a`` unused).
+    ``kind == "mesh"``: planes of the ``(t, 3, 3)`` XYZ ``triangles``; points
+    covered by no triangle are NaN (``a``, ``b``, ``c`` unused).
+    """
+
+    kind: str
+    a: float
+    b: float
+    c: float
+    cx: float = 0.0
+    cy: float = 0.0
+    triangles: Optional[np.ndarray] = field(default=None, compare=False, repr=False)
+
+    def height(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Evaluate the surface height at broadcastable coordinates."""
+        if self.kind == "radial":
+            return self.c + self.b * np.hypot(xs - self.cx, ys - self.cy)
+        if self.kind == "mesh":
+            return mesh_height(self.triangles, xs, ys)
+        return self.a * xs + self.b * ys + self.c
+
+
+def _ring_area(ring: np.ndarray) -> float:
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * abs(float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))))
+
+
+def surface_model(rings: Sequence[Ring], tolerance: float = SURFACE_FIT_TOLERANCE_M) -> Optional[SurfaceModel]:
+    """Derive the height model of a BRA polygon from its vertices.
+
+    A plane is tried first (flat and planar surfaces).  If the vertices are
+    not coplanar, a radial model around the centre of the outer ring is
+    tried (omni cone mantle).  Anything else (the directional slope) is
+    modelled by the planes of its triangulated mesh.
+
+    Args:
+        rings: Exterior ring followed by interior rings, as (x, y, z) vertices
+        tolerance: Maximum vertex residual accepted for a fit
+
+    Returns:
+        Height model, or None for surfaces without a footprint (vertical walls)
+
+    Raises:
+        BRACalculationError: If the surface cannot be triangulated
+    """
+    outer = np.asarray(rings[0], dtype=np.float64)
+    if len(outer) < 3 or _ring_area(outer) <= 0.0:
+        return None
+    pts = np.concatenate([np.asarray(r, dtype=np.float64) for r in rings])
+    x, y, z = pts[:, 0], pts[:, 1], pts[:, 2]
+
+    design = np.column_stack([x, y, np.ones_like(x)])
+    (a, b, c), *_ = np.linalg.lstsq(design, z, rcond=None)
+    if np.max(np.abs(design @ (a, b, c) - z)) <= tolerance:
+        return SurfaceModel("plane", float(a), float(b), float(c))
+
+    cx, cy = outer[:-1, 0].mean(), outer[:-1, 1].mean()
+    radius = np.hypot(x - cx, y - cy)
+    design = np.column_stack([np.ones_like(radius), radius])
+    (c0, k), *_ = np.linalg.lstsq(design, z, rcond=None)
+    if np.max(np.abs(design @ (c0, k) - z)) <= tolerance:
+        return SurfaceModel("radial", 0.0, float(k), float(c0), float(cx), float(cy))
+
+    try:
+        corners = plan_triangles([rings])
+    except BRAError as e:
+        raise BRACalculationError("Cannot model BRA surface for the terrain check", e.details or e.message) from e
+    if not len(corners):
+        raise BRACalculationError(
+            "Cannot model BRA surface for the terrain check", f"no triangle with plan area among {len(pts)} vertices"
+        )
+    return SurfaceModel("mesh", 0.0, 0.0, 0.0, triangles=corners)
+
+
+def points_in_polygon(xs: np.ndarray, ys: np.ndarray, rings: Sequence[Ring]) -> np.ndarray:
+    """Vectorised even–odd point-in-polygon test on a grid of points.
+
+    Args:
+        xs: X coordinates of the grid columns (1D)
+        ys: Y coordinates of the grid rows (1D)
+        rings: Exterior ring followed by interior rings (holes)
+
+    Returns:
+        Boolean mask of shape ``(len(ys), len(xs))``
+    """
+    gx = np.asarray(xs, dtype=np.float64)[np.newaxis, :]
+    gy = np.asarray(ys, dtype=np.float64)[:, np.newaxis]
+    inside = np.zeros((gy.shape[0], gx.shape[1]), dtype=bool)
+    for ring in rings:
+        pts = np.asarray(ring, dtype=np.float64)
+        for (x1, y1), (x2, y2) in zip(pts[:, :2], np.roll(pts[:, :2], -1, axis=0)):
+            if y1 == y2:
+                continue
+            crosses = (y1 > gy) != (y2 > gy)
+            x_cross = x1 + (gy - y1) * (x2 - x1) / (y2 - y1)
+            inside ^= crosses & (gx < x_cross)
+    return inside
+
+
+def cell_boxes(hits: np.ndarray) -> np.ndarray:
+    """Merge the set cells of a boolean grid into rectangles.
+
+    Runs of set cells along a row are joined; a run with the same columns
+    in the next row extends the rectangle downwards.
+
+    Args:
+        hits: ``(rows, columns)`` boolean mask
+
+    Returns:
+        ``(k, 4)`` int64 ``(col0, row0, col1, row1)`` with exclusive ends;
+        together they cover exactly the set cells
+    """
+    padded = np.zeros((hits.shape[0], hits.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = hits
+    edges = np.diff(padded, axis=1)
+    boxes: List[Tuple[int, int, int, int]] = []
+    open_runs: Dict[Tuple[int, int], int] = {}
+    for row in range(hits.shape[0]):
+        runs = set(zip(np.flatnonzero(edges[row] == 1).tolist(), np.flatnonzero(edges[row] == -1).tolist()))
+        for run in [run for run in open_runs if run not in runs]:
+            boxes.append((run[0], open_runs.pop(run), run[1], row))
+        for run in runs:
+            open_runs.setdefault(run, row)
+    boxes.extend((c0, r0, c1, hits.shape[0]) for (c0, c1), r0 in open_runs.items())
+    return np.array(sorted(boxes, key=lambda b: (b[1], b[0])), dtype=np.int64).reshape(-1, 4)
+
+
+class SurfacePenetration(NamedTuple):
+    """Terrain above one BRA polygon.
+
+    Attributes:
+        cells: Number of penetrating DEM cells
+        max_penetration: Largest terrain height above the surface
+        worst_x: X of the cell with the largest penetration
+        worst_y: Y of the cell with the largest penetration
+        boxes: ``(k, 4)`` rectangles ``(xmin, ymin, xmax, ymax)`` covering
+            the penetrating cells (see :func:`cell_boxes`)
+    """
+
+    cells: int
+    max_penetration: float
+    worst_x: float
+    worst_y: float
+    boxes: np.ndarray
+
+
+def evaluate_surface(cache: BlockCache, rings: Sequence[Ring]) -> Optional[SurfacePenetration]:
+    """Compare the terrain under one BRA polygon with its surface height.
+
+    Args:
+        cache: Block cache of the DEM
+        rings: Exterior ring followed by interior rings, as (x, y, z) vertices
+
+    Returns:
+        The penetration, or None when the polygon has no footprint or no
+        terrain penetrates it
+    """
+    model = surface_model(rings)
+    if model is None:
+        return None
+    outer = np.asarray(rings[0], dtype=np.float64)
+    grid = cache.grid
+    col0, row0, col1, row1 = grid.cell_window(
+        outer[:, 0].min(), outer[:, 1].min(), outer[:, 0].max(), outer[:, 1].max()
+    )
+    if col0 == col1 or row0 == row1:
+        return None
+    xs, ys = grid.cell_centres(col0, row0, col1, row1)
+    mask = points_in_polygon(xs, ys, rings)
+    if not mask.any():
+        return None
+
+    terrain = cache.window(col0, row0, col1, row1)
+    excess = terrain - model.height(xs[np.newaxis, :], ys[:, np.newaxis])
+    excess[~mask] = np.nan
+    hits = excess > 0
+    cells = int(np.count_nonzero(hits))
+    if cells == 0:
+        return None
+    worst = np.nanargmax(np.where(hits, excess, np.nan))
+    r, c = divmod(int(worst), excess.shape[1])
+    boxes = cell_boxes(hits)
+    extent = np.column_stack([
+        grid.x_origin + (col0 + boxes[:, 0]) * grid.pixel_width,
+        grid.y_origin - (row0 + boxes[:, 3]) * grid.pixel_height,
+        grid.x_origin + (col0 + boxes[:, 2]) * grid.pixel_width,
+        grid.y_origin - (row0 + boxes[:, 1]) * grid.pixel_height,
+    ])
+    return SurfacePenetration(cells, float(excess[r, c]), float(xs[c]), float(ys[r]), extent)
+
+
+@dataclass(frozen=True)
+class TerrainPenetration:
+    """Terrain penetration of one BRA surface.
+
+    Attributes:
+        layer_name: Name of the BRA layer
+        feature_id: Id of the BRA feature
+        area_name: ``area_name`` attribute of the feature (or "")
+        cells: Number of penetrating DEM cells
+        area: Penetrating area in squared map units
+        max_penetration: Largest terrain height above the surface
+        worst_x: X of the cell with the largest penetration
+        worst_y: Y of the cell with the largest penetration
+        boxes: ``(k, 4)`` rectangles ``(xmin, ymin, xmax, ymax)`` covering
+            the penetrating cells of all parts
+    """
+
+    layer_name: str
+    feature_id: int
+    area_name: str
+    cells: int
+    area: float
+    max_penetration: float
+    worst_x: float
+    worst_y: float
+    boxes: np.ndarray = field(default_factory=lambda: np.empty((0, 4)), compare=False)
+
+
+# Raster block data types → numpy dtypes (QGIS 3 flat / QGIS 4 scoped enum)
+_DTYPE_NAMES = (
+    ("Byte", np.uint8), ("Int8", np.int8), ("UInt16", np.uint16), ("Int16", np.int16),
+    ("UInt32", np.uint32), ("Int32", np.int32), ("Float32", np.float32), ("Float64", np.float64),
+)
+
+
+def _raster_dtype(data_type: object) -> Optional[type]:  # pragma: no cover
+    scope = getattr(Qgis, "DataType", Qgis)
+    for name, dtype in _DTYPE_NAMES:
+        if getattr(scope, name, None) == data_type:
+            return dtype
+    return None
+
+
+def raster_block_reader(dem_layer: object, band: int = 1) -> Tuple[GridSpec, BlockReader]:  # pragma: no cover
+    """Build the grid spec and a windowed block reader for a QGIS raster layer.
+
+    Each read requests exactly one block extent from the data provider, so
+    the provider only decodes the tiles under that block.
+
+    Args:
+        dem_layer: QgsRasterLayer holding the DEM
+        band: Band number (1-based)
+
+    Returns:
+        (grid, read_block)
+    """
+    provider = dem_layer.dataProvider()
+    extent = dem_layer.extent()
+    pw, ph = dem_layer.rasterUnitsPerPixelX(), dem_layer.rasterUnitsPerPixelY()
+    nodata = provider.sourceNoDataValue(band) if provider.sourceHasNoDataValue(band) else None
+    grid = GridSpec(
+        extent.xMinimum(), extent.yMaximum(), pw, ph, dem_layer.width(), dem_layer.height(), nodata
+    )
+
+    def read(col: int, row: int, width: int, height: int) -> np.ndarray:
+        x0 = grid.x_origin + col * pw
+        y1 = grid.y_origin - row * ph
+        block = provider.block(band, QgsRectangle(x0, y1 - height * ph, x0 + width * pw, y1), width, height)
+        dtype = _raster_dtype(block.dataType())
+        if dtype is not None:
+            data = np.frombuffer(bytes(block.data()), dtype=dtype, count=width * height)
+            data = data.reshape(height, width).astype(np.float64)
+        else:
+            data = np.array(
+                [[block.value(r, c) for c in range(width)] for r in range(height)], dtype=np.float64
+            )
+        return data
+
+    return grid, read
+
+
+def _polygon_rings(geometry: QgsGeometry) -> List[List[Ring]]:  # pragma: no cover
+    """Split a (multi)polygon Z geometry into lists of (x, y, z) rings."""
+    abstract = geometry.constGet().segmentize()
+    parts = [abstract.geometryN(i) for i in range(abstract.numGeometries())] if hasattr(
+        abstract, "numGeometries"
+    ) else [abstract]
+    polygons = []
+    for part in parts:
+        ext = part.exteriorRing()
+        if ext is None:
+            continue
+        rings = [ext] + [part.interiorRing(i) for i in range(part.numInteriorRings())]
+        polygons.append([[(p.x(), p.y(), p.z()) for p in ring.points()] for ring in rings])
+    return polygons
+
+
+def _report_layer(geometry_type: str, crs: str, name: str) -> QgsVectorLayer:  # pragma: no cover
+    """Empty memory layer with the terrain report attributes."""
+    layer = QgsVectorLayer(f"{geometry_type}?crs={crs}", name, "memory")
+    layer.dataProvider().addAttributes([
+        QgsField("bra_layer", QVariantString),
+        QgsField("bra_fid", QVariantInt),
+        QgsField("area_name", QVariantString),
+        QgsField("pen_cells", QVariantInt),
+        QgsField("pen_area", QVariantDouble),
+        QgsField("max_pen_m", QVariantDouble),
+    ])
+    layer.updateFields()
+    return layer
+
+
+def analyse_terrain(
+    dem_layer: object,
+    bra_layers: Sequence[QgsVectorLayer],
+    band: int = 1,
+) -> Tuple[List[TerrainPenetration], QgsVectorLayer, QgsVectorLayer]:  # pragma: no cover
+    """Check every BRA surface of ``bra_layers`` against a DEM.
+
+    One block cache is shared by all layers so overlapping BRAs reuse reads.
+
+    Args:
+        dem_layer: QgsRasterLayer with terrain elevations (same vertical datum
+            as ``site_elev``)
+        bra_layers: BRA output layers
+        band: DEM band number
+
+    Returns:
+        (penetrations, report layer, area layer) — the report layer has one
+        point per penetrated surface at its worst cell, the area layer the
+        merged penetrating cells of each surface as a (multi)polygon, both
+        with the same attributes
+
+    Raises:
+        BRAValidationError: If a BRA layer's CRS differs from the DEM's
+    """
+    crs = dem_layer.crs()
+    for layer in bra_layers:
+        if layer.crs() != crs:
+            raise BRAValidationError(
+                "DEM and BRA layers must share one CRS for the terrain check",
+                f"DEM: {crs.authid()}, {layer.name()}: {layer.crs().authid()}",
+            )
+    grid, read = raster_block_reader(dem_layer, band)
+    cache = BlockCache(grid, read)
+
+    results: List[TerrainPenetration] = []
+    for layer in bra_layers:
+        name_idx = layer.fields().indexFromName("area_name")
+        for feature in layer.getFeatures():
+            hits = [evaluate_surface(cache, rings) for rings in _polygon_rings(feature.geometry())]
+            hits = [hit for hit in hits if hit is not None]
+            if not hits:
+                continue
+            best = max(hits, key=lambda hit: hit.max_penetration)
+            cells = sum(hit.cells for hit in hits)
+            area_name = str(feature.attributes()[name_idx]) if name_idx >= 0 else ""
+            results.append(TerrainPenetration(
+                layer.name(), feature.id(), area_name, cells, cells * grid.cell_area,
+                best.max_penetration, best.worst_x, best.worst_y,
+                np.concatenate([hit.boxes for hit in hits]),
+            ))
+
+    report = _report_layer("Point", crs.authid(), TERRAIN_LAYER_NAME)
+    areas = _report_layer("MultiPolygon", crs.authid(), TERRAIN_AREA_LAYER_NAME)
+    points, polygons = [], []
+    for item in results:
+        attributes = [
+            item.layer_name, item.feature_id, item.area_name, item.cells,
+            round(item.area, 1), round(item.max_penetration, 2),
+        ]
+        point = QgsFeature()
+        point.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(item.worst_x, item.worst_y)))
+        point.setAttributes(attributes)
+        points.append(point)
+        polygon = QgsFeature()
+        cells = [QgsGeometry.fromRect(QgsRectangle(*box)) for box in item.boxes.tolist()]
+        merged = QgsGeometry.unaryUnion(cells)
+        merged.convertToMultiType()
+        polygon.setGeometry(merged)
+        polygon.setAttributes(attributes)
+        polygons.append(polygon)
+    if points:
+        report.dataProvider().addFeatures(points)
+        areas.dataProvider().addFeatures(polygons)
+    report.renderer().symbol().setColor(QColor("red"))
+    areas.renderer().symbol().setColor(QColor(255, 0, 0, 96))
+    report.updateExtents()
+    areas.updateExtents()
+    return results, report, areas
@@ -0,0 +1,439 @@
+"""Wind-turbine screening against omnidirectional navaid sites.
+
+For CVOR/DVOR/DF sites the omni BRA carries a turbine analysis cylinder of
+radius ``j`` and height ``h`` on top of the inner cylinder (radius ``r``)
+and the cone ``z = radius * tan(alpha)`` out to ``R``.  Screening checks a
+whole turbine layer against every site at once:
+
+* a turbine is **within** a site when its distance ``d <= j``;
+* it **infringes** the site when it stands inside the inner cylinder
+  (``d < r``), rises above the cone (``d <= R`` and
+  ``tip > site_elev + d * tan(alpha)``) or above the turbine cylinder
+  (``tip > site_elev + h``).
+
+Candidate site/turbine pairs come from a uniform grid index of the sites
+(cell size = largest ``j``): every turbine looks up the 3×3 cells around it
+with ``numpy.searchsorted`` on the sorted cell keys, so the join and all
+height checks run as array operations without Python loops over turbines.
+
+Public API
+----------
+OmniSites, Turbines, TurbineScreening
+candidate_pairs(site_x, site_y, turbine_x, turbine_y, cell) -> (site_idx, turbine_idx)
+tip_heights(tip, hub, rotor_radius, rotor_diameter) -> np.ndarray
+elevations(values, what, fields) -> np.ndarray
+screen_turbines(sites, turbines) -> TurbineScreening
+build_screening_layers(...) -> (site layer, turbine layer)   # requires live QGIS
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from qgis.core import QgsFeature, QgsField, QgsGeometry, QgsPointXY, QgsVectorLayer
+from qgis.PyQt.QtGui import QColor
+
+from ..constants import (
+    SITE_ELEV_FIELDS,
+    TURBINE_BASE_FIELDS,
+    TURBINE_HUB_FIELDS,
+    TURBINE_ROTOR_DIAMETER_FIELDS,
+    TURBINE_ROTOR_RADIUS_FIELDS,
+    TURBINE_SCREENING_LAYER_NAME,
+    TURBINE_SITE_LAYER_NAME,
+    TURBINE_TIP_FIELDS,
+)
+from ..exceptions import BRAValidationError
+from ..utils.qt_compat import QVariantDouble, QVariantInt
+
+# Cell coordinates are packed into one int64 key: high 32 bits = column
+_KEY_SHIFT = np.int64(1 << 32)
+_KEY_BIAS = np.int64(1 << 31)
+
+
+@dataclass(frozen=True)
+class OmniSites:
+    """Omni navaid sites as parallel arrays (one entry per site).
+
+    Heights ``h`` are above ``elev``; distances are in map units (metres).
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+    elev: np.ndarray
+    r: np.ndarray
+    alpha: np.ndarray
+    R: np.ndarray
+    j: np.ndarray
+    h: np.ndarray
+
+    @classmethod
+    def uniform(cls, x: Sequence[float], y: Sequence[float], elev: Any, params: Dict[str, Any]) -> "OmniSites":
+        """Build sites sharing one parameter set (``omni_r``, ``omni_alpha``, ...).
+
+        Args:
+            x: Site X coordinates
+            y: Site Y coordinates
+            elev: Site elevation(s), scalar or per site
+            params: Omni parameter dict as produced by the dock widget
+        """
+        n = len(x)
+
+        def full(value: Any) -> np.ndarray:
+            return np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)).copy()
+
+        return cls(
+            np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), full(elev),
+            full(params["omni_r"]), full(params["omni_alpha"]), full(params["omni_R"]),
+            full(params["omni_j"]), full(params["omni_h"]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+
+@dataclass(frozen=True)
+class Turbines:
+    """Wind turbines as parallel arrays; ``tip`` is above ``base``."""
+
+    x: np.ndarray
+    y: np.ndarray
+    base: np.ndarray
+    tip: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+
+@dataclass(frozen=True)
+class TurbineScreening:
+    """Result of a screening run.
+
+    Pair arrays hold one entry per (site, turbine) with ``distance <= j``;
+    count arrays hold one entry per site / per turbine.
+
+    Attributes:
+        site_idx: Site index of each pair
+        turbine_idx: Turbine index of each pair
+        distance: Horizontal distance of each pair
+        clearance: Lowest applicable limit minus turbine top (negative = infringing)
+        infringes: Pair infringes the site
+        site_within: Turbines within ``j`` per site
+        site_infringing: Infringing turbines per site
+        turbine_within: Sites within ``j`` per turbine
+        turbine_infringing: Infringed sites per turbine
+        turbine_clearance: Lowest clearance per turbine (``inf`` if no site
+            within ``j``, ``-inf`` inside an inner cylinder)
+    """
+
+    site_idx: np.ndarray
+    turbine_idx: np.ndarray
+    distance: np.ndarray
+    clearance: np.ndarray
+    infringes: np.ndarray
+    site_within: np.ndarray
+    site_infringing: np.ndarray
+    turbine_within: np.ndarray
+    turbine_infringing: np.ndarray
+    turbine_clearance: np.ndarray
+
+
+def _cell_keys(cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+    return cx.astype(np.int64) * _KEY_SHIFT + (cy.astype(np.int64) + _KEY_BIAS)
+
+
+def candidate_pairs(
+    site_x: np.ndarray,
+    site_y: np.ndarray,
+    turbine_x: np.ndarray,
+    turbine_y: np.ndarray,
+    cell: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return all site/turbine pairs in the same or adjacent grid cells.
+
+    Every pair closer than ``cell`` is guaranteed to be returned.
+
+    Args:
+        site_x, site_y: Site coordinates
+        turbine_x, turbine_y: Turbine coordinates
+        cell: Grid cell size (at least the largest search radius)
+
+    Returns:
+        (site indices, turbine indices) of the candidate pairs
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(site_x) == 0 or len(turbine_x) == 0 or cell <= 0:
+        return empty, empty
+    site_keys = _cell_keys(np.floor(site_x / cell), np.floor(site_y / cell))
+    order = np.argsort(site_keys, kind="stable")
+    sorted_keys = site_keys[order]
+    tcx, tcy = np.floor(turbine_x / cell), np.floor(turbine_y / cell)
+
+    sites, turbines = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            keys = _cell_keys(tcx + dx, tcy + dy)
+            starts = np.searchsorted(sorted_keys, keys, side="left")
+            counts = np.searchsorted(sorted_keys, keys, side="right") - starts
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            turbine_idx = np.repeat(np.arange(len(keys)), counts)
+            first = np.repeat(np.cumsum(counts) - counts, counts)
+            positions = np.arange(total) - first + np.repeat(starts, counts)
+            sites.append(order[positions])
+            turbines.append(turbine_idx)
+    if not sites:
+        return empty, empty
+    return np.concatenate(sites), np.concatenate(turbines)
+
+
+def tip_heights(
+    tip: Optional[np.ndarray],
+    hub: Optional[np.ndarray],
+    rotor_radius: Optional[np.ndarray],
+    rotor_diameter: Optional[np.ndarray],
+) -> np.ndarray:
+    """Blade-tip heights above ground, per turbine.
+
+    The tip height is taken as given; where it is missing it is the hub
+    height plus the rotor radius (half the rotor diameter).  A hub height
+    alone is never used as the turbine top.
+
+    Args:
+        tip: Tip heights (NaN where missing), or None when there is no tip field
+        hub: Hub heights (NaN where missing), or None
+        rotor_radius: Rotor radii (NaN where missing), or None
+        rotor_diameter: Rotor diameters (NaN where missing), or None
+
+    Returns:
+        Tip heights
+
+    Raises:
+        BRAValidationError: If a turbine has neither a tip height nor a hub
+            height with a rotor size
+    """
+    arrays = [a for a in (tip, hub, rotor_radius, rotor_diameter) if a is not None]
+    n = len(arrays[0]) if arrays else 0
+    missing = np.full(n, np.nan)
+    radius = missing if rotor_radius is None else rotor_radius
+    if rotor_diameter is not None:
+        radius = np.where(np.isnan(radius), rotor_diameter / 2.0, radius)
+    derived = (missing if hub is None else hub) + radius
+    result = derived if tip is None else np.where(np.isnan(tip), derived, tip)
+    unknown = int(np.count_nonzero(np.isnan(result)))
+    if not arrays or unknown:
+        raise BRAValidationError(
+            "Turbine tip heights are missing",
+            f"{unknown or 'All'} turbine(s) have neither a tip height ({', '.join(TURBINE_TIP_FIELDS)}) "
+            f"nor a hub height ({', '.join(TURBINE_HUB_FIELDS)}) with a rotor radius "
+            f"({', '.join(TURBINE_ROTOR_RADIUS_FIELDS)}) or diameter ({', '.join(TURBINE_ROTOR_DIAMETER_FIELDS)})",
+        )
+    return result
+
+
+def elevations(values: np.ndarray, what: str, fields: Sequence[str]) -> np.ndarray:
+    """Check that an elevation field has a value for every feature.
+
+    A NULL elevation is not read as zero: that would put the feature at
+    sea level and make the height checks meaningless.
+
+    Args:
+        values: Elevations (NaN where NULL)
+        what: Feature kind for the error message, e.g. ``"turbine"``
+        fields: Candidate field names, for the error message
+
+    Returns:
+        ``values``
+
+    Raises:
+        BRAValidationError: If an elevation is NULL
+    """
+    unknown = int(np.count_nonzero(np.isnan(values)))
+    if unknown:
+        raise BRAValidationError(
+            f"{what.capitalize()} elevations are missing",
+            f"{unknown} {what}(s) have a NULL elevation ({', '.join(fields)})",
+        )
+    return values
+
+
+def screen_turbines(sites: OmniSites, turbines: Turbines) -> TurbineScreening:
+    """Screen every turbine against every omni site.
+
+    Args:
+        sites: Omni sites with their BRA parameters
+        turbines: Turbine positions and heights
+
+    Returns:
+        Pairs within ``j`` with their clearance, and per-site / per-turbine counts
+
+    Raises:
+        BRAValidationError: If a site has no turbine cylinder (``j`` or ``h`` <= 0)
+    """
+    if len(sites) and (np.any(sites.j <= 0) or np.any(sites.h <= 0)):
+        raise BRAValidationError(
+            "Turbine screening needs j and h > 0 for every site",
+            "Enable the turbine analysis cylinder for the facility",
+        )
+    cell = float(sites.j.max()) if len(sites) else 0.0
+    s_idx, t_idx = candidate_pairs(sites.x, sites.y, turbines.x, turbines.y, cell)
+    distance = np.hypot(turbines.x[t_idx] - sites.x[s_idx], turbines.y[t_idx] - sites.y[s_idx])
+    within = distance <= sites.j[s_idx]
+    s_idx, t_idx, distance = s_idx[within], t_idx[within], distance[within]
+
+    top = turbines.base[t_idx] + turbines.tip[t_idx]
+    elev = sites.elev[s_idx]
+    cone = np.where(
+        distance <= sites.R[s_idx],
+        elev + distance * np.tan(np.radians(sites.alpha[s_idx])),
+        np.inf,
+    )
+    limit = np.minimum(cone, elev + sites.h[s_idx])
+    limit = np.where(distance < sites.r[s_idx], -np.inf, limit)
+    clearance = limit - top
+    infringes = clearance < 0
+
+    n_sites, n_turbines = len(sites), len(turbines)
+    turbine_clearance = np.full(n_turbines, np.inf)
+    np.minimum.at(turbine_clearance, t_idx, clearance)
+    return TurbineScreening(
+        site_idx=s_idx,
+        turbine_idx=t_idx,
+        distance=distance,
+        clearance=clearance,
+        infringes=infringes,
+        site_within=np.bincount(s_idx, minlength=n_sites),
+        site_infringing=np.bincount(s_idx[infringes], minlength=n_sites),
+        turbine_within=np.bincount(t_idx, minlength=n_turbines),
+        turbine_infringing=np.bincount(t_idx[infringes], minlength=n_turbines),
+        turbine_clearance=turbine_clearance,
+    )
+
+
+def _as_float(value: Any, null: float) -> float:  # pragma: no cover
+    try:
+        return float(value)
+    except (TypeError, ValueError):  # NULL / empty attribute
+        return null
+
+
+def _field_values(
+    layer: QgsVectorLayer,
+    candidates: Sequence[str],
+    default: Optional[float],
+    null: float = 0.0,
+) -> Optional[np.ndarray]:  # pragma: no cover
+    fields = layer.fields()
+    idx = next((fields.indexFromName(n) for n in candidates if fields.indexFromName(n) >= 0), -1)
+    if idx < 0:
+        return None if default is None else np.full(layer.featureCount(), default, dtype=np.float64)
+    return np.array(
+        [_as_float(f.attributes()[idx], null) for f in layer.getFeatures()], dtype=np.float64
+    )
+
+
+def _point_arrays(layer: QgsVectorLayer) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:  # pragma: no cover
+    fids, xs, ys = [], [], []
+    for feature in layer.getFeatures():
+        point = feature.geometry().asPoint()
+        fids.append(feature.id())
+        xs.append(point.x())
+        ys.append(point.y())
+    return np.array(fids, dtype=np.int64), np.array(xs), np.array(ys)
+
+
+def build_screening_layers(
+    site_layer: QgsVectorLayer,
+    turbine_layer: QgsVectorLayer,
+    params: Dict[str, Any],
+) -> Tuple[TurbineScreening, QgsVectorLayer, QgsVectorLayer]:  # pragma: no cover
+    """Screen a turbine layer against all sites of an omni navaid layer.
+
+    Site elevations are read from a ``site_elev``-like field when present,
+    otherwise ``params["site_elev"]`` applies to all sites.  Turbine tip
+    heights come from a ``tip_height``-like field, or from hub height plus
+    rotor radius (see :func:`tip_heights`), and are added to a ground
+    elevation field when present.  NULL elevations are rejected (see
+    :func:`elevations`).
+
+    Args:
+        site_layer: Point layer of omni navaid sites
+        turbine_layer: Point layer of turbines, same CRS
+        params: Omni parameter dict from the dock widget
+
+    Returns:
+        (screening, per-site layer, per-turbine layer)
+
+    Raises:
+        BRAValidationError: If the CRSs differ, a turbine's tip height is
+            unknown or an elevation is NULL
+    """
+    if site_layer.crs() != turbine_layer.crs():
+        raise BRAValidationError(
+            "Navaid and turbine layers must share one CRS for screening",
+            f"{site_layer.crs().authid()} vs {turbine_layer.crs().authid()}",
+        )
+    tip = tip_heights(*(
+        _field_values(turbine_layer, names, None, null=np.nan)
+        for names in (
+            TURBINE_TIP_FIELDS, TURBINE_HUB_FIELDS, TURBINE_ROTOR_RADIUS_FIELDS, TURBINE_ROTOR_DIAMETER_FIELDS,
+        )
+    ))
+    base = elevations(
+        _field_values(turbine_layer, TURBINE_BASE_FIELDS, 0.0, null=np.nan), "turbine", TURBINE_BASE_FIELDS
+    )
+    site_elev = elevations(
+        _field_values(site_layer, SITE_ELEV_FIELDS, float(params.get("site_elev", 0.0)), null=np.nan),
+        "site",
+        SITE_ELEV_FIELDS,
+    )
+
+    site_fids, sx, sy = _point_arrays(site_layer)
+    turbine_fids, tx, ty = _point_arrays(turbine_layer)
+    screening = screen_turbines(OmniSites.uniform(sx, sy, site_elev, params), Turbines(tx, ty, base, tip))
+
+    crs = site_layer.crs().authid()
+    site_out = QgsVectorLayer("Point?crs=" + crs, TURBINE_SITE_LAYER_NAME, "memory")
+    site_out.dataProvider().addAttributes([
+        QgsField("site_fid", QVariantInt),
+        QgsField("within_j", QVariantInt),
+        QgsField("infringing", QVariantInt),
+    ])
+    site_out.updateFields()
+    turbine_out = QgsVectorLayer("Point?crs=" + crs, TURBINE_SCREENING_LAYER_NAME, "memory")
+    turbine_out.dataProvider().addAttributes([
+        QgsField("turbine_fid", QVariantInt),
+        QgsField("sites_within", QVariantInt),
+        QgsField("sites_infringed", QVariantInt),
+        QgsField("clearance_m", QVariantDouble),
+    ])
+    turbine_out.updateFields()
+
+    def points(fids, xs, ys, rows):
+        features = []
+        for fid, x, y, row in zip(fids, xs, ys, rows):
+            feature = QgsFeature()
+            feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(float(x), float(y))))
+            feature.setAttributes([int(fid)] + row)
+            features.append(feature)
+        return features
+
+    site_out.dataProvider().addFeatures(points(
+        site_fids, sx, sy,
+        [[int(w), int(i)] for w, i in zip(screening.site_within, screening.site_infringing)],
+    ))
+    turbine_out.dataProvider().addFeatures(points(
+        turbine_fids, tx, ty,
+        [
+            [int(w), int(i), round(float(c), 2) if np.isfinite(c) else None]
+            for w, i, c in zip(
+                screening.turbine_within, screening.turbine_infringing, screening.turbine_clearance
+            )
+        ],
+    ))
+    turbine_out.renderer().symbol().setColor(QColor("red"))
+    for out in (site_out, turbine_out):
+        out.updateExtents()
+    return screening, site_out, turbine_out
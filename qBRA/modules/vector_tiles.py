@@ -0,0 +1,296 @@
+"""Mapbox vector-tile encoding of BRA surfaces.
+
+QGIS-free helpers used by :mod:`qBRA.services.mbtiles_sink` to cut BRA
+polygons into a Web Mercator (XYZ) tile pyramid:
+
+* coordinates are EPSG:3857 metres (:func:`lonlat_to_mercator` converts
+  EPSG:4326 input);
+* each polygon ring is clipped to the tile plus a buffer
+  (Sutherland–Hodgman on whole rings with numpy), simplified with
+  Douglas–Peucker at a tolerance given in tile units (so coarser zooms are
+  simplified more in ground distance), snapped to the integer tile grid
+  and dropped when it collapses;
+* tiles are encoded as Vector Tile 2.1 protocol buffers by hand (the
+  message layout is small and fixed), so no protobuf dependency is needed.
+
+Heights are kept as attributes; vertical surfaces (directional walls) have
+no footprint and do not appear in tiles.
+
+Public API
+----------
+lonlat_to_mercator(xy) -> ndarray
+mercator_to_lonlat(x, y) -> (lon, lat)
+tile_bounds(z, x, y) -> (xmin, ymin, xmax, ymax)
+tile_range(bbox, z, buffer) -> (x0, y0, x1, y1)
+tile_polygon(rings, z, x, y, extent, buffer, tolerance) -> List[ndarray]
+encode_tile(layers, extent) -> bytes
+"""
+
+import math
+import struct
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from ..constants import MVT_BUFFER, MVT_EXTENT
+
+#: Half the Web Mercator world width (metres).
+ORIGIN_SHIFT: float = math.pi * 6378137.0
+
+#: Tile layer content: (tile-unit rings of one polygon, properties) per feature.
+TileLayer = Sequence[Tuple[Sequence[np.ndarray], Mapping[str, Any]]]
+
+_MOVE_TO, _LINE_TO, _CLOSE_PATH = 1, 2, 7
+_POLYGON = 3
+
+
+def lonlat_to_mercator(xy: np.ndarray) -> np.ndarray:
+    """Convert ``(..., 2+)`` lon/lat degrees to Web Mercator metres (extra columns dropped)."""
+    xy = np.asarray(xy, dtype=np.float64)
+    lat = np.clip(xy[..., 1], -85.0511287798, 85.0511287798)
+    x = np.radians(xy[..., 0]) * 6378137.0
+    y = np.log(np.tan(np.pi / 4.0 + np.radians(lat) / 2.0)) * 6378137.0
+    return np.stack([x, y], axis=-1)
+
+
+def mercator_to_lonlat(x: float, y: float) -> Tuple[float, float]:
+    """Convert Web Mercator metres to lon/lat degrees."""
+    lon = math.degrees(x / 6378137.0)
+    lat = math.degrees(2.0 * math.atan(math.exp(y / 6378137.0)) - math.pi / 2.0)
+    return lon, lat
+
+
+def _tile_size(z: int) -> float:
+    return 2.0 * ORIGIN_SHIFT / (1 << z)
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Return the mercator bounds of XYZ tile ``z/x/y`` (``y`` counted from the north)."""
+    size = _tile_size(z)
+    xmin = -ORIGIN_SHIFT + x * size
+    ymax = ORIGIN_SHIFT - y * size
+    return xmin, ymax - size, xmin + size, ymax
+
+
+def tile_range(bbox: Sequence[float], z: int, buffer: float = 0.0) -> Tuple[int, int, int, int]:
+    """Return the inclusive XYZ tile range ``(x0, y0, x1, y1)`` covering a mercator bbox.
+
+    Args:
+        bbox: (xmin, ymin, xmax, ymax) in metres
+        z: Zoom level
+        buffer: Extra margin as a fraction of the tile size
+    """
+    size = _tile_size(z)
+    last = (1 << z) - 1
+    pad = buffer * size
+
+    def col(value: float) -> int:
+        return min(last, max(0, int(math.floor((value + ORIGIN_SHIFT) / size))))
+
+    def row(value: float) -> int:
+        return min(last, max(0, int(math.floor((ORIGIN_SHIFT - value) / size))))
+
+    xmin, ymin, xmax, ymax = bbox
+    return col(xmin - pad), row(ymax + pad), col(xmax + pad), row(ymin - pad)
+
+
+def _clip_edge(ring: np.ndarray, axis: int, limit: float, keep_below: bool) -> np.ndarray:
+    """Clip a closed ring (without repeated end point) against one half-plane."""
+    if len(ring) == 0:
+        return ring
+    nxt = np.roll(ring, -1, axis=0)
+    inside = ring[:, axis] <= limit if keep_below else ring[:, axis] >= limit
+    inside_next = np.roll(inside, -1)
+    crossing = inside != inside_next
+    delta = nxt[:, axis] - ring[:, axis]
+    t = np.divide(limit - ring[:, axis], delta, out=np.zeros(len(ring)), where=crossing)
+    cut = ring + (nxt - ring) * t[:, None]
+    # Per edge (p -> q): the crossing point if the edge crosses, then q if q is inside
+    slots = np.stack([cut, nxt], axis=1)
+    keep = np.stack([crossing, inside_next], axis=1)
+    return slots[keep]
+
+
+def _clip_ring(ring: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    for axis in (0, 1):
+        ring = _clip_edge(ring, axis, hi, keep_below=True)
+        ring = _clip_edge(ring, axis, lo, keep_below=False)
+    return ring
+
+
+def _simplify(ring: np.ndarray, tolerance: float) -> np.ndarray:
+    """Douglas–Peucker on a closed ring (without repeated end point)."""
+    if tolerance <= 0 or len(ring) < 5:
+        return ring
+    closed = np.vstack([ring, ring[:1]])
+    keep = np.zeros(len(closed), dtype=bool)
+    keep[0] = keep[-1] = True
+    # Split at the vertex farthest from the start so the closed ring has a real chord
+    far = int(np.argmax(np.hypot(*(closed - closed[0]).T)))
+    keep[far] = True
+    stack = [(0, far), (far, len(closed) - 1)]
+    while stack:
+        start, stop = stack.pop()
+        if stop - start < 2:
+            continue
+        a, b = closed[start], closed[stop]
+        segment = closed[start + 1:stop]
+        chord = b - a
+        length = math.hypot(chord[0], chord[1])
+        if length == 0.0:
+            dist = np.hypot(*(segment - a).T)
+        else:
+            dist = np.abs(chord[0] * (segment[:, 1] - a[1]) - chord[1] * (segment[:, 0] - a[0])) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            keep[start + 1 + i] = True
+            stack.append((start, start + 1 + i))
+            stack.append((start + 1 + i, stop))
+    return closed[keep][:-1]
+
+
+def _signed_area(ring: np.ndarray) -> float:
+    """Surveyor's formula in tile coordinates (y down): > 0 for clockwise-on-screen rings."""
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def tile_polygon(
+    rings: Sequence[np.ndarray],
+    z: int,
+    x: int,
+    y: int,
+    extent: int = MVT_EXTENT,
+    buffer: int = MVT_BUFFER,
+    tolerance: float = 1.0,
+) -> List[np.ndarray]:
+    """Cut one mercator polygon into integer tile coordinates.
+
+    Args:
+        rings: Exterior ring followed by holes, mercator XY(Z) vertices
+        z, x, y: XYZ tile
+        extent: Tile units per tile edge
+        buffer: Tile units kept around the tile
+        tolerance: Douglas–Peucker tolerance in tile units
+
+    Returns:
+        Rings as ``(k, 2)`` int arrays without repeated end point, exterior
+        clockwise and holes counter-clockwise on screen (y down); empty if
+        the exterior does not survive clipping and simplification
+    """
+    xmin, _ymin, _xmax, ymax = tile_bounds(z, x, y)
+    scale = extent / _tile_size(z)
+    out: List[np.ndarray] = []
+    for index, ring in enumerate(rings):
+        pts = np.asarray(ring, dtype=np.float64)[:, :2]
+        if len(pts) > 1 and np.array_equal(pts[0], pts[-1]):
+            pts = pts[:-1]
+        local = np.column_stack([(pts[:, 0] - xmin) * scale, (ymax - pts[:, 1]) * scale])
+        local = _clip_ring(local, -buffer, extent + buffer)
+        local = np.rint(_simplify(local, tolerance)).astype(np.int64)
+        if len(local):
+            local = local[np.any(local != np.roll(local, 1, axis=0), axis=1)]
+        area = _signed_area(local) if len(local) >= 3 else 0.0
+        if area == 0.0:
+            if index == 0:
+                return []
+            continue
+        exterior = index == 0
+        out.append(local if (area > 0) == exterior else local[::-1])
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Protocol buffer encoding
+# ---------------------------------------------------------------------------
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _bytes_field(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field: int, values: Sequence[int]) -> bytes:
+    return _bytes_field(field, b"".join(_varint(v) for v in values))
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _value(value: Any) -> bytes:
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        return _key(6, 0) + _varint(_zigzag(value))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode("utf-8"))
+
+
+def _geometry(rings: Sequence[np.ndarray]) -> List[int]:
+    commands: List[int] = []
+    cx = cy = 0
+    for ring in rings:
+        deltas = np.diff(ring, axis=0, prepend=[[cx, cy]])
+        cx, cy = int(ring[-1, 0]), int(ring[-1, 1])
+        params = [_zigzag(int(v)) for v in deltas.ravel()]
+        commands.append((_MOVE_TO & 0x7) | (1 << 3))
+        commands.extend(params[:2])
+        commands.append((_LINE_TO & 0x7) | ((len(ring) - 1) << 3))
+        commands.extend(params[2:])
+        commands.append((_CLOSE_PATH & 0x7) | (1 << 3))
+    return commands
+
+
+def encode_tile(layers: Mapping[str, TileLayer], extent: int = MVT_EXTENT) -> bytes:
+    """Encode tile layers as an (uncompressed) Vector Tile 2.1 message.
+
+    Args:
+        layers: Layer name -> (rings, properties) per feature; rings as
+            returned by :func:`tile_polygon`.  ``None`` values are omitted.
+        extent: Tile units per tile edge
+
+    Returns:
+        Protocol buffer bytes (empty layers are skipped)
+    """
+    tile = bytearray()
+    for name, features in layers.items():
+        if not features:
+            continue
+        keys: Dict[str, int] = {}
+        values: Dict[Tuple[type, Any], int] = {}
+        body = bytearray(_key(15, 0) + _varint(2) + _bytes_field(1, name.encode("utf-8")))
+        for feature_id, (rings, properties) in enumerate(features, start=1):
+            tags: List[int] = []
+            for key, value in properties.items():
+                if value is None:
+                    continue
+                tags.append(keys.setdefault(key, len(keys)))
+                tags.append(values.setdefault((type(value), value), len(values)))
+            message = _key(1, 0) + _varint(feature_id)
+            if tags:
+                message += _packed(2, tags)
+            message += _key(3, 0) + _varint(_POLYGON) + _packed(4, _geometry(rings))
+            body += _bytes_field(2, message)
+        for key in keys:
+            body += _bytes_field(3, key.encode("utf-8"))
+        for _kind, value in values:
+            body += _bytes_field(4, _value(value))
+        body += _key(5, 0) + _varint(extent)
+        tile += _bytes_field(3, bytes(body))
+    return bytes(tile)
@@ -0,0 +1,179 @@
+"""Viewport-driven materialisation of BRAs for large navaid inventories.
+
+A :class:`ViewportEngine` holds a whole inventory as resolved parameters
+only.  Navaids are bucketed into square tiles by position; on every view
+change the engine computes the tiles overlapping the extent plus a margin
+(by default the largest BRA reach of the inventory, so every BRA reaching
+into the view is included) with the vectorised kernel, and keeps the
+results in a bounded LRU cache keyed by tile.  Tiles that fall out of the
+cache are reported as removed so the display layer can drop them.  The
+module is QGIS-free.
+
+Usage
+-----
+    engine = ViewportEngine(directional, omni)      # from resolve_records()
+    update = engine.update((xmin, ymin, xmax, ymax))
+    for tile in update.added:
+        ...   # add tile.features to the display layer
+    for key in update.removed:
+        ...   # drop the features of tile ``key``
+"""
+
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..constants import (
+    OMNI_SEGMENTS,
+    VIEWPORT_CACHE_TILES,
+    VIEWPORT_MAX_NAVAIDS,
+    VIEWPORT_TILE_SIZE_M,
+)
+from ..models.omni_parameters import OmniParameters
+from ..workers.process_backend import ProcessPoolBackend
+from .batch import Feature, Navaid, iter_features
+
+Extent = Tuple[float, float, float, float]
+TileKey = Tuple[int, int]
+
+
+def navaid_reach(params: Any) -> float:
+    """Return a conservative distance from the navaid to the far edge of its BRA."""
+    if isinstance(params, OmniParameters):
+        return max(params.R, params.j if params.turbine else 0.0)
+    return math.hypot(max(params.r, params.a + params.b), max(params.D, params.L))
+
+
+@dataclass
+class Tile:
+    """Computed BRA features of the navaids located in one tile."""
+
+    key: TileKey
+    navaids: int
+    features: List[Feature] = field(default_factory=list)
+
+
+@dataclass
+class ViewportUpdate:
+    """Outcome of one view change.
+
+    Attributes:
+        added: Tiles computed for this view
+        removed: Keys of tiles evicted from the cache
+        visible: Keys of all tiles needed for this view
+        skipped: True if the view held more than ``max_navaids`` navaids and
+            nothing was materialised
+    """
+
+    added: List[Tile] = field(default_factory=list)
+    removed: List[TileKey] = field(default_factory=list)
+    visible: List[TileKey] = field(default_factory=list)
+    skipped: bool = False
+
+
+class ViewportEngine:
+    """Compute BRAs on demand for the navaids around the current view."""
+
+    def __init__(
+        self,
+        directional: Sequence[Navaid],
+        omni: Sequence[Navaid],
+        backend: Any = None,
+        tile_size: float = VIEWPORT_TILE_SIZE_M,
+        margin: Optional[float] = None,
+        max_tiles: int = VIEWPORT_CACHE_TILES,
+        max_navaids: int = VIEWPORT_MAX_NAVAIDS,
+        arc_segments: int = OMNI_SEGMENTS // 4,
+        segments: int = OMNI_SEGMENTS,
+    ) -> None:
+        """Index the inventory.
+
+        Args:
+            directional: Resolved directional navaids
+            omni: Resolved omni navaids
+            backend: Kernel backend (defaults to an in-process ProcessPoolBackend)
+            tile_size: Tile edge length in layer units
+            margin: Extent padding; defaults to the largest BRA reach
+            max_tiles: Tiles kept in the cache (visible tiles are never evicted)
+            max_navaids: Views needing more navaids are not materialised
+            arc_segments: Segments per directional slope arc
+            segments: Segments per omni circle
+        """
+        if tile_size <= 0 or max_tiles < 1:
+            raise ValueError("tile_size must be > 0 and max_tiles >= 1")
+        self._backend = backend if backend is not None else ProcessPoolBackend(max_workers=1)
+        self.tile_size = float(tile_size)
+        self.max_tiles = max_tiles
+        self.max_navaids = max_navaids
+        self._arc_segments = arc_segments
+        self._segments = segments
+        self._tiles: Dict[TileKey, Tuple[List[Navaid], List[Navaid]]] = {}
+        reach = 0.0
+        for navaids, slot in ((directional, 0), (omni, 1)):
+            for navaid in navaids:
+                self._tiles.setdefault(self.tile_key(*navaid[1]), ([], []))[slot].append(navaid)
+                reach = max(reach, navaid_reach(navaid[0]))
+        self.margin = reach if margin is None else float(margin)
+        self._cache: "OrderedDict[TileKey, Tile]" = OrderedDict()
+
+    def tile_key(self, x: float, y: float) -> TileKey:
+        """Return the key of the tile containing a point."""
+        return (math.floor(x / self.tile_size), math.floor(y / self.tile_size))
+
+    @property
+    def cached(self) -> List[TileKey]:
+        """Keys of the cached tiles, least recently used first."""
+        return list(self._cache)
+
+    def visible_tiles(self, extent: Extent) -> List[TileKey]:
+        """Return the non-empty tiles overlapping ``extent`` plus the margin."""
+        xmin, ymin, xmax, ymax = extent
+        ix0, iy0 = self.tile_key(xmin - self.margin, ymin - self.margin)
+        ix1, iy1 = self.tile_key(xmax + self.margin, ymax + self.margin)
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(self._tiles):
+            return sorted(k for k in self._tiles if ix0 <= k[0] <= ix1 and iy0 <= k[1] <= iy1)
+        return [(ix, iy) for ix in range(ix0, ix1 + 1) for iy in range(iy0, iy1 + 1) if (ix, iy) in self._tiles]
+
+    def update(self, extent: Extent) -> ViewportUpdate:
+        """Materialise the tiles needed for a view and evict stale ones.
+
+        Args:
+            extent: (xmin, ymin, xmax, ymax) of the view in layer units
+        """
+        visible = self.visible_tiles(extent)
+        count = sum(len(d) + len(o) for d, o in (self._tiles[k] for k in visible))
+        if count > self.max_navaids:
+            return ViewportUpdate(visible=visible, skipped=True)
+
+        missing = [key for key in visible if key not in self._cache]
+        added = self._compute(missing)
+        for tile in added:
+            self._cache[tile.key] = tile
+        for key in visible:
+            self._cache.move_to_end(key)
+
+        removed: List[TileKey] = []
+        keep = set(visible)
+        for key in list(self._cache):
+            if len(self._cache) <= self.max_tiles:
+                break
+            if key not in keep:
+                del self._cache[key]
+                removed.append(key)
+        return ViewportUpdate(added=added, removed=removed, visible=visible)
+
+    def clear(self) -> List[TileKey]:
+        """Drop the cache; returns the keys of the dropped tiles."""
+        keys = list(self._cache)
+        self._cache.clear()
+        return keys
+
+    def _compute(self, keys: Sequence[TileKey]) -> List[Tile]:
+        """Compute tiles, one vectorised kernel call per tile and kind."""
+        tiles = []
+        for key in keys:
+            directional, omni = self._tiles[key]
+            features = list(iter_features(directional, omni, self._backend, self._arc_segments, self._segments))
+            tiles.append(Tile(key, len(directional) + len(omni), features))
+        return tiles
@@ -0,0 +1,210 @@
+"""Direct WKB encoding of BRA surfaces.
+
+Building a BRA polygon through PyQGIS objects creates one ``QgsPoint`` per
+vertex plus the ``QgsLineString`` / ``QgsPolygon`` / ``QgsGeometry``
+wrappers around them (an omni ring alone has 129 vertices).  The encoder
+writes ISO WKB for PolygonZ and CurvePolygonZ straight from coordinate
+arrays into a reusable ``bytearray``, so each feature needs a single
+``QgsGeometry.fromWkb`` call instead.  The module is QGIS-free.
+
+Usage
+-----
+    encoder = WkbEncoder()
+    wkb = encoder.polygon_z([exterior, hole])          # memoryview
+    geometry = QgsGeometry()
+    geometry.fromWkb(bytes(wkb))
+
+The returned ``memoryview`` points into the encoder's buffer and is only
+valid until the next encode call; copy it (``bytes(wkb)``) to keep it.
+
+:func:`decode_polygons` reads (Multi)Polygon WKB back into XYZ ring
+arrays, e.g. to index the features of a BRA layer without going through
+``QgsPoint`` objects.
+
+Public API
+----------
+WkbEncoder.polygon_z(rings) -> memoryview
+WkbEncoder.curve_polygon_z(line, arc) -> memoryview
+WkbEncoder.directional(vertices) -> List[bytes]
+WkbEncoder.omni(vertices, segments) -> List[bytes]
+decode_polygons(wkb) -> List[List[ndarray]]
+"""
+
+import struct
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+from ..constants import OMNI_SEGMENTS
+from ..exceptions import BRAError
+from .kernel import DIRECTIONAL_OFFSETS, DIRECTIONAL_TEMPLATES, omni_rings
+
+#: ISO WKB type codes (Z variants).
+WKB_POLYGON = 3
+WKB_MULTIPOLYGON = 6
+WKB_LINESTRING_Z = 1002
+WKB_POLYGON_Z = 1003
+WKB_CIRCULARSTRING_Z = 1008
+WKB_COMPOUNDCURVE_Z = 1009
+WKB_CURVEPOLYGON_Z = 1010
+
+_HEADER = struct.Struct("<BI")
+_COUNT = struct.Struct("<I")
+
+
+def _coords(points: Any) -> np.ndarray:
+    return np.ascontiguousarray(points, dtype="<f8").reshape(-1, 3)
+
+
+class WkbEncoder:
+    """Encode XYZ polygons to little-endian ISO WKB in a reusable buffer."""
+
+    def __init__(self, capacity: int = 4096) -> None:
+        """Initialize the encoder.
+
+        Args:
+            capacity: Initial buffer size in bytes (grows on demand)
+        """
+        self._buffer = bytearray(capacity)
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._buffer):
+            # A fresh buffer, never an in-place resize: views handed out
+            # earlier keep the old one alive instead of blocking the growth
+            self._buffer = bytearray(max(size, 2 * len(self._buffer)))
+
+    def _header(self, offset: int, code: int) -> int:
+        _HEADER.pack_into(self._buffer, offset, 1, code)
+        return offset + _HEADER.size
+
+    def _count(self, offset: int, count: int) -> int:
+        _COUNT.pack_into(self._buffer, offset, count)
+        return offset + _COUNT.size
+
+    def _points(self, offset: int, coords: np.ndarray) -> int:
+        offset = self._count(offset, len(coords))
+        np.frombuffer(self._buffer, dtype="<f8", count=coords.size, offset=offset)[:] = coords.ravel()
+        return offset + coords.nbytes
+
+    def polygon_z(self, rings: Sequence[Any]) -> memoryview:
+        """Encode a PolygonZ.
+
+        Args:
+            rings: Closed rings (exterior first), each ``(k, 3)`` array-like
+
+        Returns:
+            WKB bytes (valid until the next encode call)
+        """
+        arrays = [_coords(ring) for ring in rings]
+        size = _HEADER.size + _COUNT.size + sum(_COUNT.size + a.nbytes for a in arrays)
+        self._reserve(size)
+        offset = self._count(self._header(0, WKB_POLYGON_Z), len(arrays))
+        for coords in arrays:
+            offset = self._points(offset, coords)
+        return memoryview(self._buffer)[:offset]
+
+    def curve_polygon_z(self, line: Any, arc: Any) -> memoryview:
+        """Encode a CurvePolygonZ whose exterior is a straight part plus one arc.
+
+        The exterior is a CompoundCurveZ of a LineStringZ (``line``) and a
+        CircularStringZ (``arc``: start, mid, end); ``line`` ends where
+        ``arc`` starts and ``arc`` ends where ``line`` starts.
+
+        Returns:
+            WKB bytes (valid until the next encode call)
+        """
+        line, arc = _coords(line), _coords(arc)
+        size = 4 * (_HEADER.size + _COUNT.size) + line.nbytes + arc.nbytes
+        self._reserve(size)
+        offset = self._count(self._header(0, WKB_CURVEPOLYGON_Z), 1)
+        offset = self._count(self._header(offset, WKB_COMPOUNDCURVE_Z), 2)
+        offset = self._points(self._header(offset, WKB_LINESTRING_Z), line)
+        offset = self._points(self._header(offset, WKB_CIRCULARSTRING_Z), arc)
+        return memoryview(self._buffer)[:offset]
+
+    def directional(self, vertices: np.ndarray) -> List[bytes]:
+        """Encode one navaid's kernel vertices, one WKB per directional template.
+
+        The slope keeps its true arc (CurvePolygonZ), as ``build_layers`` does.
+
+        Args:
+            vertices: ``(DIRECTIONAL_VERTEX_COUNT, 3)`` array of one navaid
+        """
+        out = []
+        for template, (start, stop) in zip(DIRECTIONAL_TEMPLATES, DIRECTIONAL_OFFSETS):
+            ring = vertices[start:stop]
+            if template.arc_start is None:
+                out.append(bytes(self.polygon_z([ring])))
+            else:
+                i = template.arc_start
+                out.append(bytes(self.curve_polygon_z(ring[:i + 1], ring[i:])))
+        return out
+
+    def omni(self, vertices: np.ndarray, segments: int = OMNI_SEGMENTS) -> List[bytes]:
+        """Encode one navaid's omni vertices, one WKB per present surface."""
+        return [bytes(self.polygon_z(rings)) for rings in omni_rings(vertices, segments)]
+
+
+
+def _geometry_type(code: int) -> Tuple[int, bool, bool]:
+    """Split an ISO or EWKB type code into (base type, has Z, has M)."""
+    dims = (code & 0xFFFF) // 1000
+    has_z = bool(code & 0x80000000) or dims in (1, 3)
+    has_m = bool(code & 0x40000000) or dims in (2, 3)
+    return (code & 0xFFFF) % 1000, has_z, has_m
+
+
+def _read_polygon(data: bytes, offset: int, endian: str, has_z: bool, has_m: bool) -> Tuple[List[np.ndarray], int]:
+    (ring_count,) = struct.unpack_from(endian + "I", data, offset)
+    offset += 4
+    dims = 2 + has_z + has_m
+    rings = []
+    for _ in range(ring_count):
+        (count,) = struct.unpack_from(endian + "I", data, offset)
+        offset += 4
+        coords = np.frombuffer(data, dtype=endian + "f8", count=count * dims, offset=offset).reshape(-1, dims)
+        offset += coords.nbytes
+        ring = np.full((count, 3), np.nan)
+        ring[:, :2] = coords[:, :2]
+        if has_z:
+            ring[:, 2] = coords[:, 2]
+        rings.append(ring)
+    return rings, offset
+
+
+def _read_header(data: bytes, offset: int) -> Tuple[str, int, bool, bool, int]:
+    endian = "<" if data[offset] == 1 else ">"
+    (code,) = struct.unpack_from(endian + "I", data, offset + 1)
+    offset += 5
+    if code & 0x20000000:
+        offset += 4  # EWKB SRID
+    return (endian,) + _geometry_type(code) + (offset,)
+
+
+def decode_polygons(wkb: bytes) -> List[List[np.ndarray]]:
+    """Decode Polygon or MultiPolygon WKB (ISO or EWKB, any byte order).
+
+    Args:
+        wkb: Geometry WKB
+
+    Returns:
+        Polygons, each a list of ``(k, 3)`` XYZ rings (exterior first); Z is
+        NaN for 2D geometries
+
+    Raises:
+        BRAError: If the geometry is not a (Multi)Polygon
+    """
+    data = bytes(wkb)
+    endian, base, has_z, has_m, offset = _read_header(data, 0)
+    if base == WKB_POLYGON:
+        return [_read_polygon(data, offset, endian, has_z, has_m)[0]]
+    if base != WKB_MULTIPOLYGON:
+        raise BRAError("Unsupported WKB geometry", f"type {base} (expected Polygon or MultiPolygon)")
+    (count,) = struct.unpack_from(endian + "I", data, offset)
+    offset += 4
+    polygons = []
+    for _ in range(count):
+        endian, base, has_z, has_m, offset = _read_header(data, offset)
+        rings, offset = _read_polygon(data, offset, endian, has_z, has_m)
+        polygons.append(rings)
+    return polygons
@@ -1,24 +1,75 @@
 """QGIS Plugin main class for qBRA."""
 
-from typing import Any, Optional
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+import logging
 import os
 
-from qgis.PyQt.QtCore import QObject
+from qgis.PyQt.QtCore import QObject, QThread, QTimer
 from qgis.PyQt.QtGui import QIcon
-from qgis.PyQt.QtWidgets import QAction
+from qgis.PyQt.QtWidgets import QAction, QFileDialog
 from qgis.core import QgsProject, QgsVectorLayer
+from qgis.gui import QgsMapToolEmitPoint
 
 from .dockwidgets.ils.ils_llz_dockwidget import IlsLlzDockWidget
 from .models.bra_parameters import BRAParameters
-from .exceptions import LayerNotFoundError
-from .workers.bra_worker import BRAWorker
-from .modules.ils_llz_logic import build_layers_omni
-from .utils.logging_config import get_logger
-from .utils.qt_compat import MsgSuccess, MsgWarning, MsgCritical
+from .models.bra_recipe import BRARecipe
+from .models.layer_data import BRALayerData
+from .models.linked_bra import LinkedBRA
+from .models.omni_parameters import OmniParameters
+from .exceptions import BRAError, LayerNotFoundError
+from .constants import LINK_DEBOUNCE_MS, OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI, VIEWPORT_DEBOUNCE_MS
+from .services.output_service import OutputLayerService
+from .services.link_service import LinkRegistry, refresh_directional_params
+from .services.materialise_service import LayerMaterialiser
+from .services.calculation_queue import CalculationJob, CalculationQueue
+from .services.regeneration_service import RegenerationService
+from .services.mbtiles_sink import is_mbtiles_path
+from .services.point_query_service import BRAQueryService, describe_hit
+from .services.tile_export_service import export_bra_layers
+from .services.inventory_service import runways_from_records
+from .services.viewport_service import ViewportLayer, layer_records
+from .modules.batch import resolve_records
+from .modules.viewport import ViewportEngine
+from .workers.bra_worker import BatchTask, BRABatchWorker, BRAWorker
+from .modules.ils_llz_logic import build_layers_omni, map_crs_authid, navaid_point, scenario_layer_data
+from .modules.footprint import build_footprint_layer, footprint_kind
+from .modules.kernel import DIRECTIONAL_TEMPLATES
+from .modules.aggregation import build_aerodrome_envelopes
+from .modules.terrain import analyse_terrain
+from .modules.turbine_screening import build_screening_layers
+from .services.layer_service import LayerService
+from .utils.logging_config import get_logger, start_queue_logging, stop_queue_logging
+from .utils.profiling import capture_profile
+from .utils.qt_compat import MsgInfo, MsgSuccess, MsgWarning, MsgCritical
 
 # Module logger
 logger = get_logger(__name__)
 
+
+def _dispose_thread(worker: Optional[QThread]) -> None:
+    """Delete a worker thread once its run() has returned.
+
+    Workers report through their own signals just before run() returns, so
+    the thread may still be running in the slot; Qt aborts when a running
+    QThread is destroyed, hence the wait().
+    """
+    if worker is not None:
+        worker.wait()
+        worker.deleteLater()
+
+
+def _batch_task(link: LinkedBRA) -> BatchTask:
+    """Snapshot a linked BRA as plain data for the batch worker (main thread)."""
+    layer = QgsProject.instance().mapLayer(link.navaid_layer_id)
+    if link.kind == OUTPUT_KIND_OMNI:
+        params: Any = OmniParameters.from_dict(link.params)
+    else:
+        params = replace(link.params, active_layer=None)
+    return BatchTask(
+        link.kind, params, navaid_point(layer, link.navaid_fid), f"{link.facility_key}#{link.navaid_fid}"
+    )
+
 class QbraPlugin(QObject):
     """Main plugin class for qBRA - Building Restriction Areas."""
     
@@ -32,12 +83,45 @@ class QbraPlugin(QObject):
         self.iface: Any = iface
         self._action: Optional[QAction] = None
         self._dock: Optional[IlsLlzDockWidget] = None
-        self._worker: Optional[BRAWorker] = None
+        # Calculate clicks are queued; one BRAWorker per running job
+        self._queue: CalculationQueue = CalculationQueue()
+        self._workers: Dict[int, BRAWorker] = {}
+        self._output_service: OutputLayerService = OutputLayerService()
+        # Workers compute plain data; layers are built here in time slices
+        self._materialiser: LayerMaterialiser = LayerMaterialiser(self)
+        # Linked mode: source edits mark BRAs dirty; the timer coalesces bursts
+        self._links: LinkRegistry = LinkRegistry()
+        self._watched_layers: Dict[str, List[Tuple[Any, Any]]] = {}
+        self._link_worker: Optional[BRABatchWorker] = None
+        self._link_timer: QTimer = QTimer(self)
+        self._link_timer.setSingleShot(True)
+        self._link_timer.setInterval(LINK_DEBOUNCE_MS)
+        self._link_timer.timeout.connect(self._on_link_timeout)
+        # Stored BRA layers: regenerated from their recipe once rendered/queried
+        self._regeneration: RegenerationService = RegenerationService(iface)
+        self._regen_action: Optional[QAction] = None
+        self._regen_timer: QTimer = QTimer(self)
+        self._regen_timer.setSingleShot(True)
+        self._regen_timer.setInterval(0)
+        self._regen_timer.timeout.connect(self._regenerate_visible)
+        # Viewport mode: BRAs of the navaids around the canvas extent only
+        self._viewport: Optional[ViewportLayer] = None
+        self._viewport_action: Optional[QAction] = None
+        self._tiles_action: Optional[QAction] = None
+        # Point query: R-tree over all BRA layers, kept current as layers come and go
+        self._query: BRAQueryService = BRAQueryService()
+        self._query_action: Optional[QAction] = None
+        self._query_tool: Optional[QgsMapToolEmitPoint] = None
+        self._viewport_timer: QTimer = QTimer(self)
+        self._viewport_timer.setSingleShot(True)
+        self._viewport_timer.setInterval(VIEWPORT_DEBOUNCE_MS)
+        self._viewport_timer.timeout.connect(self._update_viewport)
         self.plugin_dir: str = os.path.dirname(__file__)
         self._icon: QIcon = QIcon(os.path.join(self.plugin_dir, "icons", "qbra.svg"))
 
     def initGui(self) -> None:
         """Initialize the graphical user interface."""
+        start_queue_logging()
         self._action = QAction("QBRA ILS/LLZ", self.iface.mainWindow())
         self._action.setObjectName("qbra_ils_llz_action")
         # Apply plugin icon to toolbar/menu action
@@ -49,20 +133,74 @@ class QbraPlugin(QObject):
         self._action.triggered.connect(self._toggle_dock)
         self.iface.addToolBarIcon(self._action)
         self.iface.addPluginToMenu("QBRA", self._action)
+        self._regen_action = QAction("Regenerate stored BRA layers", self.iface.mainWindow())
+        self._regen_action.triggered.connect(self._regenerate_all)
+        self.iface.addPluginToMenu("QBRA", self._regen_action)
+        self._viewport_action = QAction("Show BRAs of navaids in view", self.iface.mainWindow())
+        self._viewport_action.setCheckable(True)
+        self._viewport_action.toggled.connect(self._toggle_viewport)
+        self.iface.addPluginToMenu("QBRA", self._viewport_action)
+        self._tiles_action = QAction("Export BRA layers to MBTiles…", self.iface.mainWindow())
+        self._tiles_action.triggered.connect(self._export_tiles)
+        self.iface.addPluginToMenu("QBRA", self._tiles_action)
+        self._query_action = QAction("Query BRAs at point", self.iface.mainWindow())
+        self._query_action.setCheckable(True)
+        self._query_action.toggled.connect(self._toggle_point_query)
+        self.iface.addPluginToMenu("QBRA", self._query_action)
+        for signal, slot in self._regeneration_connections() + self._query_connections():
+            signal.connect(slot)
+        self._query.add_layers(QgsProject.instance().mapLayers().values())
+        self._on_project_read()
 
     def unload(self) -> None:
         """Clean up and remove plugin resources."""
-        if self._worker and self._worker.isRunning():
-            self._worker.quit()
-            self._worker.wait()
-        self._worker = None
+        self._queue.cancel()
+        for worker in self._workers.values():
+            if worker.isRunning():
+                worker.quit()
+                worker.wait()
+        self._workers.clear()
+        self._queue.clear()
+        self._materialiser.clear()
+        self._link_timer.stop()
+        if self._link_worker and self._link_worker.isRunning():
+            self._link_worker.quit()
+            self._link_worker.wait()
+        self._link_worker = None
+        for layer_id in list(self._watched_layers):
+            self._unwatch_layer(layer_id)
+        self._regen_timer.stop()
+        for signal, slot in self._regeneration_connections() + self._query_connections():
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        if self._regen_action:
+            self.iface.removePluginMenu("QBRA", self._regen_action)
+            self._regen_action = None
+        self._stop_viewport()
+        if self._viewport_action:
+            self.iface.removePluginMenu("QBRA", self._viewport_action)
+            self._viewport_action = None
+        if self._tiles_action:
+            self.iface.removePluginMenu("QBRA", self._tiles_action)
+            self._tiles_action = None
+        if self._query_action:
+            self._query_action.setChecked(False)
+            self.iface.removePluginMenu("QBRA", self._query_action)
+            self._query_action = None
+        self._query_tool = None
+        self._query.clear()
         if self._action:
             self.iface.removePluginMenu("QBRA", self._action)
             self.iface.removeToolBarIcon(self._action)
             self._action = None
         if self._dock:
+            self._dock.release()
             self.iface.removeDockWidget(self._dock)
             self._dock = None
+        # Forward pending log records before the plugin goes away
+        stop_queue_logging()
 
     def _toggle_dock(self) -> None:
         """Toggle the dock widget visibility."""
@@ -78,6 +216,11 @@ class QbraPlugin(QObject):
                 # Icon setting can fail, but it's cosmetic
                 logger.debug("Failed to set dock window icon: %s", e)
             self._dock.calculateRequested.connect(self._on_calculate)
+            self._dock.envelopesRequested.connect(self._on_build_envelopes)
+            self._dock.terrainRequested.connect(self._on_terrain_check)
+            self._dock.turbinesRequested.connect(self._on_turbine_screening)
+            self._dock.scenariosRequested.connect(self._on_scenarios)
+            self._dock.cancelQueuedRequested.connect(self._on_cancel_queued)
             self._dock.closedRequested.connect(lambda: self._dock.hide())
             self.iface.addDockWidget(self._dock.defaultArea(), self._dock)
         # refresh layers each time we open to reflect current project state
@@ -94,9 +237,6 @@ class QbraPlugin(QObject):
 
     def _on_calculate(self) -> None:
         """Handle calculate button click — dispatches to omni or directional calculation."""
-        if self._worker and self._worker.isRunning():
-            return  # BUG-02: ignore re-entrant calls while a calculation is in flight
-
         if not self._dock:
             return
 
@@ -105,9 +245,35 @@ class QbraPlugin(QObject):
             omni_params = self._dock.get_omni_parameters()
             if not omni_params:
                 return
+            profile_dir = self._dock.take_profile_request()
             try:
-                result_layer = build_layers_omni(self.iface, omni_params)
-                QgsProject.instance().addMapLayer(result_layer)
+                if profile_dir is None:
+                    result_layer = build_layers_omni(self.iface, omni_params)
+                else:
+                    capture = None
+                    try:
+                        with capture_profile(profile_dir, f"omni_{omni_params.get('facility_key') or ''}") as capture:
+                            result_layer = build_layers_omni(self.iface, omni_params)
+                    finally:
+                        # Unbound if the profiler failed to start: keep its own error
+                        if capture is not None and capture.summary_path:
+                            self._on_profiled(capture.summary_path)
+                self._publish_result(
+                    result_layer,
+                    OUTPUT_KIND_OMNI,
+                    omni_params["active_layer"].id(),
+                    omni_params.get("navaid_fid"),
+                    omni_params.get("facility_key") or "",
+                    recipe_params=omni_params,
+                )
+                if self._dock.is_linked_mode():
+                    self._register_link(LinkedBRA(
+                        kind=OUTPUT_KIND_OMNI,
+                        params=omni_params,
+                        navaid_layer_id=omni_params["active_layer"].id(),
+                        navaid_fid=omni_params["navaid_fid"],
+                        facility_key=omni_params.get("facility_key") or "",
+                    ))
                 self.iface.messageBar().pushMessage(
                     "QBRA", "BRA omni areas created successfully", level=MsgSuccess
                 )
@@ -123,29 +289,630 @@ class QbraPlugin(QObject):
         if not params:
             return
 
-        self._dock.set_calculating(True)
-        self._worker = BRAWorker(self.iface, params, parent=self)
-        self._worker.finished.connect(self._on_calculation_finished)
-        self._worker.error.connect(self._on_calculation_error)
-        self._worker.finished.connect(lambda _: self._dock.set_calculating(False) if self._dock else None)
-        self._worker.error.connect(lambda _: self._dock.set_calculating(False) if self._dock else None)
-        self._worker.start()
+        # Snapshot the click: later dock edits do not affect the queued job, and
+        # the worker gets the navaid position and map CRS, never the layer
+        try:
+            navaid_xy = navaid_point(params.active_layer, params.navaid_fid)
+        except BRAError as e:
+            self._on_calculation_error(e.message)
+            return
+        self._queue.submit(
+            params,
+            self._dock.routing_source(),
+            self._dock.is_linked_mode(),
+            self._dock.take_profile_request(),
+            navaid_xy=navaid_xy,
+            crs_authid=map_crs_authid(self.iface),
+        )
+        self._start_jobs()
+
+    def _start_jobs(self) -> None:
+        """Start a worker for every queued job the concurrency limit allows."""
+        for job in self._queue.start_ready():
+            worker = BRAWorker(
+                replace(job.params, active_layer=None),
+                job.navaid_xy,
+                job.crs_authid,
+                parent=self,
+                profile_dir=job.profile_dir,
+            )
+            worker.profiled.connect(self._on_profiled)
+            worker.finished.connect(lambda data, job=job: self._on_worker_finished(job, data))
+            worker.error.connect(lambda message, job=job: self._on_worker_error(job, message))
+            self._workers[job.id] = worker
+            worker.start()
+        self._update_queue_view()
+
+    def _on_worker_finished(self, job: CalculationJob, data: BRALayerData) -> None:
+        """Queue the computed surfaces for materialisation on this thread.
+
+        Results are materialised in submission order, whatever order the
+        workers finish in.
+        """
+        self._release_worker(job)
+        self._materialise(self._queue.complete(job.id, data))
+        self._start_jobs()
+
+    def _on_worker_error(self, job: CalculationJob, message: str) -> None:
+        """Report a failed job and carry on with the queue."""
+        self._release_worker(job)
+        self._on_calculation_error(f"{job.label}: {message}")
+        self._materialise(self._queue.fail(job.id))
+        self._start_jobs()
+
+    def _release_worker(self, job: CalculationJob) -> None:
+        """Forget the worker of a finished job and let Qt delete its thread."""
+        _dispose_thread(self._workers.pop(job.id, None))
+
+    def _materialise(self, released: List[Tuple[CalculationJob, BRALayerData]]) -> None:
+        """Hand released job results to the materialiser."""
+        if released:
+            items = [((job.params, job.routing, job.linked), data) for job, data in released]
+            self._materialiser.submit(items, self._on_materialised)
+
+    def _on_materialised(self, results: List[Tuple[Any, QgsVectorLayer]]) -> None:
+        """Publish materialised directional results."""
+        for (params, routing, linked), layer in results:
+            self._on_calculation_finished(layer, params, routing, linked)
+        self._update_queue_view()
 
-    def _on_calculation_finished(self, result_layer: Optional[QgsVectorLayer]) -> None:
-        """Receive the completed layer from BRAWorker and add it to the project."""
+    def _on_cancel_queued(self) -> None:
+        """Drop the selected queued calculations (all of them if none is selected)."""
+        if not self._dock:
+            return
+        cancelled = self._queue.cancel(self._dock.queued_selection())
+        self._update_queue_view()
+        if cancelled:
+            self.iface.messageBar().pushMessage(
+                "QBRA", f"Cancelled {len(cancelled)} queued calculation(s)", level=MsgInfo
+            )
+
+    def _update_queue_view(self) -> None:
+        """Show the running and queued calculations in the dock."""
+        if self._dock:
+            self._dock.set_queue(
+                [job.label for job in self._queue.running],
+                [(job.id, job.label) for job in self._queue.pending],
+            )
+
+    def _on_profiled(self, summary_path: str) -> None:
+        """Tell the user where the profile of the last calculation was saved."""
+        self.iface.messageBar().pushMessage(
+            "QBRA", f"Calculation profile saved: {summary_path}", level=MsgInfo
+        )
+
+    def _on_build_envelopes(self) -> None:
+        """Aggregate every BRA layer in the project into aerodrome envelopes."""
+        layers = LayerService(self.iface).get_bra_layers()
+        if not layers:
+            self.iface.messageBar().pushMessage("QBRA", "No BRA layers in the project", level=MsgWarning)
+            return
+        try:
+            envelopes = build_aerodrome_envelopes(layers)
+        except BRAError as e:
+            self._on_calculation_error(e.message)
+            return
+        QgsProject.instance().addMapLayer(envelopes)
+        self.iface.messageBar().pushMessage(
+            "QBRA",
+            f"Aerodrome envelopes built from {len(layers)} BRA layer(s)",
+            level=MsgSuccess,
+        )
+
+    def _on_scenarios(self) -> None:
+        """Compute every requested facility × direction scenario of the selected navaid."""
+        if not self._dock:
+            return
+        if self._dock.is_omni_mode():
+            self.iface.messageBar().pushMessage(
+                "QBRA", "Scenario comparison needs directional mode", level=MsgWarning
+            )
+            return
+        params: Optional[BRAParameters] = self._dock.get_parameters()
+        routing = self._dock.routing_source()
+        if not params or not routing:
+            return
+        routing_layer = QgsProject.instance().mapLayer(routing[0])
+        geom = routing_layer.getFeature(routing[1]).geometry()
+        pts = geom.asMultiPolyline()[0] if geom.isMultipart() else geom.asPolyline()
+        keys, directions = self._dock.scenario_request()
+        try:
+            data = scenario_layer_data(self.iface, params, pts, keys, directions)
+        except BRAError as e:
+            self._on_calculation_error(e.message)
+            return
+        count = len(data) // len(DIRECTIONAL_TEMPLATES)
+        self._materialiser.submit([(count, data)], self._on_scenarios_materialised)
+
+    def _on_scenarios_materialised(self, results: List[Tuple[Any, QgsVectorLayer]]) -> None:
+        """Add materialised scenario layers to the project."""
+        for count, layer in results:
+            QgsProject.instance().addMapLayer(layer)
+            self.iface.messageBar().pushMessage(
+                "QBRA", f"{count} BRA scenario(s) created in '{layer.name()}'", level=MsgSuccess
+            )
+
+    def _on_terrain_check(self) -> None:
+        """Compare every BRA layer in the project against the chosen DEM."""
+        dem_id = self._dock.dem_layer_id()
+        dem = QgsProject.instance().mapLayer(dem_id) if dem_id else None
+        if dem is None:
+            self.iface.messageBar().pushMessage("QBRA", "Select a DEM layer first", level=MsgWarning)
+            return
+        layers = LayerService(self.iface).get_bra_layers()
+        if not layers:
+            self.iface.messageBar().pushMessage("QBRA", "No BRA layers in the project", level=MsgWarning)
+            return
+        try:
+            penetrations, report, areas = analyse_terrain(dem, layers)
+        except BRAError as e:
+            self._on_calculation_error(e.message)
+            return
+        if not penetrations:
+            self.iface.messageBar().pushMessage("QBRA", "No terrain penetrates the BRAs", level=MsgSuccess)
+            return
+        QgsProject.instance().addMapLayer(areas)
+        QgsProject.instance().addMapLayer(report)
+        area = sum(item.area for item in penetrations)
+        self.iface.messageBar().pushMessage(
+            "QBRA",
+            f"Terrain penetrates {len(penetrations)} BRA surface(s), {area:,.0f} m\u00b2 in total",
+            level=MsgWarning,
+        )
+
+    def _on_turbine_screening(self) -> None:
+        """Screen the chosen turbine layer against every omni site of the navaid layer."""
+        params = self._dock.get_screening_parameters()
+        if not params:
+            return
+        try:
+            screening, site_layer, turbine_layer = build_screening_layers(
+                params["site_layer"], params["turbine_layer"], params
+            )
+        except BRAError as e:
+            self._on_calculation_error(e.message)
+            return
+        project = QgsProject.instance()
+        project.addMapLayer(site_layer)
+        project.addMapLayer(turbine_layer)
+        infringing = int((screening.turbine_infringing > 0).sum())
+        within = int((screening.turbine_within > 0).sum())
+        self.iface.messageBar().pushMessage(
+            "QBRA",
+            f"Turbine screening: {within} turbine(s) within j, {infringing} infringing",
+            level=MsgWarning if infringing else MsgSuccess,
+        )
+
+    def _on_calculation_finished(
+        self,
+        result_layer: Optional[QgsVectorLayer],
+        params: Optional[BRAParameters],
+        routing: Optional[Tuple[str, int]],
+        linked: bool,
+    ) -> None:
+        """Add a completed directional layer to the project (and link it if requested)."""
         if result_layer:
-            QgsProject.instance().addMapLayer(result_layer)
+            try:
+                self._publish_result(
+                    result_layer,
+                    OUTPUT_KIND_DIRECTIONAL,
+                    params.active_layer.id() if params else "",
+                    params.navaid_fid if params else None,
+                    params.facility_key if params else "",
+                    recipe_params=params,
+                )
+            except BRAError as e:
+                self._on_calculation_error(e.message)
+                return
+            if params and linked and routing and params.navaid_fid is not None:
+                routing_layer_id, routing_fid = routing
+                self._register_link(LinkedBRA(
+                    kind=OUTPUT_KIND_DIRECTIONAL,
+                    params=params,
+                    navaid_layer_id=params.active_layer.id(),
+                    navaid_fid=params.navaid_fid,
+                    facility_key=params.facility_key,
+                    routing_layer_id=routing_layer_id,
+                    routing_fid=routing_fid,
+                ))
             self.iface.messageBar().pushMessage(
                 "QBRA",
                 "BRA areas created successfully",
                 level=MsgSuccess
             )
 
+    def _publish_result(
+        self,
+        result_layer: QgsVectorLayer,
+        kind: str,
+        navaid_layer_id: str,
+        navaid_fid: Optional[int],
+        facility_key: str,
+        persistent: bool = False,
+        recipe_params: Any = None,
+    ) -> None:
+        """Add a result layer to the project or upsert it into the persistent layer.
+
+        When the dock asks for a 2D footprint, the flat companion layer is
+        published the same way next to the exact 3D result.  A 3D result
+        added as its own layer stores the recipe of ``recipe_params`` so it
+        can be regenerated after the project is reopened.
+
+        Args:
+            result_layer: Freshly computed BRA layer
+            kind: Output kind (``"directional"`` or ``"omni"``)
+            navaid_layer_id: Id of the navaid point layer (upsert key)
+            navaid_fid: Navaid feature id (upsert key)
+            facility_key: Facility key (upsert key)
+            persistent: Always upsert, regardless of the dock setting
+            recipe_params: Parameters the result was computed from
+        """
+        outputs = [(result_layer, kind)]
+        if self._dock and self._dock.is_footprint_output():
+            outputs.append((build_footprint_layer(result_layer), footprint_kind(kind)))
+        persistent = persistent or bool(self._dock and self._dock.is_persistent_output())
+
+        for layer, layer_kind in outputs:
+            if not persistent:
+                if layer_kind == kind and recipe_params is not None:
+                    self._store_recipe(layer, kind, recipe_params)
+                QgsProject.instance().addMapLayer(layer)
+                continue
+            target = self._persistent_target(layer, layer_kind, use_dock_choice=layer_kind == kind)
+            count = self._output_service.upsert(target, layer, navaid_layer_id, navaid_fid, facility_key)
+            logger.info("Upserted %d BRA features into '%s'", count, target.name())
+
+    def _persistent_target(
+        self,
+        template: QgsVectorLayer,
+        kind: str,
+        use_dock_choice: bool,
+    ) -> QgsVectorLayer:
+        """Resolve (or create) the persistent output layer for ``kind``."""
+        target: Optional[QgsVectorLayer] = None
+        target_id = self._dock.persistent_layer_id() if self._dock and use_dock_choice else None
+        if target_id:
+            target = QgsProject.instance().mapLayer(target_id)
+            if target is not None:
+                self._output_service.mark_persistent(target, kind)
+        if target is None:
+            target = self._output_service.find_persistent_layer(kind)
+        if target is None:
+            target = self._output_service.create_persistent_layer(template, kind)
+            QgsProject.instance().addMapLayer(target)
+        return target
+
     def _on_calculation_error(self, message: str) -> None:
         """Receive an error message from BRAWorker and surface it to the user."""
         logger.error("BRA calculation failed: %s", message)
         self.iface.messageBar().pushMessage(
             "QBRA",
             f"Calculation error: {message}",
-level=MsgCritical
+            level=MsgCritical
+        )
+
+    # ------------------------------------------------------------------
+    # Linked mode
+    # ------------------------------------------------------------------
+
+    def _register_link(self, link: LinkedBRA) -> None:
+        """Record a linked BRA and start watching its source layers."""
+        self._links.register(link)
+        for layer_id, _fid in link.sources():
+            self._watch_layer(layer_id)
+        logger.debug("Linked BRA %s (%d linked)", link.key, len(self._links))
+
+    def _watch_layer(self, layer_id: str) -> None:
+        """Connect edit signals of a source layer (once per layer)."""
+        if layer_id in self._watched_layers:
+            return
+        layer = QgsProject.instance().mapLayer(layer_id)
+        if not isinstance(layer, QgsVectorLayer):
+            return
+        connections = [
+            (layer.geometryChanged, lambda fid, _geom: self._on_source_changed(layer_id, fid)),
+            (layer.attributeValueChanged, lambda fid, _idx, _val: self._on_source_changed(layer_id, fid)),
+            (layer.featureDeleted, lambda fid: self._links.drop_source(layer_id, fid)),
+            (layer.willBeDeleted, lambda: self._on_source_layer_removed(layer_id)),
+        ]
+        for signal, slot in connections:
+            signal.connect(slot)
+        self._watched_layers[layer_id] = connections
+
+    def _unwatch_layer(self, layer_id: str) -> None:
+        """Disconnect the edit signals of a source layer."""
+        for signal, slot in self._watched_layers.pop(layer_id, []):
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                # Layer already deleted on the C++ side
+                pass
+
+    def _on_source_layer_removed(self, layer_id: str) -> None:
+        """Forget links and signal connections of a removed source layer."""
+        self._links.drop_layer(layer_id)
+        self._watched_layers.pop(layer_id, None)
+
+    def _on_source_changed(self, layer_id: str, fid: int) -> None:
+        """Mark dependent BRAs dirty and (re)start the coalescing timer."""
+        if self._links.mark_dirty(layer_id, fid):
+            self._link_timer.start()
+
+    def _on_link_timeout(self) -> None:
+        """Recompute dirty linked BRAs in the background."""
+        if self._link_worker and self._link_worker.isRunning():
+            # Let the running batch finish; dirty links stay queued
+            self._link_timer.start()
+            return
+        jobs = [job for job in map(self._refresh_link, self._links.take_dirty()) if job]
+        if not jobs:
+            return
+        logger.info("Recomputing %d linked BRA(s)", len(jobs))
+        tasks = [_batch_task(job) for job in jobs]
+        _dispose_thread(self._link_worker)
+        self._link_worker = BRABatchWorker(tasks, map_crs_authid(self.iface), parent=self)
+        self._link_worker.finished.connect(
+            lambda results, jobs=jobs: self._materialiser.submit(
+                [(jobs[index], data) for index, data in results], self._on_linked_finished
+            )
+        )
+        self._link_worker.error.connect(self._on_calculation_error)
+        self._link_worker.start()
+
+    def _refresh_link(self, link: LinkedBRA) -> Optional[LinkedBRA]:
+        """Re-read the source features of a dirty link and refresh its parameters.
+
+        Returns:
+            Refreshed link, or None if a source feature no longer exists.
+        """
+        project = QgsProject.instance()
+        navaid_layer = project.mapLayer(link.navaid_layer_id)
+        navaid_feat = navaid_layer.getFeature(link.navaid_fid) if navaid_layer else None
+        if navaid_feat is None or not navaid_feat.isValid():
+            self._links.unregister(link.key)
+            return None
+        if link.kind == OUTPUT_KIND_OMNI or link.routing_layer_id is None:
+            return link
+
+        routing_layer = project.mapLayer(link.routing_layer_id)
+        routing_feat = routing_layer.getFeature(link.routing_fid) if routing_layer else None
+        if routing_feat is None or not routing_feat.isValid():
+            self._links.unregister(link.key)
+            return None
+        geom = routing_feat.geometry()
+        pts = geom.asMultiPolyline()[0] if geom.isMultipart() else geom.asPolyline()
+        try:
+            params = refresh_directional_params(link.params, navaid_feat.geometry().asPoint(), pts)
+        except (BRAError, ValueError) as e:
+            logger.warning("Linked BRA %s not recomputed: %s", link.key, e)
+            return None
+        refreshed = link.with_params(params)
+        self._links.register(refreshed)
+        return refreshed
+
+    def _on_linked_finished(self, results: List[Tuple[LinkedBRA, QgsVectorLayer]]) -> None:
+        """Upsert recomputed linked BRAs into their persistent layers."""
+        for link, layer in results:
+            try:
+                self._publish_result(
+                    layer, link.kind, link.navaid_layer_id, link.navaid_fid, link.facility_key, persistent=True
+                )
+            except BRAError as e:
+                logger.error("Failed to update linked BRA %s: %s", link.key, e)
+        if self._links.has_dirty():
+            self._link_timer.start()
+
+    # ------------------------------------------------------------------
+    # Stored BRA layers
+    # ------------------------------------------------------------------
+
+    def _regeneration_connections(self) -> List[Tuple[Any, Any]]:
+        """Signals that feed lazy regeneration, paired with their slots."""
+        project = QgsProject.instance()
+        return [
+            (project.readProject, self._on_project_read),
+            (project.cleared, self._regeneration.clear),
+            (project.layersRemoved, self._regeneration.forget),
+            (self.iface.mapCanvas().renderStarting, self._on_render_starting),
+            (self.iface.currentLayerChanged, self._on_current_layer_changed),
+        ]
+
+    def _store_recipe(self, layer: QgsVectorLayer, kind: str, params: Any) -> None:
+        """Attach the recipe of a calculation to its result layer."""
+        try:
+            self._regeneration.store(layer, BRARecipe.from_params(kind, params))
+        except ValueError as e:
+            logger.debug("BRA layer '%s' not regenerable: %s", layer.name(), e)
+
+    def _on_project_read(self, *_args: Any) -> None:
+        """List the empty BRA layers of a freshly read project."""
+        pending = self._regeneration.scan()
+        if pending:
+            logger.info("%d stored BRA layer(s) will be regenerated on demand", len(pending))
+
+    def _on_render_starting(self) -> None:
+        """Schedule regeneration of pending layers shown in the canvas."""
+        if self._regeneration.pending:
+            self._regen_timer.start()
+
+    def _on_current_layer_changed(self, layer: Any) -> None:
+        """Regenerate a pending layer as soon as it is selected for querying."""
+        if layer is not None and self._regeneration.is_pending(layer.id()):
+            self._regenerate([layer.id()])
+
+    def _regenerate_visible(self) -> None:
+        """Regenerate the pending layers currently rendered in the canvas."""
+        visible = [layer.id() for layer in self.iface.mapCanvas().layers()]
+        self._regenerate([layer_id for layer_id in visible if self._regeneration.is_pending(layer_id)])
+
+    def _regenerate_all(self) -> None:
+        """Regenerate every pending layer (explicit request from the menu)."""
+        self._regeneration.scan()
+        pending = sorted(self._regeneration.pending)
+        if not pending:
+            self.iface.messageBar().pushMessage("QBRA", "No stored BRA layers to regenerate", level=MsgInfo)
+            return
+        count = self._regenerate(pending)
+        self.iface.messageBar().pushMessage(
+            "QBRA", f"Regenerated {count} of {len(pending)} stored BRA layer(s)", level=MsgSuccess
+        )
+
+    def _regenerate(self, layer_ids: List[str]) -> int:
+        """Regenerate layers from their recipes; returns the number regenerated."""
+        done = 0
+        for layer_id in layer_ids:
+            try:
+                self._regeneration.regenerate(layer_id)
+                done += 1
+            except BRAError as e:
+                logger.warning("Stored BRA layer %s not regenerated: %s", layer_id, e)
+                self.iface.messageBar().pushMessage(
+                    "QBRA", f"Stored BRA not regenerated: {e.message}", level=MsgWarning
+                )
+        return done
+
+    def _export_tiles(self) -> None:
+        """Export every BRA layer of the project into an MBTiles file."""
+        layers = LayerService(self.iface).get_bra_layers()
+        if not layers:
+            self.iface.messageBar().pushMessage("QBRA", "No BRA layers to export", level=MsgInfo)
+            return
+        path, _filter = QFileDialog.getSaveFileName(
+            self.iface.mainWindow(), "Export BRA layers to MBTiles", "", "MBTiles (*.mbtiles)"
+        )
+        if not path:
+            return
+        if not is_mbtiles_path(path):
+            path += ".mbtiles"
+        try:
+            stats = export_bra_layers(layers, path)
+        except BRAError as e:
+            logger.error("MBTiles export failed: %s", e)
+            self.iface.messageBar().pushMessage("QBRA", f"MBTiles export failed: {e.message}", level=MsgWarning)
+            return
+        self.iface.messageBar().pushMessage(
+            "QBRA",
+            f"MBTiles: {stats.changed} of {stats.navaids} BRA(s) changed, "
+            f"{stats.tiles_written} tile(s) written, {stats.tiles_deleted} deleted",
+            level=MsgSuccess,
+        )
+
+    # ------------------------------------------------------------------
+    # Point query
+    # ------------------------------------------------------------------
+
+    def _query_connections(self) -> List[Tuple[Any, Any]]:
+        """Signals that keep the point-query index current, paired with their slots."""
+        project = QgsProject.instance()
+        return [
+            (project.layersAdded, self._query.add_layers),
+            (project.layersRemoved, self._query.remove_layers),
+            (project.cleared, self._query.clear),
+        ]
+
+    def _toggle_point_query(self, checked: bool) -> None:
+        """Activate or release the BRA point-query map tool."""
+        canvas = self.iface.mapCanvas()
+        if not checked:
+            if self._query_tool is not None and canvas.mapTool() == self._query_tool:
+                canvas.unsetMapTool(self._query_tool)
+            return
+        if self._query_tool is None:
+            self._query_tool = QgsMapToolEmitPoint(canvas)
+            self._query_tool.canvasClicked.connect(self._on_point_query)
+            self._query_tool.deactivated.connect(lambda: self._query_action.setChecked(False))
+        # Index up front so the first click answers at once
+        indexed = self._query.refresh()
+        if indexed:
+            logger.info("Point query: indexed %d BRA layer(s), %d surface(s)", indexed, len(self._query))
+        canvas.setMapTool(self._query_tool)
+
+    def _on_point_query(self, point: Any, _button: Any = None) -> None:
+        """Report the BRAs covering a clicked point and the limiting height."""
+        crs = self.iface.mapCanvas().mapSettings().destinationCrs().authid()
+        result = self._query.query(point.x(), point.y(), crs)
+        if not result.hits:
+            self.iface.messageBar().pushMessage("QBRA", "No BRA covers this point", level=MsgInfo, duration=3)
+            return
+        for hit in result.hits:
+            logger.info("BRA at (%.1f, %.1f): %s", result.x, result.y, describe_hit(hit))
+        lowest = describe_hit(result.hits[0])
+        self.iface.messageBar().pushMessage(
+            "QBRA",
+            f"Height limit {result.limit:.1f} m ({lowest}); {len(result.hits)} BRA surface(s) here, listed in the QBRA log",
+            level=MsgInfo,
+        )
+
+    # ------------------------------------------------------------------
+    # Viewport mode
+    # ------------------------------------------------------------------
+
+    def _toggle_viewport(self, checked: bool) -> None:
+        """Start or stop materialising BRAs around the canvas extent."""
+        if not checked:
+            self._stop_viewport()
+            return
+        try:
+            self._start_viewport()
+        except BRAError as e:
+            self.iface.messageBar().pushMessage("QBRA", e.message, level=MsgWarning)
+            self._viewport_action.setChecked(False)
+
+    def _start_viewport(self) -> None:
+        """Index the chosen navaid layer and show the BRAs in view."""
+        project = QgsProject.instance()
+        navaid_id = self._dock.navaid_layer_id() if self._dock else None
+        navaid_layer = project.mapLayer(navaid_id) if navaid_id else self.iface.activeLayer()
+        if not isinstance(navaid_layer, QgsVectorLayer):
+            raise LayerNotFoundError("Choose a navaid layer first")
+        routing_id = self._dock.routing_layer_id() if self._dock else None
+        routing_layer = project.mapLayer(routing_id) if routing_id else None
+        runways = runways_from_records(layer_records(routing_layer)) if routing_layer else {}
+
+        skipped: List[Any] = []
+        directional, omni = resolve_records(
+            layer_records(navaid_layer), runways, lambda navaid_id, _e: skipped.append(navaid_id)
         )
+        if not directional and not omni:
+            raise BRAError("No navaid of the layer could be resolved", f"{len(skipped)} skipped")
+        if skipped:
+            logger.warning("Viewport mode skips %d navaid(s) without valid parameters", len(skipped))
+        self._viewport = ViewportLayer(ViewportEngine(directional, omni), navaid_layer.crs().authid())
+        self._viewport.layer.willBeDeleted.connect(lambda: self._viewport_action.setChecked(False))
+        project.addMapLayer(self._viewport.layer)
+        self.iface.mapCanvas().extentsChanged.connect(self._viewport_timer.start)
+        self._update_viewport()
+
+    def _stop_viewport(self) -> None:
+        """Stop viewport mode and remove its layer."""
+        self._viewport_timer.stop()
+        if self._viewport is None:
+            return
+        try:
+            self.iface.mapCanvas().extentsChanged.disconnect(self._viewport_timer.start)
+        except (TypeError, RuntimeError):
+            pass
+        try:
+            QgsProject.instance().removeMapLayer(self._viewport.layer.id())
+        except RuntimeError:
+            # Layer already removed by the user
+            pass
+        self._viewport = None
+
+    def _update_viewport(self) -> None:
+        """Materialise the BRAs around the current canvas extent."""
+        if self._viewport is None:
+            return
+        canvas = self.iface.mapCanvas()
+        extent = canvas.mapSettings().mapToLayerCoordinates(self._viewport.layer, canvas.extent())
+        update = self._viewport.show(
+            (extent.xMinimum(), extent.yMinimum(), extent.xMaximum(), extent.yMaximum())
+        )
+        if update.skipped:
+            self.iface.messageBar().pushMessage(
+                "QBRA", "Too many navaids in view for BRAs; zoom in", level=MsgInfo, duration=3
+            )
+        elif (update.added or update.removed) and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Viewport: %d tile(s) computed, %d evicted", len(update.added), len(update.removed)
+            )
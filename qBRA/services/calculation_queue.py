@@ -0,0 +1,161 @@
+"""Calculation queue for qBRA plugin.
+
+Every directional Calculate click is snapshotted into a
+:class:`CalculationJob` (validated parameters with the navaid feature id
+pinned, the navaid position and map CRS read on the main thread, routing
+source, linked flag, profiling request) and queued instead
+of being dropped while another calculation runs.  The plugin starts the
+jobs returned by :meth:`CalculationQueue.start_ready` — in submission
+order, at most ``limit`` at a time — and reports each worker's outcome.
+Results are released in submission order, so when two jobs target the same
+navaid the later one is always published (upserted) last.  Pending jobs
+can be cancelled; running ones complete.  The class is QGIS-free.
+
+Usage
+-----
+    queue = CalculationQueue(limit=2)
+    queue.submit(params, routing, linked, profile_dir, navaid_xy=(x, y), crs_authid="EPSG:32633")
+    for job in queue.start_ready():
+        ...   # start a worker; on its result:
+    for job, data in queue.complete(job.id, data):
+        ...   # publish in submission order
+"""
+
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..constants import CALCULATION_MAX_WORKERS
+
+#: Placeholder result of a failed job: releases the jobs queued behind it.
+_FAILED = object()
+
+
+@dataclass(frozen=True)
+class CalculationJob:
+    """Snapshot of one Calculate click.
+
+    Attributes:
+        id: Queue-wide job number (1, 2, ...)
+        params: BRAParameters of the calculation
+        routing: (routing layer id, routing feature id), if any
+        linked: Register the result as a linked BRA
+        profile_dir: Profile the calculation into this directory (None: no profiling)
+        navaid_xy: Navaid position in the map CRS
+        crs_authid: Map CRS of the output
+    """
+
+    id: int
+    params: Any
+    routing: Optional[Tuple[str, int]] = None
+    linked: bool = False
+    profile_dir: Optional[str] = None
+    navaid_xy: Optional[Tuple[float, float]] = None
+    crs_authid: str = ""
+
+    @property
+    def label(self) -> str:
+        """Short description for the dock's queue list."""
+        name = getattr(self.params, "display_name", None) or getattr(self.params, "facility_label", "")
+        return f"#{self.id} {name}".strip()
+
+
+class CalculationQueue:
+    """FIFO of calculation jobs with bounded concurrency and ordered results."""
+
+    def __init__(self, limit: int = CALCULATION_MAX_WORKERS) -> None:
+        """Initialise an empty queue.
+
+        Args:
+            limit: Jobs running at the same time (at least 1)
+        """
+        self._limit = max(1, limit)
+        self._ids = count(1)
+        self._pending: List[CalculationJob] = []
+        self._running: Dict[int, CalculationJob] = {}
+        # Started jobs not yet released, in submission order, and their results
+        self._order: List[CalculationJob] = []
+        self._results: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        """Return the number of pending and running jobs."""
+        return len(self._pending) + len(self._running)
+
+    @property
+    def pending(self) -> List[CalculationJob]:
+        """Jobs waiting to start, in order."""
+        return list(self._pending)
+
+    @property
+    def running(self) -> List[CalculationJob]:
+        """Jobs started and not finished yet."""
+        return list(self._running.values())
+
+    def submit(
+        self,
+        params: Any,
+        routing: Optional[Tuple[str, int]] = None,
+        linked: bool = False,
+        profile_dir: Optional[str] = None,
+        navaid_xy: Optional[Tuple[float, float]] = None,
+        crs_authid: str = "",
+    ) -> CalculationJob:
+        """Queue a calculation; returns its job."""
+        job = CalculationJob(next(self._ids), params, routing, linked, profile_dir, navaid_xy, crs_authid)
+        self._pending.append(job)
+        return job
+
+    def start_ready(self) -> List[CalculationJob]:
+        """Move as many pending jobs to running as the limit allows and return them."""
+        started = []
+        while self._pending and len(self._running) < self._limit:
+            job = self._pending.pop(0)
+            self._running[job.id] = job
+            self._order.append(job)
+            started.append(job)
+        return started
+
+    def complete(self, job_id: int, result: Any) -> List[Tuple[CalculationJob, Any]]:
+        """Record the result of a running job.
+
+        Returns:
+            ``(job, result)`` of every job now releasable in submission order
+            (possibly none, when an earlier job is still running)
+        """
+        if self._running.pop(job_id, None) is None:
+            return []
+        self._results[job_id] = result
+        return self._release()
+
+    def fail(self, job_id: int) -> List[Tuple[CalculationJob, Any]]:
+        """Record that a running job failed; returns the results it was holding back."""
+        return self.complete(job_id, _FAILED)
+
+    def cancel(self, job_ids: Optional[Iterable[int]] = None) -> List[CalculationJob]:
+        """Drop pending jobs (all of them when ``job_ids`` is None).
+
+        Running jobs are not affected.
+
+        Returns:
+            The cancelled jobs
+        """
+        wanted = None if job_ids is None else set(job_ids)
+        cancelled = [job for job in self._pending if wanted is None or job.id in wanted]
+        self._pending = [job for job in self._pending if job not in cancelled]
+        return cancelled
+
+    def clear(self) -> None:
+        """Forget every job (e.g. when the plugin unloads)."""
+        self._pending.clear()
+        self._running.clear()
+        self._order.clear()
+        self._results.clear()
+
+    def _release(self) -> List[Tuple[CalculationJob, Any]]:
+        ready = []
+        while self._order and self._order[0].id in self._results:
+            job = self._order.pop(0)
+            result = self._results.pop(job.id)
+            if result is not _FAILED:
+                ready.append((job, result))
+        return ready
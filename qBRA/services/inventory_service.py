@@ -0,0 +1,602 @@
+"""Inventory service for headless qBRA runs.
+
+Reads navaid and runway inventories without QGIS and resolves each navaid
+record to validated calculation parameters.  Supported inputs:
+
+* CSV — point coordinates in ``x``/``y`` (or ``lon``/``lat``,
+  ``easting``/``northing``) columns, runway lines in
+  ``start_x``/``start_y``/``end_x``/``end_y`` columns, or WKT in a ``wkt``
+  column;
+* GeoJSON FeatureCollections (features decoded one at a time from the
+  ``features`` array) and GeoJSON text sequences
+  (``.geojsonl``/``.geojsons``/``.ndjson``, one feature per line), both
+  streamed;
+* GeoPackage feature tables (rows streamed from a SQLite cursor).
+
+Records are plain dicts of attributes plus a ``GEOMETRY_KEY`` entry holding
+``("Point", (x, y))`` or ``("LineString", [(x, y), ...])``.  A multi-part
+geometry is accepted when it has a single part, or when its lines chain end
+to start; other multi-part geometries are rejected.
+
+Public API
+----------
+iter_records(path, layer) -> Iterator[Record]
+chunked(iterable, size) -> Iterator[List]
+load_runways(path, layer) -> Dict[str, List[Tuple[float, float]]]
+runways_from_records(records) -> Dict[str, List[Tuple[float, float]]]
+load_obstacles(path, layer) -> (x, y, top) arrays
+resolve_directional(record, runways) -> (BRAParameters, (x, y))
+resolve_omni(record) -> (OmniParameters, (x, y))
+"""
+
+import csv
+import json
+import re
+import sqlite3
+import struct
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import FACILITY_REGISTRY, OMNI_FACILITY_PRESETS
+from ..constants import OBSTACLE_TOP_FIELDS, SITE_ELEV_FIELDS, TURBINE_BASE_FIELDS, TURBINE_TIP_FIELDS
+from ..exceptions import BRAValidationError
+from ..models.bra_parameters import BRAParameters
+from ..models.omni_parameters import OmniParameters
+from ..modules.kernel import routing_azimuth
+
+Record = Dict[str, Any]
+Point = Tuple[float, float]
+
+#: Record key holding the decoded geometry.
+GEOMETRY_KEY = "_geometry"
+
+_POINT_COLUMNS = (("x", "y"), ("lon", "lat"), ("easting", "northing"))
+_LINE_COLUMNS = ("start_x", "start_y", "end_x", "end_y")
+_SEQUENCE_SUFFIXES = (".geojsonl", ".geojsons", ".ndjson")
+_READ_SIZE = 1 << 16
+
+_ID_FIELDS = ("id", "navaid_id", "fid")
+_FACILITY_FIELDS = ("facility", "facility_key")
+_RUNWAY_FIELDS = ("runway", "rwy", "thr_rwy")
+_NAME_FIELDS = ("name", "remark", "ident")
+_DIRECTIONAL_OVERRIDES = ("a", "b", "h", "r", "D", "H", "L", "phi")
+_OMNI_OVERRIDES = ("r", "alpha", "R", "j", "h")
+
+
+class _Vertex(tuple):
+    """(x, y) tuple with the ``x()``/``y()`` accessors used by the geometry helpers."""
+
+    def x(self) -> float:
+        return self[0]
+
+    def y(self) -> float:
+        return self[1]
+
+
+# ---------------------------------------------------------------------------
+# Geometry decoding
+# ---------------------------------------------------------------------------
+
+def _single_part(kind: str, parts: Sequence[Any]) -> Optional[Tuple[str, Any]]:
+    """Collapse the parts of a Multi* geometry into one ``kind`` geometry.
+
+    A single part is returned as is; line parts are merged when each starts
+    where the previous one ends.
+
+    Raises:
+        BRAValidationError: If the parts do not form a single geometry
+    """
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return kind, parts[0]
+    if kind == "LineString" and all(prev[-1] == part[0] for prev, part in zip(parts, parts[1:])):
+        merged = list(parts[0])
+        for part in parts[1:]:
+            merged.extend(part[1:])
+        return kind, merged
+    raise BRAValidationError(
+        "Multi-part geometry is not supported",
+        f"Multi{kind} with {len(parts)} disjoint parts",
+    )
+
+
+def _wkt_pairs(coords: str) -> List[Point]:
+    return [tuple(float(v) for v in item.split()[:2]) for item in coords.split(",") if item.strip()]
+
+
+def _parse_wkt(text: str) -> Optional[Tuple[str, Any]]:
+    body = text.strip()
+    kind, _, coords = body.partition("(")
+    kind = kind.strip().upper().split()[0] if kind.strip() else ""
+    if kind == "MULTILINESTRING":
+        parts = [_wkt_pairs(part) for part in re.findall(r"\(([^()]*)\)", coords)]
+        return _single_part("LineString", [part for part in parts if len(part) >= 2])
+    pairs = _wkt_pairs(coords.replace("(", " ").replace(")", " "))
+    if kind == "POINT" and pairs:
+        return "Point", pairs[0]
+    if kind == "LINESTRING" and len(pairs) >= 2:
+        return "LineString", pairs
+    return None
+
+
+def _parse_wkb(data: bytes, offset: int = 0) -> Tuple[Optional[Tuple[str, Any]], int]:
+    """Decode a (Multi)Point/(Multi)LineString WKB, ISO or EWKB flavoured.
+
+    Raises:
+        BRAValidationError: If a multi-part geometry has several disjoint parts
+    """
+    order = "<" if data[offset] == 1 else ">"
+    (code,) = struct.unpack_from(order + "I", data, offset + 1)
+    offset += 5
+    iso = code & 0x0FFFFFFF
+    has_z = bool(code & 0x80000000) or iso // 1000 in (1, 3)
+    has_m = bool(code & 0x40000000) or iso // 1000 in (2, 3)
+    if code & 0x20000000:  # EWKB SRID
+        offset += 4
+    base = iso % 1000
+    dims = 2 + int(has_z) + int(has_m)
+    if base == 1:
+        xy = struct.unpack_from(order + "dd", data, offset)
+        return ("Point", xy), offset + 8 * dims
+    if base == 2:
+        (count,) = struct.unpack_from(order + "I", data, offset)
+        offset += 4
+        points = [struct.unpack_from(order + "dd", data, offset + i * 8 * dims) for i in range(count)]
+        return ("LineString", points), offset + count * 8 * dims
+    if base in (4, 5):
+        (count,) = struct.unpack_from(order + "I", data, offset)
+        offset += 4
+        parts = []
+        for _ in range(count):
+            part, offset = _parse_wkb(data, offset)
+            if part is not None:
+                parts.append(part[1])
+        return _single_part("Point" if base == 4 else "LineString", parts), offset
+    return None, offset
+
+
+def _parse_gpkg_blob(blob: bytes) -> Optional[Tuple[str, Any]]:
+    if blob is None or len(blob) < 8 or blob[:2] != b"GP":
+        return None
+    flags = blob[3]
+    if flags & 0x10:  # empty geometry
+        return None
+    envelope = {0: 0, 1: 32, 2: 48, 3: 48, 4: 64}.get((flags >> 1) & 0x07, 0)
+    geometry, _ = _parse_wkb(blob, 8 + envelope)
+    return geometry
+
+
+def _geojson_geometry(geometry: Optional[Mapping[str, Any]]) -> Optional[Tuple[str, Any]]:
+    if not geometry:
+        return None
+    kind, coords = geometry.get("type"), geometry.get("coordinates")
+    if kind == "Point":
+        return "Point", tuple(coords[:2])
+    if kind == "LineString":
+        return "LineString", [tuple(c[:2]) for c in coords]
+    if kind == "MultiPoint":
+        return _single_part("Point", [tuple(c[:2]) for c in coords or ()])
+    if kind == "MultiLineString":
+        return _single_part("LineString", [[tuple(c[:2]) for c in part] for part in coords or () if part])
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+def _csv_records(path: Path) -> Iterator[Record]:
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        for row in csv.DictReader(handle):
+            record: Record = dict(row)
+            geometry = None
+            if row.get("wkt"):
+                geometry = _parse_wkt(row["wkt"])
+            elif all(row.get(c) not in (None, "") for c in _LINE_COLUMNS):
+                sx, sy, ex, ey = (float(row[c]) for c in _LINE_COLUMNS)
+                geometry = ("LineString", [(sx, sy), (ex, ey)])
+            else:
+                for cx, cy in _POINT_COLUMNS:
+                    if row.get(cx) not in (None, "") and row.get(cy) not in (None, ""):
+                        geometry = ("Point", (float(row[cx]), float(row[cy])))
+                        break
+            record[GEOMETRY_KEY] = geometry
+            yield record
+
+
+def _geojson_record(feature: Mapping[str, Any]) -> Record:
+    record: Record = dict(feature.get("properties") or {})
+    if "id" in feature and "id" not in record:
+        record["id"] = feature["id"]
+    record[GEOMETRY_KEY] = _geojson_geometry(feature.get("geometry"))
+    return record
+
+
+class _JsonStream:
+    """Pull parser handing out the values of a JSON text one at a time.
+
+    Reads the file in ``_READ_SIZE`` chunks and keeps only the undecoded tail
+    in memory, so a FeatureCollection costs one feature, not the whole file.
+    """
+
+    def __init__(self, handle: Any, path: Path) -> None:
+        self._handle = handle
+        self._path = path
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(_READ_SIZE)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        self._eof = not chunk
+        return not self._eof
+
+    def peek(self) -> str:
+        """Return the next non-blank character ("" at end of file)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def take(self, expected: str) -> str:
+        """Consume the next character, which must be one of ``expected``."""
+        char = self.peek()
+        if not char or char not in expected:
+            raise BRAValidationError(
+                "Malformed GeoJSON",
+                f"{self._path}: expected one of {expected!r}, found {char or 'end of file'!r}",
+            )
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise BRAValidationError("Malformed GeoJSON", f"{self._path}: {e}") from e
+            # A value running to the end of the buffer (a number) may continue.
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
+
+
+def _geojson_features(stream: _JsonStream) -> Iterator[Mapping[str, Any]]:
+    """Yield the features of a FeatureCollection, or a lone Feature object."""
+    members: Dict[str, Any] = {}
+    collection = False
+    stream.take("{")
+    closed = stream.peek() == "}"
+    while not closed:
+        key = stream.value()
+        stream.take(":")
+        if key == "features":
+            collection = True
+            stream.take("[")
+            ended = stream.peek() == "]"
+            if ended:
+                stream.take("]")
+            while not ended:
+                yield stream.value()
+                ended = stream.take(",]") == "]"
+        else:
+            members[key] = stream.value()
+        closed = stream.take(",}") == "}"
+    if not collection:
+        yield members
+
+
+def _geojson_records(path: Path) -> Iterator[Record]:
+    with open(path, encoding="utf-8") as handle:
+        for feature in _geojson_features(_JsonStream(handle, path)):
+            yield _geojson_record(feature)
+
+
+def _geojson_sequence_records(path: Path) -> Iterator[Record]:
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip().lstrip("\x1e")
+            if line:
+                yield _geojson_record(json.loads(line))
+
+
+def _gpkg_records(path: Path, layer: Optional[str]) -> Iterator[Record]:
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        if layer is None:
+            row = connection.execute(
+                "SELECT table_name FROM gpkg_contents WHERE data_type = 'features' ORDER BY table_name"
+            ).fetchone()
+            if row is None:
+                raise BRAValidationError("GeoPackage has no feature table", str(path))
+            layer = row[0]
+        row = connection.execute(
+            "SELECT column_name FROM gpkg_geometry_columns WHERE table_name = ?", (layer,)
+        ).fetchone()
+        if row is None:
+            raise BRAValidationError("GeoPackage layer not found", f"{path}: {layer}")
+        geom_column = row[0]
+        cursor = connection.execute(f'SELECT * FROM "{layer}"')
+        names = [d[0] for d in cursor.description]
+        for row_number, values in enumerate(cursor, 1):
+            record: Record = {}
+            for name, value in zip(names, values):
+                if name == geom_column:
+                    try:
+                        record[GEOMETRY_KEY] = _parse_gpkg_blob(value)
+                    except BRAValidationError as e:
+                        raise BRAValidationError(e.message, f"{path}: {layer} row {row_number}: {e.details}") from e
+                else:
+                    record[name] = value
+            yield record
+    finally:
+        connection.close()
+
+
+def iter_records(path: str, layer: Optional[str] = None) -> Iterator[Record]:
+    """Stream records from a CSV, GeoJSON or GeoPackage inventory.
+
+    Args:
+        path: Inventory file
+        layer: GeoPackage table name (defaults to the first feature table)
+
+    Returns:
+        Iterator of records
+
+    Raises:
+        BRAValidationError: If the format is not supported
+    """
+    file_path = Path(path)
+    suffix = file_path.suffix.lower()
+    if suffix == ".csv":
+        return _csv_records(file_path)
+    if suffix in _SEQUENCE_SUFFIXES:
+        return _geojson_sequence_records(file_path)
+    if suffix in (".geojson", ".json"):
+        return _geojson_records(file_path)
+    if suffix == ".gpkg":
+        return _gpkg_records(file_path, layer)
+    raise BRAValidationError(
+        "Unsupported inventory format",
+        f"{path}: expected .csv, .geojson, {', '.join(_SEQUENCE_SUFFIXES)} or .gpkg",
+    )
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ---------------------------------------------------------------------------
+# Parameter resolution
+# ---------------------------------------------------------------------------
+
+def _first(record: Mapping[str, Any], names: Sequence[str]) -> Any:
+    for name in names:
+        value = record.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _number(record: Mapping[str, Any], name: str, default: Any) -> Any:
+    value = record.get(name)
+    return default if value in (None, "") else float(value)
+
+
+def record_id(record: Mapping[str, Any]) -> Any:
+    """Return the navaid id of a record (None if it has none)."""
+    value = _first(record, _ID_FIELDS)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def record_facility(record: Mapping[str, Any]) -> str:
+    """Return the facility key of a record (upper-cased, "" if missing)."""
+    return str(_first(record, _FACILITY_FIELDS) or "").strip().upper()
+
+
+def is_omni_record(record: Mapping[str, Any]) -> bool:
+    """Return True if the record's facility is an omnidirectional preset."""
+    return record_facility(record) in OMNI_FACILITY_PRESETS
+
+
+def _point(record: Mapping[str, Any]) -> Point:
+    geometry = record.get(GEOMETRY_KEY)
+    if not geometry or geometry[0] != "Point":
+        raise BRAValidationError("Navaid record has no point geometry", f"id={record_id(record)}")
+    return float(geometry[1][0]), float(geometry[1][1])
+
+
+def load_runways(path: str, layer: Optional[str] = None) -> Dict[str, List[Point]]:
+    """Load a runway inventory into memory, keyed by runway id/designator.
+
+    Args:
+        path: Runway inventory file (line geometries)
+        layer: GeoPackage table name
+
+    Returns:
+        Runway key -> polyline vertices (start to end)
+    """
+    return runways_from_records(iter_records(path, layer))
+
+
+def runways_from_records(records: Iterable[Mapping[str, Any]]) -> Dict[str, List[Point]]:
+    """Key runway line records by runway id/designator.
+
+    Records without a key or a line geometry are ignored.
+
+    Returns:
+        Runway key -> polyline vertices (start to end)
+    """
+    runways: Dict[str, List[Point]] = {}
+    for record in records:
+        geometry = record.get(GEOMETRY_KEY)
+        key = _first(record, _RUNWAY_FIELDS + _ID_FIELDS + _NAME_FIELDS)
+        if key is None or not geometry or geometry[0] != "LineString":
+            continue
+        runways[str(key)] = [(float(x), float(y)) for x, y in geometry[1]]
+    return runways
+
+
+def load_obstacles(path: str, layer: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Load an obstacle point inventory into coordinate and top-elevation arrays.
+
+    The top comes from an absolute top field (:data:`OBSTACLE_TOP_FIELDS`),
+    else from ground elevation plus height (turbine fields); it is NaN when
+    neither height is known.  Records without a point geometry are ignored.
+
+    Returns:
+        (x, y, top) arrays of equal length
+    """
+    xs: List[float] = []
+    ys: List[float] = []
+    tops: List[float] = []
+    for record in iter_records(path, layer):
+        geometry = record.get(GEOMETRY_KEY)
+        if not geometry or geometry[0] != "Point":
+            continue
+        top = _first(record, OBSTACLE_TOP_FIELDS)
+        if top is None:
+            height = _first(record, TURBINE_TIP_FIELDS)
+            top = None if height is None else float(_first(record, TURBINE_BASE_FIELDS) or 0.0) + float(height)
+        xs.append(float(geometry[1][0]))
+        ys.append(float(geometry[1][1]))
+        tops.append(np.nan if top is None else float(top))
+    return np.array(xs), np.array(ys), np.array(tops)
+
+
+def resolve_directional(
+    record: Mapping[str, Any],
+    runways: Mapping[str, Sequence[Point]],
+) -> Tuple[BRAParameters, Point]:
+    """Resolve a directional navaid record via :data:`FACILITY_REGISTRY`.
+
+    The azimuth comes from an ``azimuth`` column or from the referenced
+    runway line.  ``a`` is measured from the navaid to the runway start (end
+    when ``direction`` is ``backward``) for threshold-dependent facilities,
+    ``r`` follows the facility's ``r_expr``; explicit columns override both.
+
+    Args:
+        record: Navaid record
+        runways: Runway polylines from :func:`load_runways`
+
+    Returns:
+        (validated BRAParameters, navaid position)
+
+    Raises:
+        BRAValidationError: If facility, geometry or runway are missing
+        ValueError: If the resolved parameters are invalid
+    """
+    key = record_facility(record)
+    facility = FACILITY_REGISTRY.get(key)
+    if facility is None:
+        raise BRAValidationError("Unknown directional facility", f"id={record_id(record)}, facility={key!r}")
+    x, y = _point(record)
+    direction = str(record.get("direction") or "forward").strip().lower()
+    runway_key = _first(record, _RUNWAY_FIELDS)
+    line = runways.get(str(runway_key)) if runway_key is not None else None
+
+    azimuth = _number(record, "azimuth", None)
+    if azimuth is None:
+        if line is None:
+            raise BRAValidationError(
+                "Navaid record needs an azimuth or a known runway",
+                f"id={record_id(record)}, runway={runway_key!r}",
+            )
+        azimuth = routing_azimuth([_Vertex(p) for p in line], direction)
+    azimuth = float(azimuth) % 360
+
+    defaults = facility.defaults
+    a = _number(record, "a", defaults.a)
+    if a is None:
+        if line is None:
+            raise BRAValidationError(
+                "Facility needs the runway threshold to derive 'a'",
+                f"id={record_id(record)}, facility={key}",
+            )
+        pick = line[0] if direction == "forward" else line[-1]
+        a = ((pick[0] - x) ** 2 + (pick[1] - y) ** 2) ** 0.5
+    r = _number(record, "r", None)
+    if r is None:
+        r = facility.derived_r(a)
+
+    name = _first(record, _NAME_FIELDS) or runway_key or record_id(record) or key
+    navaid_id = record_id(record)
+    params = BRAParameters(
+        active_layer=None,
+        azimuth=azimuth,
+        a=float(a),
+        b=_number(record, "b", defaults.b),
+        h=_number(record, "h", defaults.h),
+        r=float(r),
+        D=_number(record, "D", defaults.D),
+        H=_number(record, "H", defaults.H),
+        L=_number(record, "L", defaults.L),
+        phi=_number(record, "phi", defaults.phi),
+        site_elev=float(_first(record, SITE_ELEV_FIELDS) or 0.0),
+        remark=str(name),
+        direction=direction,
+        facility_key=key,
+        facility_label=facility.label,
+        navaid_fid=navaid_id if isinstance(navaid_id, int) else None,
+    )
+    return params, (x, y)
+
+
+def resolve_omni(record: Mapping[str, Any]) -> Tuple[OmniParameters, Point]:
+    """Resolve an omnidirectional navaid record via :data:`OMNI_FACILITY_PRESETS`.
+
+    The turbine cylinder is produced when the preset defines ``j``/``h``
+    (CVOR/DVOR/DF) unless a ``turbine`` column says otherwise.
+
+    Raises:
+        BRAValidationError: If facility or geometry are missing
+        ValueError: If the resolved parameters are invalid
+    """
+    key = record_facility(record)
+    preset = OMNI_FACILITY_PRESETS.get(key)
+    if preset is None:
+        raise BRAValidationError("Unknown omni facility", f"id={record_id(record)}, facility={key!r}")
+    label, defaults = preset
+    x, y = _point(record)
+    turbine_value = record.get("turbine")
+    turbine = ("j" in defaults) if turbine_value in (None, "") else str(turbine_value).lower() in ("1", "true", "yes")
+    values = {name: _number(record, name, defaults.get(name, 0.0)) for name in _OMNI_OVERRIDES}
+    name = _first(record, _NAME_FIELDS) or record_id(record) or key
+    navaid_id = record_id(record)
+    params = OmniParameters.from_dict({
+        "site_elev": float(_first(record, SITE_ELEV_FIELDS) or 0.0),
+        "omni_r": values["r"],
+        "omni_alpha": values["alpha"],
+        "omni_R": values["R"],
+        "omni_turbine": turbine,
+        "omni_j": values["j"],
+        "omni_h": values["h"],
+        "facility_key": key,
+        "facility_label": label,
+        "display_name": f"{name} - {label}",
+        "navaid_fid": navaid_id if isinstance(navaid_id, int) else None,
+    })
+    return params, (x, y)
@@ -0,0 +1,123 @@
+"""Layer catalog for qBRA plugin.
+
+Caches the geometry type of project layers by layer id.  Asking a layer for
+its ``wkbType()`` can block on the data provider (remote PostGIS / WFS layers
+open a connection the first time), so the type is resolved once per layer
+and reused by every later combo refresh or layer lookup.  The plugin drops
+entries of removed layers via :meth:`LayerCatalog.forget`.
+
+:func:`source_geometry_type` resolves a type from a layer's provider key and
+source alone, by opening a provider of its own, so it can run on a worker
+thread without touching project layers; the result is then stored on the
+main thread with :meth:`LayerCatalog.store`.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from qgis.core import QgsLayerTreeNode, QgsProject, QgsProviderRegistry, QgsWkbTypes
+
+
+class LayerCatalog:
+    """Geometry type per layer id, resolved lazily and at most once."""
+
+    def __init__(self) -> None:
+        """Initialize an empty catalog."""
+        self._types: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached layers."""
+        return len(self._types)
+
+    def __contains__(self, layer_id: object) -> bool:
+        """Return True if the geometry type of ``layer_id`` is cached."""
+        return layer_id in self._types
+
+    def cached(self, layer_id: str) -> Optional[int]:
+        """Return the cached geometry type of a layer, or None if unknown."""
+        return self._types.get(layer_id)
+
+    def geometry_type(self, layer: Any) -> int:
+        """Return the geometry type of a vector layer, resolving it on a miss.
+
+        Args:
+            layer: QgsVectorLayer
+
+        Returns:
+            QgsWkbTypes geometry type (PointGeometry, LineGeometry, ...)
+        """
+        layer_id = layer.id()
+        gtype = self._types.get(layer_id)
+        if gtype is None:
+            gtype = QgsWkbTypes.geometryType(layer.wkbType())
+            self._types[layer_id] = gtype
+        return gtype
+
+    def store(self, layer_id: str, gtype: int) -> None:
+        """Cache a geometry type resolved elsewhere (e.g. by a worker thread)."""
+        self._types[layer_id] = gtype
+
+    def unknown(self, layers: Iterable[Any]) -> List[Any]:
+        """Return the layers whose geometry type is not cached yet."""
+        return [layer for layer in layers if layer.id() not in self._types]
+
+    def forget(self, layer_ids: Iterable[str]) -> None:
+        """Drop the cached types of removed (or changed) layers."""
+        for layer_id in layer_ids:
+            self._types.pop(layer_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached types (e.g. when a project is closed)."""
+        self._types.clear()
+
+
+def source_geometry_type(provider_key: str, source: str) -> Optional[int]:
+    """Resolve the geometry type of a data source with a provider of its own.
+
+    No project layer is touched, so this may run off the main thread.
+
+    Args:
+        provider_key: Data provider key of the layer (``layer.providerType()``)
+        source: Data source of the layer (``layer.source()``)
+
+    Returns:
+        QgsWkbTypes geometry type, or None if the source cannot be opened on its own
+    """
+    provider = QgsProviderRegistry.instance().createProvider(provider_key, source)
+    if provider is None or not provider.isValid():
+        return None
+    return QgsWkbTypes.geometryType(provider.wkbType())
+
+
+def resolve_sources(sources: Iterable[Tuple[str, str, str]]) -> Iterator[Tuple[str, Optional[int]]]:
+    """Yield ``(layer id, geometry type or None)`` for ``(layer id, provider key, source)`` triples.
+
+    A provider failing on one source does not stop the others.
+    """
+    for layer_id, provider_key, source in sources:
+        try:
+            gtype = source_geometry_type(provider_key, source)
+        except Exception:
+            gtype = None
+        yield layer_id, gtype
+
+
+def iter_tree_layers(root: Optional[QgsLayerTreeNode] = None) -> Iterator[Any]:
+    """Yield the map layers of the layer tree in display order, groups included.
+
+    Only the tree is walked; layers are not asked for their geometry type.
+
+    Args:
+        root: Tree node to start from (defaults to the project root)
+    """
+    node = root if root is not None else QgsProject.instance().layerTreeRoot()
+    for child in node.children():
+        if child.nodeType() == child.NodeLayer:
+            layer = child.layer()
+            if layer is not None:
+                yield layer
+        elif child.nodeType() == child.NodeGroup:
+            yield from iter_tree_layers(child)
+
+
+#: Catalog shared by the layer service and the dock widget.
+shared_catalog = LayerCatalog()
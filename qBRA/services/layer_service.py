@@ -2,10 +2,21 @@
 
 Provides layer management operations for QGIS layers.
 Handles layer discovery, filtering, and default selection logic.
+Geometry types come from a :class:`LayerCatalog`, so each layer's provider is
+asked for its ``wkbType()`` only once.
 """
 
 from typing import Any, List, Tuple, Optional
-from qgis.core import QgsProject, QgsVectorLayer, QgsWkbTypes, QgsLayerTreeNode
+from qgis.core import QgsProject, QgsVectorLayer, QgsWkbTypes
+
+from .layer_catalog import LayerCatalog, iter_tree_layers, shared_catalog
+from ..constants import (
+    LAYER_NAME_SUFFIX,
+    OMNI_LAYER_NAME_SUFFIX,
+    OUTPUT_KIND_DIRECTIONAL,
+    OUTPUT_KIND_OMNI,
+    PERSISTENT_LAYER_PROPERTY,
+)
 
 
 class LayerService:
@@ -15,13 +26,25 @@ class LayerService:
     It depends on QGIS iface for accessing the active layer.
     """
     
-    def __init__(self, iface: Any) -> None:
+    def __init__(self, iface: Any, catalog: Optional[LayerCatalog] = None) -> None:
         """Initialize layer service.
         
         Args:
             iface: QGIS interface object
+            catalog: Geometry type cache (defaults to the shared catalog)
         """
         self.iface = iface
+        self.catalog = catalog if catalog is not None else shared_catalog
+
+    def iter_layers(self) -> List[Any]:
+        """Get all map layers of the layer tree, groups included, in display order.
+
+        Cheap: layers are not asked for their geometry type.
+
+        Returns:
+            List of map layers (vector, raster, ...)
+        """
+        return list(iter_tree_layers(QgsProject.instance().layerTreeRoot()))
     
     def get_layers_from_project(
         self, 
@@ -38,29 +61,13 @@ class LayerService:
             List of tuples (layer_name, layer_object)
         """
         layers: List[Tuple[str, QgsVectorLayer]] = []
-        root = QgsProject.instance().layerTreeRoot()
-        
-        def visit(node: QgsLayerTreeNode) -> None:
-            """Recursively visit layer tree nodes."""
-            for child in node.children():
-                if child.nodeType() == child.NodeLayer:
-                    layer = child.layer()
-                    if not isinstance(layer, QgsVectorLayer):
-                        continue
-                    
-                    # Filter by geometry type if specified
-                    if geometry_type is not None:
-                        layer_geom_type = QgsWkbTypes.geometryType(layer.wkbType())
-                        if layer_geom_type != geometry_type:
-                            continue
-                    
-                    layers.append((layer.name(), layer))
-                    
-                elif child.nodeType() == child.NodeGroup:
-                    # Recursively visit group children
-                    visit(child)
-        
-        visit(root)
+        for layer in self.iter_layers():
+            if not isinstance(layer, QgsVectorLayer):
+                continue
+            # Filter by geometry type if specified
+            if geometry_type is not None and self.catalog.geometry_type(layer) != geometry_type:
+                continue
+            layers.append((layer.name(), layer))
         return layers
     
     def get_point_layers(self) -> List[Tuple[str, QgsVectorLayer]]:
@@ -87,6 +94,24 @@ class LayerService:
         """
         return self.get_layers_from_project(QgsWkbTypes.PolygonGeometry)
     
+    def get_bra_layers(self) -> List[QgsVectorLayer]:
+        """Get all 3D BRA output layers (directional and omni) from the project.
+
+        A layer qualifies if it is marked as a persistent BRA output or if its
+        name carries a BRA output suffix.  Footprint and envelope layers are
+        excluded.
+
+        Returns:
+            List of BRA output layers
+        """
+        bra_kinds = (OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI)
+        suffixes = (LAYER_NAME_SUFFIX, OMNI_LAYER_NAME_SUFFIX)
+        return [
+            layer
+            for name, layer in self.get_polygon_layers()
+            if layer.customProperty(PERSISTENT_LAYER_PROPERTY) in bra_kinds or name.endswith(suffixes)
+        ]
+    
     def get_active_layer(self) -> Optional[QgsVectorLayer]:
         """Get the currently active layer in QGIS.
         
@@ -106,7 +131,7 @@ class LayerService:
         """
         active = self.get_active_layer()
         if active:
-            geom_type = QgsWkbTypes.geometryType(active.wkbType())
+            geom_type = self.catalog.geometry_type(active)
             if geom_type == QgsWkbTypes.PointGeometry:
                 return active
         return None
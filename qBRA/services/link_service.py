@@ -0,0 +1,169 @@
+"""Link service for qBRA plugin.
+
+Tracks which BRAs were generated from which navaid / routing features so that
+edits to those features can trigger an incremental recomputation of only the
+affected BRAs.  Contains no Qt wiring: the plugin forwards layer edit signals
+to :meth:`LinkRegistry.mark_dirty` and drains :meth:`LinkRegistry.take_dirty`
+once the edits have settled.
+"""
+
+from dataclasses import replace
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from ..config import FACILITY_REGISTRY
+from ..models.bra_parameters import BRAParameters
+from ..models.linked_bra import LinkedBRA
+from ..modules.kernel import routing_azimuth
+
+LinkKey = Tuple[str, int, str]
+SourceKey = Tuple[str, int]
+
+
+class LinkRegistry:
+    """Registry of linked BRAs with a dirty set for pending recomputation.
+
+    Lookups from an edited (layer id, feature id) to the BRAs depending on it
+    go through a reverse index, so marking a feature dirty is O(1) regardless
+    of how many BRAs are linked.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._links: Dict[LinkKey, LinkedBRA] = {}
+        self._by_source: Dict[SourceKey, Set[LinkKey]] = {}
+        self._dirty: Set[LinkKey] = set()
+
+    def __len__(self) -> int:
+        """Return the number of linked BRAs."""
+        return len(self._links)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if a link with this key is registered."""
+        return key in self._links
+
+    def register(self, link: LinkedBRA) -> None:
+        """Register (or replace) a linked BRA.
+
+        Args:
+            link: Link to register; an existing link with the same key is replaced
+        """
+        if link.key in self._links:
+            self.unregister(link.key)
+        self._links[link.key] = link
+        for source in link.sources():
+            self._by_source.setdefault(source, set()).add(link.key)
+
+    def unregister(self, key: LinkKey) -> None:
+        """Remove a linked BRA; unknown keys are ignored.
+
+        Args:
+            key: Link key (navaid layer id, navaid fid, facility key)
+        """
+        link = self._links.pop(key, None)
+        self._dirty.discard(key)
+        if link is None:
+            return
+        for source in link.sources():
+            keys = self._by_source.get(source)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._by_source[source]
+
+    def layer_ids(self) -> Set[str]:
+        """Return the ids of all source layers referenced by linked BRAs."""
+        return {layer_id for layer_id, _fid in self._by_source}
+
+    def mark_dirty(self, layer_id: str, fid: int) -> bool:
+        """Mark every BRA depending on a source feature as dirty.
+
+        Args:
+            layer_id: Id of the edited layer
+            fid: Id of the edited feature
+
+        Returns:
+            True if at least one linked BRA became dirty
+        """
+        keys = self._by_source.get((layer_id, fid))
+        if not keys:
+            return False
+        self._dirty.update(keys)
+        return True
+
+    def drop_source(self, layer_id: str, fid: int) -> List[LinkedBRA]:
+        """Unregister every BRA depending on a deleted source feature.
+
+        Args:
+            layer_id: Id of the layer the feature was deleted from
+            fid: Id of the deleted feature
+
+        Returns:
+            The links that were removed
+        """
+        removed = [self._links[key] for key in self._by_source.get((layer_id, fid), set())]
+        for link in removed:
+            self.unregister(link.key)
+        return removed
+
+    def drop_layer(self, layer_id: str) -> List[LinkedBRA]:
+        """Unregister every BRA depending on any feature of a removed layer.
+
+        Args:
+            layer_id: Id of the removed layer
+
+        Returns:
+            The links that were removed
+        """
+        keys = {key for (lid, _fid), keys in self._by_source.items() if lid == layer_id for key in keys}
+        removed = [self._links[key] for key in keys]
+        for link in removed:
+            self.unregister(link.key)
+        return removed
+
+    def has_dirty(self) -> bool:
+        """Return True if any linked BRA is waiting for recomputation."""
+        return bool(self._dirty)
+
+    def take_dirty(self) -> List[LinkedBRA]:
+        """Return and clear the dirty links.
+
+        Returns:
+            Dirty links, each exactly once, however many edits touched it
+        """
+        dirty = [self._links[key] for key in self._dirty if key in self._links]
+        self._dirty.clear()
+        return dirty
+
+
+def refresh_directional_params(
+    params: BRAParameters,
+    navaid_point: Any,
+    routing_points: Sequence[Any],
+) -> BRAParameters:
+    """Recompute the geometry-derived parameters after a source edit.
+
+    The azimuth is always re-derived from the routing line.  For facilities
+    whose ``a`` depends on the threshold (see :data:`FACILITY_REGISTRY`),
+    ``a`` is re-measured from the navaid to the routing start vertex and ``r``
+    follows its ``r_expr``.  All other parameters keep their snapshot values.
+
+    Args:
+        params: Parameter snapshot of the previous run
+        navaid_point: Current navaid position (object with ``x()``/``y()``)
+        routing_points: Current routing polyline vertices
+
+    Returns:
+        New BRAParameters instance
+
+    Raises:
+        BRACalculationError: If the routing line has fewer than 2 vertices
+    """
+    azimuth = routing_azimuth(routing_points, params.direction)
+    a, r = params.a, params.r
+    facility = FACILITY_REGISTRY.get(params.facility_key)
+    if facility is not None and facility.a_depends_on_threshold:
+        pick = routing_points[0] if params.direction == "forward" else routing_points[-1]
+        a = ((pick.x() - navaid_point.x()) ** 2 + (pick.y() - navaid_point.y()) ** 2) ** 0.5
+        r = facility.derived_r(a, r)
+    return replace(params, azimuth=azimuth, a=a, r=r)
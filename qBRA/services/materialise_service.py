@@ -0,0 +1,170 @@
+"""Main-thread materialisation of computed BRAs.
+
+Workers return :class:`~qBRA.models.layer_data.BRALayerData` (plain WKB and
+attribute values).  :class:`LayerMaterialiser` turns submitted results into
+memory layers on the thread that owns it (the main thread), adding features
+in chunks for at most ``budget_ms`` per event-loop turn, so large batches
+never freeze the UI and layer objects are only created where they live.
+
+Submissions are processed in order; the callback of a submission receives
+``(tag, layer)`` for each of its results once all of them are complete.
+
+Usage
+-----
+    materialiser = LayerMaterialiser(parent=self)
+    worker.finished.connect(
+        lambda data: materialiser.submit([(params, data)], self._on_layers_ready)
+    )
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Sequence, Tuple
+
+from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsVectorLayer
+
+from ..constants import MATERIALISE_BUDGET_MS, MATERIALISE_CHUNK
+from ..models.layer_data import BRALayerData
+from ..modules.ils_llz_logic import create_output_layer, finish_output_layer, surface_features
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+Materialised = List[Tuple[Any, QgsVectorLayer]]
+
+
+class _Submission:
+    """Progress of one submission: current result, layer and surface offset."""
+
+    __slots__ = ("items", "callback", "results", "layer", "offset")
+
+    def __init__(self, items: Sequence[Tuple[Any, BRALayerData]], callback: Callable[[Materialised], None]) -> None:
+        self.items = list(items)
+        self.callback = callback
+        self.results: Materialised = []
+        self.layer: Optional[QgsVectorLayer] = None
+        self.offset = 0
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) == len(self.items)
+
+
+class MaterialiseQueue:
+    """Ordered submissions of computed BRAs, built chunk by chunk."""
+
+    def __init__(self, chunk: int = MATERIALISE_CHUNK) -> None:
+        """Initialise the queue.
+
+        Args:
+            chunk: Features added per provider call
+        """
+        self._chunk = max(1, chunk)
+        self._queue: Deque[_Submission] = deque()
+
+    def __len__(self) -> int:
+        """Number of submissions not completed yet."""
+        return len(self._queue)
+
+    def submit(
+        self,
+        items: Sequence[Tuple[Any, BRALayerData]],
+        callback: Callable[[Materialised], None],
+    ) -> None:
+        """Queue computed BRAs for materialisation.
+
+        Args:
+            items: ``(tag, data)`` pairs; the tag is handed back with the layer
+            callback: Called with ``[(tag, layer), ...]`` once all items are built
+        """
+        self._queue.append(_Submission(items, callback))
+
+    def clear(self) -> None:
+        """Drop pending submissions (their callbacks are not called)."""
+        self._queue.clear()
+
+    def step(self, budget: float) -> bool:
+        """Materialise for up to ``budget`` seconds (at least one chunk).
+
+        Returns:
+            True if submissions remain
+        """
+        deadline = time.perf_counter() + budget
+        while self._queue:
+            submission = self._queue[0]
+            if not submission.done:
+                self._advance(submission)
+            if submission.done:
+                self._queue.popleft()
+                submission.callback(submission.results)
+            if time.perf_counter() >= deadline:
+                break
+        return bool(self._queue)
+
+    def _advance(self, submission: _Submission) -> None:
+        """Add one chunk of features of the submission's current result."""
+        tag, data = submission.items[len(submission.results)]
+        if submission.layer is None:
+            submission.layer = create_output_layer(data)
+            submission.offset = 0
+        stop = min(len(data), submission.offset + self._chunk)
+        if stop > submission.offset:
+            ok, _added = submission.layer.dataProvider().addFeatures(
+                surface_features(data, submission.offset, stop)
+            )
+            if not ok:
+                logger.warning("Failed to add BRA features to '%s'", data.name)
+        submission.offset = stop
+        if stop >= len(data):
+            finish_output_layer(submission.layer, data.kind)
+            submission.results.append((tag, submission.layer))
+            submission.layer = None
+
+
+class LayerMaterialiser(QObject):
+    """Drive a :class:`MaterialiseQueue` from the event loop in time slices."""
+
+    def __init__(
+        self,
+        parent: Any = None,
+        budget_ms: int = MATERIALISE_BUDGET_MS,
+        chunk: int = MATERIALISE_CHUNK,
+    ) -> None:
+        """Initialise the materialiser.
+
+        Args:
+            parent: Optional Qt parent object.
+            budget_ms: Time spent per event-loop turn
+            chunk: Features added per provider call
+        """
+        super().__init__(parent)
+        self._budget = budget_ms / 1000.0
+        self._queue = MaterialiseQueue(chunk)
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+
+    def __len__(self) -> int:
+        """Number of submissions not completed yet."""
+        return len(self._queue)
+
+    def submit(
+        self,
+        items: Sequence[Tuple[Any, BRALayerData]],
+        callback: Callable[[Materialised], None],
+    ) -> None:
+        """Queue computed BRAs; see :meth:`MaterialiseQueue.submit`."""
+        self._queue.submit(items, callback)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def clear(self) -> None:
+        """Stop and drop pending submissions."""
+        self._timer.stop()
+        self._queue.clear()
+
+    def _step(self) -> None:
+        """Materialise for one time slice, then yield to the event loop."""
+        if not self._queue.step(self._budget):
+            self._timer.stop()
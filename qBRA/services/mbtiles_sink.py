@@ -0,0 +1,333 @@
+"""MBTiles output sink for BRA vector tiles.
+
+Collects the features of a run (the same ``write(rings, properties, kind)``
+interface as the GeoJSON writer and :class:`~qBRA.services.postgis_sink.PostGISSink`)
+and, on close, cuts them into a vector-tile pyramid stored in an MBTiles
+(SQLite) file.  Directional and omni features go to the tile layers
+``<prefix>_directional`` and ``<prefix>_omni``; below the detail zoom only
+the coarse attributes are kept.  Geometry handling lives in
+:mod:`qBRA.modules.vector_tiles`.
+
+Rebuilds are incremental.  The file keeps a digest and the extent of every
+navaid (key: output kind, facility key, navaid id) in ``qbra_navaids``; a
+later run re-encodes only the tiles overlapping navaids that were added,
+changed or removed since, and deletes tiles that became empty.  Every run
+must therefore pass the whole inventory: navaids missing from a run are
+removed from the tiles.  Changed export settings (zooms, tolerance, …)
+rebuild everything.  Tiles are encoded in worker processes when
+``workers > 1``; the SQLite writes stay in the calling process.  The module
+is QGIS-free.
+
+Usage
+-----
+    with MBTilesSink("bra.mbtiles", "EPSG:3857", minzoom=8, maxzoom=14) as sink:
+        for rings, properties, kind in features:
+            sink.write(rings, properties, kind)
+    print(sink.stats.tiles_written)
+"""
+
+import gzip
+import hashlib
+import json
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..constants import (
+    MBTILES_COARSE_ATTRIBUTES,
+    MBTILES_DETAIL_ZOOM,
+    MBTILES_MAX_ZOOM,
+    MBTILES_MIN_ZOOM,
+    MBTILES_SIMPLIFY_TOLERANCE,
+    MBTILES_TASK_TILES,
+    MVT_BUFFER,
+    MVT_EXTENT,
+    OUTPUT_KIND_DIRECTIONAL,
+)
+from ..exceptions import BRAError, BRAValidationError
+from ..modules.vector_tiles import encode_tile, lonlat_to_mercator, mercator_to_lonlat, tile_polygon, tile_range
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+#: Source CRS names accepted by the sink (tiles are always Web Mercator).
+MERCATOR_CRS = ("EPSG:3857", "EPSG:900913", "EPSG:102100")
+LONLAT_CRS = ("EPSG:4326", "OGC:CRS84")
+
+TileKey = Tuple[int, int, int]
+#: (tile layer name, mercator rings, properties)
+_TileFeature = Tuple[str, List[np.ndarray], Dict[str, Any]]
+
+
+def is_mbtiles_path(path: str) -> bool:
+    """Return True if ``path`` names an MBTiles file."""
+    return path.lower().endswith(".mbtiles")
+
+
+@dataclass
+class MBTilesStats:
+    """Outcome of one MBTiles build."""
+
+    navaids: int = 0
+    changed: int = 0
+    tiles_written: int = 0
+    tiles_deleted: int = 0
+    full_rebuild: bool = False
+
+
+def _encode_tiles(
+    tasks: Sequence[Tuple[TileKey, Dict[str, List[Tuple[List[np.ndarray], Dict[str, Any]]]]]],
+    extent: int,
+    buffer: int,
+    tolerance: float,
+) -> List[Tuple[TileKey, Optional[bytes]]]:
+    """Worker entry point: encode tiles; None for tiles without features."""
+    results: List[Tuple[TileKey, Optional[bytes]]] = []
+    for (z, x, y), layers in tasks:
+        tile_layers = {}
+        for name, features in layers.items():
+            cut = [(tile_polygon(rings, z, x, y, extent, buffer, tolerance), properties)
+                   for rings, properties in features]
+            tile_layers[name] = [(rings, properties) for rings, properties in cut if rings]
+        data = encode_tile(tile_layers, extent)
+        results.append(((z, x, y), gzip.compress(data, mtime=0) if data else None))
+    return results
+
+
+class MBTilesSink:
+    """Tile BRA features into an MBTiles vector-tile pyramid."""
+
+    def __init__(
+        self,
+        path: str,
+        source_crs: Optional[str],
+        minzoom: int = MBTILES_MIN_ZOOM,
+        maxzoom: int = MBTILES_MAX_ZOOM,
+        workers: int = 1,
+        tolerance: float = MBTILES_SIMPLIFY_TOLERANCE,
+        detail_zoom: int = MBTILES_DETAIL_ZOOM,
+        coarse_attributes: Sequence[str] = MBTILES_COARSE_ATTRIBUTES,
+        layer_prefix: str = "bra",
+        mp_context: Optional[Any] = None,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            path: MBTiles file (created if missing, updated incrementally otherwise)
+            source_crs: CRS of the written rings (``EPSG:3857`` or ``EPSG:4326``)
+            minzoom, maxzoom: Zoom range of the pyramid
+            workers: Worker processes encoding tiles
+            tolerance: Simplification tolerance in tile units
+            detail_zoom: First zoom carrying all attributes
+            coarse_attributes: Attributes kept below ``detail_zoom``
+            layer_prefix: Tile layer names are ``<prefix>_<kind>``
+            mp_context: Optional ``multiprocessing`` context for the workers
+
+        Raises:
+            BRAValidationError: If the CRS is not supported or the zoom range is invalid
+        """
+        crs = (source_crs or "").upper()
+        if crs not in MERCATOR_CRS + LONLAT_CRS:
+            raise BRAValidationError(
+                "Vector tiles need Web Mercator or WGS84 input",
+                f"CRS {source_crs!r}; expected one of {', '.join(MERCATOR_CRS + LONLAT_CRS)}",
+            )
+        if not 0 <= minzoom <= maxzoom <= 24 or workers < 1:
+            raise BRAValidationError(
+                "Invalid vector tile settings", f"zooms {minzoom}..{maxzoom} (0..24), workers {workers}"
+            )
+        self._path = Path(path)
+        self._lonlat = crs in LONLAT_CRS
+        self.minzoom, self.maxzoom = minzoom, maxzoom
+        self._workers = workers
+        self._tolerance = float(tolerance)
+        self._detail_zoom = detail_zoom
+        self._coarse = tuple(coarse_attributes)
+        self._prefix = layer_prefix
+        self._mp_context = mp_context
+        self._features: Dict[str, List[_TileFeature]] = {}
+        self._digests: Dict[str, Any] = {}
+        self._bboxes: Dict[str, List[float]] = {}
+        self._fields: Dict[str, Dict[str, str]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self.count = 0
+        self.stats = MBTilesStats()
+
+    def __enter__(self) -> "MBTilesSink":
+        try:
+            self._conn = sqlite3.connect(str(self._path))
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT);"
+                "CREATE UNIQUE INDEX IF NOT EXISTS name ON metadata (name);"
+                "CREATE TABLE IF NOT EXISTS tiles "
+                "(zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB);"
+                "CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles (zoom_level, tile_column, tile_row);"
+                "CREATE TABLE IF NOT EXISTS qbra_navaids "
+                "(key TEXT PRIMARY KEY, digest TEXT, xmin REAL, ymin REAL, xmax REAL, ymax REAL);"
+            )
+        except sqlite3.Error as e:
+            raise BRAError("Cannot open MBTiles file", f"{self._path}: {e}") from e
+        return self
+
+    def __exit__(self, exc_type: Any, *_exc: Any) -> None:
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def write(self, rings: Sequence[np.ndarray], properties: Dict[str, Any], kind: str = OUTPUT_KIND_DIRECTIONAL) -> None:
+        """Collect one polygon (exterior ring first) with its properties."""
+        mercator = [lonlat_to_mercator(r) if self._lonlat else np.asarray(r, dtype=np.float64)[:, :2]
+                    for r in rings]
+        key = json.dumps([kind, properties.get("facility_key"), properties.get("navaid_id")], default=str)
+        layer = f"{self._prefix}_{kind}"
+        self._features.setdefault(key, []).append((layer, mercator, dict(properties)))
+
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = hashlib.sha1()
+        digest.update(json.dumps(properties, sort_keys=True, default=str).encode("utf-8"))
+        for ring in mercator:
+            digest.update(np.round(ring, 2).tobytes())
+        outer = mercator[0]
+        bbox = [float(outer[:, 0].min()), float(outer[:, 1].min()), float(outer[:, 0].max()), float(outer[:, 1].max())]
+        known = self._bboxes.get(key)
+        self._bboxes[key] = bbox if known is None else [
+            min(known[0], bbox[0]), min(known[1], bbox[1]), max(known[2], bbox[2]), max(known[3], bbox[3])
+        ]
+        fields = self._fields.setdefault(layer, {})
+        for name, value in properties.items():
+            fields.setdefault(name, "Number" if isinstance(value, (int, float)) and not isinstance(value, bool)
+                              else "String")
+        self.count += 1
+
+    def flush(self) -> MBTilesStats:
+        """Re-encode the tiles touched by changed navaids and commit.
+
+        Raises:
+            BRAError: If the MBTiles file cannot be written
+        """
+        if self._conn is None:
+            raise BRAError("MBTiles sink is not open", str(self._path))
+        conn = self._conn
+        try:
+            stats = self._build(conn)
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise BRAError("MBTiles write failed", f"{self._path}: {e}") from e
+        self.stats = stats
+        logger.info(
+            "MBTiles %s: %d of %d navaids changed, %d tiles written, %d deleted",
+            self._path, stats.changed, stats.navaids, stats.tiles_written, stats.tiles_deleted,
+        )
+        return stats
+
+    def _settings(self) -> str:
+        return json.dumps({
+            "minzoom": self.minzoom, "maxzoom": self.maxzoom, "extent": MVT_EXTENT, "buffer": MVT_BUFFER,
+            "tolerance": self._tolerance, "detail_zoom": self._detail_zoom,
+            "coarse": list(self._coarse), "prefix": self._prefix,
+        }, sort_keys=True)
+
+    def _build(self, conn: sqlite3.Connection) -> MBTilesStats:
+        metadata = dict(conn.execute("SELECT name, value FROM metadata"))
+        previous = {row[0]: (row[1], row[2:]) for row in conn.execute("SELECT * FROM qbra_navaids")}
+        current = {key: (digest.hexdigest(), tuple(self._bboxes[key])) for key, digest in self._digests.items()}
+
+        stats = MBTilesStats(navaids=len(current), full_rebuild=metadata.get("qbra_settings") != self._settings())
+        if stats.full_rebuild:
+            conn.execute("DELETE FROM tiles")
+            changed = set(current) | set(previous)
+        else:
+            changed = {key for key, (digest, _bbox) in current.items() if previous.get(key, (None,))[0] != digest}
+            changed |= set(previous) - set(current)
+        stats.changed = len(changed)
+
+        boxes = [previous[key][1] for key in changed if key in previous]
+        boxes += [current[key][1] for key in changed if key in current]
+        dirty = self._dirty_tiles(boxes)
+        for (z, x, y), data in self._encode(dirty):
+            row = (1 << z) - 1 - y
+            if data is None:
+                cursor = conn.execute("DELETE FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+                                      (z, x, row))
+                stats.tiles_deleted += cursor.rowcount
+                continue
+            conn.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", (z, x, row, data))
+            stats.tiles_written += 1
+
+        conn.execute("DELETE FROM qbra_navaids")
+        conn.executemany("INSERT INTO qbra_navaids VALUES (?, ?, ?, ?, ?, ?)",
+                         [(key, digest, *bbox) for key, (digest, bbox) in current.items()])
+        self._write_metadata(conn, current)
+        return stats
+
+    def _dirty_tiles(self, boxes: Sequence[Sequence[float]]) -> Set[TileKey]:
+        pad = MVT_BUFFER / MVT_EXTENT
+        dirty: Set[TileKey] = set()
+        for z in range(self.minzoom, self.maxzoom + 1):
+            for box in boxes:
+                x0, y0, x1, y1 = tile_range(box, z, pad)
+                dirty.update((z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+        return dirty
+
+    def _tasks(self, dirty: Set[TileKey]) -> Iterator[List[Tuple[TileKey, Dict[str, List[Any]]]]]:
+        """Group the features of each dirty tile into worker tasks."""
+        pad = MVT_BUFFER / MVT_EXTENT
+        tiles: Dict[TileKey, Dict[str, List[Any]]] = {key: {} for key in dirty}
+        for key, features in self._features.items():
+            bbox = self._bboxes[key]
+            for z in range(self.minzoom, self.maxzoom + 1):
+                x0, y0, x1, y1 = tile_range(bbox, z, pad)
+                for x in range(x0, x1 + 1):
+                    for y in range(y0, y1 + 1):
+                        layers = tiles.get((z, x, y))
+                        if layers is None:
+                            continue
+                        for layer, rings, properties in features:
+                            if z < self._detail_zoom:
+                                properties = {k: v for k, v in properties.items() if k in self._coarse}
+                            layers.setdefault(layer, []).append((rings, properties))
+        items = sorted(tiles.items())
+        for start in range(0, len(items), MBTILES_TASK_TILES):
+            yield items[start:start + MBTILES_TASK_TILES]
+
+    def _encode(self, dirty: Set[TileKey]) -> Iterator[Tuple[TileKey, Optional[bytes]]]:
+        args = (MVT_EXTENT, MVT_BUFFER, self._tolerance)
+        if self._workers == 1 or len(dirty) <= MBTILES_TASK_TILES:
+            for task in self._tasks(dirty):
+                yield from _encode_tiles(task, *args)
+            return
+        with ProcessPoolExecutor(max_workers=self._workers, mp_context=self._mp_context) as pool:
+            futures = [pool.submit(_encode_tiles, task, *args) for task in self._tasks(dirty)]
+            for future in futures:
+                yield from future.result()
+
+    def _write_metadata(self, conn: sqlite3.Connection, current: Mapping[str, Tuple[str, Tuple[float, ...]]]) -> None:
+        values: Dict[str, str] = {
+            "name": self._path.stem,
+            "format": "pbf",
+            "type": "overlay",
+            "minzoom": str(self.minzoom),
+            "maxzoom": str(self.maxzoom),
+            "qbra_settings": self._settings(),
+            "json": json.dumps({"vector_layers": [
+                {"id": layer, "fields": fields, "minzoom": self.minzoom, "maxzoom": self.maxzoom}
+                for layer, fields in sorted(self._fields.items())
+            ]}),
+        }
+        if current:
+            boxes = np.array([bbox for _digest, bbox in current.values()])
+            west, south = mercator_to_lonlat(boxes[:, 0].min(), boxes[:, 1].min())
+            east, north = mercator_to_lonlat(boxes[:, 2].max(), boxes[:, 3].max())
+            values["bounds"] = f"{west:.6f},{south:.6f},{east:.6f},{north:.6f}"
+            values["center"] = f"{(west + east) / 2:.6f},{(south + north) / 2:.6f},{self.minzoom}"
+        conn.executemany("INSERT OR REPLACE INTO metadata VALUES (?, ?)", sorted(values.items()))
@@ -0,0 +1,208 @@
+"""glTF/OBJ output sink for BRA surfaces as 3D meshes.
+
+Collects the features of a run (the same ``write(rings, properties, kind)``
+interface as the GeoJSON writer and the other sinks), triangulates every
+surface once with :class:`~qBRA.modules.mesh.MeshBuilder` and, on close,
+writes the indexed mesh:
+
+* ``.glb`` — binary glTF 2.0 (one file);
+* ``.gltf`` — glTF 2.0 JSON with the buffers in a ``.bin`` file beside it;
+* ``.obj`` — Wavefront OBJ, one group per surface.
+
+glTF output has one node per navaid (named after the navaid id, properties
+in ``extras``) with one primitive per surface; all primitives share one
+float32 position accessor and index a uint32 buffer.  Positions are stored
+relative to the mesh origin, which the root node translates back; glTF is
+Y-up, so source ``(x, y, z)`` (east, north, height) is written as
+``(x, z, -y)``.  OBJ has no transform: its vertices stay in source axes
+relative to the origin given in the header comment.  The module is
+QGIS-free.
+
+Usage
+-----
+    with MeshSink("bra.glb") as sink:
+        for rings, properties, kind in features:
+            sink.write(rings, properties, kind)
+    print(sink.mesh.triangles.shape)
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from ..modules.mesh import Mesh, MeshBuilder
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+#: File suffixes written by :class:`MeshSink`.
+MESH_SUFFIXES = (".glb", ".gltf", ".obj")
+
+_GLB_MAGIC, _GLB_JSON, _GLB_BIN = 0x46546C67, 0x4E4F534A, 0x004E4942
+_FLOAT, _UNSIGNED_INT = 5126, 5125
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+_TRIANGLES = 4
+
+#: Base colour per output kind (RGBA); directional as in the BRA layer style.
+_MATERIALS = (
+    (OUTPUT_KIND_DIRECTIONAL, [0.0, 0.5, 0.0, 0.5]),
+    (OUTPUT_KIND_OMNI, [0.9, 0.5, 0.1, 0.5]),
+)
+
+
+def is_mesh_path(path: str) -> bool:
+    """Return True if ``path`` names a glTF or OBJ output."""
+    return Path(path).suffix.lower() in MESH_SUFFIXES
+
+
+def _y_up(vertices: np.ndarray) -> np.ndarray:
+    return np.column_stack([vertices[:, 0], vertices[:, 2], -vertices[:, 1]]).astype(np.float32)
+
+
+def _pad(data: bytes, fill: bytes) -> bytes:
+    return data + fill * (-len(data) % 4)
+
+
+def gltf_document(mesh: Mesh, uri: Optional[str] = None) -> Tuple[Dict[str, Any], bytes]:
+    """Build the glTF JSON document and binary buffer of a mesh.
+
+    Args:
+        mesh: Indexed mesh
+        uri: Buffer URI for ``.gltf`` output; None for the GLB binary chunk
+
+    Returns:
+        (glTF JSON document, buffer bytes)
+    """
+    y_up = _y_up(mesh.vertices)
+    positions = y_up.tobytes()
+    indices = mesh.triangles.astype("<u4").tobytes()
+    buffer = positions + indices
+    if not len(y_up):
+        y_up = np.zeros((1, 3), np.float32)
+    accessors: List[Dict[str, Any]] = [{
+        "bufferView": 0, "componentType": _FLOAT, "count": len(mesh.vertices), "type": "VEC3",
+        "min": y_up.min(axis=0).tolist(), "max": y_up.max(axis=0).tolist(),
+    }]
+    materials = {kind: i for i, (kind, _color) in enumerate(_MATERIALS)}
+    navaids: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+    for part in mesh.parts:
+        if not part.count:
+            continue
+        accessors.append({
+            "bufferView": 1, "byteOffset": part.first * 12, "componentType": _UNSIGNED_INT,
+            "count": part.count * 3, "type": "SCALAR",
+        })
+        key = (part.kind, str(part.properties.get("facility_key", "")), str(part.properties.get("navaid_id", "")))
+        navaids.setdefault(key, []).append({
+            "attributes": {"POSITION": 0}, "indices": len(accessors) - 1, "mode": _TRIANGLES,
+            "material": materials.get(part.kind, 0), "extras": part.properties,
+        })
+    meshes, nodes = [], []
+    for (kind, facility_key, navaid_id), primitives in navaids.items():
+        nodes.append({
+            "name": f"{navaid_id} {facility_key}".strip(), "mesh": len(meshes),
+            "extras": {"kind": kind, "navaid_id": navaid_id, "facility_key": facility_key},
+        })
+        meshes.append({"name": nodes[-1]["name"], "primitives": primitives})
+    ox, oy, oz = (float(v) for v in mesh.origin)
+    root = {"name": "BRA", "translation": [ox, oz, -oy], "extras": {"origin": [ox, oy, oz]}}
+    if nodes:
+        root["children"] = list(range(1, len(nodes) + 1))
+    buffer_def: Dict[str, Any] = {"byteLength": len(buffer)}
+    if uri is not None:
+        buffer_def["uri"] = uri
+    document: Dict[str, Any] = {
+        "asset": {"version": "2.0", "generator": "qBRA"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [root] + nodes,
+        "materials": [
+            {"name": kind, "doubleSided": True, "alphaMode": "BLEND",
+             "pbrMetallicRoughness": {"baseColorFactor": color, "metallicFactor": 0.0}}
+            for kind, color in _MATERIALS
+        ],
+        "buffers": [buffer_def],
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": len(positions), "target": _ARRAY_BUFFER},
+            {"buffer": 0, "byteOffset": len(buffer) - len(indices), "byteLength": len(indices),
+             "target": _ELEMENT_ARRAY_BUFFER},
+        ],
+        "accessors": accessors,
+    }
+    if meshes:
+        document["meshes"] = meshes
+    return document, buffer
+
+
+def write_glb(mesh: Mesh, path: str) -> None:
+    """Write a mesh as binary glTF."""
+    document, buffer = gltf_document(mesh)
+    chunk_json = _pad(json.dumps(document, default=str).encode("utf-8"), b" ")
+    chunk_bin = _pad(buffer, b"\0")
+    length = 12 + 8 + len(chunk_json) + 8 + len(chunk_bin)
+    with open(path, "wb") as handle:
+        handle.write(struct.pack("<III", _GLB_MAGIC, 2, length))
+        handle.write(struct.pack("<II", len(chunk_json), _GLB_JSON) + chunk_json)
+        handle.write(struct.pack("<II", len(chunk_bin), _GLB_BIN) + chunk_bin)
+
+
+def write_gltf(mesh: Mesh, path: str) -> None:
+    """Write a mesh as glTF JSON plus a ``.bin`` buffer file beside it."""
+    bin_path = Path(path).with_suffix(".bin")
+    document, buffer = gltf_document(mesh, bin_path.name)
+    bin_path.write_bytes(buffer)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, default=str)
+
+
+def write_obj(mesh: Mesh, path: str) -> None:
+    """Write a mesh as Wavefront OBJ (one group per surface)."""
+    with open(path, "w", encoding="utf-8") as handle:
+        ox, oy, oz = (float(v) for v in mesh.origin)
+        handle.write(f"# qBRA mesh, vertices relative to origin {ox!r} {oy!r} {oz!r}\n")
+        np.savetxt(handle, mesh.vertices, fmt="v %.3f %.3f %.3f")
+        faces = mesh.triangles.astype(np.int64) + 1
+        for part in mesh.parts:
+            properties = part.properties
+            name = "_".join(
+                str(properties.get(key, "")) for key in ("navaid_id", "facility_key", "id")
+            ).replace(" ", "_")
+            handle.write(f"g {name}\n")
+            np.savetxt(handle, faces[part.first:part.first + part.count], fmt="f %d %d %d")
+
+
+_WRITERS = {".glb": write_glb, ".gltf": write_gltf, ".obj": write_obj}
+
+
+class MeshSink:
+    """Write BRA features as one indexed glTF or OBJ mesh."""
+
+    def __init__(self, path: str) -> None:
+        """Initialise the sink.
+
+        Args:
+            path: Output file (``.glb``, ``.gltf`` or ``.obj``)
+        """
+        self._path = Path(path)
+        self._writer = _WRITERS.get(self._path.suffix.lower(), write_glb)
+        self._builder = MeshBuilder()
+        self.mesh: Optional[Mesh] = None
+
+    def __enter__(self) -> "MeshSink":
+        return self
+
+    def __exit__(self, exc_type: Any, *_exc: Any) -> None:
+        if exc_type is not None:
+            return
+        self.mesh = self._builder.build()
+        self._writer(self.mesh, str(self._path))
+        logger.info("Wrote %d surfaces (%d vertices, %d triangles) to %s",
+                    len(self.mesh), len(self.mesh.vertices), len(self.mesh.triangles), self._path)
+
+    def write(self, rings: Sequence[np.ndarray], properties: Dict[str, Any], kind: str = OUTPUT_KIND_DIRECTIONAL) -> None:
+        """Triangulate one polygon (exterior ring first) into the mesh."""
+        self._builder.add(rings, properties, kind)
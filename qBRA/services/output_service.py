@@ -0,0 +1,272 @@
+"""Output service for qBRA plugin.
+
+Writes BRA results into a single persistent output layer instead of adding a
+new memory layer to the project on every calculation.  Results are upserted
+keyed on navaid layer id + navaid feature id + facility key, so re-running a
+navaid replaces its previous features and leaves every other navaid
+untouched.  New features are written before the previous ones are removed,
+so a failed write never loses the previous BRA.
+"""
+
+from typing import Any, List, Optional
+
+from qgis.core import (
+    QgsCoordinateTransform,
+    QgsCsException,
+    QgsExpression,
+    QgsFeature,
+    QgsFeatureRequest,
+    QgsField,
+    QgsGeometry,
+    QgsProject,
+    QgsVectorLayer,
+    QgsWkbTypes,
+)
+
+from ..constants import (
+    CRS_TEMPLATE_PREFIX,
+    FACILITY_KEY_FIELD,
+    FOOTPRINT_CRS_TEMPLATE_PREFIX,
+    FOOTPRINT_SUFFIX,
+    LAYER_NAME_SUFFIX,
+    NAVAID_FID_FIELD,
+    NAVAID_LAYER_FIELD,
+    OMNI_LAYER_NAME_SUFFIX,
+    OUTPUT_KIND_OMNI,
+    PERSISTENT_LAYER_PROPERTY,
+)
+from ..exceptions import BRACalculationError, BRAValidationError
+from ..utils.qt_compat import QVariantInt, QVariantString, ReqNoGeometry
+
+
+class OutputLayerService:
+    """Service for persistent BRA output layers.
+
+    The persistent layer may be a memory layer created by the plugin or any
+    file-backed polygon layer chosen by the user; all writes go through the
+    layer's data provider.
+    """
+
+    def __init__(self, project: Optional[Any] = None) -> None:
+        """Initialize output service.
+
+        Args:
+            project: QgsProject to search for persistent layers (defaults to
+                ``QgsProject.instance()``)
+        """
+        self._project = project
+
+    def project(self) -> Any:
+        """Return the project used for persistent layer lookup."""
+        return self._project if self._project is not None else QgsProject.instance()
+
+    def find_persistent_layer(self, kind: str) -> Optional[QgsVectorLayer]:
+        """Find the persistent output layer of the given kind in the project.
+
+        Args:
+            kind: Output kind (``"directional"`` or ``"omni"``)
+
+        Returns:
+            The marked layer, or None if the project has none
+        """
+        for layer in self.project().mapLayers().values():
+            if not isinstance(layer, QgsVectorLayer):
+                continue
+            if layer.customProperty(PERSISTENT_LAYER_PROPERTY) == kind:
+                return layer
+        return None
+
+    def create_persistent_layer(self, template: QgsVectorLayer, kind: str) -> QgsVectorLayer:
+        """Create a persistent memory layer with the schema of ``template``.
+
+        The new layer is marked with :data:`PERSISTENT_LAYER_PROPERTY` but is
+        not added to the project; the caller decides when to do that.
+        Footprint kinds (e.g. ``"omni_footprint"``) get a flat polygon layer.
+
+        Args:
+            template: A BRA result layer whose CRS and fields are copied
+            kind: Output kind (``"directional"``, ``"omni"`` or a footprint kind)
+
+        Returns:
+            Empty memory layer carrying the template fields plus the upsert keys
+        """
+        name = OMNI_LAYER_NAME_SUFFIX if kind.startswith(OUTPUT_KIND_OMNI) else LAYER_NAME_SUFFIX
+        prefix = CRS_TEMPLATE_PREFIX
+        if kind.endswith(FOOTPRINT_SUFFIX):
+            name = f"{name} {FOOTPRINT_SUFFIX}"
+            prefix = FOOTPRINT_CRS_TEMPLATE_PREFIX
+        layer = QgsVectorLayer(prefix + template.crs().authid(), name, "memory")
+        layer.dataProvider().addAttributes(list(template.fields()))
+        layer.updateFields()
+        self.ensure_key_fields(layer)
+        self.mark_persistent(layer, kind)
+        return layer
+
+    def mark_persistent(self, layer: QgsVectorLayer, kind: str) -> None:
+        """Mark a layer as the persistent output target for ``kind``.
+
+        Args:
+            layer: Layer to mark
+            kind: Output kind (``"directional"`` or ``"omni"``)
+        """
+        layer.setCustomProperty(PERSISTENT_LAYER_PROPERTY, kind)
+
+    def ensure_key_fields(self, layer: QgsVectorLayer) -> None:
+        """Add the navaid layer / navaid id / facility key fields to ``layer`` if missing.
+
+        Args:
+            layer: Target layer
+
+        Raises:
+            BRACalculationError: If the provider refuses the new fields
+        """
+        fields = layer.fields()
+        missing = [
+            QgsField(name, field_type)
+            for name, field_type in (
+                (NAVAID_LAYER_FIELD, QVariantString),
+                (NAVAID_FID_FIELD, QVariantInt),
+                (FACILITY_KEY_FIELD, QVariantString),
+            )
+            if fields.indexFromName(name) < 0
+        ]
+        if not missing:
+            return
+        if not layer.dataProvider().addAttributes(missing):
+            raise BRACalculationError(
+                "Failed to add upsert key fields to output layer",
+                f"Layer: {layer.name()}, fields: {[f.name() for f in missing]}",
+            )
+        layer.updateFields()
+
+    def matching_feature_ids(
+        self,
+        layer: QgsVectorLayer,
+        navaid_layer_id: str,
+        navaid_fid: int,
+        facility_key: str,
+    ) -> List[int]:
+        """Return ids of features in ``layer`` written for a navaid/facility.
+
+        Args:
+            layer: Persistent output layer (must already carry the key fields)
+            navaid_layer_id: Id of the navaid point layer
+            navaid_fid: Navaid feature id
+            facility_key: Facility key (e.g. ``"LOC"``)
+
+        Returns:
+            Feature ids matching all three keys
+        """
+        expression = "{} AND {} AND {}".format(
+            QgsExpression.createFieldEqualityExpression(NAVAID_LAYER_FIELD, navaid_layer_id),
+            QgsExpression.createFieldEqualityExpression(NAVAID_FID_FIELD, navaid_fid),
+            QgsExpression.createFieldEqualityExpression(FACILITY_KEY_FIELD, facility_key),
+        )
+        request = QgsFeatureRequest()
+        request.setFilterExpression(expression)
+        request.setFlags(ReqNoGeometry)
+        request.setNoAttributes()
+        return [feature.id() for feature in layer.getFeatures(request)]
+
+    def upsert(
+        self,
+        target: QgsVectorLayer,
+        source: QgsVectorLayer,
+        navaid_layer_id: str,
+        navaid_fid: Optional[int],
+        facility_key: str,
+    ) -> int:
+        """Replace the features of one navaid/facility in ``target``.
+
+        Every feature of ``source`` is copied in, then the features
+        previously written for the same key are deleted; if the delete fails
+        the new features are removed again, so the target keeps exactly one
+        version of the BRA.  Geometries are transformed to the target CRS.
+        Attributes are matched by field name so file-backed targets with
+        extra or reordered fields work too.
+
+        Args:
+            target: Persistent output layer
+            source: Freshly computed BRA layer
+            navaid_layer_id: Id of the navaid point layer (upsert key)
+            navaid_fid: Navaid feature id (upsert key)
+            facility_key: Facility key (upsert key)
+
+        Returns:
+            Number of features written
+
+        Raises:
+            BRAValidationError: If the target is not a polygon layer or a key is missing
+            BRACalculationError: If a geometry cannot be transformed or the
+                provider rejects the insert or delete
+        """
+        if QgsWkbTypes.geometryType(target.wkbType()) != QgsWkbTypes.PolygonGeometry:
+            raise BRAValidationError(
+                "Persistent BRA output layer must be a polygon layer",
+                f"Layer: {target.name()}",
+            )
+        if not navaid_layer_id or navaid_fid is None or not facility_key:
+            raise BRAValidationError(
+                "Navaid id and facility key are required to update a persistent BRA layer",
+                f"navaid_layer={navaid_layer_id!r}, navaid_fid={navaid_fid}, facility_key={facility_key!r}",
+            )
+
+        self.ensure_key_fields(target)
+        fields = target.fields()
+        layer_idx = fields.indexFromName(NAVAID_LAYER_FIELD)
+        fid_idx = fields.indexFromName(NAVAID_FID_FIELD)
+        key_idx = fields.indexFromName(FACILITY_KEY_FIELD)
+        mapping = [
+            (src_idx, fields.indexFromName(field.name()))
+            for src_idx, field in enumerate(source.fields())
+        ]
+
+        transform = None
+        if source.crs() != target.crs():
+            transform = QgsCoordinateTransform(source.crs(), target.crs(), self.project())
+
+        features = []
+        for src_feature in source.getFeatures():
+            src_attrs = src_feature.attributes()
+            attrs: List[Any] = [None] * fields.count()
+            for src_idx, dst_idx in mapping:
+                if dst_idx >= 0:
+                    attrs[dst_idx] = src_attrs[src_idx]
+            attrs[layer_idx] = navaid_layer_id
+            attrs[fid_idx] = navaid_fid
+            attrs[key_idx] = facility_key
+            geometry = src_feature.geometry()
+            if transform is not None:
+                geometry = QgsGeometry(geometry)
+                try:
+                    geometry.transform(transform)
+                except QgsCsException as e:
+                    raise BRACalculationError(
+                        "Failed to transform BRA features to the output layer CRS",
+                        f"Layer: {target.name()}, {source.crs().authid()} -> {target.crs().authid()}: {e}",
+                    ) from e
+            feature = QgsFeature()
+            feature.setGeometry(geometry)
+            feature.setAttributes(attrs)
+            features.append(feature)
+
+        provider = target.dataProvider()
+        # Previous features are looked up before the new ones share their key
+        stale = self.matching_feature_ids(target, navaid_layer_id, navaid_fid, facility_key)
+        added: List[Any] = []
+        if features:
+            ok, added = provider.addFeatures(features)
+            if not ok:
+                raise BRACalculationError(
+                    "Failed to write BRA features to output layer",
+                    f"Layer: {target.name()}, features: {len(features)}",
+                )
+        if stale and not provider.deleteFeatures(stale):
+            provider.deleteFeatures([feature.id() for feature in added])
+            raise BRACalculationError(
+                "Failed to remove previous BRA features from output layer",
+                f"Layer: {target.name()}, feature ids: {stale}",
+            )
+        target.updateExtents()
+        target.triggerRepaint()
+        return len(features)
@@ -0,0 +1,196 @@
+"""Point-query service for qBRA plugin.
+
+QGIS side of the BRA point query: keeps a
+:class:`~qBRA.modules.point_query.SurfaceIndex` per layer CRS over every BRA
+output layer of the project.  The plugin reports added and removed layers;
+a layer is (re)indexed lazily, on the first query after it was added or
+its data changed, by decoding the WKB of its features (curved slopes are
+segmentised first).  A clicked point is transformed once per indexed CRS
+and the hits of all layers are merged, lowest surface first.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProject,
+    QgsVectorLayer,
+    QgsWkbTypes,
+)
+
+from ..constants import (
+    LAYER_NAME_SUFFIX,
+    OMNI_LAYER_NAME_SUFFIX,
+    OUTPUT_KIND_DIRECTIONAL,
+    OUTPUT_KIND_OMNI,
+    PERSISTENT_LAYER_PROPERTY,
+    SCENARIO_LAYER_NAME_SUFFIX,
+    VIEWPORT_LAYER_NAME,
+)
+from ..exceptions import BRAError
+from ..modules.point_query import PointQueryResult, Surface, SurfaceHit, SurfaceIndex
+from ..modules.wkb import decode_polygons
+from ..utils.logging_config import get_logger
+from .tile_export_service import feature_properties
+
+logger = get_logger(__name__)
+
+
+def is_bra_layer(layer: Any) -> bool:
+    """Return True for 3D BRA output layers.
+
+    The criteria of ``LayerService.get_bra_layers``, plus scenario and
+    viewport layers.
+    """
+    if not isinstance(layer, QgsVectorLayer):
+        return False
+    if layer.customProperty(PERSISTENT_LAYER_PROPERTY) in (OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI):
+        return True
+    name = layer.name()
+    return name == VIEWPORT_LAYER_NAME or name.endswith(
+        (LAYER_NAME_SUFFIX, OMNI_LAYER_NAME_SUFFIX, SCENARIO_LAYER_NAME_SUFFIX)
+    )
+
+
+def layer_surfaces(layer: QgsVectorLayer) -> List[Surface]:
+    """Read the features of a BRA layer as ``(key, properties, polygons)`` surfaces.
+
+    Keys are ``(layer id, feature id)``; features without geometry or with
+    an undecodable one are skipped.
+    """
+    layer_id, name = layer.id(), layer.name()
+    names = [field.name() for field in layer.fields()]
+    surfaces: List[Surface] = []
+    for feature in layer.getFeatures():
+        geometry = feature.geometry()
+        if geometry is None or geometry.isEmpty():
+            continue
+        if QgsWkbTypes.isCurvedType(geometry.wkbType()):
+            geometry = QgsGeometry(geometry.constGet().segmentize())
+        try:
+            polygons = decode_polygons(bytes(geometry.asWkb()))
+        except BRAError as e:
+            logger.debug("Feature %s of '%s' not indexed: %s", feature.id(), name, e)
+            continue
+        surfaces.append(((layer_id, feature.id()), feature_properties(name, names, feature.attributes()), polygons))
+    return surfaces
+
+
+def describe_hit(hit: SurfaceHit) -> str:
+    """One-line description of a covering surface, e.g. ``"RWY09 - ILS LLZ: slope at 42.5 m"``."""
+    properties = hit.properties
+    name = properties.get("area_name") or properties.get("navaid_id")
+    return f"{name}: {properties.get('area')} at {hit.height:.1f} m"
+
+
+class BRAQueryService:
+    """Point queries over all BRA layers of a project."""
+
+    def __init__(self, project: Optional[Any] = None) -> None:
+        """Initialize the service.
+
+        Args:
+            project: Project holding the layers (defaults to the current one)
+        """
+        self._project = project
+        self._indexes: Dict[str, SurfaceIndex] = {}
+        self._crs: Dict[str, str] = {}
+        self._stale: Set[str] = set()
+
+    @property
+    def project(self) -> Any:
+        return self._project if self._project is not None else QgsProject.instance()
+
+    @property
+    def layer_ids(self) -> List[str]:
+        """Ids of the tracked BRA layers."""
+        return list(self._crs)
+
+    def __len__(self) -> int:
+        """Return the number of indexed surfaces."""
+        return sum(len(index) for index in self._indexes.values())
+
+    def add_layers(self, layers: Iterable[Any]) -> int:
+        """Track the BRA layers among ``layers``; returns how many were BRA layers.
+
+        Non-BRA layers are ignored.  Each tracked layer is re-indexed on the
+        next query after its data changes.
+        """
+        added = 0
+        for layer in layers:
+            if not is_bra_layer(layer):
+                continue
+            layer_id = layer.id()
+            if layer_id not in self._crs:
+                layer.dataChanged.connect(lambda layer_id=layer_id: self.invalidate(layer_id))
+            self._crs[layer_id] = layer.crs().authid()
+            self._stale.add(layer_id)
+            added += 1
+        return added
+
+    def invalidate(self, layer_id: str) -> None:
+        """Mark a tracked layer for re-indexing."""
+        if layer_id in self._crs:
+            self._stale.add(layer_id)
+
+    def remove_layers(self, layer_ids: Iterable[str]) -> None:
+        """Stop tracking removed layers."""
+        for layer_id in layer_ids:
+            authid = self._crs.pop(layer_id, None)
+            self._stale.discard(layer_id)
+            if authid is not None and authid in self._indexes:
+                self._indexes[authid].remove(layer_id)
+
+    def clear(self) -> None:
+        """Drop every layer (e.g. when the project is closed)."""
+        self._indexes.clear()
+        self._crs.clear()
+        self._stale.clear()
+
+    def refresh(self) -> int:
+        """Index the layers added or changed since the last refresh.
+
+        Returns:
+            Number of layers indexed
+        """
+        done = 0
+        for layer_id in sorted(self._stale):
+            layer = self.project.mapLayer(layer_id)
+            if layer is None:
+                self.remove_layers([layer_id])
+                continue
+            for index in self._indexes.values():
+                index.remove(layer_id)
+            authid = layer.crs().authid()
+            self._crs[layer_id] = authid
+            count = self._indexes.setdefault(authid, SurfaceIndex()).add(layer_id, layer_surfaces(layer))
+            logger.debug("Indexed %d surface(s) of BRA layer '%s'", count, layer.name())
+            done += 1
+        self._stale.clear()
+        return done
+
+    def query(self, x: float, y: float, crs_authid: str) -> PointQueryResult:
+        """Return the BRA surfaces covering a point, lowest first.
+
+        Args:
+            x, y: Point coordinates
+            crs_authid: CRS of the point (e.g. the canvas CRS)
+        """
+        self.refresh()
+        result = PointQueryResult(x, y)
+        for authid, index in self._indexes.items():
+            if not len(index):
+                continue
+            px, py = x, y
+            if authid != crs_authid:
+                transform = QgsCoordinateTransform(
+                    QgsCoordinateReferenceSystem(crs_authid), QgsCoordinateReferenceSystem(authid), self.project
+                )
+                point = transform.transform(QgsPointXY(x, y))
+                px, py = point.x(), point.y()
+            result.hits.extend(index.query(px, py).hits)
+        result.hits.sort(key=lambda hit: hit.height)
+        return result
@@ -0,0 +1,230 @@
+"""PostGIS output sink for BRA features.
+
+Loads BRA polygons into PostGIS with ``COPY`` instead of row-by-row inserts
+through a QGIS/OGR provider.  Features are buffered per output kind and sent
+in batches as tab-separated text with hex WKB geometry into a temporary
+staging table, which is merged into the target table once, when the sink is
+closed.  The whole run is one transaction: it is committed on close and
+rolled back if the run fails.
+
+Directional and omni BRAs have different schemas, so each kind gets its own
+table (``<table>_directional`` / ``<table>_omni``, as with the persistent
+plugin layers).  With ``upsert`` enabled (default) the rows of a navaid
+(``navaid_id`` + ``facility_key``) replace any rows stored by earlier runs.
+Merging once per run deletes those rows exactly once, so a navaid whose
+surfaces straddle two batches keeps all of them.
+
+Requires ``psycopg2``, which is optional for the rest of qBRA.
+
+Usage
+-----
+    with PostGISSink("postgresql://user@host/db", "public.bra", srid=32633) as sink:
+        sink.write(rings, properties, OUTPUT_KIND_DIRECTIONAL)
+"""
+
+import io
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import psycopg2
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+from ..constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI, POSTGIS_BATCH_SIZE
+from ..exceptions import BRAError
+from ..modules.attributes import DIRECTIONAL_FIELDS, OMNI_FIELDS
+from ..modules.wkb import WkbEncoder
+
+#: Upsert key columns, written ahead of the attribute fields.
+KEY_COLUMNS: Tuple[str, ...] = ("navaid_id", "facility_key")
+
+_KIND_FIELDS = {
+    OUTPUT_KIND_DIRECTIONAL: DIRECTIONAL_FIELDS,
+    OUTPUT_KIND_OMNI: OMNI_FIELDS,
+}
+_DSN_PREFIXES = ("postgresql://", "postgres://", "PG:")
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def is_postgis_dsn(target: str) -> bool:
+    """Return True if an output target is a PostgreSQL connection string."""
+    return target.startswith(_DSN_PREFIXES)
+
+
+def quote_ident(name: str) -> str:
+    """Quote a (optionally schema-qualified) SQL identifier."""
+    return ".".join('"' + part.replace('"', '""') + '"' for part in name.split("."))
+
+
+def copy_value(value: Any) -> str:
+    """Format one value for ``COPY ... FROM STDIN`` text format."""
+    if value is None:
+        return "\\N"
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class _KindTable:
+    """Target table, staging table and row buffer of one output kind."""
+
+    def __init__(self, table: str, kind: str, srid: int) -> None:
+        base = f"{table}_{kind}"
+        self.fields = _KIND_FIELDS[kind]
+        self.target = quote_ident(base)
+        self.index = quote_ident(base.rsplit(".", 1)[-1] + "_navaid_idx")
+        self.staging = quote_ident(f"qbra_stage_{kind}")
+        self.srid = srid
+        self.attributes = [*KEY_COLUMNS, *(name for name, _kind in self.fields)]
+        self.columns = ", ".join(quote_ident(name) for name in self.attributes)
+        self.buffer = io.StringIO()
+        self.rows = 0
+        self.created = False
+        self.staged = False
+
+    def create_sql(self) -> List[str]:
+        types = [f"{quote_ident(name)} TEXT NOT NULL" for name in KEY_COLUMNS]
+        types += [f"{quote_ident(name)} {'INTEGER' if kind is int else 'TEXT'}" for name, kind in self.fields]
+        return [
+            f"CREATE TABLE IF NOT EXISTS {self.target} ({', '.join(types)}, "
+            f"geom geometry(PolygonZ, {self.srid}))",
+            f"CREATE INDEX IF NOT EXISTS {self.index} ON {self.target} "
+            f"({', '.join(quote_ident(name) for name in KEY_COLUMNS)})",
+            f"CREATE TEMP TABLE IF NOT EXISTS {self.staging} "
+            f"(LIKE {self.target} EXCLUDING ALL, wkb BYTEA) ON COMMIT DROP",
+        ]
+
+    def merge_sql(self, upsert: bool) -> List[str]:
+        statements = []
+        if upsert:
+            statements.append(
+                f"DELETE FROM {self.target} t USING "
+                f"(SELECT DISTINCT navaid_id, facility_key FROM {self.staging}) s "
+                "WHERE t.navaid_id = s.navaid_id AND t.facility_key = s.facility_key"
+            )
+        statements.append(
+            f"INSERT INTO {self.target} ({self.columns}, geom) "
+            f"SELECT {self.columns}, ST_SetSRID(ST_GeomFromWKB(wkb), {self.srid}) FROM {self.staging}"
+        )
+        statements.append(f"TRUNCATE {self.staging}")
+        return statements
+
+
+class PostGISSink:
+    """Write BRA features to PostGIS in batched ``COPY`` loads, one transaction per run."""
+
+    def __init__(
+        self,
+        dsn: Optional[str],
+        table: str = "bra",
+        srid: int = 0,
+        batch_size: int = POSTGIS_BATCH_SIZE,
+        upsert: bool = True,
+        connection: Any = None,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            dsn: libpq connection string or URI (``PG:`` prefix allowed)
+            table: Base name of the target tables, optionally schema-qualified
+            srid: SRID of the geometry columns
+            batch_size: Features buffered per kind before a ``COPY`` to staging
+            upsert: Replace stored rows with the same navaid id + facility
+            connection: Open DB-API connection to use instead of ``dsn``
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self._dsn = dsn[3:] if dsn and dsn.startswith("PG:") else dsn
+        self._connection = connection
+        self._owns_connection = connection is None
+        self._table = table
+        self._srid = srid
+        self._batch_size = batch_size
+        self._upsert = upsert
+        self._tables: Dict[str, _KindTable] = {}
+        self._cursor: Any = None
+        self._encoder = WkbEncoder()
+        self.count = 0
+
+    def __enter__(self) -> "PostGISSink":
+        if self._connection is None:
+            if not PSYCOPG2_AVAILABLE:
+                raise BRAError("PostGIS output requires psycopg2", "pip install psycopg2-binary")
+            try:
+                self._connection = psycopg2.connect(self._dsn)
+            except psycopg2.Error as e:
+                raise BRAError("Cannot connect to PostGIS", str(e).strip()) from e
+        self._cursor = self._connection.cursor()
+        return self
+
+    def __exit__(self, exc_type: Any, *_exc: Any) -> None:
+        try:
+            if exc_type is not None:
+                self._connection.rollback()
+                return
+            try:
+                self.flush()
+                self._merge()
+                self._connection.commit()
+            except BRAError:
+                self._connection.rollback()
+                raise
+            except Exception as e:  # DB-API drivers share no common error base
+                self._connection.rollback()
+                raise BRAError("PostGIS commit failed", str(e).strip()) from e
+        finally:
+            self._cursor.close()
+            self._cursor = None
+            if self._owns_connection:
+                self._connection.close()
+                self._connection = None
+
+    def write(self, rings: Sequence[Any], properties: Dict[str, Any], kind: str = OUTPUT_KIND_DIRECTIONAL) -> None:
+        """Buffer one polygon (exterior ring first) with its properties.
+
+        ``properties`` holds ``navaid_id``, ``facility_key`` and the fields
+        of the kind's schema; a batch is copied to staging once it is full.
+        """
+        table = self._tables.get(kind)
+        if table is None:
+            table = self._tables[kind] = _KindTable(self._table, kind, self._srid)
+        row = [copy_value(properties.get(name)) for name in table.attributes]
+        row.append("\\\\x" + self._encoder.polygon_z(rings).hex())
+        table.buffer.write("\t".join(row))
+        table.buffer.write("\n")
+        table.rows += 1
+        self.count += 1
+        if table.rows >= self._batch_size:
+            self._load(table)
+
+    def flush(self) -> None:
+        """Copy all buffered features to staging."""
+        for table in self._tables.values():
+            if table.rows:
+                self._load(table)
+
+    def _merge(self) -> None:
+        """Merge the staged features of the run into the target tables."""
+        for table in self._tables.values():
+            if not table.staged:
+                continue
+            try:
+                for statement in table.merge_sql(self._upsert):
+                    self._cursor.execute(statement)
+            except Exception as e:  # DB-API drivers share no common error base
+                raise BRAError("PostGIS load failed", f"{table.target}: {str(e).strip()}") from e
+            table.staged = False
+
+    def _load(self, table: _KindTable) -> None:
+        cursor = self._cursor
+        try:
+            if not table.created:
+                for statement in table.create_sql():
+                    cursor.execute(statement)
+                table.created = True
+            table.buffer.seek(0)
+            cursor.copy_expert(f"COPY {table.staging} ({table.columns}, wkb) FROM STDIN", table.buffer)
+        except Exception as e:  # DB-API drivers share no common error base
+            raise BRAError("PostGIS load failed", f"{table.target}: {str(e).strip()}") from e
+        table.buffer = io.StringIO()
+        table.rows = 0
+        table.staged = True
@@ -0,0 +1,149 @@
+"""Regeneration service for qBRA plugin.
+
+BRA results added to the project as memory layers lose their features when
+the project is closed.  Each such layer keeps a :class:`BRARecipe` in the
+custom property :data:`RECIPE_PROPERTY`; after a project is loaded the
+service lists the empty layers that carry a recipe, and the plugin asks it
+to recompute a layer only when that layer is rendered, queried or
+regenerated explicitly.  Contains no Qt wiring.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from qgis.core import QgsProject, QgsVectorLayer
+
+from ..constants import OUTPUT_KIND_OMNI, RECIPE_PROPERTY
+from ..exceptions import BRACalculationError, BRAValidationError, LayerNotFoundError
+from ..models.bra_recipe import BRARecipe
+from ..modules.ils_llz_logic import build_layers, build_layers_omni
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+Builder = Callable[[Any, Any], QgsVectorLayer]
+
+
+class RegenerationService:
+    """Store BRA recipes on layers and regenerate empty layers on demand."""
+
+    def __init__(
+        self,
+        iface: Any,
+        project: Optional[Any] = None,
+        builders: Optional[Dict[str, Builder]] = None,
+    ) -> None:
+        """Initialize regeneration service.
+
+        Args:
+            iface: QGIS interface object (passed through to the build functions)
+            project: QgsProject holding the layers (defaults to ``QgsProject.instance()``)
+            builders: Build function per output kind (defaults to
+                ``build_layers`` / ``build_layers_omni``)
+        """
+        self.iface = iface
+        self._project = project
+        self._builders = builders
+        self._pending: Set[str] = set()
+
+    def project(self) -> Any:
+        """Return the project used for layer lookup."""
+        return self._project if self._project is not None else QgsProject.instance()
+
+    @property
+    def pending(self) -> Set[str]:
+        """Ids of layers waiting for regeneration."""
+        return set(self._pending)
+
+    def is_pending(self, layer_id: str) -> bool:
+        """Return True if the layer waits for regeneration."""
+        return layer_id in self._pending
+
+    def store(self, layer: QgsVectorLayer, recipe: BRARecipe) -> None:
+        """Attach a recipe to a BRA layer."""
+        layer.setCustomProperty(RECIPE_PROPERTY, recipe.to_json())
+
+    def recipe(self, layer: QgsVectorLayer) -> Optional[BRARecipe]:
+        """Return the recipe stored on a layer, or None if it has no (valid) recipe."""
+        text = layer.customProperty(RECIPE_PROPERTY)
+        if not text:
+            return None
+        try:
+            return BRARecipe.from_json(str(text))
+        except BRAValidationError as e:
+            logger.warning("Ignoring BRA recipe of layer '%s': %s", layer.name(), e)
+            return None
+
+    def scan(self) -> List[str]:
+        """Find empty layers with a recipe (e.g. after a project was read).
+
+        Returns:
+            Ids of the layers now waiting for regeneration
+        """
+        self._pending = {
+            layer_id
+            for layer_id, layer in self.project().mapLayers().items()
+            if isinstance(layer, QgsVectorLayer)
+            and layer.featureCount() == 0
+            and layer.customProperty(RECIPE_PROPERTY)
+        }
+        return sorted(self._pending)
+
+    def forget(self, layer_ids: Any) -> None:
+        """Stop tracking removed layers."""
+        self._pending.difference_update(layer_ids)
+
+    def clear(self) -> None:
+        """Stop tracking all layers (e.g. when the project is closed)."""
+        self._pending.clear()
+
+    def regenerate(self, layer_id: str) -> int:
+        """Recompute a pending layer's features from its recipe.
+
+        The layer leaves the pending set whether or not regeneration
+        succeeds, so a broken recipe is not retried on every repaint.
+
+        Returns:
+            Number of features written
+
+        Raises:
+            LayerNotFoundError: If the layer or its navaid layer is gone
+            BRAValidationError: If the layer has no valid recipe
+            BRACalculationError: If the calculation or the write fails
+        """
+        self._pending.discard(layer_id)
+        project = self.project()
+        layer = project.mapLayer(layer_id)
+        if not isinstance(layer, QgsVectorLayer):
+            raise LayerNotFoundError("BRA layer to regenerate not found", f"Layer id: {layer_id}")
+        recipe = self.recipe(layer)
+        if recipe is None:
+            raise BRAValidationError("Layer has no stored BRA recipe", f"Layer: {layer.name()}")
+        navaid_layer = project.mapLayer(recipe.navaid_layer_id)
+        if navaid_layer is None:
+            raise LayerNotFoundError(
+                "Navaid layer of stored BRA not found",
+                f"Layer: {layer.name()}, navaid layer id: {recipe.navaid_layer_id}",
+            )
+
+        try:
+            params = recipe.build_params(navaid_layer)
+            built = self._builder(recipe.kind)(self.iface, params)
+        except ValueError as e:
+            raise BRACalculationError("Stored BRA parameters are no longer valid", str(e)) from e
+        features = list(built.getFeatures())
+        if features:
+            ok, _added = layer.dataProvider().addFeatures(features)
+            if not ok:
+                raise BRACalculationError(
+                    "Failed to write regenerated BRA features",
+                    f"Layer: {layer.name()}, features: {len(features)}",
+                )
+        layer.updateExtents()
+        layer.triggerRepaint()
+        logger.info("Regenerated %d BRA features of '%s'", len(features), layer.name())
+        return len(features)
+
+    def _builder(self, kind: str) -> Builder:
+        if self._builders is not None:
+            return self._builders[kind]
+        return build_layers_omni if kind == OUTPUT_KIND_OMNI else build_layers
@@ -0,0 +1,101 @@
+"""Vector-tile export of project BRA layers.
+
+QGIS side of the MBTiles export: reprojects the features of the BRA output
+layers (as produced by ``build_layers`` / ``build_layers_omni``) to Web
+Mercator and feeds them to :class:`~qBRA.services.mbtiles_sink.MBTilesSink`.
+Features are keyed by layer name plus ``navaid_fid`` (persistent layers)
+so exporting the project again into the same file only re-encodes tiles of
+BRAs that changed.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsGeometry,
+    QgsProject,
+    QgsVectorLayer,
+)
+
+from ..constants import (
+    MBTILES_MAX_ZOOM,
+    MBTILES_MIN_ZOOM,
+    NAVAID_FID_FIELD,
+    OMNI_LAYER_NAME_SUFFIX,
+    OUTPUT_KIND_DIRECTIONAL,
+    OUTPUT_KIND_OMNI,
+    PERSISTENT_LAYER_PROPERTY,
+)
+from .mbtiles_sink import MBTilesSink, MBTilesStats
+
+TILE_CRS = "EPSG:3857"
+
+
+def layer_kind(layer: QgsVectorLayer) -> str:
+    """Return the output kind of a BRA layer."""
+    kind = layer.customProperty(PERSISTENT_LAYER_PROPERTY)
+    if kind in (OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI):
+        return kind
+    return OUTPUT_KIND_OMNI if layer.name().endswith(OMNI_LAYER_NAME_SUFFIX) else OUTPUT_KIND_DIRECTIONAL
+
+
+def feature_properties(layer_name: str, names: Sequence[str], values: Sequence[Any]) -> Dict[str, Any]:
+    """Attribute dict of one BRA feature, with the navaid key used by the sink.
+
+    QGIS NULL values become None.
+    """
+    properties = {
+        name: None if value is None or (hasattr(value, "isNull") and value.isNull()) else value
+        for name, value in zip(names, values)
+    }
+    fid = properties.get(NAVAID_FID_FIELD)
+    properties["navaid_id"] = layer_name if fid is None else f"{layer_name}:{fid}"
+    properties.setdefault("facility_key", properties.get("type"))
+    return properties
+
+
+def _rings(geometry: QgsGeometry) -> List[List[np.ndarray]]:
+    parts = geometry.asMultiPolygon() if geometry.isMultipart() else [geometry.asPolygon()]
+    return [[np.array([(p.x(), p.y()) for p in ring]) for ring in part] for part in parts if part]
+
+
+def export_bra_layers(
+    layers: Sequence[QgsVectorLayer],
+    path: str,
+    minzoom: int = MBTILES_MIN_ZOOM,
+    maxzoom: int = MBTILES_MAX_ZOOM,
+    project: Optional[Any] = None,
+) -> MBTilesStats:
+    """Export BRA layers into an MBTiles file.
+
+    Args:
+        layers: BRA output layers (see ``LayerService.get_bra_layers``)
+        path: MBTiles file, updated incrementally if it exists
+        minzoom, maxzoom: Zoom range of the pyramid
+        project: Project providing the transform context (defaults to the current one)
+
+    Returns:
+        Build statistics
+
+    Raises:
+        BRAError: If the file cannot be written
+    """
+    target = QgsCoordinateReferenceSystem(TILE_CRS)
+    context = (project or QgsProject.instance()).transformContext()
+    with MBTilesSink(path, TILE_CRS, minzoom, maxzoom) as sink:
+        for layer in layers:
+            kind = layer_kind(layer)
+            transform = QgsCoordinateTransform(layer.crs(), target, context)
+            names = [field.name() for field in layer.fields()]
+            for feature in layer.getFeatures():
+                geometry = QgsGeometry(feature.geometry())
+                if geometry.isEmpty():
+                    continue
+                geometry.transform(transform)
+                properties = feature_properties(layer.name(), names, feature.attributes())
+                for rings in _rings(geometry):
+                    sink.write(rings, properties, kind)
+    return sink.stats
@@ -0,0 +1,124 @@
+"""Viewport service for qBRA plugin.
+
+QGIS side of viewport-driven materialisation: converts project layers into
+inventory records for :class:`~qBRA.modules.viewport.ViewportEngine` and
+keeps a memory layer in sync with the engine's tile cache.  Features of a
+tile are added when the tile is computed and deleted when it is evicted;
+the plugin drives :meth:`ViewportLayer.show` from canvas extent changes.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from qgis.core import QgsFeature, QgsField, QgsVectorLayer, QgsWkbTypes
+
+from ..constants import CRS_TEMPLATE_PREFIX, VIEWPORT_LAYER_NAME
+from ..modules.ils_llz_logic import wkb_geometry
+from ..modules.viewport import Extent, TileKey, ViewportEngine, ViewportUpdate
+from ..modules.wkb import WkbEncoder
+from ..utils.qt_compat import QVariantInt, QVariantString
+from .inventory_service import GEOMETRY_KEY, Record
+
+#: (name, type) of the viewport layer fields, shared by both output kinds.
+VIEWPORT_FIELDS: Tuple[Tuple[str, type], ...] = (
+    ("navaid_id", str),
+    ("facility_key", str),
+    ("tile", str),
+    ("id", int),
+    ("area", str),
+    ("max_elev", str),
+    ("area_name", str),
+    ("type", str),
+)
+
+
+def layer_records(layer: QgsVectorLayer) -> List[Record]:
+    """Read a point or line layer into inventory records.
+
+    Attribute values are keyed by field name; the feature id is used as
+    ``id`` unless the layer has such a field.
+    """
+    names = [field.name() for field in layer.fields()]
+    records: List[Record] = []
+    for feature in layer.getFeatures():
+        record: Record = dict(zip(names, feature.attributes()))
+        record.setdefault("id", feature.id())
+        geometry = feature.geometry()
+        record[GEOMETRY_KEY] = _geometry(geometry) if geometry is not None and not geometry.isEmpty() else None
+        records.append(record)
+    return records
+
+
+def _geometry(geometry: Any) -> Optional[Tuple[str, Any]]:
+    gtype = geometry.type()
+    if gtype == QgsWkbTypes.LineGeometry:
+        parts = geometry.asMultiPolyline() if geometry.isMultipart() else [geometry.asPolyline()]
+        return ("LineString", [(p.x(), p.y()) for p in parts[0]]) if parts and parts[0] else None
+    if gtype == QgsWkbTypes.PointGeometry:
+        point = geometry.asMultiPoint()[0] if geometry.isMultipart() else geometry.asPoint()
+        return "Point", (point.x(), point.y())
+    return None
+
+
+class ViewportLayer:
+    """Memory layer mirroring the tile cache of a :class:`ViewportEngine`."""
+
+    def __init__(self, engine: ViewportEngine, crs_authid: str, name: str = VIEWPORT_LAYER_NAME) -> None:
+        """Create the (empty) display layer.
+
+        Args:
+            engine: Engine over the navaid inventory
+            crs_authid: CRS of the navaid layer (e.g. ``"EPSG:32633"``)
+            name: Layer name
+        """
+        self.engine = engine
+        self.layer = QgsVectorLayer(CRS_TEMPLATE_PREFIX + crs_authid, name, "memory")
+        self.layer.dataProvider().addAttributes([
+            QgsField(field, QVariantInt if kind is int else QVariantString) for field, kind in VIEWPORT_FIELDS
+        ])
+        self.layer.updateFields()
+        self._fids: Dict[TileKey, List[int]] = {}
+        self._encoder = WkbEncoder()
+
+    def show(self, extent: Extent) -> ViewportUpdate:
+        """Materialise the BRAs around ``extent`` and drop evicted tiles.
+
+        Args:
+            extent: (xmin, ymin, xmax, ymax) in the layer CRS
+        """
+        update = self.engine.update(extent)
+        provider = self.layer.dataProvider()
+        stale = [fid for key in update.removed for fid in self._fids.pop(key, [])]
+        if stale:
+            provider.deleteFeatures(stale)
+        for tile in update.added:
+            tile_name = f"{tile.key[0]}_{tile.key[1]}"
+            features = []
+            for rings, properties, _kind in tile.features:
+                feature = QgsFeature(self.layer.fields())
+                feature.setGeometry(wkb_geometry(self._encoder.polygon_z(rings)))
+                feature.setAttributes([
+                    tile_name if name == "tile" else _value(properties.get(name), kind)
+                    for name, kind in VIEWPORT_FIELDS
+                ])
+                features.append(feature)
+            ok, added = provider.addFeatures(features)
+            self._fids[tile.key] = [feature.id() for feature in added] if ok else []
+        if stale or update.added:
+            self.layer.updateExtents()
+            self.layer.triggerRepaint()
+        return update
+
+    def clear(self) -> None:
+        """Drop every materialised feature and the engine cache."""
+        self.engine.clear()
+        stale = [fid for fids in self._fids.values() for fid in fids]
+        self._fids.clear()
+        if stale:
+            self.layer.dataProvider().deleteFeatures(stale)
+            self.layer.triggerRepaint()
+
+
+def _value(value: Any, kind: type) -> Any:
+    if value is None:
+        return None
+    return int(value) if kind is int else str(value)
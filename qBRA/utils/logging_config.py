@@ -2,10 +2,31 @@
 
 This module provides structured logging for the qBRA plugin, integrating with
 QGIS MessageLog for display in the QGIS interface.
+
+Plugin loggers do not call QGIS directly: they put records on a shared
+queue (``QueueHandler``), which is cheap and thread-safe from worker
+threads, and a single :class:`BatchQueueListener` thread drains the queue
+and forwards the records to the QGIS log in batches.  The listener starts
+with the first QGIS logger; the plugin stops it (flushing pending records)
+on unload via :func:`stop_queue_logging`.
+
+Disabled levels are filtered by the logger before a record is created.  In
+hot loops, hoist the check so disabled debug calls cost nothing::
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for feature in features:
+        if debug:
+            logger.debug("Feature %s", feature.id())
 """
 
+import copy
 import logging
-from typing import Optional
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
+
+from ..constants import LOG_BATCH_SIZE
 
 try:
     from qgis.core import QgsMessageLog
@@ -14,10 +35,21 @@ try:
 except ImportError:
     QGIS_AVAILABLE = False
 
-
 # Plugin name for QGIS MessageLog
 PLUGIN_NAME = "qBRA"
 
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Python logging levels -> QGIS levels (anything else maps to MsgInfo)
+_QGIS_LEVELS: Dict[int, object] = {
+    logging.DEBUG: MsgInfo,
+    logging.INFO: MsgInfo,
+    logging.WARNING: MsgWarning,
+    logging.ERROR: MsgCritical,
+    logging.CRITICAL: MsgCritical,
+} if QGIS_AVAILABLE else {}
+
 
 class QGISLogHandler(logging.Handler):
     """Custom logging handler that writes to QGIS MessageLog.
@@ -43,19 +75,31 @@ class QGISLogHandler(logging.Handler):
         """
         if not QGIS_AVAILABLE:
             return
-        
-        # Map Python logging levels to QGIS levels
-        level_map = {
-            logging.DEBUG: MsgInfo,
-            logging.INFO: MsgInfo,
-            logging.WARNING: MsgWarning,
-            logging.ERROR: MsgCritical,
-            logging.CRITICAL: MsgCritical,
-        }
-        
-        qgis_level = level_map.get(record.levelno, MsgInfo)
-        message = self.format(record)
-        
+        self._log(self.format(record), _QGIS_LEVELS.get(record.levelno, MsgInfo))
+
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        """Emit records with one QGIS log entry per run of equal QGIS level.
+
+        Args:
+            records: Log records in arrival order
+        """
+        if not QGIS_AVAILABLE:
+            return
+        lines: List[str] = []
+        current = None
+        for record in records:
+            if record.levelno < self.level:
+                continue
+            level = _QGIS_LEVELS.get(record.levelno, MsgInfo)
+            if lines and level != current:
+                self._log("\n".join(lines), current)
+                lines = []
+            current = level
+            lines.append(self.format(record))
+        if lines:
+            self._log("\n".join(lines), current)
+
+    def _log(self, message: str, qgis_level: object) -> None:
         try:
             QgsMessageLog.logMessage(message, self.plugin_name, qgis_level)
         except Exception:
@@ -63,6 +107,107 @@ class QGISLogHandler(logging.Handler):
             print(f"[{self.plugin_name}] {message}")
 
 
+class _RecordQueueHandler(QueueHandler):
+    """Queue handler that only merges the message arguments in the caller.
+
+    Full formatting (time stamp, logger name) happens in the listener; the
+    arguments are merged here because they may be mutated after the call,
+    and tracebacks are rendered here because they hold frames.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class BatchQueueListener(QueueListener):
+    """Queue listener forwarding records to its handlers in batches.
+
+    After a blocking read it takes whatever else is already queued (up to
+    ``batch_size`` records) and passes the batch to handlers offering
+    ``emit_batch``; other handlers get the records one by one.
+    """
+
+    def __init__(self, log_queue: "queue.Queue", *handlers: logging.Handler, batch_size: int = LOG_BATCH_SIZE):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def _monitor(self) -> None:
+        log_queue = self.queue
+        stop = False
+        while not stop:
+            batch: List[logging.LogRecord] = []
+            record = log_queue.get()
+            while True:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    batch.append(record)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = log_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self.handle_batch(batch)
+
+    def handle_batch(self, records: List[logging.LogRecord]) -> None:
+        """Pass a batch of records to every handler."""
+        for handler in self.handlers:
+            emit_batch = getattr(handler, "emit_batch", None)
+            if emit_batch is not None:
+                try:
+                    emit_batch(records)
+                except Exception:
+                    handler.handleError(records[-1])
+                continue
+            for record in records:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+_listener: Optional[BatchQueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def start_queue_logging(batch_size: int = LOG_BATCH_SIZE) -> BatchQueueListener:
+    """Start the listener forwarding queued records to QGIS (idempotent).
+
+    Args:
+        batch_size: Maximum records forwarded per batch
+
+    Returns:
+        The running listener
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            handler = QGISLogHandler(PLUGIN_NAME)
+            handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+            _listener = BatchQueueListener(_log_queue, handler, batch_size=batch_size)
+            _listener.start()
+        return _listener
+
+
+def stop_queue_logging() -> None:
+    """Forward pending records and stop the listener thread.
+
+    Records logged afterwards stay queued until the listener is started again.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
 def setup_logger(
     name: str,
     level: int = logging.INFO,
@@ -70,7 +215,8 @@ def setup_logger(
 ) -> logging.Logger:
     """Setup and configure a logger for the qBRA plugin.
     
-    Creates a namespaced logger with appropriate handlers for QGIS integration.
+    Creates a namespaced logger with appropriate handlers for QGIS integration:
+    a queue handler feeding the QGIS log listener, or a console handler.
     
     Args:
         name: Logger name (should be module path, e.g., "qBRA.dockwidgets.ils")
@@ -95,19 +241,15 @@ def setup_logger(
     logger.setLevel(level)
     logger.propagate = False
     
-    # Choose handler based on QGIS availability and preference
+    # QGIS output goes through the shared queue (formatted by the listener)
     if use_qgis and QGIS_AVAILABLE:
-        handler = QGISLogHandler(PLUGIN_NAME)
-    else:
-        handler = logging.StreamHandler()
-    
+        logger.addHandler(_RecordQueueHandler(_log_queue))
+        start_queue_logging()
+        return logger
+
+    handler = logging.StreamHandler()
     # Format with timestamp, level, and message
-    formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    handler.setFormatter(formatter)
-    
+    handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
     logger.addHandler(handler)
     
     return logger
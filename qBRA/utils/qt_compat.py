@@ -19,6 +19,7 @@ Usage::
         LeftDockWidgetArea, RightDockWidgetArea,
         QVariantInt, QVariantString, QVariantDouble,
         MsgInfo, MsgWarning, MsgCritical, MsgSuccess,
+        ReqNoGeometry,
     )
 """
 
@@ -74,6 +75,17 @@ else:
     MsgCritical = Qgis.Critical  # type: ignore[attr-defined]
     MsgSuccess = Qgis.Success  # type: ignore[attr-defined]
 
+# ---------------------------------------------------------------------------
+# QgsFeatureRequest flags
+# QGIS 3: QgsFeatureRequest.NoGeometry (flat)
+# QGIS 3.36+/4: Qgis.FeatureRequestFlag.NoGeometry (scoped enum)
+# ---------------------------------------------------------------------------
+if hasattr(Qgis, "FeatureRequestFlag"):
+    ReqNoGeometry = Qgis.FeatureRequestFlag.NoGeometry  # type: ignore[attr-defined]
+else:
+    from qgis.core import QgsFeatureRequest as _QgsFeatureRequest
+    ReqNoGeometry = _QgsFeatureRequest.NoGeometry  # type: ignore[attr-defined]
+
 __all__ = [
     "LeftDockWidgetArea",
     "RightDockWidgetArea",
@@ -84,4 +96,5 @@ __all__ = [
     "MsgWarning",
     "MsgCritical",
     "MsgSuccess",
+    "ReqNoGeometry",
 ]
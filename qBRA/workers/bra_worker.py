@@ -1,24 +1,57 @@
 """Background worker for BRA layer calculation.
 
-Runs ``build_layers`` on a dedicated QThread so the QGIS UI stays responsive
-during the geometry computation.
+Runs the BRA geometry computation on a dedicated QThread so the QGIS UI
+stays responsive.  Workers take plain values only — parameters without
+their layer, the navaid position and the map CRS authid, read on the main
+thread when the job is snapshotted — and only produce plain data
+(:class:`~qBRA.models.layer_data.BRALayerData`); layers are created on the
+main thread by :class:`~qBRA.services.materialise_service.LayerMaterialiser`,
+so no QObject is touched in (or moved out of) the worker thread.
 
 Usage
 -----
-    worker = BRAWorker(iface, params)
-    worker.finished.connect(on_finished)   # receives QgsVectorLayer
+    worker = BRAWorker(replace(params, active_layer=None), navaid_point(layer, fid), map_crs_authid(iface))
+    worker.finished.connect(on_finished)   # receives BRALayerData
     worker.error.connect(on_error)         # receives error message str
     worker.start()
+
+``BRABatchWorker`` does the same for a list of :class:`BatchTask` (used by
+linked mode to recompute only the BRAs whose source features changed).
+
+With ``profile_dir`` set, ``BRAWorker`` runs the calculation under cProfile
+(see :mod:`qBRA.utils.profiling`) and emits ``profiled`` with the summary
+file once the files are written.
 """
 
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple, Union
 
 from qgis.PyQt.QtCore import QThread, pyqtSignal
-from qgis.core import QgsVectorLayer
 
 from ..models.bra_parameters import BRAParameters
-from ..modules.ils_llz_logic import build_layers
+from ..models.layer_data import BRALayerData
+from ..models.omni_parameters import OmniParameters
+from ..modules.ils_llz_logic import directional_surfaces, omni_surfaces
 from ..exceptions import BRACalculationError
+from ..constants import OUTPUT_KIND_OMNI
+from ..utils.profiling import capture_profile
+
+
+@dataclass(frozen=True)
+class BatchTask:
+    """Plain-data snapshot of one BRA to recompute in a :class:`BRABatchWorker`.
+
+    Attributes:
+        kind: Output kind (``"directional"`` or ``"omni"``)
+        params: BRAParameters without ``active_layer``, or OmniParameters
+        navaid_xy: Navaid position in the map CRS
+        label: Name used in error messages
+    """
+
+    kind: str
+    params: Union[BRAParameters, OmniParameters]
+    navaid_xy: Tuple[float, float]
+    label: str
 
 
 class BRAWorker(QThread):
@@ -26,33 +59,111 @@ class BRAWorker(QThread):
 
     Signals
     -------
-    finished(QgsVectorLayer)
+    finished(BRALayerData)
         Emitted when calculation completes successfully.
     error(str)
         Emitted when calculation fails; carries a user-readable message.
+    profiled(str)
+        Emitted before finished/error when profiling; carries the summary path.
     """
 
-    finished: pyqtSignal = pyqtSignal(object)   # QgsVectorLayer
+    finished: pyqtSignal = pyqtSignal(object)   # BRALayerData
     error: pyqtSignal = pyqtSignal(str)
+    profiled: pyqtSignal = pyqtSignal(str)
 
-    def __init__(self, iface: Any, params: BRAParameters, parent: Any = None) -> None:
+    def __init__(
+        self,
+        params: BRAParameters,
+        navaid_xy: Tuple[float, float],
+        crs_authid: str,
+        parent: Any = None,
+        profile_dir: Optional[str] = None,
+    ) -> None:
         """Initialise the worker.
 
         Args:
-            iface: QGIS interface object (passed through to build_layers).
-            params: Validated BRAParameters for the calculation.
+            params: Validated BRAParameters for the calculation (layer not used).
+            navaid_xy: Navaid position in the map CRS.
+            crs_authid: Map CRS authid of the output.
             parent: Optional Qt parent object.
+            profile_dir: Profile the calculation into this directory ("" for
+                the default directory, None to not profile).
         """
         super().__init__(parent)
-        self._iface = iface
         self._params = params
+        self._navaid_xy = navaid_xy
+        self._crs_authid = crs_authid
+        self._profile_dir = profile_dir
 
     def run(self) -> None:
-        """Execute build_layers and emit finished or error signal."""
+        """Compute the BRA surfaces and emit finished or error signal."""
         try:
-            layer: QgsVectorLayer = build_layers(self._iface, self._params)
-            self.finished.emit(layer)
+            data: BRALayerData = self._build()
+            self.finished.emit(data)
         except BRACalculationError as e:
             self.error.emit(e.message)
         except Exception as e:
             self.error.emit(f"{type(e).__name__}: {e}")
+
+    def _build(self) -> BRALayerData:
+        """Compute the surfaces, under cProfile in this thread if requested."""
+        if self._profile_dir is None:
+            return directional_surfaces(self._params, self._navaid_xy, self._crs_authid)
+        capture = None
+        try:
+            with capture_profile(self._profile_dir, f"directional_{self._params.facility_key}") as capture:
+                return directional_surfaces(self._params, self._navaid_xy, self._crs_authid)
+        finally:
+            # The files are written once the with block has exited
+            if capture is not None and capture.summary_path:
+                self.profiled.emit(capture.summary_path)
+
+
+
+class BRABatchWorker(QThread):
+    """QThread that recomputes a batch of linked BRAs off the main thread.
+
+    A failing job does not abort the batch; its message is collected and
+    reported through ``error`` after the successful results are emitted.
+
+    Signals
+    -------
+    finished(list)
+        Emitted with a list of ``(task index, BRALayerData)`` tuples.
+    error(str)
+        Emitted once if any job failed; carries the joined messages.
+    """
+
+    finished: pyqtSignal = pyqtSignal(object)   # List[Tuple[int, BRALayerData]]
+    error: pyqtSignal = pyqtSignal(str)
+
+    def __init__(self, tasks: List[BatchTask], crs_authid: str, parent: Any = None) -> None:
+        """Initialise the worker.
+
+        Args:
+            tasks: BRAs to recompute.
+            crs_authid: Map CRS authid of the output.
+            parent: Optional Qt parent object.
+        """
+        super().__init__(parent)
+        self._tasks = list(tasks)
+        self._crs_authid = crs_authid
+
+    def run(self) -> None:
+        """Execute every task and emit finished (and error if any task failed)."""
+        results: List[Tuple[int, BRALayerData]] = []
+        failures: List[str] = []
+        for index, task in enumerate(self._tasks):
+            try:
+                if task.kind == OUTPUT_KIND_OMNI:
+                    data = omni_surfaces(task.params, task.navaid_xy, self._crs_authid)
+                else:
+                    data = directional_surfaces(task.params, task.navaid_xy, self._crs_authid)
+                results.append((index, data))
+            except BRACalculationError as e:
+                failures.append(f"{task.label}: {e.message}")
+            except Exception as e:
+                failures.append(f"{task.label}: {type(e).__name__}: {e}")
+        self.finished.emit(results)
+        if failures:
+            self.error.emit("; ".join(failures))
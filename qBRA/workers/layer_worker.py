@@ -0,0 +1,49 @@
+"""Background worker resolving layer geometry types.
+
+Remote providers (PostGIS, WFS, ...) may take a while to report a geometry
+type.  ``LayerTypeWorker`` resolves the types of layers missing from the
+layer catalog on its own thread: it only receives ``(layer id, provider
+key, source)`` strings and opens providers of its own through
+:func:`~qBRA.services.layer_catalog.resolve_sources`, so no project
+layer is used off the main thread.
+
+Usage
+-----
+    worker = LayerTypeWorker([(layer.id(), layer.providerType(), layer.source())])
+    worker.resolved.connect(on_resolved)   # (layer id, geometry type or None)
+    worker.start()
+"""
+
+from typing import Any, List, Sequence, Tuple
+
+from qgis.PyQt.QtCore import QThread, pyqtSignal
+
+from ..services.layer_catalog import resolve_sources
+
+
+class LayerTypeWorker(QThread):
+    """QThread resolving the geometry types of data sources.
+
+    Signals
+    -------
+    resolved(str, object)
+        Emitted per layer with its id and geometry type (None when the
+        source cannot be opened on its own).
+    """
+
+    resolved: pyqtSignal = pyqtSignal(str, object)
+
+    def __init__(self, sources: Sequence[Tuple[str, str, str]], parent: Any = None) -> None:
+        """Initialise the worker.
+
+        Args:
+            sources: ``(layer id, provider key, source)`` per layer.
+            parent: Optional Qt parent object.
+        """
+        super().__init__(parent)
+        self._sources: List[Tuple[str, str, str]] = list(sources)
+
+    def run(self) -> None:
+        """Resolve every source and emit resolved for each."""
+        for layer_id, gtype in resolve_sources(self._sources):
+            self.resolved.emit(layer_id, gtype)
@@ -0,0 +1,201 @@
+"""Process-pool backend for the headless geometry kernel.
+
+QGIS geometry objects cannot be pickled and ``BRAWorker`` is bound by the
+GIL, so large headless runs use worker processes instead.  The parameter
+matrix and the output vertex array live in
+:mod:`multiprocessing.shared_memory` blocks: each task only carries the
+block names and a row range, the worker runs the vectorised kernel
+(:mod:`qBRA.modules.kernel`) on its slice and writes the vertices in place.
+Nothing per feature is pickled in either direction.
+
+Usage
+-----
+    with ProcessPoolBackend(max_workers=32) as backend:
+        vertices = backend.compute("directional", columns)
+        for start, stop, chunk in backend.iter_chunks("omni", omni_cols):
+            ...   # stream chunks as they complete
+
+Small inputs (a single chunk) or ``max_workers=1`` are computed in-process.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..constants import OMNI_SEGMENTS, PROCESS_CHUNK_SIZE
+from ..modules.kernel import (
+    DIRECTIONAL_COLUMNS,
+    DIRECTIONAL_VERTEX_COUNT,
+    OMNI_COLUMNS,
+    OMNI_RING_COUNT,
+    directional_vertices,
+    omni_vertices,
+)
+
+#: kind -> (parameter column count, vertex count for ``segments``, kernel)
+_KERNELS: Dict[str, Tuple[int, Callable[[int], int], Callable[..., np.ndarray]]] = {
+    "directional": (
+        len(DIRECTIONAL_COLUMNS),
+        lambda _segments: DIRECTIONAL_VERTEX_COUNT,
+        lambda cols, out, _segments: directional_vertices(cols, out=out),
+    ),
+    "omni": (
+        len(OMNI_COLUMNS),
+        lambda segments: OMNI_RING_COUNT * (segments + 1),
+        lambda cols, out, segments: omni_vertices(cols, segments, out=out),
+    ),
+}
+
+
+def _kernel(kind: str) -> Tuple[int, Callable[[int], int], Callable[..., np.ndarray]]:
+    try:
+        return _KERNELS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown geometry kind {kind!r}; expected one of {sorted(_KERNELS)}") from None
+
+
+def _run_slice(kind: str, in_name: str, out_name: str, rows: int, start: int, stop: int, segments: int) -> int:
+    """Worker entry point: compute rows ``start:stop`` in shared memory."""
+    n_cols, vertex_count, kernel = _kernel(kind)
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    columns = out = None
+    try:
+        columns = np.ndarray((rows, n_cols), dtype=np.float64, buffer=shm_in.buf)
+        out = np.ndarray((rows, vertex_count(segments), 3), dtype=np.float64, buffer=shm_out.buf)
+        kernel(columns[start:stop], out[start:stop], segments)
+    finally:
+        # Views must be released before the blocks can be closed
+        columns = out = None
+        shm_in.close()
+        shm_out.close()
+    return stop - start
+
+
+class ProcessPoolBackend:
+    """Run the geometry kernel across worker processes via shared memory.
+
+    The pool is created lazily on first use and reused until :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: int = PROCESS_CHUNK_SIZE,
+        mp_context: Optional[Any] = None,
+    ) -> None:
+        """Initialize the backend.
+
+        Args:
+            max_workers: Worker process count (defaults to the CPU count)
+            chunk_size: Navaids per task
+            mp_context: Optional ``multiprocessing`` context (e.g. ``"spawn"``)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self._mp_context = mp_context
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ProcessPoolBackend":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut the worker pool down."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._max_workers, mp_context=self._mp_context)
+        return self._pool
+
+    def _in_process(self, rows: int) -> bool:
+        return self._max_workers == 1 or rows <= self._chunk_size
+
+    @contextmanager
+    def _shared(self, columns: np.ndarray, out_shape: Tuple[int, ...]) -> Iterator[Tuple[str, str, Callable[[], np.ndarray]]]:
+        """Create input/output shared blocks.
+
+        Yields (input name, output name, output view factory).  Views from
+        the factory must not outlive the block, so callers copy from them.
+        """
+        shm_in = shared_memory.SharedMemory(create=True, size=max(columns.nbytes, 1))
+        shm_out = shared_memory.SharedMemory(create=True, size=max(int(np.prod(out_shape)) * 8, 1))
+        try:
+            np.ndarray(columns.shape, dtype=np.float64, buffer=shm_in.buf)[...] = columns
+            yield shm_in.name, shm_out.name, lambda: np.ndarray(out_shape, dtype=np.float64, buffer=shm_out.buf)
+        finally:
+            for shm in (shm_in, shm_out):
+                shm.close()
+                shm.unlink()
+
+    def _submit(self, kind: str, in_name: str, out_name: str, rows: int, segments: int) -> List[Future]:
+        pool = self._executor()
+        return [
+            pool.submit(_run_slice, kind, in_name, out_name, rows, start, min(start + self._chunk_size, rows), segments)
+            for start in range(0, rows, self._chunk_size)
+        ]
+
+    def compute(self, kind: str, columns: np.ndarray, segments: int = OMNI_SEGMENTS) -> np.ndarray:
+        """Compute all vertices of ``columns``.
+
+        Args:
+            kind: ``"directional"`` or ``"omni"``
+            columns: Parameter matrix in the kernel's column order
+            segments: Omni circle segmentation
+
+        Returns:
+            Vertex array ``(n, V, 3)`` owned by the caller
+        """
+        n_cols, vertex_count, kernel = _kernel(kind)
+        columns = np.ascontiguousarray(columns, dtype=np.float64).reshape(-1, n_cols)
+        rows = len(columns)
+        out_shape = (rows, vertex_count(segments), 3)
+        if self._in_process(rows):
+            return kernel(columns, np.empty(out_shape), segments)
+        with self._shared(columns, out_shape) as (in_name, out_name, view):
+            for future in self._submit(kind, in_name, out_name, rows, segments):
+                future.result()
+            result = view().copy()
+        return result
+
+    def iter_chunks(
+        self, kind: str, columns: np.ndarray, segments: int = OMNI_SEGMENTS
+    ) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """Yield ``(start, stop, vertices)`` per chunk as soon as it completes.
+
+        Chunks arrive in completion order, which lets the caller materialise
+        or write output while other workers are still computing.
+        """
+        n_cols, vertex_count, kernel = _kernel(kind)
+        columns = np.ascontiguousarray(columns, dtype=np.float64).reshape(-1, n_cols)
+        rows = len(columns)
+        out_shape = (rows, vertex_count(segments), 3)
+        if self._in_process(rows):
+            for start in range(0, rows, self._chunk_size):
+                stop = min(start + self._chunk_size, rows)
+                chunk = columns[start:stop]
+                yield start, stop, kernel(chunk, np.empty((len(chunk),) + out_shape[1:]), segments)
+            return
+        with self._shared(columns, out_shape) as (in_name, out_name, view):
+            futures = self._submit(kind, in_name, out_name, rows, segments)
+            starts = {future: i * self._chunk_size for i, future in enumerate(futures)}
+            try:
+                for future in as_completed(futures):
+                    done = future.result()
+                    start = starts[future]
+                    yield start, start + done, view()[start:start + done].copy()
+            finally:
+                # Abandoned early: no worker may touch the blocks once unlinked
+                for future in futures:
+                    future.cancel()
+                wait(futures)
@@ -9,6 +9,7 @@ that all qBRA imports in test files succeed without a real QGIS installation.
 """
 
 import sys
+from typing import Any
 from unittest.mock import Mock, MagicMock
 
 # ============================================================================
@@ -33,6 +34,7 @@ except ImportError:
         PolygonGeometry = 2
         UnknownGeometry = 3
         NullGeometry = 4
+        GeometryType = int  # used in annotations
 
         @staticmethod
         def geometryType(wkb_type: int) -> int:
@@ -53,10 +55,14 @@ except ImportError:
 
     class _QgsFeature:
         """Minimal QgsFeature stub that stores geometry and attributes."""
-        def __init__(self) -> None:
+        def __init__(self, fields: Any = None) -> None:
+            self._fields = fields
             self._geometry: Any = None
             self._attributes: list = []
 
+        def fields(self) -> Any:
+            return self._fields
+
         def setGeometry(self, geom: Any) -> None:
             self._geometry = geom
 
@@ -72,12 +78,16 @@ except ImportError:
         def geometry(self) -> Any:
             return self._geometry
 
+    class _QgsRasterLayer:
+        pass
+
     # --- Assemble mocked qgis.core module ------------------------------------
     _core = MagicMock()
     _core.QgsWkbTypes = _QgsWkbTypes
     _core.QgsVectorLayer = _QgsVectorLayer
     _core.QgsLayerTreeNode = _QgsLayerTreeNode
     _core.QgsFeature = _QgsFeature
+    _core.QgsRasterLayer = _QgsRasterLayer
 
     # --- PyQt stubs -----------------------------------------------------------
     _pyqt_qtcore = MagicMock()
@@ -94,12 +104,12 @@ except ImportError:
     sys.modules.setdefault("qgis.PyQt.QtWidgets", MagicMock())
     sys.modules.setdefault("qgis.PyQt.uic", MagicMock())
     sys.modules.setdefault("qgis.utils", MagicMock())
+    sys.modules.setdefault("qgis.gui", MagicMock())
 
 # ============================================================================
 # Standard imports — must come AFTER sys.modules injection
 # ============================================================================
 import pytest
-from typing import Any, Dict
 
 # qBRA models are importable now that QGIS stubs are in sys.modules
 from qBRA.models.bra_parameters import BRAParameters, FacilityConfig, FacilityDefaults
@@ -0,0 +1,100 @@
+"""Tests for per-aerodrome BRA aggregation (grouping and banding)."""
+
+import pytest
+
+from qBRA.constants import ENVELOPE_BASIS_EXACT, ENVELOPE_BASIS_LOWER_BOUND
+from qBRA.modules.aggregation import band_basis, group_overlapping, lowest_surface_bands, surface_level
+
+
+def _box(x, y, size=10.0):
+    return (x, y, x + size, y + size)
+
+
+@pytest.mark.unit
+class TestGroupOverlapping:
+    def test_empty(self):
+        assert group_overlapping([]) == []
+
+    def test_overlapping_extents_form_one_group(self):
+        extents = [_box(0, 0), _box(5, 5), _box(12, 12)]
+        # 0 overlaps 1, 1 overlaps 2 → transitive single group
+        assert group_overlapping(extents) == [[0, 1, 2]]
+
+    def test_separate_aerodromes(self):
+        extents = [_box(0, 0), _box(1000, 0), _box(4, 4), _box(1003, 2)]
+        assert group_overlapping(extents) == [[0, 2], [1, 3]]
+
+    def test_touching_extents_are_grouped(self):
+        assert group_overlapping([_box(0, 0), _box(10, 0)]) == [[0, 1]]
+
+    def test_margin_bridges_gaps(self):
+        extents = [_box(0, 0), _box(15, 0)]
+        assert group_overlapping(extents) == [[0], [1]]
+        assert group_overlapping(extents, margin=3.0) == [[0, 1]]
+
+    def test_large_extent_spanning_many_cells(self):
+        extents = [_box(0, 0, 1.0), _box(50, 50, 1.0), _box(-100, -100, 300.0), _box(500, 500, 1.0)]
+        assert group_overlapping(extents) == [[0, 1, 2], [3]]
+
+    def test_many_disjoint_extents(self):
+        extents = [_box(i * 100.0, 0) for i in range(200)]
+        assert len(group_overlapping(extents)) == 200
+
+
+def _bands(items):
+    """Run banding with footprints modelled as sets of grid cells."""
+    return lowest_surface_bands(
+        items,
+        union=lambda gs: frozenset().union(*gs),
+        difference=lambda a, b: a - b,
+        is_empty=lambda g: not g,
+    )
+
+
+@pytest.mark.unit
+class TestLowestSurfaceBands:
+    def test_lower_surface_wins_in_overlap(self):
+        low = frozenset({1, 2, 3})
+        high = frozenset({3, 4, 5})
+        assert _bands([(120.0, high), (100.0, low)]) == [
+            (100.0, low),
+            (120.0, frozenset({4, 5})),
+        ]
+
+    def test_fully_covered_surface_is_dropped(self):
+        low = frozenset({1, 2, 3})
+        assert _bands([(100.0, low), (150.0, frozenset({2}))]) == [(100.0, low)]
+
+    def test_equal_heights_are_merged(self):
+        result = _bands([(100.0, frozenset({1})), (100.0, frozenset({2}))])
+        assert result == [(100.0, frozenset({1, 2}))]
+
+    def test_bands_partition_the_union(self):
+        items = [(130.0, frozenset(range(0, 10))), (110.0, frozenset(range(5, 15))), (90.0, frozenset(range(12, 20)))]
+        bands = _bands(items)
+        regions = [region for _h, region in bands]
+        assert frozenset().union(*regions) == frozenset(range(0, 20))
+        assert sum(len(r) for r in regions) == 20
+        assert [h for h, _r in bands] == [90.0, 110.0, 130.0]
+
+    def test_empty_input(self):
+        assert _bands([]) == []
+
+    def test_flat_surface_claims_equal_height_before_slope(self):
+        slope = frozenset({1, 2, 3})
+        flat = frozenset({3, 4})
+        assert _bands([((100.0, True), slope), ((100.0, False), flat)]) == [
+            ((100.0, False), flat),
+            ((100.0, True), frozenset({1, 2})),
+        ]
+
+
+@pytest.mark.unit
+class TestSurfaceLevel:
+    def test_horizontal_surface_is_exact(self):
+        assert surface_level([52.0, 52.0, 52.004]) == (52.0, False)
+        assert band_basis(False) == ENVELOPE_BASIS_EXACT
+
+    def test_rising_slope_is_a_lower_bound(self):
+        assert surface_level([10.0, 10.0, 150.0, 150.0]) == (10.0, True)
+        assert band_basis(True) == ENVELOPE_BASIS_LOWER_BOUND
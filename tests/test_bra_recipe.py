@@ -0,0 +1,79 @@
+"""Unit tests for the BRARecipe model (stored BRA parameters)."""
+
+import json
+
+import pytest
+from unittest.mock import Mock
+
+from qBRA.constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from qBRA.exceptions import BRAValidationError
+from qBRA.models.bra_parameters import BRAParameters
+from qBRA.models.bra_recipe import BRARecipe
+
+
+def _layer(layer_id="navaids_1"):
+    layer = Mock()
+    layer.id.return_value = layer_id
+    return layer
+
+
+def _directional(layer, **overrides):
+    base = dict(
+        active_layer=layer, azimuth=90.0, a=1000.0, b=500.0, h=70.0, r=7000.0, D=500.0, H=10.0,
+        L=2300.0, phi=30.0, site_elev=100.0, remark="RWY09", direction="forward",
+        facility_key="LOC", facility_label="ILS LLZ", navaid_fid=7,
+    )
+    base.update(overrides)
+    return BRAParameters(**base)
+
+
+def _omni(layer):
+    return {
+        "active_layer": layer, "navaid_fid": 3, "site_elev": 20.0, "facility_key": "OMNI_NDB",
+        "facility_label": "NDB", "display_name": "BRA", "omni_r": 300.0, "omni_alpha": 1.0,
+        "omni_R": 3000.0, "omni_turbine": False, "omni_j": 0.0, "omni_h": 0.0,
+    }
+
+
+@pytest.mark.unit
+class TestBRARecipe:
+    def test_directional_round_trip(self):
+        layer = _layer()
+        params = _directional(layer)
+        recipe = BRARecipe.from_params(OUTPUT_KIND_DIRECTIONAL, params)
+        assert (recipe.navaid_layer_id, recipe.navaid_fid) == ("navaids_1", 7)
+        assert "active_layer" not in recipe.params and "navaid_fid" not in recipe.params
+
+        loaded = BRARecipe.from_json(recipe.to_json())
+        assert loaded == recipe
+        rebuilt = loaded.build_params(layer)
+        assert isinstance(rebuilt, BRAParameters)
+        assert rebuilt == params
+
+    def test_omni_round_trip(self):
+        layer = _layer("n2")
+        recipe = BRARecipe.from_params(OUTPUT_KIND_OMNI, _omni(layer))
+        rebuilt = BRARecipe.from_json(recipe.to_json()).build_params(layer)
+        assert rebuilt == _omni(layer)
+
+    def test_recipe_is_compact(self):
+        recipe = BRARecipe.from_params(OUTPUT_KIND_DIRECTIONAL, _directional(_layer()))
+        assert len(recipe.to_json()) < 1024
+
+    def test_requires_navaid_reference(self):
+        with pytest.raises(ValueError, match="navaid reference"):
+            BRARecipe.from_params(OUTPUT_KIND_DIRECTIONAL, _directional(_layer(), navaid_fid=None))
+
+    def test_rejects_unknown_kind(self):
+        with pytest.raises(ValueError):
+            BRARecipe("footprint", "n", 1, {})
+
+    @pytest.mark.parametrize("text", [
+        "not json",
+        json.dumps({"version": 99, "kind": "omni", "navaid_layer_id": "n", "navaid_fid": 1, "params": {}}),
+        json.dumps({"version": 1, "kind": "omni"}),
+        json.dumps([1, 2]),
+    ])
+    def test_invalid_json(self, text):
+        with pytest.raises(BRAValidationError):
+            BRARecipe.from_json(text)
@@ -0,0 +1,66 @@
+"""Tests for the queue of directional calculations."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from qBRA.services.calculation_queue import CalculationQueue
+
+
+def _params(name):
+    return SimpleNamespace(display_name=name, facility_label="ILS LLZ")
+
+
+@pytest.mark.unit
+class TestCalculationQueue:
+    def test_runs_in_order_one_at_a_time(self):
+        queue = CalculationQueue(limit=1)
+        first = queue.submit(_params("RWY09"), ("routing", 4), True, "/tmp/prof")
+        second = queue.submit(_params("RWY27"))
+        assert (first.routing, first.linked, first.profile_dir) == (("routing", 4), True, "/tmp/prof")
+        assert (first.navaid_xy, first.crs_authid) == (None, "")
+        assert queue.start_ready() == [first]
+        assert queue.start_ready() == [] and queue.pending == [second] and len(queue) == 2
+        assert queue.complete(first.id, "data-1") == [(first, "data-1")]
+        assert queue.start_ready() == [second]
+        assert queue.complete(second.id, "data-2") == [(second, "data-2")]
+        assert len(queue) == 0
+        # Unknown or already completed jobs are ignored
+        assert queue.complete(second.id, "again") == []
+
+    def test_job_snapshots_navaid_position_and_crs(self):
+        job = CalculationQueue().submit(_params("RWY09"), navaid_xy=(10.0, 20.0), crs_authid="EPSG:32633")
+        assert (job.navaid_xy, job.crs_authid) == ((10.0, 20.0), "EPSG:32633")
+
+    def test_results_released_in_submission_order(self):
+        queue = CalculationQueue(limit=2)
+        jobs = [queue.submit(_params(f"N{i}")) for i in range(3)]
+        assert queue.start_ready() == jobs[:2]
+        # The second job finishes first: held back until the first one is done
+        assert queue.complete(jobs[1].id, "b") == []
+        assert queue.start_ready() == [jobs[2]]
+        assert queue.complete(jobs[0].id, "a") == [(jobs[0], "a"), (jobs[1], "b")]
+        assert queue.complete(jobs[2].id, "c") == [(jobs[2], "c")]
+
+    def test_failure_releases_later_results(self):
+        queue = CalculationQueue(limit=2)
+        first, second = queue.submit(_params("A")), queue.submit(_params("B"))
+        queue.start_ready()
+        assert queue.complete(second.id, "b") == []
+        assert queue.fail(first.id) == [(second, "b")]
+        assert len(queue) == 0
+
+    def test_cancel_pending(self):
+        queue = CalculationQueue(limit=1)
+        jobs = [queue.submit(_params(f"N{i}")) for i in range(4)]
+        queue.start_ready()
+        # Running jobs are not cancelled
+        assert queue.cancel([jobs[0].id, jobs[2].id]) == [jobs[2]]
+        assert queue.pending == [jobs[1], jobs[3]]
+        assert queue.cancel() == [jobs[1], jobs[3]]
+        assert queue.pending == [] and queue.running == [jobs[0]]
+
+    def test_labels(self):
+        queue = CalculationQueue()
+        assert queue.submit(_params("RWY09 - ILS LLZ")).label == "#1 RWY09 - ILS LLZ"
+        assert queue.submit(_params(None)).label == "#2 ILS LLZ"
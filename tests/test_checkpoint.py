@@ -0,0 +1,159 @@
+"""Tests for checkpointed, resumable batch runs."""
+
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from qBRA import cli
+from qBRA.cli import main
+from qBRA.exceptions import BRAError
+from qBRA.modules.checkpoint import Journal, truncate_output
+
+RUNWAYS = "runway,start_x,start_y,end_x,end_y\n09,0,1000,0,4000\n"
+
+
+def _navaids():
+    lines = ["id,facility,runway,x,y,site_elev"]
+    for i in range(1, 31):
+        if i % 3 == 0:
+            lines.append(f"{i},LOC,09,0,{i},10")
+        elif i == 7:
+            lines.append(f"{i},UNKNOWN,,0,0,0")
+        else:
+            lines.append(f"{i},OMNI_CVOR,,{1000 * i},0,{i}")
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def inventory(tmp_path):
+    navaids, runways = tmp_path / "navaids.csv", tmp_path / "runways.csv"
+    navaids.write_text(_navaids())
+    runways.write_text(RUNWAYS)
+    return str(navaids), str(runways)
+
+
+def _crash_after(monkeypatch, count):
+    write = cli.GeoJSONWriter.write
+    calls = []
+
+    def failing(self, *args):
+        calls.append(1)
+        if len(calls) > count:
+            raise OSError("disk went away")
+        write(self, *args)
+
+    monkeypatch.setattr(cli.GeoJSONWriter, "write", failing)
+
+
+@pytest.mark.unit
+class TestResume:
+    @pytest.mark.parametrize("suffix", [".geojson", ".geojsonl"])
+    def test_resume_matches_clean_run(self, inventory, tmp_path, monkeypatch, capsys, suffix):
+        navaids, runways = inventory
+        common = [navaids, "--runways", runways, "--chunk-size", "4", "--segments", "8"]
+        clean = tmp_path / f"clean{suffix}"
+        assert main(common + ["-o", str(clean)]) == 0
+        clean_summary = capsys.readouterr().err.splitlines()[-1].split(" in ")[0]
+
+        out = tmp_path / f"bra{suffix}"
+        journal = str(out) + ".journal.json"
+        with monkeypatch.context() as patch:
+            _crash_after(patch, 40)
+            assert main(common + ["-o", str(out), "--checkpoint-every", "5"]) == 1
+        state = json.loads(open(journal).read())
+        # Checkpoints land on navaid boundaries inside the open chunk
+        assert 0 < state["features"] <= 40 and state["done"]
+        assert out.stat().st_size > state["offset"]
+
+        assert main(common + ["-o", str(out), "--checkpoint-every", "5", "--resume"]) == 0
+        assert out.read_bytes() == clean.read_bytes()
+        summary = capsys.readouterr().err.splitlines()[-1]
+        assert summary.split(" in ")[0] == clean_summary
+        assert summary.endswith(f"({state['navaids']} navaids restored from the checkpoint)")
+        assert not (tmp_path / journal).exists()
+
+    def test_resume_without_journal_starts_over(self, inventory, tmp_path):
+        navaids, runways = inventory
+        out = tmp_path / "bra.geojsonl"
+        assert main([navaids, "--runways", runways, "-o", str(out), "--resume"]) == 0
+        assert len(out.read_text().splitlines()) == 10 * 7 + 19 * 3
+
+    def test_changed_options_refused(self, inventory, tmp_path, monkeypatch, capsys):
+        navaids, runways = inventory
+        out = tmp_path / "bra.geojson"
+        with monkeypatch.context() as patch:
+            _crash_after(patch, 60)
+            assert main([navaids, "--runways", runways, "-o", str(out), "--checkpoint-every", "5"]) == 1
+        capsys.readouterr()
+        assert main([navaids, "--runways", runways, "-o", str(out), "--resume", "--segments", "16"]) == 1
+        assert "segments" in capsys.readouterr().err
+
+    def test_unsupported_outputs(self, inventory, tmp_path):
+        navaids, _runways = inventory
+        assert main([navaids, "-o", str(tmp_path / "bra.glb"), "--resume"]) == 2
+        assert main([navaids, "-o", str(tmp_path / "s.csv"), "--sweep", "phi=20,30", "--checkpoint-every", "5"]) == 2
+
+
+@pytest.mark.unit
+class TestRunStats:
+    def test_rate_counts_this_run_only(self):
+        stats = cli.RunStats(navaids=100, features=700, elapsed=2.0, restored=80)
+        assert stats.throughput == pytest.approx(10.0)
+        assert "10.0 navaids/s (80 navaids restored" in stats.summary()
+        assert "restored" not in cli.RunStats(navaids=4, elapsed=1.0).summary()
+
+
+@pytest.mark.unit
+class TestWriterOffset:
+    @pytest.mark.parametrize("suffix", [".geojson", ".geojsonl"])
+    def test_offset_is_file_size_without_newline_translation(self, tmp_path, suffix):
+        path = tmp_path / f"bra{suffix}"
+        ring = np.array([[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [0.0, 1.0, 1.0], [0.0, 0.0, 1.0]])
+        with patch("qBRA.cli.open", create=True, side_effect=open) as opened:
+            with cli.GeoJSONWriter(str(path), "EPSG:32633") as writer:
+                for i in range(3):
+                    writer.write([ring], {"remark": f"RWY0{i} é"})
+                offset = writer.sync()
+            truncate_output(str(path), offset)
+            with cli.GeoJSONWriter(str(path), resume=(offset, 3)) as writer:
+                writer.write([ring], {"remark": "RWY27"})
+                resumed = writer.sync()
+        assert all(call.kwargs.get("newline") == "" for call in opened.call_args_list)
+        footer = b"" if suffix == ".geojsonl" else b"\n]}\n"
+        assert offset < resumed and path.stat().st_size == resumed + len(footer)
+        assert b"\r" not in path.read_bytes()
+        assert len(json.loads(path.read_text())["features"] if footer else path.read_text().splitlines()) == 4
+
+
+@pytest.mark.unit
+class TestJournal:
+    def test_round_trip(self, inventory, tmp_path):
+        navaids, _runways = inventory
+        path = str(tmp_path / "j.json")
+        journal = Journal.start(path, navaids, "out.geojson", {"segments": 8})
+        journal.records, journal.done = 4, [["omni", "5", "OMNI_CVOR"]]
+        journal.save()
+        loaded = Journal.load(path)
+        assert loaded == journal and loaded.done_keys == {("omni", "5", "OMNI_CVOR")}
+        loaded.check(navaids, "out.geojson", {"segments": 8})
+        with pytest.raises(BRAError):
+            loaded.check(navaids, "other.geojson", {"segments": 8})
+        loaded.finish()
+        loaded.finish()
+        with pytest.raises(BRAError):
+            Journal.load(path)
+
+    def test_unsupported_version(self, tmp_path):
+        path = tmp_path / "j.json"
+        path.write_text('{"version": 99}')
+        with pytest.raises(BRAError):
+            Journal.load(str(path))
+
+    def test_truncate_output(self, tmp_path):
+        path = tmp_path / "out"
+        path.write_bytes(b"0123456789")
+        assert truncate_output(str(path), 4) == 6 and path.read_bytes() == b"0123"
+        with pytest.raises(BRAError):
+            truncate_output(str(path), 8)
@@ -0,0 +1,79 @@
+"""Tests for the command-line BRA generator."""
+
+import json
+
+import pytest
+
+from qBRA.cli import crs_srid, main
+
+NAVAIDS = (
+    "id,facility,runway,x,y,site_elev\n"
+    "1,LOC,09,0,0,10\n"
+    "2,OMNI_CVOR,,5000,5000,20\n"
+    "3,OMNI_NDB,,-5000,0,0\n"
+    "4,UNKNOWN,,1,1,0\n"
+)
+RUNWAYS = "runway,start_x,start_y,end_x,end_y\n09,0,1000,0,4000\n"
+
+
+@pytest.fixture
+def inventory(tmp_path):
+    navaids, runways = tmp_path / "navaids.csv", tmp_path / "runways.csv"
+    navaids.write_text(NAVAIDS)
+    runways.write_text(RUNWAYS)
+    return str(navaids), str(runways)
+
+
+@pytest.mark.unit
+class TestCli:
+    def test_feature_collection(self, inventory, tmp_path, capsys):
+        navaids, runways = inventory
+        out = tmp_path / "bra.geojson"
+        assert main([navaids, "--runways", runways, "-o", str(out), "--chunk-size", "2",
+                     "--crs", "EPSG:32633"]) == 0
+        data = json.loads(out.read_text())
+        assert data["crs"]["properties"]["name"] == "EPSG:32633"
+        by_navaid = {}
+        for feature in data["features"]:
+            by_navaid.setdefault(feature["properties"]["navaid_id"], []).append(feature)
+        assert {k: len(v) for k, v in by_navaid.items()} == {1: 7, 2: 3, 3: 2}
+        slope = by_navaid[1][3]["properties"]
+        assert (slope["area"], slope["max_elev"], slope["r"]) == ("slope", "80.0", "7000.0")
+        mantle = by_navaid[2][1]
+        assert mantle["properties"]["area"] == "cone mantle"
+        assert len(mantle["geometry"]["coordinates"]) == 2
+        summary = capsys.readouterr().err
+        assert "3 navaids (12 features, 1 skipped)" in summary and "navaids/s" in summary
+
+    def test_sequence_output(self, inventory, tmp_path):
+        navaids, runways = inventory
+        out = tmp_path / "bra.geojsonl"
+        assert main([navaids, "--runways", runways, "-o", str(out), "--segments", "16"]) == 0
+        lines = out.read_text().splitlines()
+        assert len(lines) == 12
+        ring = json.loads(lines[-1])["geometry"]["coordinates"][0]
+        assert len(ring) == 17
+
+    def test_nothing_generated(self, tmp_path):
+        navaids = tmp_path / "n.csv"
+        navaids.write_text("id,facility,x,y\n1,NOPE,0,0\n")
+        assert main([str(navaids), "-o", str(tmp_path / "o.geojson")]) == 1
+
+    def test_missing_input(self, tmp_path, capsys):
+        assert main([str(tmp_path / "missing.csv"), "-o", str(tmp_path / "o.geojson")]) == 1
+        assert "Error" in capsys.readouterr().err
+
+    def test_invalid_arguments(self, tmp_path):
+        assert main(["n.csv", "-o", str(tmp_path / "o.geojson"), "--chunk-size", "0"]) == 2
+
+    def test_facility_key_property(self, inventory, tmp_path):
+        navaids, runways = inventory
+        out = tmp_path / "bra.geojsonl"
+        assert main([navaids, "--runways", runways, "-o", str(out)]) == 0
+        keys = {json.loads(line)["properties"]["facility_key"] for line in out.read_text().splitlines()}
+        assert keys == {"LOC", "OMNI_CVOR", "OMNI_NDB"}
+
+    def test_crs_srid(self):
+        assert crs_srid("EPSG:32633") == 32633
+        assert crs_srid("epsg:4326") == 4326
+        assert crs_srid(None) == 0 and crs_srid("urn:ogc:def:crs:OGC::CRS84") == 0
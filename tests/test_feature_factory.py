@@ -0,0 +1,72 @@
+"""Tests for the BRA attribute schema and feature factory."""
+
+import pytest
+
+from qBRA.models.bra_parameters import BRAParameters
+from qBRA.models.omni_parameters import OmniParameters
+from qBRA.modules.attributes import (
+    DIRECTIONAL_FIELDS,
+    DIRECTIONAL_LEADING,
+    OMNI_FIELDS,
+    OMNI_LEADING,
+    directional_values,
+    omni_values,
+)
+from qBRA.modules.feature_factory import directional_factory, omni_factory
+
+
+def _params(**overrides):
+    values = dict(
+        active_layer=None, azimuth=45.0, a=1000.123, b=500.0, h=70.0, r=7000.456,
+        D=500.0, H=10.0, L=2300.0, phi=30.0, site_elev=100.0, remark="RWY09",
+        direction="forward", facility_key="LOC", facility_label="ILS LLZ",
+    )
+    values.update(overrides)
+    return BRAParameters(**values)
+
+
+@pytest.mark.unit
+class TestAttributes:
+    def test_schema_lengths(self):
+        assert len(DIRECTIONAL_FIELDS) - DIRECTIONAL_LEADING == len(directional_values(_params()))
+        omni = OmniParameters(site_elev=0.0, r=300.0, alpha=1.0, R=3000.0)
+        assert len(OMNI_FIELDS) - OMNI_LEADING == len(omni_values(omni))
+        assert DIRECTIONAL_FIELDS[-1][0] == OMNI_FIELDS[-1][0] == "type"
+
+    def test_directional_values(self):
+        values = directional_values(_params())
+        assert values == ("RWY09 - ILS LLZ", "1000.12", "500.0", "70.0", "7000.46", "500.0", "10.0",
+                          "2300.0", "30.0", "ILS LLZ")
+        assert directional_values(_params(display_name="Shown"))[0] == "Shown"
+        assert directional_values(_params(), "Override")[0] == "Override"
+
+    def test_omni_values(self):
+        omni = OmniParameters(site_elev=0.0, r=600.0, alpha=1.0, R=3000.0, turbine=True,
+                              j=15000.0, h=52.0, facility_label="CVOR", display_name="VOR")
+        assert omni_values(omni) == ("VOR", "600.0", "1.0", "3000.0", "15000.0", "52.0", "CVOR")
+
+
+@pytest.mark.unit
+class TestFeatureFactory:
+    def test_factories_are_shared(self):
+        assert directional_factory() is directional_factory()
+        assert omni_factory() is not directional_factory()
+        assert len(directional_factory().field_list()) == len(DIRECTIONAL_FIELDS)
+        assert len(omni_factory().field_list()) == len(OMNI_FIELDS)
+
+    def test_template_stamps_features(self):
+        factory = directional_factory()
+        template = factory.navaid(directional_values(_params()))
+        base = template.feature("geom-1", 1, "base", "100.0")
+        wall = template.feature("geom-5", 5, "wall", "110.0")
+        assert base.attributes()[:4] == [1, "base", "100.0", "RWY09 - ILS LLZ"]
+        assert wall.attributes()[:3] == [5, "wall", "110.0"]
+        assert base.attributes()[3:] == wall.attributes()[3:]
+        assert wall.geometry() == "geom-5"
+        assert base.fields() == factory.fields
+
+    def test_template_checks_leading_values(self):
+        template = omni_factory().navaid(("x",) * (len(OMNI_FIELDS) - OMNI_LEADING))
+        assert template.feature(None, 1, "inner cylinder top").attributes()[:2] == [1, "inner cylinder top"]
+        with pytest.raises(ValueError):
+            template.feature(None, 1, "inner cylinder top", "extra")
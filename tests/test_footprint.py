@@ -0,0 +1,98 @@
+"""Tests for the 2D footprint companion layer."""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from qBRA.constants import METRES_PER_DEGREE
+from qBRA.modules.footprint import (
+    build_footprint_layer,
+    footprint_geometry,
+    footprint_kind,
+    footprint_tolerance,
+)
+
+
+def _flat_geometry(area=10.0, empty=False):
+    geom = Mock()
+    geom.isEmpty.return_value = empty
+    geom.area.return_value = area
+    geom.simplify.return_value = geom
+    return geom
+
+
+@pytest.mark.unit
+class TestFootprintTolerance:
+    def test_projected_crs_keeps_metres(self):
+        assert footprint_tolerance(2.0, is_geographic=False) == 2.0
+
+    def test_geographic_crs_converts_to_degrees(self):
+        assert footprint_tolerance(METRES_PER_DEGREE, is_geographic=True) == pytest.approx(1.0)
+
+    def test_footprint_kind(self):
+        assert footprint_kind("omni") == "omni_footprint"
+
+
+@pytest.mark.unit
+class TestFootprintGeometry:
+    def test_segmentizes_and_drops_z(self):
+        source = Mock()
+        flat = _flat_geometry()
+        with patch("qBRA.modules.footprint.QgsGeometry", return_value=flat):
+            result = footprint_geometry(source, tolerance=1.0)
+        segmentized = source.constGet.return_value.segmentize.return_value
+        segmentized.dropZValue.assert_called_once()
+        flat.simplify.assert_called_once_with(1.0)
+        assert result is flat
+
+    def test_zero_tolerance_skips_simplify(self):
+        flat = _flat_geometry()
+        with patch("qBRA.modules.footprint.QgsGeometry", return_value=flat):
+            footprint_geometry(Mock(), tolerance=0.0)
+        flat.simplify.assert_not_called()
+
+    def test_vertical_wall_has_no_footprint(self):
+        with patch("qBRA.modules.footprint.QgsGeometry", return_value=_flat_geometry(area=0.0)):
+            assert footprint_geometry(Mock(), tolerance=1.0) is None
+
+    def test_empty_result_has_no_footprint(self):
+        with patch("qBRA.modules.footprint.QgsGeometry", return_value=_flat_geometry(empty=True)):
+            assert footprint_geometry(Mock(), tolerance=1.0) is None
+
+
+@pytest.mark.unit
+class TestBuildFootprintLayer:
+    def _source(self, features):
+        source = Mock()
+        source.name.return_value = "RWY09 - LOC BRA_areas"
+        source.crs.return_value.authid.return_value = "EPSG:32631"
+        source.crs.return_value.isGeographic.return_value = False
+        source.fields.return_value = []
+        source.getFeatures.return_value = features
+        return source
+
+    def _feature(self, attrs):
+        feature = Mock()
+        feature.attributes.return_value = attrs
+        return feature
+
+    def test_copies_attributes_and_skips_walls(self):
+        out = Mock()
+        source = self._source([self._feature([1, "base"]), self._feature([5, "wall"])])
+        flats = iter([Mock(), None])
+        with patch("qBRA.modules.footprint.QgsVectorLayer", return_value=out) as ctor, \
+                patch("qBRA.modules.footprint.footprint_geometry", side_effect=lambda g, t: next(flats)):
+            result = build_footprint_layer(source)
+        assert result is out
+        uri, name, provider = ctor.call_args[0]
+        assert uri == "Polygon?crs=EPSG:32631"
+        assert name == "RWY09 - LOC BRA_areas footprint"
+        written = out.dataProvider.return_value.addFeatures.call_args[0][0]
+        assert [f.attributes() for f in written] == [[1, "base"]]
+
+    def test_no_features_written_when_all_degenerate(self):
+        out = Mock()
+        source = self._source([self._feature([5, "wall"])])
+        with patch("qBRA.modules.footprint.QgsVectorLayer", return_value=out), \
+                patch("qBRA.modules.footprint.footprint_geometry", return_value=None):
+            build_footprint_layer(source)
+        out.dataProvider.return_value.addFeatures.assert_not_called()
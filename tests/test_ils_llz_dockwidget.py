@@ -99,6 +99,7 @@ class TestGetOmniParameters:
         layer = Mock()
         layer.__class__ = QgsVectorLayer
         layer.selectedFeatureCount.return_value = 1
+        layer.selectedFeatures.return_value = [Mock()]
         with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject") as mock_proj:
             mock_proj.instance.return_value.mapLayer.return_value = layer
             result = dw.get_omni_parameters()
@@ -109,12 +110,26 @@ class TestGetOmniParameters:
         assert result["omni_turbine"] is False
         assert "active_layer" in result
 
+    def test_includes_navaid_fid(self):
+        dw = _make_dockwidget("Omnidirectional")
+        layer = Mock()
+        layer.__class__ = QgsVectorLayer
+        layer.selectedFeatureCount.return_value = 1
+        feat = Mock()
+        feat.id.return_value = 42
+        layer.selectedFeatures.return_value = [feat]
+        with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject") as mock_proj:
+            mock_proj.instance.return_value.mapLayer.return_value = layer
+            result = dw.get_omni_parameters()
+        assert result["navaid_fid"] == 42
+
     def test_display_name_uses_facility_label_when_no_custom(self):
         dw = _make_dockwidget("Omnidirectional")
         from qgis.core import QgsVectorLayer
         layer = Mock()
         layer.__class__ = QgsVectorLayer
         layer.selectedFeatureCount.return_value = 1
+        layer.selectedFeatures.return_value = [Mock()]
         with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject") as mock_proj:
             mock_proj.instance.return_value.mapLayer.return_value = layer
             result = dw.get_omni_parameters()
@@ -127,6 +142,7 @@ class TestGetOmniParameters:
         layer = Mock()
         layer.__class__ = QgsVectorLayer
         layer.selectedFeatureCount.return_value = 1
+        layer.selectedFeatures.return_value = [Mock()]
         with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject") as mock_proj:
             mock_proj.instance.return_value.mapLayer.return_value = layer
             result = dw.get_omni_parameters()
@@ -150,6 +166,34 @@ class TestOnModeChanged:
         assert any("omnidirectional" in lbl.lower() for lbl in labels)
 
 
+class TestGetScreeningParameters:
+    def test_requires_turbine_cylinder(self):
+        dw = _make_dockwidget("Omnidirectional")
+        dw._widget.chkOmniTurbine.isChecked.return_value = False
+        with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject"):
+            assert dw.get_screening_parameters() is None
+        dw.iface.messageBar.return_value.pushMessage.assert_called_once()
+
+    def test_requires_both_layers(self):
+        dw = _make_dockwidget("Omnidirectional")
+        dw._widget.chkOmniTurbine.isChecked.return_value = True
+        dw._widget.cboTurbineLayer.currentData.return_value = None
+        with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject"):
+            assert dw.get_screening_parameters() is None
+
+    def test_returns_layers_and_omni_values(self):
+        dw = _make_dockwidget("Omnidirectional")
+        dw._widget.chkOmniTurbine.isChecked.return_value = True
+        dw._widget.cboTurbineLayer.currentData.return_value = "turbines-id"
+        with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject") as mock_proj:
+            mock_proj.instance.return_value.mapLayer.side_effect = lambda lid: f"layer:{lid}"
+            result = dw.get_screening_parameters()
+        assert result["turbine_layer"] == "layer:turbines-id"
+        assert result["site_layer"].startswith("layer:")
+        assert result["omni_turbine"] is True
+        assert {"omni_r", "omni_alpha", "omni_R", "omni_j", "omni_h", "site_elev"} <= set(result)
+
+
 class TestApplyFacilityDefaults:
     def test_gp_sets_fixed_a(self):
         """For GP facility, 'a' is fixed at 800 (not threshold-dependent)."""
@@ -178,3 +222,271 @@ class TestApplyFacilityDefaults:
             dw._apply_facility_defaults()
         dw._widget.spnB.setValue.assert_called_with(500.0)
         dw._widget.spnh.setValue.assert_called_with(70.0)
+
+
+class TestPersistentOutput:
+    def test_persistent_output_flag_follows_checkbox(self):
+        dw = _make_dockwidget("Directional")
+        dw._widget.chkPersistentOutput.isChecked.return_value = True
+        assert dw.is_persistent_output() is True
+        dw._widget.chkPersistentOutput.isChecked.return_value = False
+        assert dw.is_persistent_output() is False
+
+    def test_persistent_layer_id_none_for_plugin_layer(self):
+        dw = _make_dockwidget("Directional")
+        dw._widget.cboOutputLayer.currentData.return_value = None
+        assert dw.persistent_layer_id() is None
+
+    def test_persistent_layer_id_returns_selected_layer(self):
+        dw = _make_dockwidget("Directional")
+        dw._widget.cboOutputLayer.currentData.return_value = "bra-layer-id"
+        assert dw.persistent_layer_id() == "bra-layer-id"
+
+    def test_dem_layer_id(self):
+        dw = _make_dockwidget("Directional")
+        dw._widget.cboDemLayer.currentData.return_value = "dem-id"
+        assert dw.dem_layer_id() == "dem-id"
+        dw._widget.cboDemLayer.currentData.return_value = None
+        assert dw.dem_layer_id() is None
+
+    def test_linked_mode_forces_persistent_output(self):
+        dw = _make_dockwidget("Directional")
+        dw._on_linked_toggled(True)
+        dw._widget.chkPersistentOutput.setChecked.assert_called_once_with(True)
+
+    def test_disabling_persistent_output_clears_linked_mode(self):
+        dw = _make_dockwidget("Directional")
+        dw._on_persistent_toggled(False)
+        dw._widget.cboOutputLayer.setEnabled.assert_called_once_with(False)
+        dw._widget.chkLinkedMode.setChecked.assert_called_once_with(False)
+
+    def test_routing_source_returns_selected_feature(self):
+        dw = _make_dockwidget("Directional")
+        layer = Mock()
+        layer.selectedFeatureCount.return_value = 1
+        feat = Mock()
+        feat.id.return_value = 5
+        layer.selectedFeatures.return_value = [feat]
+        with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject") as mock_proj:
+            mock_proj.instance.return_value.mapLayer.return_value = layer
+            assert dw.routing_source() == ("layer-id-2", 5)
+
+    def test_routing_source_none_without_selection(self):
+        dw = _make_dockwidget("Directional")
+        layer = Mock()
+        layer.selectedFeatureCount.return_value = 0
+        with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject") as mock_proj:
+            mock_proj.instance.return_value.mapLayer.return_value = layer
+            assert dw.routing_source() is None
+
+    def test_footprint_output_follows_checkbox(self):
+        dw = _make_dockwidget("Directional")
+        dw._widget.chkFootprint.isChecked.return_value = True
+        assert dw.is_footprint_output() is True
+
+    def test_profile_request_covers_one_calculation(self):
+        dw = _make_dockwidget("Directional")
+        dw._widget.chkProfileNext.isChecked.return_value = False
+        assert dw.take_profile_request() is None
+        dw._widget.chkProfileNext.isChecked.return_value = True
+        dw._widget.txtProfileDir.text.return_value = " /tmp/profiles "
+        assert dw.take_profile_request() == "/tmp/profiles"
+        dw._widget.chkProfileNext.setChecked.assert_called_with(False)
+
+    def test_scenario_request(self):
+        dw = _make_dockwidget("Directional")
+        assert dw._widget.lstScenarioFacilities.addItem.call_count == 4
+        items = {0: Mock(), 1: Mock(), 2: Mock(), 3: Mock()}
+        for row, item in items.items():
+            item.isSelected.return_value = row in (1, 3)
+        dw._widget.lstScenarioFacilities.item.side_effect = items.get
+        dw._widget.chkScenarioBothDirections.isChecked.return_value = True
+        assert dw.scenario_request() == (["LOCII", "DME"], ["forward", "backward"])
+        items[1].isSelected.return_value = items[3].isSelected.return_value = False
+        dw._widget.chkScenarioBothDirections.isChecked.return_value = False
+        dw._widget.btnDirection.property.return_value = "backward"
+        assert dw.scenario_request() == (["LOC"], ["backward"])
+
+    def test_queue_view(self):
+        dw = _make_dockwidget("Directional")
+        dw.set_queue(["#1 RWY09"], [(2, "#2 RWY27"), (3, "#3 RWY09")])
+        dw._widget.lblQueueStatus.setText.assert_called_with("Running: #1 RWY09; queued: 2")
+        dw._widget.btnCalculate.setText.assert_called_with("Queue calculation")
+        dw._widget.lstQueue.addItem.assert_called_with("#3 RWY09")
+        dw._widget.btnCancelQueued.setEnabled.assert_called_with(True)
+        items = {0: Mock(), 1: Mock()}
+        items[0].isSelected.return_value, items[1].isSelected.return_value = False, True
+        dw._widget.lstQueue.item.side_effect = items.get
+        assert dw.queued_selection() == [3]
+        items[1].isSelected.return_value = False
+        assert dw.queued_selection() is None
+        dw.set_queue([], [])
+        dw._widget.lblQueueStatus.setText.assert_called_with("No calculation running")
+        dw._widget.btnCalculate.setText.assert_called_with("Calculate")
+        dw._widget.btnCancelQueued.setEnabled.assert_called_with(False)
+
+
+class _FakeCombo:
+    """Minimal QComboBox stand-in tracking (text, data) items."""
+
+    def __init__(self):
+        self.items = []
+        self.index = -1
+
+    def clear(self):
+        self.items, self.index = [], -1
+
+    def addItem(self, text, data=None):
+        self.items.append((text, data))
+        if self.index < 0:
+            self.index = 0
+
+    def findData(self, data):
+        return next((i for i, (_t, d) in enumerate(self.items) if d == data), -1)
+
+    def setCurrentIndex(self, index):
+        self.index = index
+
+    def currentData(self):
+        return self.items[self.index][1] if self.index >= 0 else None
+
+
+def _vector_layer(layer_id, wkb_type):
+    layer = Mock()
+    layer.__class__ = QgsVectorLayer
+    layer.id.return_value = layer_id
+    layer.name.return_value = layer_id.upper()
+    layer.wkbType.return_value = wkb_type
+    return layer
+
+
+class TestAsyncLayerCombos:
+    def _dock(self, layers, active=None):
+        from qBRA.services.layer_catalog import LayerCatalog
+        dw = _make_dockwidget("Directional")
+        for name in ("cboNavaidLayer", "cboRoutingLayer", "cboOutputLayer", "cboDemLayer", "cboTurbineLayer"):
+            setattr(dw._widget, name, _FakeCombo())
+        dw.iface.activeLayer.return_value = active
+        dw._layer_service.catalog = LayerCatalog()
+        dw._layer_service.iter_layers.return_value = layers
+        dw._pending_layers = set()
+        dw._layer_selection = {}
+        dw._type_workers = []
+        return dw
+
+    def _refresh(self, dw):
+        with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.LayerTypeWorker") as worker:
+            dw.refresh_layers()
+        return worker
+
+    def _resolve(self, dw, layers, geometry_types=None):
+        # What the worker would emit: the type of each pending layer's source
+        from qgis.core import QgsWkbTypes
+        by_id = {layer.id(): layer for layer in layers}
+        with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject") as mock_proj:
+            mock_proj.instance.return_value.mapLayer.side_effect = by_id.get
+            for layer in layers:
+                gtype = QgsWkbTypes.geometryType(layer.wkbType.return_value)
+                dw._on_layer_type(layer.id(), (geometry_types or {}).get(layer.id(), gtype))
+
+    def test_refresh_defers_unknown_layers(self):
+        from qgis.core import QgsWkbTypes
+        layers = [_vector_layer("pts", QgsWkbTypes.Point), _vector_layer("lines", QgsWkbTypes.LineString)]
+        dw = self._dock(layers)
+        worker = self._refresh(dw)
+        for layer in layers:
+            layer.wkbType.assert_not_called()
+        assert dw._widget.cboNavaidLayer.items == []
+        assert dw._pending_layers == {"pts", "lines"}
+        sources = worker.call_args[0][0]
+        assert [source[0] for source in sources] == ["pts", "lines"]
+        assert sources[0][1:] == (layers[0].providerType(), layers[0].source())
+        worker.return_value.start.assert_called_once()
+        assert dw._type_workers == [worker.return_value]
+
+        self._resolve(dw, layers)
+        assert dw._widget.cboNavaidLayer.items == [("PTS", "pts")]
+        assert dw._widget.cboTurbineLayer.items == [("PTS", "pts")]
+        assert dw._widget.cboRoutingLayer.items == [("LINES", "lines")]
+        assert not dw._pending_layers
+        for layer in layers:
+            layer.wkbType.assert_not_called()
+
+    def test_unopenable_source_uses_layer_type(self):
+        from qgis.core import QgsWkbTypes
+        layers = [_vector_layer("virt", QgsWkbTypes.Point)]
+        dw = self._dock(layers)
+        self._refresh(dw)
+        self._resolve(dw, layers, geometry_types={"virt": None})
+        assert dw._widget.cboNavaidLayer.items == [("VIRT", "virt")]
+        layers[0].wkbType.assert_called_once()
+
+    def test_late_result_after_refresh_not_duplicated(self):
+        from qgis.core import QgsWkbTypes
+        layers = [_vector_layer("pts", QgsWkbTypes.Point)]
+        dw = self._dock(layers)
+        self._refresh(dw)
+        self._resolve(dw, layers)
+        self._resolve(dw, layers)
+        assert dw._widget.cboNavaidLayer.items == [("PTS", "pts")]
+
+    def test_second_refresh_uses_catalog(self):
+        from qgis.core import QgsWkbTypes
+        layers = [_vector_layer("poly", QgsWkbTypes.Polygon)]
+        dw = self._dock(layers)
+        self._refresh(dw)
+        self._resolve(dw, layers)
+        worker = self._refresh(dw)
+        worker.assert_not_called()
+        assert dw._widget.cboOutputLayer.items == [("<plugin BRA layer>", None), ("POLY", "poly")]
+        assert not dw._pending_layers
+
+    def test_active_point_layer_selected_when_resolved(self):
+        from qgis.core import QgsWkbTypes
+        layers = [_vector_layer("a", QgsWkbTypes.Point), _vector_layer("b", QgsWkbTypes.Point)]
+        dw = self._dock(layers, active=layers[1])
+        self._refresh(dw)
+        self._resolve(dw, layers)
+        assert dw._widget.cboNavaidLayer.currentData() == "b"
+
+    def test_previous_output_restored(self):
+        from qgis.core import QgsWkbTypes
+        layers = [_vector_layer("p1", QgsWkbTypes.Polygon), _vector_layer("p2", QgsWkbTypes.Polygon)]
+        dw = self._dock(layers)
+        self._refresh(dw)
+        self._resolve(dw, layers)
+        dw._widget.cboOutputLayer.setCurrentIndex(2)
+        self._refresh(dw)
+        assert dw._widget.cboOutputLayer.currentData() == "p2"
+
+    def test_removed_layers_dropped(self):
+        from qgis.core import QgsWkbTypes
+        layers = [_vector_layer("x", QgsWkbTypes.Point), _vector_layer("y", QgsWkbTypes.Point)]
+        dw = self._dock(layers)
+        dw._layer_service.catalog.geometry_type(layers[0])
+        self._refresh(dw)
+        dw._on_layers_removed(["x", "y"])
+        assert "x" not in dw._layer_service.catalog
+        assert not dw._pending_layers
+
+    def test_release_disconnects_project(self):
+        from qgis.core import QgsWkbTypes
+        dw = self._dock([_vector_layer("pts", QgsWkbTypes.Point)])
+        worker = self._refresh(dw).return_value
+        with patch("qBRA.dockwidgets.ils.ils_llz_dockwidget.QgsProject") as mock_proj:
+            dw.release()
+            signal = mock_proj.instance.return_value.layersRemoved
+            signal.disconnect.assert_called_once_with(dw._on_layers_removed)
+            signal.disconnect.side_effect = TypeError
+            dw.release()
+        worker.resolved.disconnect.assert_called_once_with(dw._on_layer_type)
+        worker.wait.assert_called_once()
+        assert not dw._type_workers and not dw._pending_layers
+
+    def test_finished_worker_deleted(self):
+        dw = self._dock([])
+        worker = Mock()
+        dw._type_workers = [worker]
+        dw._on_type_worker_finished(worker)
+        assert dw._type_workers == []
+        worker.deleteLater.assert_called_once()
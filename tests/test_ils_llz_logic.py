@@ -218,6 +218,26 @@ class TestBuildLayersOmni:
         with pytest.raises(ValueError, match="Select one feature"):
             build_layers_omni(iface, {"active_layer": layer, "omni_r": 300, "omni_alpha": 1.0, "omni_R": 3000})
 
+    def test_raises_when_navaid_fid_not_found(self):
+        """Raises ValueError when the addressed navaid feature does not exist."""
+        from qBRA.modules.ils_llz_logic import build_layers_omni
+        layer = self._make_layer()
+        layer.getFeature.return_value.isValid.return_value = False
+        iface = self._make_iface()
+        with pytest.raises(ValueError, match="not found"):
+            build_layers_omni(iface, {"active_layer": layer, "navaid_fid": 9, "omni_r": 300, "omni_alpha": 1.0, "omni_R": 3000})
+
+    def test_navaid_fid_bypasses_selection(self):
+        """Uses getFeature() instead of the selection when navaid_fid is given."""
+        from qBRA.modules.ils_llz_logic import build_layers_omni
+        layer = self._make_layer()
+        layer.getFeature.return_value = layer.selectedFeatures.return_value[0]
+        layer.selectedFeatures.return_value = []
+        iface = self._make_iface()
+        with patch("qBRA.modules.ils_llz_logic.QgsVectorLayer", return_value=Mock()):
+            build_layers_omni(iface, {"active_layer": layer, "navaid_fid": 9, "omni_r": 300, "omni_alpha": 1.0, "omni_R": 3000})
+        layer.getFeature.assert_called_once_with(9)
+
     def test_raises_invalid_r_R(self):
         """Raises ValueError when r=0 or R=0."""
         from qBRA.modules.ils_llz_logic import build_layers_omni
@@ -292,3 +312,38 @@ class TestBuildLayersOmni:
             })
         assert result is mock_out
 
+
+class TestNavaidSnapshot:
+    """Tests for the main-thread reads handed to the workers."""
+
+    def test_navaid_point_from_selection_or_fid(self):
+        from qBRA.modules.ils_llz_logic import navaid_point
+        layer = TestBuildLayersOmni()._make_layer(5.0, 6.0)
+        assert navaid_point(layer, None) == (5.0, 6.0)
+        layer.getFeature.return_value = layer.selectedFeatures.return_value[0]
+        assert navaid_point(layer, 3) == (5.0, 6.0)
+        layer.getFeature.assert_called_once_with(3)
+
+    def test_navaid_point_errors(self):
+        from qBRA.modules.ils_llz_logic import navaid_point
+        from qBRA.exceptions import BRACalculationError
+        layer = TestBuildLayersOmni()._make_layer()
+        layer.getFeature.return_value.isValid.return_value = False
+        with pytest.raises(BRACalculationError, match="not found"):
+            navaid_point(layer, 3)
+        layer.selectedFeatures.return_value = []
+        with pytest.raises(BRACalculationError, match="No feature selected"):
+            navaid_point(layer, None)
+
+    def test_map_crs_authid(self):
+        from qBRA.modules.ils_llz_logic import map_crs_authid
+        assert map_crs_authid(TestBuildLayersOmni()._make_iface("EPSG:32633")) == "EPSG:32633"
+
+    def test_omni_surfaces_take_plain_values(self):
+        from qBRA.constants import OUTPUT_KIND_OMNI
+        from qBRA.models.omni_parameters import OmniParameters
+        from qBRA.modules.ils_llz_logic import omni_surfaces
+        omni = OmniParameters(site_elev=0.0, r=300.0, alpha=1.0, R=3000.0, display_name="VOR")
+        data = omni_surfaces(omni, (1000.0, 2000.0), "EPSG:32633")
+        assert data.kind == OUTPUT_KIND_OMNI and data.crs_authid == "EPSG:32633"
+        assert len(data) == 2
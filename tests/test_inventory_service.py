@@ -0,0 +1,205 @@
+"""Tests for the headless inventory reader and parameter resolution."""
+
+import json
+import sqlite3
+import struct
+
+import pytest
+
+from qBRA.exceptions import BRAValidationError
+from qBRA.services.inventory_service import (
+    GEOMETRY_KEY,
+    chunked,
+    is_omni_record,
+    iter_records,
+    load_runways,
+    resolve_directional,
+    resolve_omni,
+)
+
+
+def _gpkg_point(x, y):
+    # GeoPackage header (no envelope, little endian) + ISO WKB Point Z
+    return b"GP\x00\x01" + struct.pack("<i", 32633) + struct.pack("<BIddd", 1, 1001, x, y, 0.0)
+
+
+def _gpkg_multiline(*parts):
+    # GeoPackage header + ISO WKB MultiLineString of 2D LineString parts
+    wkb = struct.pack("<BII", 1, 5, len(parts))
+    for part in parts:
+        wkb += struct.pack("<BII", 1, 2, len(part)) + b"".join(struct.pack("<dd", *p) for p in part)
+    return b"GP\x00\x01" + struct.pack("<i", 32633) + wkb
+
+
+def _write_gpkg(path, rows):
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE gpkg_contents (table_name TEXT, data_type TEXT)")
+    con.execute("CREATE TABLE gpkg_geometry_columns (table_name TEXT, column_name TEXT)")
+    con.execute("INSERT INTO gpkg_contents VALUES ('navaids', 'features')")
+    con.execute("INSERT INTO gpkg_geometry_columns VALUES ('navaids', 'geom')")
+    con.execute("CREATE TABLE navaids (fid INTEGER, facility TEXT, site_elev REAL, geom BLOB)")
+    con.executemany("INSERT INTO navaids VALUES (?, ?, ?, ?)",
+                    [(fid, fac, elev, _gpkg_point(x, y)) for fid, fac, elev, x, y in rows])
+    con.commit()
+    con.close()
+
+
+@pytest.mark.unit
+class TestReaders:
+    def test_csv_points_and_wkt(self, tmp_path):
+        path = tmp_path / "navaids.csv"
+        path.write_text("id,facility,x,y,wkt\n1,LOC,10,20,\n2,GP,,,POINT (3 4)\n")
+        records = list(iter_records(str(path)))
+        assert [r[GEOMETRY_KEY] for r in records] == [("Point", (10.0, 20.0)), ("Point", (3.0, 4.0))]
+        assert records[0]["facility"] == "LOC"
+
+    def test_geojson_and_sequence(self, tmp_path):
+        feature = {"type": "Feature", "id": 7, "properties": {"facility": "OMNI_NDB"},
+                   "geometry": {"type": "Point", "coordinates": [1.0, 2.0, 3.0]}}
+        collection = tmp_path / "n.geojson"
+        collection.write_text(json.dumps({"type": "FeatureCollection", "features": [feature]}))
+        sequence = tmp_path / "n.geojsonl"
+        sequence.write_text("\x1e" + json.dumps(feature) + "\n\n" + json.dumps(feature) + "\n")
+        assert list(iter_records(str(collection)))[0] == {"facility": "OMNI_NDB", "id": 7,
+                                                          GEOMETRY_KEY: ("Point", (1.0, 2.0))}
+        assert len(list(iter_records(str(sequence)))) == 2
+
+    def test_gpkg(self, tmp_path):
+        path = tmp_path / "n.gpkg"
+        _write_gpkg(str(path), [(1, "LOC", 12.0, 100.0, 200.0), (2, "OMNI_DVOR", 5.0, -1.0, -2.0)])
+        records = list(iter_records(str(path)))
+        assert [r["fid"] for r in records] == [1, 2]
+        assert records[1][GEOMETRY_KEY] == ("Point", (-1.0, -2.0))
+
+    def test_geojson_collection_is_streamed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("qBRA.services.inventory_service._READ_SIZE", 7)
+        features = [{"type": "Feature", "properties": {"id": i, "h": 12.5},
+                     "geometry": {"type": "Point", "coordinates": [i, -i]}} for i in range(3)]
+        path = tmp_path / "n.geojson"
+        path.write_text(json.dumps({"features": features, "type": "FeatureCollection", "name": "n"}, indent=2))
+        records = list(iter_records(str(path)))
+        assert [r[GEOMETRY_KEY] for r in records] == [("Point", (i, -i)) for i in range(3)]
+        assert records[2]["h"] == 12.5
+
+    def test_geojson_lone_feature_and_empty_collection(self, tmp_path):
+        feature = tmp_path / "f.geojson"
+        feature.write_text(json.dumps({"type": "Feature", "properties": {"id": 1},
+                                       "geometry": {"type": "Point", "coordinates": [1, 2]}}))
+        empty = tmp_path / "e.geojson"
+        empty.write_text('{"type": "FeatureCollection", "features": [ ]}')
+        assert [r[GEOMETRY_KEY] for r in iter_records(str(feature))] == [("Point", (1, 2))]
+        assert list(iter_records(str(empty))) == []
+
+    @pytest.mark.parametrize("text", ['{"type": "FeatureCollection", "features": [{"id": 1}',
+                                      '{"features": [{"id": 1} {"id": 2}]}'])
+    def test_geojson_malformed(self, tmp_path, text):
+        path = tmp_path / "n.geojson"
+        path.write_text(text)
+        with pytest.raises(BRAValidationError, match="Malformed GeoJSON"):
+            list(iter_records(str(path)))
+
+    def test_multipart_geometries(self, tmp_path):
+        path = tmp_path / "rwy.csv"
+        path.write_text('runway,wkt\n09,"MULTILINESTRING ((0 0, 0 1), (0 1, 0 2))"\n'
+                        '18,"MULTILINESTRING ((0 0, 0 1), (5 5, 5 6))"\n')
+        with pytest.raises(BRAValidationError, match="Multi-part"):
+            list(iter_records(str(path)))
+        line = {"type": "MultiLineString", "coordinates": [[[0, 0], [0, 1]]]}
+        points = {"type": "MultiPoint", "coordinates": [[0, 0], [1, 1]]}
+        sequence = tmp_path / "n.geojsonl"
+        sequence.write_text(json.dumps({"type": "Feature", "geometry": line}) + "\n")
+        assert next(iter_records(str(sequence)))[GEOMETRY_KEY] == ("LineString", [(0, 0), (0, 1)])
+        sequence.write_text(json.dumps({"type": "Feature", "geometry": points}) + "\n")
+        with pytest.raises(BRAValidationError, match="Multi-part"):
+            list(iter_records(str(sequence)))
+
+    def test_gpkg_multilinestring_parts(self, tmp_path):
+        path = tmp_path / "rwy.gpkg"
+        _write_gpkg(str(path), [])
+        con = sqlite3.connect(str(path))
+        con.execute("INSERT INTO navaids VALUES (1, 'RWY', 0, ?)",
+                    (_gpkg_multiline([(0, 0), (0, 1)], [(0, 1), (0, 3)]),))
+        con.execute("INSERT INTO navaids VALUES (2, 'RWY', 0, ?)",
+                    (_gpkg_multiline([(0, 0), (0, 1)], [(4, 4), (4, 5)]),))
+        con.commit()
+        con.close()
+        records = iter_records(str(path))
+        assert next(records)[GEOMETRY_KEY] == ("LineString", [(0, 0), (0, 1), (0, 3)])
+        with pytest.raises(BRAValidationError, match="Multi-part") as excinfo:
+            next(records)
+        assert "navaids row 2" in excinfo.value.details
+
+    def test_gpkg_missing_layer(self, tmp_path):
+        path = tmp_path / "n.gpkg"
+        _write_gpkg(str(path), [])
+        with pytest.raises(BRAValidationError):
+            list(iter_records(str(path), layer="other"))
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(BRAValidationError):
+            iter_records(str(tmp_path / "n.shp"))
+
+    def test_chunked(self):
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_load_runways(self, tmp_path):
+        path = tmp_path / "rwy.csv"
+        path.write_text("runway,start_x,start_y,end_x,end_y\n09,0,1000,0,4000\nbad,,,,\n")
+        assert load_runways(str(path)) == {"09": [(0.0, 1000.0), (0.0, 4000.0)]}
+
+
+@pytest.mark.unit
+class TestResolve:
+    RUNWAYS = {"09": [(0.0, 1000.0), (0.0, 4000.0)]}
+
+    def test_directional_from_runway(self):
+        record = {"id": "3", "facility": "loc", "runway": "09", "site_elev": "12",
+                  GEOMETRY_KEY: ("Point", (0.0, 0.0))}
+        params, xy = resolve_directional(record, self.RUNWAYS)
+        assert xy == (0.0, 0.0)
+        assert params.azimuth == pytest.approx(0.0)
+        assert params.a == pytest.approx(1000.0)
+        assert params.r == pytest.approx(7000.0)
+        assert params.site_elev == 12.0 and params.navaid_fid == 3
+        assert params.facility_key == "LOC" and params.remark == "09"
+
+    def test_directional_backward_and_overrides(self):
+        record = {"facility": "GP", "runway": "09", "direction": "backward", "b": "80",
+                  GEOMETRY_KEY: ("Point", (0.0, 0.0))}
+        params, _xy = resolve_directional(record, self.RUNWAYS)
+        assert params.azimuth == pytest.approx(180.0)
+        assert (params.a, params.b, params.r) == (800, 80.0, 6000)
+
+    def test_directional_explicit_azimuth(self):
+        record = {"facility": "GP", "azimuth": "450", GEOMETRY_KEY: ("Point", (0.0, 0.0))}
+        assert resolve_directional(record, {})[0].azimuth == 90.0
+
+    @pytest.mark.parametrize("record", [
+        {"facility": "NOPE", GEOMETRY_KEY: ("Point", (0.0, 0.0))},
+        {"facility": "GP", "azimuth": "0", GEOMETRY_KEY: None},
+        {"facility": "GP", GEOMETRY_KEY: ("Point", (0.0, 0.0))},
+        {"facility": "LOC", "azimuth": "0", GEOMETRY_KEY: ("Point", (0.0, 0.0))},
+    ])
+    def test_directional_errors(self, record):
+        with pytest.raises(BRAValidationError):
+            resolve_directional(record, {})
+
+    def test_directional_invalid_values(self):
+        record = {"facility": "GP", "azimuth": "0", "b": "-1", GEOMETRY_KEY: ("Point", (0.0, 0.0))}
+        with pytest.raises(ValueError):
+            resolve_directional(record, {})
+
+    def test_omni_presets(self):
+        dvor = {"id": 5, "facility": "OMNI_DVOR", "name": "ABC", GEOMETRY_KEY: ("Point", (1.0, 2.0))}
+        ndb = {"facility": "OMNI_NDB", "r": "250", GEOMETRY_KEY: ("Point", (1.0, 2.0))}
+        assert is_omni_record(dvor) and not is_omni_record({"facility": "LOC"})
+        params, xy = resolve_omni(dvor)
+        assert xy == (1.0, 2.0)
+        assert params.turbine and (params.j, params.h) == (10000, 52)
+        assert params.display_name.startswith("ABC - ") and params.navaid_fid == 5
+        params, _xy = resolve_omni(ndb)
+        assert not params.turbine and params.r == 250.0
+
+    def test_omni_turbine_column(self):
+        record = {"facility": "OMNI_CVOR", "turbine": "no", GEOMETRY_KEY: ("Point", (0.0, 0.0))}
+        assert not resolve_omni(record)[0].turbine
@@ -0,0 +1,191 @@
+"""Tests for the headless BRA geometry kernel."""
+
+from math import cos, radians, sin, tan
+
+import numpy as np
+import pytest
+
+from qBRA.exceptions import BRACalculationError
+from qBRA.modules.kernel import (
+    DIRECTIONAL_OFFSETS,
+    DIRECTIONAL_TEMPLATES,
+    DIRECTIONAL_VERTEX_COUNT,
+    directional_columns,
+    directional_points,
+    directional_rings,
+    directional_vertices,
+    linearize_arc,
+    omni_columns,
+    omni_rings,
+    omni_vertices,
+    routing_azimuth,
+)
+
+# x, y, azimuth, a, b, r, D, L, phi, site_elev, H, h
+LOC_ROW = (0.0, 0.0, 0.0, 1000.0, 500.0, 7000.0, 500.0, 2300.0, 30.0, 100.0, 10.0, 70.0)
+
+
+def _dist(p, q):
+    return float(np.hypot(*(np.asarray(p) - np.asarray(q))))
+
+
+@pytest.mark.unit
+class TestDirectionalPoints:
+    def test_reference_points(self):
+        pts = {k: v[0] for k, v in directional_points(directional_columns([LOC_ROW])).items()}
+        np.testing.assert_allclose(pts["threshold"], (0, 1000), atol=1e-9)
+        np.testing.assert_allclose(pts["back"], (0, -500), atol=1e-9)
+        np.testing.assert_allclose(pts["ahead_left"], (-500, 1000), atol=1e-9)
+        np.testing.assert_allclose(pts["ahead_right"], (500, 1000), atol=1e-9)
+        np.testing.assert_allclose(pts["back_left"], (-500, -500), atol=1e-9)
+        np.testing.assert_allclose(pts["lateral_right"], (2300, -500), atol=1e-9)
+
+    def test_diverge_point_on_both_lines(self):
+        pts = directional_points(directional_columns([LOC_ROW]))
+        t = 1800.0 / sin(radians(30))
+        np.testing.assert_allclose(pts["diverge_left"][0], (-2300, 1000 + t * cos(radians(30))), atol=1e-6)
+
+    def test_arc_points_on_circle_ahead(self):
+        pts = directional_points(directional_columns([LOC_ROW]))
+        for name in ("arc_left", "arc_right", "arc_mid"):
+            assert _dist(pts[name][0], (0, 0)) == pytest.approx(7000.0)
+            assert pts[name][0][1] > 0
+        np.testing.assert_allclose(pts["arc_mid"][0], (0, 7000), atol=1e-6)
+        # arc_left lies on the diverging line from ahead_left at azimuth - phi
+        d = pts["arc_left"][0] - pts["ahead_left"][0]
+        assert np.degrees(np.arctan2(d[0], d[1])) == pytest.approx(-30.0)
+
+    def test_rotation_follows_azimuth(self):
+        rotated = list(LOC_ROW)
+        rotated[2] = 90.0
+        base = directional_points(directional_columns([LOC_ROW]))
+        turned = directional_points(directional_columns([rotated]))
+        for name, p in base.items():
+            x, y = p[0]
+            np.testing.assert_allclose(turned[name][0], (y, -x), atol=1e-6)
+
+    def test_vectorised_rows_match_single_rows(self):
+        rng = np.random.default_rng(3)
+        rows = [
+            (rng.uniform(-1e5, 1e5), rng.uniform(-1e5, 1e5), rng.uniform(0, 360), *LOC_ROW[3:])
+            for _ in range(20)
+        ]
+        batch = directional_vertices(directional_columns(rows))
+        for i, row in enumerate(rows):
+            np.testing.assert_allclose(batch[i], directional_vertices(directional_columns([row]))[0])
+
+
+@pytest.mark.unit
+class TestDirectionalVertices:
+    def test_layout(self):
+        verts = directional_vertices(directional_columns([LOC_ROW]))
+        assert verts.shape == (1, DIRECTIONAL_VERTEX_COUNT, 3)
+        assert [t.id for t in DIRECTIONAL_TEMPLATES] == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_rings_closed_and_heights(self):
+        verts = directional_vertices(directional_columns([LOC_ROW]))[0]
+        z_by_area = {}
+        for template, (start, stop) in zip(DIRECTIONAL_TEMPLATES, DIRECTIONAL_OFFSETS):
+            ring = verts[start:stop]
+            np.testing.assert_allclose(ring[0], ring[-1])
+            z_by_area.setdefault(template.area, set()).update(ring[:, 2].tolist())
+        assert z_by_area["base"] == {100.0}
+        assert z_by_area["left level"] == {110.0}
+        assert z_by_area["slope"] == {100.0, 170.0}
+        assert z_by_area["wall"] == {100.0, 110.0}
+
+    def test_writes_into_preallocated_output(self):
+        out = np.zeros((2, DIRECTIONAL_VERTEX_COUNT, 3))
+        result = directional_vertices(directional_columns([LOC_ROW, LOC_ROW]), out=out)
+        assert result is out
+        assert np.all(out[:, 0, 2] == 100.0)
+
+
+@pytest.mark.unit
+class TestOmniVertices:
+    # x, y, site_elev, r, alpha, R, j, h, turbine
+    ROW = (10.0, 20.0, 50.0, 600.0, 1.0, 3000.0, 15000.0, 52.0, 1.0)
+
+    def test_rings(self):
+        verts = omni_vertices(omni_columns([self.ROW]), segments=8)[0]
+        assert verts.shape == (36, 3)
+        rings = verts.reshape(4, 9, 3)
+        for ring, radius in zip(rings, (600.0, 3000.0, 600.0, 15000.0)):
+            np.testing.assert_allclose(ring[0], ring[-1])
+            np.testing.assert_allclose(np.hypot(ring[:, 0] - 10.0, ring[:, 1] - 20.0), radius)
+        assert rings[0, 1, 1] > 20.0 and rings[2, 1, 1] < 20.0  # hole is reversed
+        assert rings[0, 0, 2] == pytest.approx(50.0 + 600.0 * tan(radians(1.0)))
+        assert rings[1, 0, 2] == pytest.approx(50.0 + 3000.0 * tan(radians(1.0)))
+        assert rings[3, 0, 2] == pytest.approx(102.0)
+
+    def test_no_turbine_ring_without_turbine_mode(self):
+        row = self.ROW[:-1] + (0.0,)
+        verts = omni_vertices(omni_columns([row, self.ROW]), segments=8)
+        assert np.isnan(verts[0, 27:]).all()
+        assert not np.isnan(verts[1]).any()
+
+
+@pytest.mark.unit
+class TestRings:
+    def test_linearize_arc_through_mid(self):
+        start, mid, end = np.array([-100.0, 0, 0]), np.array([0.0, 100, 5]), np.array([100.0, 0, 10])
+        arc = linearize_arc(start, mid, end, 8)
+        assert arc.shape == (9, 3)
+        np.testing.assert_allclose(np.hypot(arc[:, 0], arc[:, 1]), 100.0)
+        assert (arc[1:-1, 1] > 0).all()
+        np.testing.assert_allclose(arc[[0, -1]], [start, end])
+        np.testing.assert_allclose(arc[:, 2], np.linspace(0, 10, 9))
+
+    def test_linearize_arc_collinear(self):
+        arc = linearize_arc(np.array([0.0, 0, 0]), np.array([1.0, 0, 0]), np.array([2.0, 0, 0]), 4)
+        np.testing.assert_allclose(arc[:, 0], [0, 0.5, 1, 1.5, 2])
+
+    def test_directional_rings(self):
+        verts = directional_vertices(directional_columns([LOC_ROW]))[0]
+        rings = directional_rings(verts, arc_segments=16)
+        assert len(rings) == len(DIRECTIONAL_TEMPLATES)
+        for ring in rings:
+            np.testing.assert_allclose(ring[0], ring[-1], atol=1e-6)
+        slope = rings[3]
+        assert len(slope) == 3 + 17
+        np.testing.assert_allclose(np.hypot(slope[3:, 0], slope[3:, 1]), 7000.0)
+
+    def test_omni_rings_skip_missing_turbine(self):
+        row = TestOmniVertices.ROW
+        verts = omni_vertices(omni_columns([row, row[:-1] + (0.0,)]), segments=8)
+        with_turbine, without = (omni_rings(v, 8) for v in verts)
+        assert [len(p) for p in with_turbine] == [1, 2, 1]
+        assert [len(p) for p in without] == [1, 2]
+
+
+@pytest.mark.unit
+class TestRoutingAzimuth:
+    """Tests for routing_azimuth()."""
+
+    class _Pt:
+        def __init__(self, x, y):
+            self._x, self._y = x, y
+
+        def x(self):
+            return self._x
+
+        def y(self):
+            return self._y
+
+    @pytest.mark.parametrize("end, expected", [
+        ((0.0, 1.0), 0.0),
+        ((1.0, 0.0), 90.0),
+        ((0.0, -1.0), 180.0),
+        ((-1.0, 0.0), 270.0),
+    ])
+    def test_forward_cardinal_directions(self, end, expected):
+        pts = [self._Pt(0.0, 0.0), self._Pt(0.5, 0.5), self._Pt(*end)]
+        assert routing_azimuth(pts, "forward") == pytest.approx(expected)
+
+    def test_backward_reverses_direction(self):
+        pts = [self._Pt(0.0, 0.0), self._Pt(1.0, 0.0)]
+        assert routing_azimuth(pts, "backward") == pytest.approx(270.0)
+
+    def test_insufficient_vertices_raises(self):
+        with pytest.raises(BRACalculationError, match="insufficient vertices"):
+            routing_azimuth([self._Pt(0.0, 0.0)])
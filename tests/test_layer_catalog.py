@@ -0,0 +1,102 @@
+"""Tests for the layer geometry type catalog."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from qgis.core import QgsLayerTreeNode, QgsWkbTypes
+
+from qBRA.services.layer_catalog import LayerCatalog, iter_tree_layers, resolve_sources, source_geometry_type
+
+
+def _layer(layer_id, wkb_type=QgsWkbTypes.Point):
+    layer = Mock()
+    layer.id.return_value = layer_id
+    layer.wkbType.return_value = wkb_type
+    return layer
+
+
+def _node(layer=None, children=None):
+    node = Mock()
+    node.NodeLayer = QgsLayerTreeNode.NodeLayer
+    node.NodeGroup = QgsLayerTreeNode.NodeGroup
+    node.nodeType.return_value = QgsLayerTreeNode.NodeGroup if children is not None else QgsLayerTreeNode.NodeLayer
+    node.children.return_value = children or []
+    node.layer.return_value = layer
+    return node
+
+
+@pytest.mark.unit
+class TestLayerCatalog:
+    def test_resolves_once(self):
+        catalog = LayerCatalog()
+        layer = _layer("a", QgsWkbTypes.LineString)
+        assert catalog.cached("a") is None
+        assert catalog.geometry_type(layer) == QgsWkbTypes.LineGeometry
+        assert catalog.geometry_type(layer) == QgsWkbTypes.LineGeometry
+        layer.wkbType.assert_called_once()
+        assert catalog.cached("a") == QgsWkbTypes.LineGeometry
+        assert "a" in catalog and len(catalog) == 1
+
+    def test_unknown_lists_uncached_layers(self):
+        catalog = LayerCatalog()
+        a, b = _layer("a"), _layer("b")
+        catalog.geometry_type(a)
+        assert catalog.unknown([a, b]) == [b]
+        b.wkbType.assert_not_called()
+
+    def test_forget_and_clear(self):
+        catalog = LayerCatalog()
+        for layer_id in ("a", "b", "c"):
+            catalog.geometry_type(_layer(layer_id))
+        catalog.forget(["a", "missing"])
+        assert "a" not in catalog and len(catalog) == 2
+        catalog.clear()
+        assert len(catalog) == 0
+
+    def test_store(self):
+        catalog = LayerCatalog()
+        catalog.store("a", QgsWkbTypes.PointGeometry)
+        layer = _layer("a", QgsWkbTypes.Polygon)
+        assert catalog.geometry_type(layer) == QgsWkbTypes.PointGeometry
+        layer.wkbType.assert_not_called()
+
+
+@pytest.mark.unit
+class TestSourceGeometryType:
+    def test_opens_own_provider(self):
+        with patch("qBRA.services.layer_catalog.QgsProviderRegistry") as registry:
+            create = registry.instance.return_value.createProvider
+            create.return_value.isValid.return_value = True
+            create.return_value.wkbType.return_value = QgsWkbTypes.LineString
+            assert source_geometry_type("postgres", "dbname='gis' table=\"rwy\"") == QgsWkbTypes.LineGeometry
+        create.assert_called_once_with("postgres", "dbname='gis' table=\"rwy\"")
+
+    def test_unopenable_source(self):
+        with patch("qBRA.services.layer_catalog.QgsProviderRegistry") as registry:
+            create = registry.instance.return_value.createProvider
+            create.return_value.isValid.return_value = False
+            assert source_geometry_type("ogr", "/missing.gpkg") is None
+            create.return_value = None
+            assert source_geometry_type("ogr", "/missing.gpkg") is None
+
+    def test_resolve_sources_survives_failures(self):
+        sources = [("a", "memory", "Point"), ("b", "ogr", "/broken")]
+        types = {"Point": QgsWkbTypes.PointGeometry}
+
+        def resolve(provider_key, source):
+            if source not in types:
+                raise RuntimeError("provider crashed")
+            return types[source]
+
+        with patch("qBRA.services.layer_catalog.source_geometry_type", side_effect=resolve):
+            assert list(resolve_sources(sources)) == [("a", QgsWkbTypes.PointGeometry), ("b", None)]
+
+
+@pytest.mark.unit
+class TestIterTreeLayers:
+    def test_display_order_with_groups(self):
+        a, b, c = _layer("a"), _layer("b"), _layer("c")
+        root = _node(children=[_node(a), _node(children=[_node(b), _node(None)]), _node(c)])
+        assert list(iter_tree_layers(root)) == [a, b, c]
+        for layer in (a, b, c):
+            layer.wkbType.assert_not_called()
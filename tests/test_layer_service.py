@@ -352,3 +352,30 @@ class TestLayerServiceProjectMethods:
             result = service.find_layer_by_name("Missing")
 
         assert result is None
+
+    def test_get_bra_layers_by_suffix_and_property(self, mock_iface):
+        """get_bra_layers returns suffixed or persistent BRA layers only."""
+        from unittest.mock import patch
+        from qgis.core import QgsWkbTypes
+        directional = self._make_vector_layer("RWY09 - LOC BRA_areas", QgsWkbTypes.Polygon)
+        directional.customProperty.return_value = None
+        omni = self._make_vector_layer("DVOR BRA_omni", QgsWkbTypes.Polygon)
+        omni.customProperty.return_value = None
+        persistent = self._make_vector_layer("My BRAs", QgsWkbTypes.Polygon)
+        persistent.customProperty.return_value = "directional"
+        footprint = self._make_vector_layer("BRA_areas footprint", QgsWkbTypes.Polygon)
+        footprint.customProperty.return_value = "directional_footprint"
+        other = self._make_vector_layer("Parcels", QgsWkbTypes.Polygon)
+        other.customProperty.return_value = None
+
+        with patch("qBRA.services.layer_service.QgsProject") as mock_proj_cls:
+            mock_root = Mock()
+            mock_root.children.return_value = [
+                self._make_node(layer) for layer in (directional, omni, persistent, footprint, other)
+            ]
+            mock_proj_cls.instance.return_value.layerTreeRoot.return_value = mock_root
+
+            service = LayerService(mock_iface)
+            result = service.get_bra_layers()
+
+        assert result == [directional, omni, persistent]
@@ -0,0 +1,170 @@
+"""Tests for LinkRegistry and linked-mode parameter refresh.
+
+Pure bookkeeping tests — no Qt signals or QGIS layers involved.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from qBRA.constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from qBRA.exceptions import BRACalculationError
+from qBRA.models.linked_bra import LinkedBRA
+from qBRA.services.link_service import LinkRegistry, refresh_directional_params
+
+
+class _Pt:
+    def __init__(self, x, y):
+        self._x, self._y = x, y
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+
+def _directional(fid=1, key="LOC", routing_fid=10):
+    return LinkedBRA(
+        kind=OUTPUT_KIND_DIRECTIONAL,
+        params=Mock(),
+        navaid_layer_id="nav",
+        navaid_fid=fid,
+        facility_key=key,
+        routing_layer_id="rwy",
+        routing_fid=routing_fid,
+    )
+
+
+def _omni(fid=1, key="OMNI_DVOR"):
+    return LinkedBRA(kind=OUTPUT_KIND_OMNI, params={}, navaid_layer_id="nav", navaid_fid=fid, facility_key=key)
+
+
+@pytest.mark.unit
+class TestLinkRegistry:
+    def test_register_and_len(self):
+        reg = LinkRegistry()
+        reg.register(_directional())
+        reg.register(_omni(fid=2))
+        assert len(reg) == 2
+        assert ("nav", 1, "LOC") in reg
+        assert reg.layer_ids() == {"nav", "rwy"}
+
+    def test_register_replaces_same_key(self):
+        reg = LinkRegistry()
+        reg.register(_directional(routing_fid=10))
+        reg.register(_directional(routing_fid=11))
+        assert len(reg) == 1
+        assert reg.mark_dirty("rwy", 10) is False
+        assert reg.mark_dirty("rwy", 11) is True
+
+    def test_mark_dirty_unknown_source(self):
+        reg = LinkRegistry()
+        reg.register(_directional())
+        assert reg.mark_dirty("nav", 99) is False
+        assert reg.has_dirty() is False
+
+    def test_routing_edit_dirties_all_dependents(self):
+        reg = LinkRegistry()
+        reg.register(_directional(fid=1, key="LOC"))
+        reg.register(_directional(fid=2, key="GP"))
+        reg.register(_directional(fid=3, key="DME", routing_fid=20))
+        assert reg.mark_dirty("rwy", 10) is True
+        assert {link.navaid_fid for link in reg.take_dirty()} == {1, 2}
+
+    def test_repeated_edits_are_coalesced(self):
+        reg = LinkRegistry()
+        reg.register(_directional())
+        for _ in range(5):
+            reg.mark_dirty("nav", 1)
+            reg.mark_dirty("rwy", 10)
+        dirty = reg.take_dirty()
+        assert len(dirty) == 1
+        assert reg.take_dirty() == []
+
+    def test_unregister_clears_dirty_and_index(self):
+        reg = LinkRegistry()
+        link = _directional()
+        reg.register(link)
+        reg.mark_dirty("nav", 1)
+        reg.unregister(link.key)
+        assert len(reg) == 0
+        assert reg.has_dirty() is False
+        assert reg.layer_ids() == set()
+        reg.unregister(link.key)  # unknown key is ignored
+
+    def test_drop_source(self):
+        reg = LinkRegistry()
+        reg.register(_directional(fid=1))
+        reg.register(_directional(fid=2, routing_fid=20))
+        removed = reg.drop_source("rwy", 10)
+        assert [link.navaid_fid for link in removed] == [1]
+        assert len(reg) == 1
+
+    def test_drop_layer(self):
+        reg = LinkRegistry()
+        reg.register(_directional(fid=1))
+        reg.register(_omni(fid=2))
+        removed = reg.drop_layer("rwy")
+        assert [link.navaid_fid for link in removed] == [1]
+        assert len(reg) == 1
+        assert reg.layer_ids() == {"nav"}
+
+
+@pytest.mark.unit
+class TestLinkedBRA:
+    def test_sources_directional(self):
+        assert _directional().sources() == (("nav", 1), ("rwy", 10))
+
+    def test_sources_omni(self):
+        assert _omni().sources() == (("nav", 1),)
+
+    def test_requires_routing_pair(self):
+        with pytest.raises(ValueError, match="together"):
+            LinkedBRA(kind=OUTPUT_KIND_DIRECTIONAL, params=Mock(), navaid_layer_id="nav",
+                      navaid_fid=1, facility_key="LOC", routing_layer_id="rwy")
+
+    def test_requires_facility_key(self):
+        with pytest.raises(ValueError, match="facility_key"):
+            LinkedBRA(kind=OUTPUT_KIND_OMNI, params={}, navaid_layer_id="nav", navaid_fid=1, facility_key="")
+
+    def test_requires_navaid_layer(self):
+        with pytest.raises(ValueError, match="navaid_layer_id"):
+            LinkedBRA(kind=OUTPUT_KIND_OMNI, params={}, navaid_layer_id="", navaid_fid=1, facility_key="X")
+
+    def test_with_params_keeps_identity(self):
+        link = _omni()
+        refreshed = link.with_params({"omni_r": 1})
+        assert refreshed.key == link.key
+        assert refreshed.params == {"omni_r": 1}
+
+
+@pytest.mark.unit
+class TestRefreshDirectionalParams:
+    def test_threshold_dependent_facility_updates_a_and_r(self, sample_bra_parameters):
+        # LOC: a depends on threshold, r = a + 6000
+        pts = [_Pt(0.0, 3000.0), _Pt(0.0, 6000.0)]
+        result = refresh_directional_params(sample_bra_parameters, _Pt(0.0, 0.0), pts)
+        assert result.azimuth == pytest.approx(0.0)
+        assert result.a == pytest.approx(3000.0)
+        assert result.r == pytest.approx(9000.0)
+        assert result.b == sample_bra_parameters.b
+
+    def test_backward_direction_uses_end_vertex(self, sample_bra_parameters):
+        from dataclasses import replace
+        params = replace(sample_bra_parameters, direction="backward")
+        pts = [_Pt(0.0, 1000.0), _Pt(4000.0, 1000.0)]
+        result = refresh_directional_params(params, _Pt(4000.0, 0.0), pts)
+        assert result.azimuth == pytest.approx(270.0)
+        assert result.a == pytest.approx(1000.0)
+
+    def test_fixed_a_facility_keeps_a_and_r(self, sample_bra_parameters):
+        from dataclasses import replace
+        params = replace(sample_bra_parameters, facility_key="GP", a=800.0, r=6000.0)
+        pts = [_Pt(0.0, 0.0), _Pt(1000.0, 0.0)]
+        result = refresh_directional_params(params, _Pt(50.0, 50.0), pts)
+        assert result.azimuth == pytest.approx(90.0)
+        assert (result.a, result.r) == (800.0, 6000.0)
+
+    def test_raises_for_degenerate_routing(self, sample_bra_parameters):
+        with pytest.raises(BRACalculationError):
+            refresh_directional_params(sample_bra_parameters, _Pt(0, 0), [_Pt(0, 0)])
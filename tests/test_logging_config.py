@@ -4,10 +4,17 @@ import logging
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
+import queue
+import threading
+
+from qBRA.utils import logging_config
 from qBRA.utils.logging_config import (
+    BatchQueueListener,
     QGISLogHandler,
     setup_logger,
     get_logger,
+    start_queue_logging,
+    stop_queue_logging,
     PLUGIN_NAME,
     QGIS_AVAILABLE,
 )
@@ -236,3 +243,93 @@ class TestLoggingIntegration:
         assert "Exception occurred" in output
         assert "ValueError: Test exception" in output
         assert "Traceback" in output
+
+
+
+def _record(msg, level=logging.INFO, args=()):
+    return logging.LogRecord("qBRA.test", level, "", 0, msg, args, None)
+
+
+@pytest.mark.skipif(not QGIS_AVAILABLE, reason="QGIS not available")
+class TestQueueLogging:
+    """Test the queue/listener pipeline to the QGIS log."""
+
+    @patch("qBRA.utils.logging_config.QgsMessageLog")
+    def test_emit_batch_groups_runs_of_equal_level(self, mock_qgs_log):
+        """Consecutive records of one QGIS level become one log entry."""
+        handler = QGISLogHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.emit_batch([
+            _record("a"), _record("b", logging.DEBUG), _record("c", logging.WARNING), _record("d"),
+        ])
+        messages = [c.args[0] for c in mock_qgs_log.logMessage.call_args_list]
+        assert messages == ["a\nb", "c", "d"]
+
+    @patch("qBRA.utils.logging_config.QgsMessageLog")
+    def test_listener_forwards_in_batches(self, mock_qgs_log):
+        """Records queued while the listener is busy are forwarded together."""
+        log_queue = queue.Queue()
+        handler = QGISLogHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        for i in range(5):
+            log_queue.put(_record(f"m{i}"))
+        listener = BatchQueueListener(log_queue, handler, batch_size=3)
+        listener.start()
+        listener.stop()
+        messages = [c.args[0] for c in mock_qgs_log.logMessage.call_args_list]
+        assert messages == ["m0\nm1\nm2", "m3\nm4"]
+
+    def test_listener_plain_handlers_get_records(self):
+        """Handlers without emit_batch receive each record, honouring their level."""
+        log_queue = queue.Queue()
+        received = []
+        handler = logging.Handler(level=logging.WARNING)
+        handler.emit = received.append
+        log_queue.put(_record("info"))
+        log_queue.put(_record("warn", logging.WARNING))
+        listener = BatchQueueListener(log_queue, handler)
+        listener.start()
+        listener.stop()
+        assert [r.msg for r in received] == ["warn"]
+
+    def test_logger_enqueues_merged_records_from_threads(self):
+        """QGIS loggers enqueue records with merged arguments and rendered tracebacks."""
+        logger = setup_logger("qBRA.test.queued")
+        stop_queue_logging()
+        try:
+            assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+            payload = ["before"]
+
+            def work():
+                logger.info("payload %s", payload)
+                try:
+                    raise ValueError("boom")
+                except ValueError:
+                    logger.error("failed", exc_info=True)
+
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+            payload.append("after")
+            first = logging_config._log_queue.get_nowait()
+            second = logging_config._log_queue.get_nowait()
+            assert first.getMessage() == "payload ['before']" and first.args is None
+            assert second.exc_info is None and "ValueError: boom" in second.exc_text
+        finally:
+            start_queue_logging()
+
+    @patch("qBRA.utils.logging_config.QgsMessageLog")
+    def test_stop_flushes_pending_records(self, mock_qgs_log):
+        """Stopping the shared listener forwards what is still queued."""
+        logger = setup_logger("qBRA.test.flush")
+        stop_queue_logging()
+        logger.warning("pending")
+        start_queue_logging()
+        stop_queue_logging()
+        start_queue_logging()
+        messages = [c.args[0] for c in mock_qgs_log.logMessage.call_args_list]
+        assert any(m.endswith("qBRA.test.flush - WARNING - pending") for m in messages)
+
+    def test_start_is_idempotent(self):
+        """Starting twice returns the running listener."""
+        assert start_queue_logging() is start_queue_logging()
@@ -0,0 +1,111 @@
+"""Tests for the two-phase (compute / materialise) BRA pipeline."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from qBRA.constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from qBRA.models.layer_data import BRALayerData
+from qBRA.modules.ils_llz_logic import materialise_layer, omni_layer_data
+from qBRA.services.materialise_service import MaterialiseQueue
+
+
+def _data(count, kind=OUTPUT_KIND_OMNI, name="N"):
+    extra = ("10",) if kind == OUTPUT_KIND_DIRECTIONAL else ()
+    surfaces = tuple(((i + 1, f"area{i}", *extra), b"wkb%d" % i) for i in range(count))
+    return BRALayerData(kind, name, "EPSG:32633", ("N", "1", "2", "3", "0", "0", "NDB"), surfaces)
+
+
+def _layer_factory():
+    layers = []
+
+    def make(*_args):
+        layer = Mock()
+        layer.dataProvider.return_value.addFeatures.return_value = (True, [])
+        layers.append(layer)
+        return layer
+
+    return layers, make
+
+
+@pytest.fixture
+def layers():
+    created, make = _layer_factory()
+    with patch("qBRA.modules.ils_llz_logic.QgsVectorLayer", side_effect=make):
+        yield created
+
+
+def _added(layer):
+    return [len(c.args[0]) for c in layer.dataProvider.return_value.addFeatures.call_args_list]
+
+
+@pytest.mark.unit
+class TestLayerData:
+    def test_rejects_unknown_kind(self):
+        with pytest.raises(ValueError, match="Unknown output kind"):
+            BRALayerData("footprint", "x", "EPSG:4326", (), ())
+
+    def test_omni_compute_phase_creates_no_layer(self):
+        feat = Mock()
+        feat.geometry.return_value.asPoint.return_value.x.return_value = 1000.0
+        feat.geometry.return_value.asPoint.return_value.y.return_value = 2000.0
+        layer = Mock()
+        layer.selectedFeatures.return_value = [feat]
+        iface = Mock()
+        iface.mapCanvas.return_value.mapSettings.return_value.destinationCrs.return_value.authid.return_value = "EPSG:32633"
+        with patch("qBRA.modules.ils_llz_logic.QgsVectorLayer") as vector_layer:
+            data = omni_layer_data(iface, {
+                "active_layer": layer, "omni_r": 300, "omni_alpha": 1.0, "omni_R": 3000, "display_name": "VOR",
+            })
+        vector_layer.assert_not_called()
+        assert data.kind == OUTPUT_KIND_OMNI and data.crs_authid == "EPSG:32633"
+        assert data.name.startswith("VOR ")
+        assert [leading for leading, _wkb in data.surfaces] == [(1, "inner cylinder top"), (2, "cone mantle")]
+        assert all(isinstance(wkb, bytes) for _leading, wkb in data.surfaces)
+
+    def test_materialise_layer(self, layers):
+        data = _data(3, OUTPUT_KIND_DIRECTIONAL)
+        layer = materialise_layer(data)
+        assert layer is layers[0]
+        (features,), _kw = layer.dataProvider.return_value.addFeatures.call_args
+        assert [f.attributes()[:3] for f in features] == [[1, "area0", "10"], [2, "area1", "10"], [3, "area2", "10"]]
+        assert features[0].attributes()[3:] == list(data.shared)
+        layer.renderer.return_value.symbol.return_value.setOpacity.assert_called_once_with(0.5)
+
+
+@pytest.mark.unit
+class TestMaterialiseQueue:
+    def test_chunks_and_callbacks_in_order(self, layers):
+        queue = MaterialiseQueue(chunk=2)
+        done = []
+        queue.submit([("a", _data(5)), ("b", _data(1))], done.append)
+        queue.submit([("c", _data(2))], done.append)
+        assert len(queue) == 2
+        assert queue.step(budget=10.0) is False
+        assert [[tag for tag, _layer in results] for results in done] == [["a", "b"], ["c"]]
+        assert [_added(layer) for layer in layers] == [[2, 2, 1], [1], [2]]
+        assert done[0][0][1] is layers[0]
+        for layer in layers:
+            layer.updateExtents.assert_called_once()
+
+    def test_zero_budget_yields_after_each_chunk(self, layers):
+        queue = MaterialiseQueue(chunk=2)
+        done = []
+        queue.submit([("a", _data(5))], done.append)
+        steps = 1
+        while queue.step(budget=0.0):
+            steps += 1
+            assert not done
+        assert steps == 3 and len(done) == 1
+        assert _added(layers[0]) == [2, 2, 1]
+
+    def test_empty_submission_and_clear(self, layers):
+        queue = MaterialiseQueue()
+        done = []
+        queue.submit([], done.append)
+        queue.submit([("x", _data(0))], done.append)
+        assert queue.step(budget=1.0) is False
+        assert done[0] == [] and done[1][0][0] == "x" and _added(layers[0]) == []
+        queue.submit([("y", _data(1))], done.append)
+        queue.clear()
+        assert len(queue) == 0 and queue.step(budget=1.0) is False and len(done) == 2
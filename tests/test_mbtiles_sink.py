@@ -0,0 +1,293 @@
+"""Tests for vector-tile encoding and the MBTiles sink."""
+
+import gzip
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from qBRA.cli import main
+from qBRA.constants import NAVAID_FID_FIELD, OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI, PERSISTENT_LAYER_PROPERTY
+from qBRA.exceptions import BRAValidationError
+from qBRA.modules import vector_tiles
+from qBRA.modules.vector_tiles import (
+    encode_tile,
+    lonlat_to_mercator,
+    mercator_to_lonlat,
+    tile_bounds,
+    tile_polygon,
+    tile_range,
+)
+from qBRA.services import mbtiles_sink
+from qBRA.services.mbtiles_sink import MBTilesSink, is_mbtiles_path
+from qBRA.services.tile_export_service import feature_properties, layer_kind
+
+
+def _varint(data, pos):
+    shift = result = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, pos
+
+
+def _fields(data):
+    """Minimal protobuf reader: yields (field, wire_type, value)."""
+    pos = 0
+    while pos < len(data):
+        key, pos = _varint(data, pos)
+        field, wire = key >> 3, key & 7
+        if wire == 0:
+            value, pos = _varint(data, pos)
+        elif wire == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        else:
+            size, pos = _varint(data, pos)
+            value, pos = data[pos:pos + size], pos + size
+        yield field, wire, value
+
+
+def _packed(data):
+    pos, out = 0, []
+    while pos < len(data):
+        value, pos = _varint(data, pos)
+        out.append(value)
+    return out
+
+
+def _unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def decode_tile(data):
+    """Decode a tile into {layer: {"extent", "features": [(properties, rings)]}}."""
+    layers = {}
+    for _f, _w, layer_data in _fields(data):
+        name, keys, values, raw, extent = None, [], [], [], None
+        for field, _wire, value in _fields(layer_data):
+            if field == 1:
+                name = value.decode()
+            elif field == 2:
+                raw.append(value)
+            elif field == 3:
+                keys.append(value.decode())
+            elif field == 4:
+                (vfield, _vw, v), = _fields(value)
+                values.append(v.decode() if vfield == 1 else
+                              float(np.frombuffer(v, "<f8")[0]) if vfield == 3 else
+                              _unzigzag(v) if vfield == 6 else v)
+            elif field == 5:
+                extent = value
+        features = []
+        for feature in raw:
+            tags, commands = [], []
+            for field, _wire, value in _fields(feature):
+                if field == 2:
+                    tags = _packed(value)
+                elif field == 4:
+                    commands = _packed(value)
+            properties = {keys[tags[i]]: values[tags[i + 1]] for i in range(0, len(tags), 2)}
+            rings, ring, cx, cy, i = [], [], 0, 0, 0
+            while i < len(commands):
+                command, count = commands[i] & 7, commands[i] >> 3
+                i += 1
+                if command == 7:
+                    rings.append(np.array(ring))
+                    ring = []
+                    continue
+                for _ in range(count):
+                    cx += _unzigzag(commands[i])
+                    cy += _unzigzag(commands[i + 1])
+                    ring.append((cx, cy))
+                    i += 2
+            features.append((properties, rings))
+        layers[name] = {"extent": extent, "features": features}
+    return layers
+
+
+def _square(cx, cy, half):
+    return np.array([[cx - half, cy - half], [cx + half, cy - half], [cx + half, cy + half],
+                     [cx - half, cy + half], [cx - half, cy - half]])
+
+
+def _tiles(path):
+    with sqlite3.connect(str(path)) as conn:
+        return {(z, x, y): data for z, x, y, data in conn.execute("SELECT * FROM tiles")}
+
+
+def _write(path, features, **kwargs):
+    kwargs.setdefault("minzoom", 8)
+    kwargs.setdefault("maxzoom", 10)
+    with MBTilesSink(str(path), "EPSG:3857", **kwargs) as sink:
+        for rings, properties, kind in features:
+            sink.write(rings, properties, kind)
+    return sink.stats
+
+
+def _navaid(navaid_id, cx, cy, half=2000.0, kind=OUTPUT_KIND_DIRECTIONAL, **extra):
+    properties = {"navaid_id": navaid_id, "facility_key": "LOC", "area": "base", "type": "LOC", **extra}
+    return [_square(cx, cy, half)], properties, kind
+
+
+@pytest.mark.unit
+class TestVectorTiles:
+    def test_tile_grid(self):
+        assert tile_bounds(0, 0, 0) == pytest.approx((-vector_tiles.ORIGIN_SHIFT, -vector_tiles.ORIGIN_SHIFT,
+                                                      vector_tiles.ORIGIN_SHIFT, vector_tiles.ORIGIN_SHIFT))
+        # Rows are counted from the north
+        assert tile_range((10.0, 10.0, 20.0, 20.0), 1) == (1, 0, 1, 0)
+        assert tile_range((-10.0, -10.0, 10.0, 10.0), 1) == (0, 0, 1, 1)
+        xy = lonlat_to_mercator([[10.0, 45.0, 99.0]])
+        assert xy.shape == (1, 2)
+        assert mercator_to_lonlat(*xy[0]) == pytest.approx((10.0, 45.0))
+
+    def test_clip_and_winding(self):
+        xmin, ymin, xmax, ymax = tile_bounds(10, 512, 511)
+        size = xmax - xmin
+        # Overlaps the tile's south-west corner; hole fully inside the tile
+        outer = _square(xmin, ymin, size / 4)
+        hole = _square(xmin + size / 8, ymin + size / 8, size / 32)
+        rings = tile_polygon([outer, hole], 10, 512, 511, extent=4096, buffer=64)
+        assert len(rings) == 2
+        exterior, interior = rings
+        assert exterior[:, 0].min() == -64 and exterior[:, 1].max() == 4096 + 64
+        assert vector_tiles._signed_area(exterior) > 0 > vector_tiles._signed_area(interior)
+        # Far away: nothing survives
+        assert tile_polygon([_square(xmax * 10, ymax * 10, 1.0)], 10, 512, 511) == []
+
+    def test_simplification_per_zoom(self):
+        angles = np.linspace(0.0, 2 * np.pi, 721)
+        circle = np.column_stack([1000.0 * np.cos(angles), 1000.0 * np.sin(angles)])
+        coarse = tile_polygon([circle], 8, 128, 127, tolerance=2.0)
+        fine = tile_polygon([circle], 14, 8192, 8191, tolerance=2.0)
+        assert 0 < len(coarse[0]) < 10 < len(fine[0])
+        # Collapses to nothing at low zoom
+        assert tile_polygon([_square(1.0, 1.0, 5.0)], 2, 2, 1) == []
+
+    def test_encode_round_trip(self):
+        ring = np.array([[0, 0], [10, 0], [10, 10], [0, 10]])
+        data = encode_tile({
+            "bra_directional": [([ring], {"navaid_id": "A", "count": 3, "height": 1.5, "skip": None})],
+            "bra_omni": [],
+        })
+        layers = decode_tile(data)
+        assert list(layers) == ["bra_directional"]
+        (properties, rings), = layers["bra_directional"]["features"]
+        assert properties == {"navaid_id": "A", "count": 3, "height": 1.5}
+        assert rings[0].tolist() == ring.tolist()
+        assert layers["bra_directional"]["extent"] == 4096
+
+
+@pytest.mark.unit
+class TestMBTilesSink:
+    def test_pyramid_and_metadata(self, tmp_path):
+        path = tmp_path / "bra.mbtiles"
+        stats = _write(path, [_navaid("A", 0.0, 0.0), _navaid("B", 1000.0, 0.0, kind=OUTPUT_KIND_OMNI, r=1.0)])
+        assert stats.navaids == 2 and stats.changed == 2 and stats.full_rebuild
+        tiles = _tiles(path)
+        assert stats.tiles_written == len(tiles) and {z for z, _x, _y in tiles} == {8, 9, 10}
+        with sqlite3.connect(str(path)) as conn:
+            metadata = dict(conn.execute("SELECT * FROM metadata"))
+        assert metadata["format"] == "pbf" and metadata["minzoom"] == "8" and "bra_omni" in metadata["json"]
+        # TMS rows: tile (10, 512, 511) in XYZ lies north-east of the origin
+        layers = decode_tile(gzip.decompress(tiles[(10, 512, 1023 - 511)]))
+        assert set(layers) == {"bra_directional", "bra_omni"}
+
+    def test_attributes_pruned_below_detail_zoom(self, tmp_path):
+        path = tmp_path / "bra.mbtiles"
+        _write(path, [_navaid("A", 0.0, 0.0, extra_field=5)], detail_zoom=10)
+        tiles = _tiles(path)
+        coarse = decode_tile(gzip.decompress(tiles[(9, 256, 511 - 255)]))["bra_directional"]["features"][0][0]
+        detail = decode_tile(gzip.decompress(tiles[(10, 512, 1023 - 511)]))["bra_directional"]["features"][0][0]
+        assert "extra_field" not in coarse and coarse["navaid_id"] == "A"
+        assert detail["extra_field"] == 5
+
+    def test_incremental_rebuild(self, tmp_path):
+        path = tmp_path / "bra.mbtiles"
+        far = 2_000_000.0
+        features = [_navaid("A", 0.0, 0.0), _navaid("B", far, far)]
+        _write(path, features)
+        before = _tiles(path)
+
+        unchanged = _write(path, features)
+        assert (unchanged.changed, unchanged.tiles_written, unchanged.full_rebuild) == (0, 0, False)
+
+        moved = _write(path, [_navaid("A", 0.0, 0.0), _navaid("B", far + 500.0, far)])
+        after = _tiles(path)
+        assert moved.changed == 1 and 0 < moved.tiles_written < len(before)
+        near_a = [key for key in before if key[0] == 10 and key[1] in (511, 512)]
+        assert near_a and all(after[key] == before[key] for key in near_a)
+
+        removed = _write(path, [_navaid("A", 0.0, 0.0)])
+        assert removed.changed == 1 and removed.tiles_deleted > 0 and removed.tiles_written == 0
+        assert len(_tiles(path)) == sum(1 for key in before if key[1] in (255, 256, 511, 512, 127, 128))
+
+    def test_settings_change_rebuilds_everything(self, tmp_path):
+        path = tmp_path / "bra.mbtiles"
+        _write(path, [_navaid("A", 0.0, 0.0)])
+        stats = _write(path, [_navaid("A", 0.0, 0.0)], maxzoom=9)
+        assert stats.full_rebuild and {z for z, _x, _y in _tiles(path)} == {8, 9}
+
+    def test_lonlat_input(self, tmp_path):
+        path = tmp_path / "bra.mbtiles"
+        ring = np.array([[10.0, 45.0], [10.02, 45.0], [10.02, 45.02], [10.0, 45.02], [10.0, 45.0]])
+        with MBTilesSink(str(path), "EPSG:4326", 10, 10) as sink:
+            sink.write([ring], {"navaid_id": 1, "facility_key": "DME"}, OUTPUT_KIND_DIRECTIONAL)
+        x0, y0, _x1, _y1 = tile_range(lonlat_to_mercator(ring).min(axis=0).tolist() * 2, 10)
+        assert (10, x0, 1023 - y0) in _tiles(path)
+
+    def test_parallel_encoding_matches_serial(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(mbtiles_sink, "MBTILES_TASK_TILES", 4)
+        features = [_navaid(str(i), i * 30_000.0, 0.0) for i in range(3)]
+        _write(tmp_path / "serial.mbtiles", features)
+        _write(tmp_path / "parallel.mbtiles", features, workers=2)
+        assert _tiles(tmp_path / "serial.mbtiles") == _tiles(tmp_path / "parallel.mbtiles")
+
+    @pytest.mark.parametrize("crs, zooms", [("EPSG:32633", (8, 10)), (None, (8, 10)), ("EPSG:3857", (10, 8))])
+    def test_validation(self, tmp_path, crs, zooms):
+        with pytest.raises(BRAValidationError):
+            MBTilesSink(str(tmp_path / "x.mbtiles"), crs, *zooms)
+
+    def test_is_mbtiles_path(self):
+        assert is_mbtiles_path("out/BRA.MBTiles") and not is_mbtiles_path("bra.geojson")
+
+
+@pytest.mark.unit
+class TestTileExport:
+    def test_layer_kind(self):
+        layer = MagicMock()
+        layer.customProperty.return_value = OUTPUT_KIND_OMNI
+        assert layer_kind(layer) == OUTPUT_KIND_OMNI
+        layer.customProperty.return_value = None
+        layer.name.return_value = "VOR_BRA_omni"
+        assert layer_kind(layer) == OUTPUT_KIND_OMNI
+        layer.name.return_value = "LOC_BRA_areas"
+        assert layer_kind(layer) == OUTPUT_KIND_DIRECTIONAL
+        layer.customProperty.assert_called_with(PERSISTENT_LAYER_PROPERTY)
+
+    def test_feature_properties(self):
+        null = SimpleNamespace(isNull=lambda: True)
+        properties = feature_properties("BRA", ["type", NAVAID_FID_FIELD, "remark"], ["LOC", 7, null])
+        assert properties["navaid_id"] == "BRA:7" and properties["facility_key"] == "LOC"
+        assert properties["remark"] is None
+        assert feature_properties("L1", ["type"], ["DME"])["navaid_id"] == "L1"
+
+
+@pytest.mark.unit
+def test_cli_mbtiles(tmp_path, capsys):
+    navaids = tmp_path / "navaids.csv"
+    navaids.write_text("id,facility,azimuth,x,y,site_elev\n1,LOC,90,1000000,5000000,10\n2,OMNI_NDB,,1020000,5000000,0\n")
+    output = tmp_path / "bra.mbtiles"
+    args = [str(navaids), "-o", str(output), "--crs", "EPSG:3857", "--min-zoom", "9", "--max-zoom", "11"]
+    assert main(args) == 0
+    tiles = _tiles(output)
+    assert tiles and {z for z, _x, _y in tiles} == {9, 10, 11}
+    assert main(args) == 0
+    assert len(_tiles(output)) == len(tiles)
+    assert main([str(navaids), "-o", str(output), "--crs", "EPSG:32633"]) == 1
+    assert "Web Mercator" in capsys.readouterr().err
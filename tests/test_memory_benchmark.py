@@ -0,0 +1,61 @@
+"""Tests for the peak-memory benchmark harness."""
+
+import io
+import json
+
+import pytest
+
+from benchmarks.memory_benchmark import (
+    HEADLESS_STAGES,
+    baseline_thresholds,
+    check_thresholds,
+    main,
+    run_benchmark,
+)
+
+
+@pytest.mark.unit
+class TestMemoryBenchmark:
+    def test_report(self):
+        report = run_benchmark(20, HEADLESS_STAGES + ("build_layers_omni",), top=3)
+        stages = {s["name"]: s for s in report["stages"]}
+        assert set(stages) == set(HEADLESS_STAGES) | {"build_layers_omni"}
+        for name in HEADLESS_STAGES:
+            assert stages[name]["tracemalloc_peak_bytes"] > 0
+            assert stages[name]["bytes_per_navaid"] == pytest.approx(stages[name]["tracemalloc_peak_bytes"] / 20, abs=0.1)
+            assert 0 < len(stages[name]["top_allocations"]) <= 3
+        # The test environment only has a mocked QGIS, which does not count as QGIS here
+        assert stages["build_layers_omni"]["skipped"] == "QGIS not available"
+
+    def test_unknown_stage(self):
+        with pytest.raises(ValueError):
+            run_benchmark(5, ("nope",))
+
+    def test_thresholds(self):
+        report = {"navaids": 10, "stages": [
+            {"name": "a", "bytes_per_navaid": 100.0, "rss_bytes_per_navaid": 50.0, "skipped": None},
+            {"name": "b", "bytes_per_navaid": 100.0, "rss_bytes_per_navaid": None, "skipped": None},
+            {"name": "c", "bytes_per_navaid": 0.0, "rss_bytes_per_navaid": None, "skipped": "QGIS not available"},
+        ]}
+        thresholds = {"a": {"max_bytes_per_navaid": 150, "max_rss_bytes_per_navaid": 40},
+                      "b": {"max_bytes_per_navaid": 90}, "c": {"max_bytes_per_navaid": 1}}
+        failures = check_thresholds(report, thresholds)
+        assert len(failures) == 2
+        assert failures[0].startswith("a: rss_bytes_per_navaid")
+        assert baseline_thresholds(report, 2.0) == {"navaids": 10, "stages": {
+            "a": {"max_bytes_per_navaid": 200, "max_rss_bytes_per_navaid": 100},
+            "b": {"max_bytes_per_navaid": 200},
+        }}
+
+    def test_main_writes_report_and_fails_on_threshold(self, tmp_path):
+        thresholds = tmp_path / "thresholds.json"
+        thresholds.write_text(json.dumps({"stages": {"kernel_omni": {"max_bytes_per_navaid": 1}}}))
+        report_path = tmp_path / "report.json"
+        out = io.StringIO()
+        status = main(["--navaids", "10", "--stage", "kernel_omni", "--thresholds", str(thresholds),
+                       "--report", str(report_path), "--write-thresholds", str(tmp_path / "new.json")], out)
+        assert status == 1
+        report = json.loads(report_path.read_text())
+        assert report["passed"] is False and report["failures"]
+        assert "FAIL kernel_omni" in out.getvalue()
+        assert "kernel_omni" in json.loads((tmp_path / "new.json").read_text())["stages"]
@@ -0,0 +1,178 @@
+"""Tests for BRA mesh triangulation and the glTF/OBJ sink."""
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from qBRA.cli import main
+from qBRA.constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from qBRA.exceptions import BRAError
+from qBRA.modules.kernel import omni_columns, omni_rings, omni_vertices
+from qBRA.modules.mesh import MeshBuilder, covers, mesh_height, plan_frames, plan_triangles, triangulate
+from qBRA.services.mesh_sink import MeshSink, gltf_document, is_mesh_path
+
+NAVAIDS = (
+    "id,facility,runway,x,y,site_elev\n"
+    "1,LOC,09,500000,5000000,10\n"
+    "2,OMNI_CVOR,,505000,5005000,20\n"
+)
+RUNWAYS = "runway,start_x,start_y,end_x,end_y\n09,500000,5001000,500000,5004000\n"
+
+
+def _area(vertices, triangles):
+    a, b, c = (vertices[triangles[:, k]] for k in range(3))
+    return 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1).sum()
+
+
+def _read_glb(path):
+    data = path.read_bytes()
+    magic, version, length = struct.unpack_from("<III", data)
+    assert (magic, version, length) == (0x46546C67, 2, len(data))
+    json_length, _kind = struct.unpack_from("<II", data, 12)
+    document = json.loads(data[20:20 + json_length])
+    bin_length, _kind = struct.unpack_from("<II", data, 20 + json_length)
+    return document, data[28 + json_length:28 + json_length + bin_length]
+
+
+@pytest.mark.unit
+class TestTriangulate:
+    def test_square(self):
+        ring = np.array([[0, 0, 5], [10, 0, 5], [10, 10, 5], [0, 10, 5], [0, 0, 5]], dtype=float)
+        vertices, triangles = triangulate([ring])
+        assert len(vertices) == 4 and triangles.shape == (2, 3)
+        assert _area(vertices, triangles) == pytest.approx(100.0)
+
+    def test_vertical_wall(self):
+        ring = np.array([[0, 0, 0], [0, 0, 20], [30, 0, 20], [30, 0, 0], [0, 0, 0]], dtype=float)
+        vertices, triangles = triangulate([ring])
+        assert _area(vertices, triangles) == pytest.approx(600.0)
+
+    def test_zero_height_wall_has_no_triangles(self):
+        ring = np.array([[0, 0, 0], [0, 0, 0], [30, 0, 0], [30, 0, 0], [0, 0, 0]], dtype=float)
+        assert len(triangulate([ring])[1]) == 0
+
+    def test_concave_ring_is_ear_clipped(self):
+        ring = np.array([[0, 0, 0], [4, 0, 0], [4, 4, 0], [2, 1, 0], [0, 4, 0], [0, 0, 0]], dtype=float)
+        vertices, triangles = triangulate([ring])
+        assert triangles.shape == (3, 3)
+        assert _area(vertices, triangles) == pytest.approx(10.0)
+
+    def test_cone_mantle_strip(self):
+        columns = omni_columns([(0.0, 0.0, 0.0, 100.0, 1.0, 1000.0, 0.0, 0.0, 0.0)])
+        mantle = omni_rings(omni_vertices(columns, 32)[0], 32)[1]
+        vertices, triangles = triangulate(mantle)
+        assert len(vertices) == 64 and len(triangles) == 64
+        flat = 16 * np.sin(2 * np.pi / 32) * (1000.0 ** 2 - 100.0 ** 2)
+        assert flat < _area(vertices, triangles) < flat * 1.001
+
+    def test_unsupported_holes(self):
+        ring = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 0]], dtype=float)
+        with pytest.raises(BRAError):
+            triangulate([ring, ring, ring])
+        with pytest.raises(BRAError):
+            triangulate([ring, np.vstack([ring[:2], ring])])
+
+
+@pytest.mark.unit
+class TestPlanHelpers:
+    # Square rising from z=0 at x=0 to z=10 at x=10, plus a vertical wall
+    SLOPE = np.array([[0, 0, 0], [10, 0, 10], [10, 10, 10], [0, 10, 0], [0, 0, 0]], dtype=float)
+    WALL = np.array([[0, 0, 0], [10, 0, 0], [10, 0, 5], [0, 0, 5], [0, 0, 0]], dtype=float)
+
+    def test_plan_triangles_drop_walls_and_nan(self):
+        nan = np.full((4, 3), np.nan)
+        tri = plan_triangles([[self.SLOPE], [self.WALL], [nan]])
+        assert tri.shape == (2, 3, 3)
+
+    def test_frames_give_barycentric_heights(self):
+        origin, inverse, gradient = plan_frames(plan_triangles([[self.SLOPE]]))
+        weights = np.einsum("tij,tj->ti", inverse, np.array([2.5, 5.0]) - origin[:, :2])
+        inside = covers(weights)
+        assert inside.any()
+        heights = origin[:, 2] + np.einsum("ti,ti->t", gradient, weights)
+        assert heights[inside] == pytest.approx(2.5)
+
+    def test_mesh_height(self):
+        tri = plan_triangles([[self.SLOPE]])
+        heights = mesh_height(tri, np.array([0.0, 5.0, 10.0, 11.0]), np.array([5.0, 5.0, 10.0, 5.0]))
+        assert heights[:3] == pytest.approx([0.0, 5.0, 10.0])
+        assert np.isnan(heights[3])
+
+
+@pytest.mark.unit
+class TestMeshBuilder:
+    def test_shared_buffers(self):
+        builder = MeshBuilder()
+        square = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0, 0, 0]], dtype=float)
+        builder.add([square + [500000, 5000000, 0]], {"navaid_id": 1}, OUTPUT_KIND_DIRECTIONAL)
+        builder.add([square + [500010, 5000000, 0]], {"navaid_id": 2}, OUTPUT_KIND_DIRECTIONAL)
+        builder.add([np.full((5, 3), np.nan)], {"navaid_id": 3}, OUTPUT_KIND_OMNI)
+        mesh = builder.build()
+        assert len(mesh) == 2
+        assert mesh.vertices.dtype == np.float32 and mesh.triangles.dtype == np.uint32
+        assert mesh.vertices.shape == (8, 3) and mesh.triangles.shape == (4, 3)
+        assert mesh.triangles[2:].min() == 4
+        assert mesh.parts[1].first == 2 and mesh.parts[1].count == 2
+        absolute = mesh.vertices.astype(np.float64) + mesh.origin
+        assert absolute[4] == pytest.approx([500010, 5000000, 0], abs=1e-3)
+
+    def test_empty(self):
+        mesh = MeshBuilder().build()
+        assert len(mesh) == 0
+        document, buffer = gltf_document(mesh)
+        assert buffer == b"" and "meshes" not in document
+
+
+@pytest.mark.unit
+class TestMeshSink:
+    def test_is_mesh_path(self):
+        assert is_mesh_path("a.GLB") and is_mesh_path("b.gltf") and is_mesh_path("c.obj")
+        assert not is_mesh_path("d.geojson")
+
+    def test_cli_glb(self, tmp_path):
+        navaids, output = tmp_path / "navaids.csv", tmp_path / "bra.glb"
+        navaids.write_text(NAVAIDS)
+        (tmp_path / "runways.csv").write_text(RUNWAYS)
+        assert main([str(navaids), "--runways", str(tmp_path / "runways.csv"), "-o", str(output),
+                     "--segments", "16", "--arc-segments", "4"]) == 0
+        document, buffer = _read_glb(output)
+        assert [node["name"] for node in document["nodes"][1:]] == ["1 LOC", "2 OMNI_CVOR"]
+        assert [len(mesh["primitives"]) for mesh in document["meshes"]] == [7, 3]
+        positions = document["accessors"][0]
+        vertices = np.frombuffer(buffer, "<f4", positions["count"] * 3).reshape(-1, 3)
+        assert np.allclose(vertices.min(axis=0), positions["min"])
+        indices = np.frombuffer(buffer, "<u4", offset=document["bufferViews"][1]["byteOffset"])
+        assert indices.max() < positions["count"]
+        slope = document["meshes"][0]["primitives"][3]
+        assert slope["extras"]["area"] == "slope"
+        # Heights come back Y-up through the root translation
+        root = document["nodes"][0]
+        assert vertices[:, 1].min() + root["translation"][1] == pytest.approx(10.0, abs=0.01)
+
+    def test_segmentisation(self, tmp_path):
+        navaids = tmp_path / "navaids.csv"
+        navaids.write_text(NAVAIDS)
+        counts = []
+        for segments in ("16", "64"):
+            output = tmp_path / f"bra{segments}.gltf"
+            assert main([str(navaids), "-o", str(output), "--segments", segments]) == 0
+            document = json.loads(output.read_text())
+            assert (tmp_path / f"bra{segments}.bin").stat().st_size == document["buffers"][0]["byteLength"]
+            counts.append(document["accessors"][0]["count"])
+        assert counts[1] > counts[0]
+
+    def test_obj(self, tmp_path):
+        output = tmp_path / "bra.obj"
+        columns = omni_columns([(100.0, 200.0, 5.0, 50.0, 1.0, 500.0, 0.0, 0.0, 0.0)])
+        with MeshSink(str(output)) as sink:
+            for rings in omni_rings(omni_vertices(columns, 8)[0], 8):
+                sink.write(rings, {"navaid_id": "N1", "facility_key": "NDB", "id": 1}, OUTPUT_KIND_OMNI)
+        lines = output.read_text().splitlines()
+        assert lines[0].startswith("# qBRA mesh")
+        assert sum(line.startswith("v ") for line in lines) == len(sink.mesh.vertices) == 8 + 16
+        faces = [line for line in lines if line.startswith("f ")]
+        assert len(faces) == len(sink.mesh.triangles)
+        assert min(int(i) for face in faces for i in face.split()[1:]) == 1
+        assert "g N1_NDB_1" in lines
@@ -0,0 +1,35 @@
+"""Tests for the OmniParameters model."""
+
+import pytest
+
+from qBRA.models.omni_parameters import OmniParameters
+
+CVOR = {"site_elev": 50.0, "omni_r": 600.0, "omni_alpha": 1.0, "omni_R": 3000.0,
+        "omni_turbine": True, "omni_j": 15000.0, "omni_h": 52.0}
+
+
+@pytest.mark.unit
+class TestOmniParameters:
+    def test_from_dict(self):
+        params = OmniParameters.from_dict(dict(CVOR, facility_label="CVOR", display_name="VOR A"))
+        assert (params.r, params.R, params.j, params.h) == (600.0, 3000.0, 15000.0, 52.0)
+        assert params.turbine and params.type_value == "CVOR"
+        assert params.display_name == "VOR A"
+
+    def test_turbine_values_ignored_when_off(self):
+        params = OmniParameters.from_dict(dict(CVOR, omni_turbine=False))
+        assert params.j == params.h == 0.0
+
+    def test_type_value_falls_back_to_key(self):
+        assert OmniParameters.from_dict(dict(CVOR, facility_key="OMNI_CVOR")).type_value == "OMNI_CVOR"
+
+    @pytest.mark.parametrize("override, message", [
+        ({"omni_r": 0.0}, "r and R must be > 0"),
+        ({"omni_R": 500.0}, "R must be >= r"),
+        ({"omni_alpha": 91.0}, "alpha must be in"),
+        ({"omni_h": 0.0}, "j and h must be > 0"),
+        ({"omni_j": 100.0}, "j must be >= r"),
+    ])
+    def test_validation(self, override, message):
+        with pytest.raises(ValueError, match=message):
+            OmniParameters.from_dict(dict(CVOR, **override))
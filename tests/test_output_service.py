@@ -0,0 +1,238 @@
+"""Tests for OutputLayerService.
+
+Tests persistent output layer lookup and navaid/facility upserts.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from qgis.core import QgsVectorLayer, QgsWkbTypes
+
+from qBRA.constants import (
+    FACILITY_KEY_FIELD,
+    NAVAID_FID_FIELD,
+    NAVAID_LAYER_FIELD,
+    OUTPUT_KIND_DIRECTIONAL,
+    OUTPUT_KIND_OMNI,
+    PERSISTENT_LAYER_PROPERTY,
+)
+from qBRA.exceptions import BRACalculationError, BRAValidationError
+from qBRA.services.output_service import OutputLayerService
+
+
+class _Fields:
+    """Minimal QgsFields stand-in backed by a list of names."""
+
+    def __init__(self, names):
+        self.names = list(names)
+
+    def indexFromName(self, name):
+        return self.names.index(name) if name in self.names else -1
+
+    def count(self):
+        return len(self.names)
+
+    def __iter__(self):
+        for name in self.names:
+            field = Mock()
+            field.name.return_value = name
+            yield field
+
+
+def _feature(attrs, fid=0):
+    feature = Mock()
+    feature.id.return_value = fid
+    feature.attributes.return_value = list(attrs)
+    feature.geometry.return_value = Mock()
+    return feature
+
+
+_CRS = Mock()
+
+
+def _layer(names, features=(), wkb=QgsWkbTypes.Polygon, kind=None, crs=_CRS):
+    layer = Mock()
+    layer.__class__ = QgsVectorLayer
+    layer.crs.return_value = crs
+    layer.name.return_value = "BRA_areas"
+    layer.wkbType.return_value = wkb
+    layer.fields.return_value = _Fields(names)
+    layer.getFeatures.return_value = list(features)
+    layer.customProperty.return_value = kind
+    provider = Mock()
+    provider.addAttributes.return_value = True
+    provider.deleteFeatures.return_value = True
+    provider.addFeatures.return_value = (True, [])
+    layer.dataProvider.return_value = provider
+    return layer
+
+
+@pytest.fixture
+def service():
+    return OutputLayerService(project=Mock())
+
+
+@pytest.mark.unit
+class TestFindPersistentLayer:
+    def test_returns_marked_layer(self, service):
+        plain = _layer(["id"])
+        marked = _layer(["id"], kind=OUTPUT_KIND_OMNI)
+        service.project().mapLayers.return_value = {"a": plain, "b": marked}
+        assert service.find_persistent_layer(OUTPUT_KIND_OMNI) is marked
+
+    def test_returns_none_without_marked_layer(self, service):
+        service.project().mapLayers.return_value = {"a": _layer(["id"])}
+        assert service.find_persistent_layer(OUTPUT_KIND_DIRECTIONAL) is None
+
+    def test_ignores_non_vector_layers(self, service):
+        raster = Mock()
+        raster.customProperty.return_value = OUTPUT_KIND_DIRECTIONAL
+        service.project().mapLayers.return_value = {"r": raster}
+        assert service.find_persistent_layer(OUTPUT_KIND_DIRECTIONAL) is None
+
+    def test_mark_persistent_sets_property(self, service):
+        layer = _layer(["id"])
+        service.mark_persistent(layer, OUTPUT_KIND_DIRECTIONAL)
+        layer.setCustomProperty.assert_called_once_with(PERSISTENT_LAYER_PROPERTY, OUTPUT_KIND_DIRECTIONAL)
+
+
+@pytest.mark.unit
+class TestEnsureKeyFields:
+    def test_adds_missing_key_fields(self, service):
+        layer = _layer(["id", "area"])
+        service.ensure_key_fields(layer)
+        added = layer.dataProvider().addAttributes.call_args[0][0]
+        assert len(added) == 3
+        layer.updateFields.assert_called_once()
+
+    def test_noop_when_fields_present(self, service):
+        layer = _layer(["id", NAVAID_LAYER_FIELD, NAVAID_FID_FIELD, FACILITY_KEY_FIELD])
+        service.ensure_key_fields(layer)
+        layer.dataProvider().addAttributes.assert_not_called()
+
+    def test_raises_when_provider_rejects_fields(self, service):
+        layer = _layer(["id"])
+        layer.dataProvider().addAttributes.return_value = False
+        with pytest.raises(BRACalculationError):
+            service.ensure_key_fields(layer)
+
+
+@pytest.mark.unit
+class TestUpsert:
+    def _target(self, stale=()):
+        return _layer(["id", "area", NAVAID_LAYER_FIELD, NAVAID_FID_FIELD, FACILITY_KEY_FIELD], features=stale)
+
+    def test_copies_features_with_keys(self, service):
+        target = self._target()
+        source = _layer(["id", "area", "type"], features=[_feature([1, "base", "LOC"]), _feature([2, "slope", "LOC"])])
+        count = service.upsert(target, source, "navaids", 7, "LOC")
+        assert count == 2
+        written = target.dataProvider().addFeatures.call_args[0][0]
+        # 'type' has no counterpart in the target and is dropped
+        assert written[0].attributes() == [1, "base", "navaids", 7, "LOC"]
+        assert written[1].attributes() == [2, "slope", "navaids", 7, "LOC"]
+
+    def test_key_includes_navaid_layer(self, service):
+        with patch("qBRA.services.output_service.QgsExpression") as expression:
+            service.upsert(self._target(), _layer(["id"], features=[_feature([1])]), "navaids", 7, "LOC")
+        keys = [c.args for c in expression.createFieldEqualityExpression.call_args_list]
+        assert keys == [(NAVAID_LAYER_FIELD, "navaids"), (NAVAID_FID_FIELD, 7), (FACILITY_KEY_FIELD, "LOC")]
+
+    def test_adds_before_deleting_previous_features(self, service):
+        target = self._target(stale=[_feature([], fid=11)])
+        provider = target.dataProvider()
+        calls = Mock()
+        calls.attach_mock(provider.addFeatures, "add")
+        calls.attach_mock(provider.deleteFeatures, "delete")
+        service.upsert(target, _layer(["id"], features=[_feature([1])]), "navaids", 7, "LOC")
+        assert [c[0] for c in calls.mock_calls] == ["add", "delete"]
+
+    def test_previous_features_kept_when_insert_fails(self, service):
+        target = self._target(stale=[_feature([], fid=11)])
+        target.dataProvider().addFeatures.return_value = (False, [])
+        with pytest.raises(BRACalculationError, match="write"):
+            service.upsert(target, _layer(["id"], features=[_feature([1])]), "navaids", 7, "LOC")
+        target.dataProvider().deleteFeatures.assert_not_called()
+
+    def test_new_features_removed_when_delete_fails(self, service):
+        target = self._target(stale=[_feature([], fid=11)])
+        provider = target.dataProvider()
+        provider.addFeatures.return_value = (True, [_feature([], fid=21)])
+        provider.deleteFeatures.side_effect = [False, True]
+        with pytest.raises(BRACalculationError, match="remove"):
+            service.upsert(target, _layer(["id"], features=[_feature([1])]), "navaids", 7, "LOC")
+        assert provider.deleteFeatures.call_args_list[-1].args == ([21],)
+
+    def test_transforms_to_target_crs(self, service):
+        target = self._target()
+        source = _layer(["id"], features=[_feature([1])], crs=Mock())
+        with patch("qBRA.services.output_service.QgsCoordinateTransform") as transform, \
+                patch("qBRA.services.output_service.QgsGeometry") as geometry:
+            service.upsert(target, source, "navaids", 7, "LOC")
+        transform.assert_called_once_with(source.crs(), target.crs(), service.project())
+        geometry.return_value.transform.assert_called_once_with(transform.return_value)
+        written = target.dataProvider().addFeatures.call_args[0][0]
+        assert written[0].geometry() is geometry.return_value
+
+    def test_same_crs_is_not_transformed(self, service):
+        with patch("qBRA.services.output_service.QgsCoordinateTransform") as transform:
+            service.upsert(self._target(), _layer(["id"], features=[_feature([1])]), "navaids", 7, "LOC")
+        transform.assert_not_called()
+
+    def test_deletes_previous_features_for_same_key(self, service):
+        target = self._target(stale=[_feature([], fid=11), _feature([], fid=12)])
+        source = _layer(["id"], features=[_feature([1])])
+        service.upsert(target, source, "navaids", 7, "LOC")
+        target.dataProvider().deleteFeatures.assert_called_once_with([11, 12])
+
+    def test_no_delete_when_nothing_stale(self, service):
+        target = self._target()
+        source = _layer(["id"], features=[_feature([1])])
+        service.upsert(target, source, "navaids", 7, "LOC")
+        target.dataProvider().deleteFeatures.assert_not_called()
+
+    def test_rejects_non_polygon_target(self, service):
+        target = _layer(["id"], wkb=QgsWkbTypes.Point)
+        with pytest.raises(BRAValidationError, match="polygon"):
+            service.upsert(target, _layer(["id"]), "navaids", 7, "LOC")
+
+    def test_requires_navaid_fid(self, service):
+        with pytest.raises(BRAValidationError, match="Navaid id"):
+            service.upsert(self._target(), _layer(["id"]), "navaids", None, "LOC")
+
+    def test_raises_when_delete_fails(self, service):
+        target = self._target(stale=[_feature([], fid=3)])
+        target.dataProvider().deleteFeatures.return_value = False
+        with pytest.raises(BRACalculationError, match="remove"):
+            service.upsert(target, _layer(["id"], features=[_feature([1])]), "navaids", 7, "LOC")
+
+    def test_raises_when_insert_fails(self, service):
+        target = self._target()
+        target.dataProvider().addFeatures.return_value = (False, [])
+        with pytest.raises(BRACalculationError, match="write"):
+            service.upsert(target, _layer(["id"], features=[_feature([1])]), "navaids", 7, "LOC")
+
+
+@pytest.mark.unit
+class TestCreatePersistentLayer:
+    def test_creates_marked_memory_layer(self, service):
+        template = _layer(["id", "area"])
+        template.crs.return_value.authid.return_value = "EPSG:3857"
+        created = _layer(["id", "area"])
+        with patch("qBRA.services.output_service.QgsVectorLayer", return_value=created) as ctor:
+            result = service.create_persistent_layer(template, OUTPUT_KIND_OMNI)
+        assert result is created
+        uri, name, provider = ctor.call_args[0]
+        assert uri.endswith("EPSG:3857")
+        assert name == "BRA_omni"
+        assert provider == "memory"
+        created.setCustomProperty.assert_called_once_with(PERSISTENT_LAYER_PROPERTY, OUTPUT_KIND_OMNI)
+
+    def test_footprint_kind_creates_flat_layer(self, service):
+        template = _layer(["id"])
+        template.crs.return_value.authid.return_value = "EPSG:3857"
+        with patch("qBRA.services.output_service.QgsVectorLayer", return_value=_layer(["id"])) as ctor:
+            service.create_persistent_layer(template, "directional_footprint")
+        uri, name, _provider = ctor.call_args[0]
+        assert uri == "Polygon?crs=EPSG:3857"
+        assert name == "BRA_areas footprint"
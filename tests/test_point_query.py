@@ -0,0 +1,176 @@
+"""Tests for the BRA point-query index and service."""
+
+import time
+from unittest.mock import MagicMock, Mock
+
+import numpy as np
+import pytest
+
+from qgis.core import QgsVectorLayer
+
+from qBRA.constants import OUTPUT_KIND_OMNI
+from qBRA.modules.kernel import (
+    DIRECTIONAL_TEMPLATES,
+    directional_columns,
+    directional_rings,
+    directional_vertices,
+    omni_columns,
+    omni_rings,
+    omni_vertices,
+)
+from qBRA.modules.point_query import PackedRTree, SurfaceIndex
+from qBRA.modules.wkb import WkbEncoder
+from qBRA.services.point_query_service import BRAQueryService, describe_hit, is_bra_layer, layer_surfaces
+
+TAN1 = np.tan(np.radians(1.0))
+
+
+def _omni(key, x, y, site_elev=10.0, r=100.0, R=1000.0, segments=32):
+    columns = omni_columns([(x, y, site_elev, r, 1.0, R, 0.0, 0.0, 0.0)])
+    rings = omni_rings(omni_vertices(columns, segments)[0], segments)
+    return [((key, i), {"area": area}, [polygon]) for i, (polygon, area) in
+            enumerate(zip(rings, ("inner cylinder top", "cone mantle")))]
+
+
+def _directional(key):
+    # x, y, azimuth, a, b, r, D, L, phi, site_elev, H, h
+    row = (0.0, 0.0, 0.0, 1000.0, 500.0, 7000.0, 500.0, 2300.0, 30.0, 100.0, 10.0, 70.0)
+    rings = directional_rings(directional_vertices(directional_columns([row]))[0], 8)
+    return [((key, t.id), {"area": t.area}, [[ring]]) for t, ring in zip(DIRECTIONAL_TEMPLATES, rings)]
+
+
+@pytest.mark.unit
+class TestPackedRTree:
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        low = rng.uniform(0, 1000, (500, 2))
+        boxes = np.hstack([low, low + rng.uniform(0, 50, (500, 2))])
+        tree = PackedRTree(boxes, capacity=4)
+        assert len(tree) == 500
+        for x, y in rng.uniform(0, 1000, (50, 2)):
+            expected = np.flatnonzero((boxes[:, 0] <= x) & (boxes[:, 1] <= y) & (boxes[:, 2] >= x) & (boxes[:, 3] >= y))
+            assert sorted(tree.query_point(x, y).tolist()) == expected.tolist()
+
+    def test_empty_and_single(self):
+        assert len(PackedRTree(np.empty((0, 4))).query_point(0, 0)) == 0
+        tree = PackedRTree([[0, 0, 1, 1]])
+        assert tree.query_point(1, 1).tolist() == [0] and len(tree.query_point(2, 0)) == 0
+
+
+@pytest.mark.unit
+class TestSurfaceIndex:
+    def test_omni_heights(self):
+        index = SurfaceIndex()
+        assert index.add("omni", _omni("omni", 0.0, 0.0)) == 2
+        centre = index.query(0.0, 0.0)
+        assert [hit.properties["area"] for hit in centre.hits] == ["inner cylinder top"]
+        assert centre.limit == pytest.approx(10.0 + 100.0 * TAN1)
+        # On a radial mantle edge the interpolation is exact
+        assert index.query(500.0, 0.0).limit == pytest.approx(10.0 + 500.0 * TAN1)
+        assert index.query(1500.0, 0.0).limit is None
+
+    def test_directional_walls_skipped(self):
+        index = SurfaceIndex()
+        # The three walls have no plan area
+        assert index.add("dir", _directional("dir")) == 4
+        hits = index.query(0.0, 0.0).hits
+        assert [hit.key for hit in hits] == [("dir", 1)] and hits[0].height == pytest.approx(100.0)
+        slope = index.query(0.0, 3000.0).hits
+        assert [hit.properties["area"] for hit in slope] == ["slope"]
+        assert 100.0 < slope[0].height < 170.0
+
+    def test_overlapping_groups_lowest_first(self):
+        index = SurfaceIndex(capacity=4)
+        index.add("a", _omni("a", 0.0, 0.0, site_elev=50.0))
+        index.add("b", _omni("b", 300.0, 0.0, site_elev=10.0))
+        result = index.query(210.0, 0.0)
+        assert [hit.key[0] for hit in result.hits] == ["b", "a"]
+        assert result.limit == pytest.approx(10.0 + 100.0 * TAN1)
+        assert index.remove("b") and not index.remove("b")
+        assert [hit.key[0] for hit in index.query(210.0, 0.0).hits] == ["a"]
+        index.clear()
+        assert len(index) == 0 and index.query(0.0, 0.0).limit is None
+
+    def test_thousands_of_bras(self):
+        index = SurfaceIndex()
+        rng = np.random.default_rng(2)
+        for i, (x, y) in enumerate(rng.uniform(0, 200_000, (2000, 2))):
+            index.add(i, _omni(i, x, y, segments=16))
+        points = rng.uniform(0, 200_000, (200, 2))
+        index.query(0.0, 0.0)  # builds the tree
+        start = time.perf_counter()
+        results = [index.query(x, y) for x, y in points]
+        per_query = (time.perf_counter() - start) / len(points)
+        assert len(index) == 4000 and any(results[i].hits for i in range(len(points)))
+        # Generous bound: well under a millisecond on a normal machine
+        assert per_query < 0.005
+
+
+def _layer(layer_id, name, surfaces, kind=None, authid="EPSG:32633"):
+    layer = MagicMock()
+    layer.__class__ = QgsVectorLayer
+    layer.id.return_value = layer_id
+    layer.name.return_value = name
+    layer.customProperty.return_value = kind
+    layer.crs.return_value.authid.return_value = authid
+    field = Mock()
+    field.name.return_value = "area"
+    layer.fields.return_value = [field]
+    encoder = WkbEncoder()
+    features = []
+    for fid, (_key, properties, polygons) in enumerate(surfaces):
+        feature = Mock()
+        feature.id.return_value = fid
+        feature.attributes.return_value = [properties["area"]]
+        geometry = feature.geometry.return_value
+        geometry.isEmpty.return_value = False
+        geometry.wkbType.return_value = 1003
+        geometry.asWkb.return_value = bytes(encoder.polygon_z(polygons[0]))
+        features.append(feature)
+    layer.getFeatures.side_effect = lambda: iter(features)
+    return layer
+
+
+@pytest.mark.unit
+class TestBRAQueryService:
+    def test_is_bra_layer(self):
+        assert is_bra_layer(_layer("1", "RWY09 BRA_areas", []))
+        assert is_bra_layer(_layer("2", "anything", [], kind=OUTPUT_KIND_OMNI))
+        assert is_bra_layer(_layer("3", "RWY09 BRA_scenarios", []))
+        assert not is_bra_layer(_layer("4", "RWY09 BRA_areas footprint", []))
+        assert not is_bra_layer(Mock())
+
+    def test_layer_surfaces(self, monkeypatch):
+        monkeypatch.setattr("qBRA.services.point_query_service.QgsWkbTypes.isCurvedType", lambda _t: False, raising=False)
+        surfaces = layer_surfaces(_layer("L1", "N1 BRA_omni", _omni("x", 0.0, 0.0)))
+        assert [key for key, _props, _polygons in surfaces] == [("L1", 0), ("L1", 1)]
+        assert surfaces[1][1]["area"] == "cone mantle" and surfaces[1][1]["navaid_id"] == "N1 BRA_omni"
+        assert len(surfaces[1][2][0]) == 2
+
+    def test_tracks_layers(self, monkeypatch):
+        monkeypatch.setattr("qBRA.services.point_query_service.QgsWkbTypes.isCurvedType", lambda _t: False, raising=False)
+        a = _layer("A", "A BRA_omni", _omni("A", 0.0, 0.0, site_elev=50.0))
+        b = _layer("B", "B BRA_omni", _omni("B", 300.0, 0.0))
+        layers = {"A": a, "B": b}
+        project = Mock()
+        project.mapLayer.side_effect = layers.get
+        service = BRAQueryService(project)
+        assert service.add_layers([a, b, Mock()]) == 2
+        assert service.layer_ids == ["A", "B"] and len(service) == 0
+        result = service.query(210.0, 0.0, "EPSG:32633")
+        assert len(service) == 4
+        assert [hit.key for hit in result.hits] == [("B", 0), ("A", 1)]
+        assert describe_hit(result.hits[0]) == f"B BRA_omni: inner cylinder top at {10.0 + 100.0 * TAN1:.1f} m"
+        # Indexed once; re-indexed only after a data change
+        a.getFeatures.reset_mock()
+        service.query(0.0, 0.0, "EPSG:32633")
+        a.getFeatures.assert_not_called()
+        a.dataChanged.connect.call_args[0][0]()
+        service.query(0.0, 0.0, "EPSG:32633")
+        a.getFeatures.assert_called_once()
+        service.remove_layers(["B"])
+        assert [hit.key[0] for hit in service.query(210.0, 0.0, "EPSG:32633").hits] == ["A"]
+        # Layers gone from the project are dropped on refresh
+        del layers["A"]
+        service.invalidate("A")
+        assert service.refresh() == 0 and service.layer_ids == []
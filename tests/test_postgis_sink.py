@@ -0,0 +1,215 @@
+"""Tests for the PostGIS output sink.
+
+The unit tests record the SQL and ``COPY`` payloads sent to a fake DB-API
+connection, which also replays the staging/merge statements on in-memory
+tables so the surviving rows can be checked.  ``TestPostGISLive`` loads into a real database and runs only
+when ``QBRA_TEST_PG_DSN`` points at a PostGIS-enabled PostgreSQL instance.
+"""
+
+import os
+import re
+import struct
+
+import numpy as np
+import pytest
+
+from qBRA.cli import main
+from qBRA.constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from qBRA.exceptions import BRAError
+from qBRA.services import postgis_sink
+from qBRA.services.postgis_sink import PostGISSink, copy_value, is_postgis_dsn, quote_ident
+
+RING = np.array([[0, 0, 1], [10, 0, 1], [10, 10, 1], [0, 0, 1]], dtype=float)
+
+
+class _FakeCursor:
+    def __init__(self, connection):
+        self._connection = connection
+
+    def execute(self, sql):
+        if self._connection.fail_on and self._connection.fail_on in sql:
+            raise RuntimeError("boom")
+        self._connection.statements.append(sql)
+        self._connection.replay(sql)
+
+    def copy_expert(self, sql, handle):
+        self._connection.statements.append(sql)
+        payload = handle.read()
+        self._connection.copies.append(payload)
+        staging = re.match(r"COPY (\S+)", sql).group(1)
+        rows = [line.split("\t") for line in payload.splitlines()]
+        self._connection.tables.setdefault(staging, []).extend(rows)
+
+    def close(self):
+        self._connection.cursor_closed = True
+
+
+class _FakeConnection:
+    def __init__(self, fail_on=None):
+        self.statements, self.copies = [], []
+        self.committed = self.rolled_back = self.closed = self.cursor_closed = False
+        self.fail_on = fail_on
+        self.tables = {}
+
+    def replay(self, sql):
+        """Apply the merge statements to ``tables`` (rows keyed by their first two columns)."""
+        tables = self.tables
+        if sql.startswith("DELETE"):
+            target, staging = re.match(r"DELETE FROM (\S+) t USING .* FROM (\S+)\) s", sql).groups()
+            keys = {tuple(row[:2]) for row in tables.get(staging, [])}
+            tables[target] = [row for row in tables.get(target, []) if tuple(row[:2]) not in keys]
+        elif sql.startswith("INSERT"):
+            target, staging = re.match(r"INSERT INTO (\S+) .* FROM (\S+)$", sql).groups()
+            tables.setdefault(target, []).extend(tables.get(staging, []))
+        elif sql.startswith("TRUNCATE"):
+            tables[sql.split()[1]] = []
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+def _directional(navaid_id, surface_id=1, facility_key="LOC"):
+    return {"navaid_id": navaid_id, "facility_key": facility_key, "id": surface_id, "area": "base",
+            "max_elev": "10", "area_name": "RWY09\ttest", "a": "1", "b": "2", "h": "3", "r": "4",
+            "D": "5", "H": "6", "L": "7", "phi": "8", "type": "ILS LLZ"}
+
+
+def _omni(navaid_id):
+    return {"navaid_id": navaid_id, "facility_key": "OMNI_NDB", "id": 1, "area": "cylinder",
+            "area_name": "BRA", "r": "300", "alpha": "1", "R": "3000", "j": "0", "h": "0", "type": "NDB"}
+
+
+@pytest.mark.unit
+class TestHelpers:
+    def test_dsn_detection(self):
+        assert is_postgis_dsn("postgresql://u@h/db")
+        assert is_postgis_dsn("PG:dbname=gis")
+        assert not is_postgis_dsn("bra.geojson")
+
+    def test_quote_ident(self):
+        assert quote_ident("public.bra") == '"public"."bra"'
+        assert quote_ident('we"ird') == '"we""ird"'
+
+    def test_copy_value_escapes(self):
+        assert copy_value(None) == "\\N"
+        assert copy_value("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
+        assert copy_value(7) == "7"
+
+
+@pytest.mark.unit
+class TestPostGISSink:
+    def test_batches_and_single_transaction(self):
+        conn = _FakeConnection()
+        with PostGISSink(None, "public.bra", srid=32633, batch_size=2, connection=conn) as sink:
+            for navaid_id in range(3):
+                sink.write([RING], _directional(navaid_id), OUTPUT_KIND_DIRECTIONAL)
+            sink.write([RING, RING[::-1]], _omni(9), OUTPUT_KIND_OMNI)
+        assert sink.count == 4
+        assert conn.committed and not conn.rolled_back
+        assert conn.cursor_closed and not conn.closed  # borrowed connection stays open
+        # One full batch during the run, then the directional rest and omni on close
+        assert [len(c.splitlines()) for c in conn.copies] == [2, 1, 1]
+        creates = [s for s in conn.statements if s.startswith("CREATE TABLE")]
+        assert len(creates) == 2
+        assert '"public"."bra_directional"' in creates[0] and "geometry(PolygonZ, 32633)" in creates[0]
+        assert any('"bra_directional_navaid_idx"' in s for s in conn.statements)
+
+    def test_copy_rows(self):
+        conn = _FakeConnection()
+        with PostGISSink(None, connection=conn) as sink:
+            sink.write([RING], _directional("N1"))
+        columns = conn.copies[0].rstrip("\n").split("\t")
+        assert columns[:4] == ["N1", "LOC", "1", "base"]
+        assert columns[5:7] == ["RWY09\\ttest", "1"]
+        wkb = bytes.fromhex(columns[-1][3:])
+        assert columns[-1].startswith("\\\\x")
+        assert struct.unpack_from("<BII", wkb) == (1, 1003, 1)
+        assert len(wkb) == 1 + 4 + 4 + 4 + RING.size * 8
+
+    def test_upsert_replaces_navaid_rows(self):
+        conn = _FakeConnection()
+        with PostGISSink(None, connection=conn) as sink:
+            sink.write([RING], _directional(1))
+        delete = next(s for s in conn.statements if s.startswith("DELETE"))
+        assert "t.navaid_id = s.navaid_id AND t.facility_key = s.facility_key" in delete
+        inserts = [s for s in conn.statements if s.startswith("INSERT")]
+        assert "ST_SetSRID(ST_GeomFromWKB(wkb), 0)" in inserts[0]
+
+    def test_navaid_straddling_batches_keeps_all_rows(self):
+        conn = _FakeConnection()
+        conn.tables['"bra_directional"'] = [["1", "LOC", "stale"], ["2", "LOC", "kept"]]
+        with PostGISSink(None, batch_size=2, connection=conn) as sink:
+            for surface_id in (1, 2, 3):
+                sink.write([RING], _directional(1, surface_id), OUTPUT_KIND_DIRECTIONAL)
+        assert [len(c.splitlines()) for c in conn.copies] == [2, 1]
+        assert len([s for s in conn.statements if s.startswith("DELETE")]) == 1
+        rows = conn.tables['"bra_directional"']
+        assert [row[2] for row in rows] == ["kept", "1", "2", "3"]
+
+    def test_append_skips_delete(self):
+        conn = _FakeConnection()
+        with PostGISSink(None, upsert=False, connection=conn) as sink:
+            sink.write([RING], _directional(1))
+        assert not any(s.startswith("DELETE") for s in conn.statements)
+
+    def test_failure_rolls_back(self):
+        conn = _FakeConnection(fail_on="INSERT")
+        with pytest.raises(BRAError, match="PostGIS load failed"):
+            with PostGISSink(None, connection=conn) as sink:
+                sink.write([RING], _directional(1))
+        assert conn.rolled_back and not conn.committed
+
+    def test_error_in_run_rolls_back(self):
+        conn = _FakeConnection()
+        with pytest.raises(KeyError):
+            with PostGISSink(None, connection=conn) as sink:
+                sink.write([RING], _directional(1))
+                raise KeyError("x")
+        assert conn.rolled_back and not conn.copies
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            PostGISSink(None, batch_size=0)
+
+    def test_missing_driver(self, monkeypatch, tmp_path, capsys):
+        monkeypatch.setattr(postgis_sink, "PSYCOPG2_AVAILABLE", False)
+        with pytest.raises(BRAError, match="psycopg2"):
+            with PostGISSink("PG:dbname=gis"):
+                pass
+        navaids = tmp_path / "n.csv"
+        navaids.write_text("id,facility,x,y,site_elev\n1,OMNI_NDB,0,0,0\n")
+        assert main([str(navaids), "-o", "postgresql://localhost/gis"]) == 1
+        assert "psycopg2" in capsys.readouterr().err
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not os.environ.get("QBRA_TEST_PG_DSN") or not postgis_sink.PSYCOPG2_AVAILABLE,
+                    reason="QBRA_TEST_PG_DSN not set or psycopg2 missing")
+class TestPostGISLive:
+    def test_load_and_upsert(self, tmp_path):
+        import psycopg2
+
+        dsn = os.environ["QBRA_TEST_PG_DSN"]
+        navaids = tmp_path / "n.csv"
+        navaids.write_text("id,facility,x,y,site_elev\n1,OMNI_NDB,0,0,0\n2,OMNI_CVOR,100,100,5\n")
+        args = [str(navaids), "-o", dsn, "--table", "qbra_test", "--crs", "EPSG:32633"]
+        with psycopg2.connect(dsn) as conn, conn.cursor() as cur:
+            cur.execute('DROP TABLE IF EXISTS "qbra_test_omni"')
+        try:
+            assert main(args) == 0
+            assert main(args) == 0  # second run replaces, does not duplicate
+            with psycopg2.connect(dsn) as conn, conn.cursor() as cur:
+                cur.execute('SELECT count(*), min(ST_SRID(geom)), bool_and(ST_IsValid(geom)) FROM "qbra_test_omni"')
+                assert cur.fetchone() == (5, 32633, True)
+        finally:
+            with psycopg2.connect(dsn) as conn, conn.cursor() as cur:
+                cur.execute('DROP TABLE IF EXISTS "qbra_test_omni"')
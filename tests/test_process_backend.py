@@ -0,0 +1,68 @@
+"""Tests for the shared-memory process-pool geometry backend."""
+
+import numpy as np
+import pytest
+
+from qBRA.modules.kernel import directional_columns, directional_vertices, omni_columns, omni_vertices
+from qBRA.workers.process_backend import ProcessPoolBackend
+
+
+def _directional(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return directional_columns(
+        (rng.uniform(0, 1e5), rng.uniform(0, 1e5), rng.uniform(0, 360),
+         1000.0, 500.0, 7000.0, 500.0, 2300.0, 30.0, 100.0, 10.0, 70.0)
+        for _ in range(n)
+    )
+
+
+def _omni(n):
+    return omni_columns((i * 10.0, 0.0, 5.0, 600.0, 1.0, 3000.0, 15000.0, 52.0, i % 2) for i in range(n))
+
+
+@pytest.mark.unit
+class TestProcessPoolBackend:
+    def test_pool_matches_in_process_kernel(self):
+        columns = _directional(50)
+        with ProcessPoolBackend(max_workers=2, chunk_size=7) as backend:
+            result = backend.compute("directional", columns)
+        np.testing.assert_array_equal(result, directional_vertices(columns))
+
+    def test_omni_with_segments(self):
+        columns = _omni(11)
+        with ProcessPoolBackend(max_workers=2, chunk_size=4) as backend:
+            result = backend.compute("omni", columns, segments=16)
+        np.testing.assert_array_equal(result, omni_vertices(columns, 16))
+
+    def test_iter_chunks_cover_all_rows(self):
+        columns = _directional(30, seed=1)
+        expected = directional_vertices(columns)
+        seen = np.zeros(30, dtype=bool)
+        with ProcessPoolBackend(max_workers=2, chunk_size=8) as backend:
+            for start, stop, chunk in backend.iter_chunks("directional", columns):
+                np.testing.assert_array_equal(chunk, expected[start:stop])
+                seen[start:stop] = True
+        assert seen.all()
+
+    def test_abandoned_iteration_is_safe(self):
+        with ProcessPoolBackend(max_workers=2, chunk_size=5) as backend:
+            chunks = backend.iter_chunks("directional", _directional(40))
+            next(chunks)
+            chunks.close()
+            # The pool stays usable afterwards
+            assert backend.compute("directional", _directional(12)).shape[0] == 12
+
+    def test_small_inputs_run_in_process(self):
+        backend = ProcessPoolBackend(chunk_size=100)
+        result = backend.compute("directional", _directional(3))
+        assert result.shape[0] == 3
+        assert [c[:2] for c in backend.iter_chunks("directional", _directional(3))] == [(0, 3)]
+        assert backend._pool is None
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            ProcessPoolBackend(max_workers=1).compute("conical", _directional(1))
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            ProcessPoolBackend(chunk_size=0)
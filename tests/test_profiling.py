@@ -0,0 +1,48 @@
+"""Tests for the profiling capture."""
+
+import os
+import pstats
+
+import pytest
+
+from qBRA.utils import profiling
+from qBRA.utils.profiling import capture_profile, default_profile_dir
+
+
+def _work():
+    return sum(i * i for i in range(20_000))
+
+
+@pytest.mark.unit
+class TestCaptureProfile:
+    def test_writes_prof_and_summary(self, tmp_path):
+        directory = tmp_path / "profiles"
+        with capture_profile(str(directory), "directional LOC/1", top_n=5) as capture:
+            assert capture.prof_path is None
+            _work()
+        assert os.path.dirname(capture.prof_path) == str(directory)
+        assert os.path.basename(capture.prof_path).startswith("qbra_directional_LOC_1_")
+        stats = pstats.Stats(capture.prof_path)
+        assert any(name == "_work" for _file, _line, name in stats.stats)
+        summary = open(capture.summary_path, encoding="utf-8").read()
+        assert summary.startswith("qBRA profile: directional LOC/1")
+        assert "cumulative" in summary and "_work" in summary
+
+    def test_written_when_block_raises(self, tmp_path):
+        with pytest.raises(ZeroDivisionError):
+            with capture_profile(str(tmp_path), "omni") as capture:
+                1 / 0
+        assert os.path.exists(capture.prof_path) and os.path.exists(capture.summary_path)
+
+    def test_default_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(profiling.tempfile, "gettempdir", lambda: str(tmp_path))
+        with capture_profile("", "omni") as capture:
+            _work()
+        assert os.path.dirname(capture.prof_path) == default_profile_dir() == str(tmp_path / "qbra_profiles")
+
+    def test_unwritable_directory_is_not_fatal(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        with capture_profile(str(blocker / "sub"), "omni") as capture:
+            _work()
+        assert capture.prof_path is None and capture.summary_path is None
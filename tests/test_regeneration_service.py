@@ -0,0 +1,125 @@
+"""Tests for RegenerationService (lazy regeneration of stored BRA layers)."""
+
+import pytest
+from unittest.mock import Mock
+
+from qgis.core import QgsVectorLayer
+
+from qBRA.constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI, RECIPE_PROPERTY
+from qBRA.exceptions import BRACalculationError, BRAValidationError, LayerNotFoundError
+from qBRA.models.bra_recipe import BRARecipe
+from qBRA.services.regeneration_service import RegenerationService
+
+OMNI_PARAMS = {"site_elev": 0.0, "facility_key": "OMNI_NDB", "omni_r": 300.0}
+
+
+def _layer(layer_id, feature_count=0, recipe=None):
+    layer = Mock()
+    layer.__class__ = QgsVectorLayer
+    layer.id.return_value = layer_id
+    layer.name.return_value = layer_id
+    layer.featureCount.return_value = feature_count
+    properties = {RECIPE_PROPERTY: recipe.to_json() if recipe else None}
+    layer.customProperty.side_effect = properties.get
+    layer.setCustomProperty.side_effect = properties.__setitem__
+    layer.dataProvider.return_value.addFeatures.return_value = (True, [])
+    return layer
+
+
+def _project(*layers):
+    by_id = {layer.id(): layer for layer in layers}
+    project = Mock()
+    project.mapLayers.return_value = by_id
+    project.mapLayer.side_effect = by_id.get
+    return project
+
+
+def _omni_recipe(navaid_layer_id="navaids"):
+    return BRARecipe(OUTPUT_KIND_OMNI, navaid_layer_id, 4, dict(OMNI_PARAMS))
+
+
+def _service(project, built_features=("f1", "f2")):
+    built = Mock()
+    built.getFeatures.return_value = list(built_features)
+    builder = Mock(return_value=built)
+    service = RegenerationService(Mock(), project, {OUTPUT_KIND_OMNI: builder, OUTPUT_KIND_DIRECTIONAL: builder})
+    return service, builder
+
+
+@pytest.mark.unit
+class TestRegenerationService:
+    def test_store_and_read_recipe(self):
+        layer = _layer("bra")
+        service, _ = _service(_project(layer))
+        service.store(layer, _omni_recipe())
+        assert service.recipe(layer) == _omni_recipe()
+
+    def test_invalid_recipe_ignored(self):
+        layer = _layer("bra")
+        layer.customProperty.side_effect = {RECIPE_PROPERTY: "{broken"}.get
+        service, _ = _service(_project(layer))
+        assert service.recipe(layer) is None
+
+    def test_scan_lists_only_empty_layers_with_recipe(self):
+        empty = _layer("empty", 0, _omni_recipe())
+        filled = _layer("filled", 3, _omni_recipe())
+        plain = _layer("plain", 0)
+        service, builder = _service(_project(empty, filled, plain))
+        assert service.scan() == ["empty"]
+        assert service.is_pending("empty") and not service.is_pending("filled")
+        builder.assert_not_called()  # scanning never computes geometry
+
+    def test_regenerate_writes_features(self):
+        navaids = _layer("navaids")
+        bra = _layer("bra", 0, _omni_recipe())
+        service, builder = _service(_project(navaids, bra))
+        service.scan()
+        assert service.regenerate("bra") == 2
+        params = builder.call_args[0][1]
+        assert params["active_layer"] is navaids and params["navaid_fid"] == 4
+        bra.dataProvider.return_value.addFeatures.assert_called_once_with(["f1", "f2"])
+        bra.triggerRepaint.assert_called_once()
+        assert not service.pending
+
+    def test_missing_navaid_layer(self):
+        bra = _layer("bra", 0, _omni_recipe("gone"))
+        service, _ = _service(_project(bra))
+        service.scan()
+        with pytest.raises(LayerNotFoundError):
+            service.regenerate("bra")
+        assert not service.is_pending("bra")  # not retried on every repaint
+
+    def test_missing_recipe(self):
+        service, _ = _service(_project(_layer("bra")))
+        with pytest.raises(BRAValidationError):
+            service.regenerate("bra")
+
+    def test_missing_layer(self):
+        service, _ = _service(_project())
+        with pytest.raises(LayerNotFoundError):
+            service.regenerate("nope")
+
+    def test_invalid_parameters(self):
+        navaids = _layer("navaids")
+        bra = _layer("bra", 0, _omni_recipe())
+        service, builder = _service(_project(navaids, bra))
+        builder.side_effect = ValueError("Navaid feature 4 not found")
+        with pytest.raises(BRACalculationError):
+            service.regenerate("bra")
+
+    def test_provider_failure(self):
+        navaids = _layer("navaids")
+        bra = _layer("bra", 0, _omni_recipe())
+        bra.dataProvider.return_value.addFeatures.return_value = (False, [])
+        service, _ = _service(_project(navaids, bra))
+        with pytest.raises(BRACalculationError):
+            service.regenerate("bra")
+
+    def test_forget_and_clear(self):
+        layers = [_layer(name, 0, _omni_recipe()) for name in ("a", "b", "c")]
+        service, _ = _service(_project(*layers))
+        service.scan()
+        service.forget(["a"])
+        assert service.pending == {"b", "c"}
+        service.clear()
+        assert not service.pending
@@ -0,0 +1,112 @@
+"""Tests for multi-scenario (facility × direction) directional BRAs."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from qBRA.constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from qBRA.exceptions import BRAValidationError
+from qBRA.models.bra_parameters import BRAParameters
+from qBRA.models.layer_data import BRALayerData
+from qBRA.modules.attributes import SCENARIO_FIELDS
+from qBRA.modules.batch import iter_features
+from qBRA.modules.ils_llz_logic import scenario_layer_data
+from qBRA.modules.scenarios import expand_scenarios, scenario_surfaces
+from qBRA.modules.wkb import WkbEncoder
+from qBRA.workers.process_backend import ProcessPoolBackend
+
+
+class _Pt:
+    def __init__(self, x, y):
+        self._x, self._y = x, y
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+
+# Runway from (0, 1000) to (0, 4000); navaid at the origin
+ROUTING = [_Pt(0.0, 1000.0), _Pt(0.0, 4000.0)]
+
+
+def _params(**changes):
+    values = dict(
+        active_layer=None, azimuth=0.0, a=1200.0, b=500.0, h=70.0, r=7200.0, D=500.0, H=10.0,
+        L=2300.0, phi=30.0, site_elev=10.0, remark="RWY09", direction="forward", facility_key="LOC",
+        facility_label="ILS LLZ – single frequency", display_name="Custom - ILS LLZ", navaid_fid=3,
+    )
+    values.update(changes)
+    return BRAParameters(**values)
+
+
+@pytest.mark.unit
+class TestExpandScenarios:
+    def test_facilities_by_directions(self):
+        base = _params()
+        scenarios = expand_scenarios(base, (0.0, 0.0), ROUTING, ["LOC", "GP", "DME"], ["backward", "forward"])
+        assert [(p.facility_key, p.direction) for p in scenarios] == [
+            ("LOC", "forward"), ("LOC", "backward"), ("GP", "forward"),
+            ("GP", "backward"), ("DME", "forward"), ("DME", "backward"),
+        ]
+        # The dock's own scenario is kept as entered
+        assert scenarios[0] is base
+        # Other direction: azimuth flipped, a re-measured to the runway end
+        assert scenarios[1].azimuth == pytest.approx(180.0)
+        assert (scenarios[1].a, scenarios[1].r, scenarios[1].b) == (4000.0, 10000.0, 500.0)
+        gp = scenarios[2]
+        assert (gp.a, gp.r, gp.D, gp.facility_label) == (800, 6000, 250, "ILS GP M-Type (dual)")
+        assert gp.display_name == "RWY09 - ILS GP M-Type (dual)" and gp.navaid_fid == 3
+        dme = scenarios[5]
+        assert (dme.a, dme.r, dme.phi) == (4000.0, 10000.0, 40)
+
+    def test_invalid_requests(self):
+        with pytest.raises(BRAValidationError):
+            expand_scenarios(_params(), (0.0, 0.0), ROUTING, [], ["forward"])
+        with pytest.raises(BRAValidationError):
+            expand_scenarios(_params(), (0.0, 0.0), ROUTING, ["LOC"], ["sideways"])
+        with pytest.raises(BRAValidationError):
+            expand_scenarios(_params(), (0.0, 0.0), ROUTING, ["OMNI_NDB"], ["forward"])
+
+
+@pytest.mark.unit
+class TestScenarioSurfaces:
+    def test_tagged_rows_match_batch_geometry(self):
+        scenarios = expand_scenarios(_params(), (0.0, 0.0), ROUTING, ["LOC", "LOCII"], ["forward", "backward"])
+        surfaces = scenario_surfaces(scenarios, (0.0, 0.0), arc_segments=8)
+        assert len(surfaces) == 4 * 7
+        assert all(len(values) == len(SCENARIO_FIELDS) for values, _wkb in surfaces)
+        names = [name for name, _kind in SCENARIO_FIELDS]
+        row = dict(zip(names, surfaces[7 + 3][0]))
+        assert (row["area"], row["scenario"], row["direction"], row["type"]) == (
+            "slope", "LOC backward", "backward", "ILS LLZ – single frequency")
+        assert row["max_elev"] == "80.0"
+        # Same vertices as the headless pipeline for the same parameters
+        navaids = [(p, (0.0, 0.0), i) for i, p in enumerate(scenarios)]
+        encoder = WkbEncoder()
+        expected = [bytes(encoder.polygon_z(rings)) for rings, _props, _kind in
+                    iter_features(navaids, [], ProcessPoolBackend(max_workers=1), 8)]
+        assert [wkb for _values, wkb in surfaces] == expected
+
+    def test_layer_data(self):
+        feat = Mock()
+        feat.isValid.return_value = True
+        feat.geometry.return_value.asPoint.return_value = _Pt(0.0, 0.0)
+        layer = Mock()
+        layer.getFeature.return_value = feat
+        iface = Mock()
+        iface.mapCanvas.return_value.mapSettings.return_value.destinationCrs.return_value.authid.return_value = "EPSG:32633"
+        with patch("qBRA.modules.ils_llz_logic.QgsVectorLayer") as vector_layer:
+            data = scenario_layer_data(iface, _params(active_layer=layer), ROUTING, ["LOC"], ["forward", "backward"])
+        vector_layer.assert_not_called()
+        layer.getFeature.assert_called_once_with(3)
+        assert data.scenarios and data.shared == () and len(data) == 14
+        assert data.name == "RWY09 BRA_scenarios" and data.crs_authid == "EPSG:32633"
+
+    def test_layer_data_validation(self):
+        with pytest.raises(ValueError):
+            BRALayerData(OUTPUT_KIND_OMNI, "x", "EPSG:4326", (), (), scenarios=True)
+        with pytest.raises(ValueError):
+            BRALayerData(OUTPUT_KIND_DIRECTIONAL, "x", "EPSG:4326", ("N",), (), scenarios=True)
+        assert len(BRALayerData(OUTPUT_KIND_DIRECTIONAL, "x", "EPSG:4326", (), (), scenarios=True)) == 0
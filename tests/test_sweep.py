@@ -0,0 +1,182 @@
+"""Tests for parameter sweeps over BRA parameters."""
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from qBRA.cli import main
+from qBRA.constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from qBRA.exceptions import BRAValidationError
+from qBRA.modules.batch import resolve_records
+from qBRA.modules.kernel import directional_columns, directional_rings, directional_row, directional_vertices
+from qBRA.modules.mesh import mesh_height, plan_triangles
+from qBRA.modules.sweep import Obstacles, applies_to, parse_sweep, parse_values, sweep
+from qBRA.services.inventory_service import GEOMETRY_KEY
+
+LOC = {"id": 1, "facility": "LOC", "azimuth": 90, "a": 1000, "site_elev": 10, GEOMETRY_KEY: ("Point", (0.0, 0.0))}
+NDB = {"id": 2, "facility": "OMNI_NDB", "site_elev": 0, GEOMETRY_KEY: ("Point", (50_000.0, 0.0))}
+DVOR = {"id": 3, "facility": "OMNI_DVOR", "site_elev": 0, GEOMETRY_KEY: ("Point", (0.0, 50_000.0))}
+
+
+def _ring_area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+@pytest.mark.unit
+class TestParsing:
+    def test_list_and_range(self):
+        assert parse_values("20, 25,30") == (20.0, 25.0, 30.0)
+        assert parse_values("1500:2300:200") == (1500.0, 1700.0, 1900.0, 2100.0, 2300.0)
+        assert parse_values("0.1:0.3:0.1") == (0.1, 0.2, 0.3)
+        assert parse_values("5:6:2") == (5.0,)
+
+    @pytest.mark.parametrize("text", ["", "1:2", "3:1:1", "1:2:0", "x"])
+    def test_invalid_values(self, text):
+        with pytest.raises(ValueError):
+            parse_values(text)
+
+    def test_parse_sweep(self):
+        assert parse_sweep(["phi=20,30", "L=1000:2000:500"]) == {"phi": (20.0, 30.0), "L": (1000.0, 1500.0, 2000.0)}
+        with pytest.raises(BRAValidationError, match="Invalid sweep parameter"):
+            parse_sweep(["azimuth=1,2"])
+        with pytest.raises(BRAValidationError, match="Invalid sweep values"):
+            parse_sweep(["phi=a,b"])
+
+    def test_applies_to(self):
+        assert applies_to(OUTPUT_KIND_DIRECTIONAL, {"phi": (1.0,), "h": (1.0,)})
+        assert not applies_to(OUTPUT_KIND_OMNI, {"phi": (1.0,)})
+        assert applies_to(OUTPUT_KIND_OMNI, {"alpha": (1.0,), "r": (1.0,)})
+
+
+@pytest.mark.unit
+class TestDirectionalSweep:
+    def test_variants_and_metrics_match_geometry(self):
+        directional, _omni = resolve_records([LOC], {})
+        result = sweep(directional, OUTPUT_KIND_DIRECTIONAL, {"phi": (20.0, 30.0), "L": (1500.0, 2300.0)})
+        assert len(result) == 4 and not result.invalid
+        assert result.values.tolist() == [[20, 1500], [20, 2300], [30, 1500], [30, 2300]]
+        for i, (params, xy, _id) in enumerate(result.variants):
+            assert (params.phi, params.L) == tuple(result.values[i])
+            vertices = directional_vertices(directional_columns([directional_row(params, *xy)]))[0]
+            rings = directional_rings(vertices)
+            area = sum(_ring_area(ring) for ring in rings)
+            assert result.area[i] == pytest.approx(area)
+            xy_all = np.concatenate(rings)[:, :2]
+            assert result.extent[i] == pytest.approx([*xy_all.min(axis=0), *xy_all.max(axis=0)])
+        # Wider lateral extent and divergence give a larger footprint
+        assert result.area[3] > result.area[0]
+
+    def test_invalid_variants_are_reported(self):
+        directional, _omni = resolve_records([LOC], {})
+        result = sweep(directional, OUTPUT_KIND_DIRECTIONAL, {"h": (-1.0, 70.0)})
+        assert len(result) == 1
+        assert result.combination.tolist() == [1]
+        (navaid_id, values, error), = result.invalid
+        assert navaid_id == 1 and values == {"h": -1.0} and "non-negative" in error
+
+    def test_obstacle_counts(self):
+        directional, _omni = resolve_records([LOC], {})
+        # Azimuth 90: base from x=-500 to x=1000, level surfaces beside it, slope beyond
+        obstacles = Obstacles(
+            x=[0.0, 0.0, 3000.0, 3000.0, -200.0, 1e6],
+            y=[0.0, 0.0, 0.0, 0.0, -1000.0, 0.0],
+            top=[11.0, np.nan, 10.5, 80.0, 25.0, 999.0],
+        )
+        result = sweep(directional, OUTPUT_KIND_DIRECTIONAL, {"L": (600.0, 2300.0)}, obstacles)
+        # Base: anything above site level penetrates; NaN tops never do.
+        # Slope at x=3000 is ~37.5 on the triangulated slope ring.
+        # The level-surface obstacle (limit 20) is outside the narrow variant.
+        assert result.obstacles.tolist() == [4, 5]
+        assert result.penetrations.tolist() == [2, 3]
+
+    def test_slope_limit_matches_mesh(self):
+        loc = {**LOC, "a": 3000, "site_elev": 0}
+        directional, _omni = resolve_records([loc], {})
+        params, xy, _id = directional[0]
+        assert (params.a, params.r, params.h) == (3000, 9000, 70)
+        vertices = directional_vertices(directional_columns([directional_row(params, *xy)]))[0]
+        triangles = plan_triangles([[directional_rings(vertices)[3]]])
+        x, y = np.array([6000.0, 8800.0]), np.array([0.0, 1000.0])
+        z = mesh_height(triangles, x, y)
+        # A plane along the azimuth would give 35.0 on the axis; the mesh is higher
+        assert z[0] == pytest.approx(39.83, abs=0.01)
+        obstacles = Obstacles(x=np.repeat(x, 2), y=np.repeat(y, 2), top=np.stack([z - 0.1, z + 0.1], axis=1).ravel())
+        result = sweep(directional, OUTPUT_KIND_DIRECTIONAL, {"h": (70.0,)}, obstacles)
+        assert result.obstacles.tolist() == [4]
+        assert result.penetrations.tolist() == [2]
+
+    def test_rows_and_geometry_on_request(self):
+        directional, _omni = resolve_records([LOC], {})
+        result = sweep(directional, OUTPUT_KIND_DIRECTIONAL, {"phi": (20.0, 30.0)})
+        rows = result.rows()
+        assert [row["variant"] for row in rows] == [0, 1]
+        assert rows[1]["phi"] == 30.0 and rows[1]["navaid_id"] == 1 and rows[1]["facility_key"] == "LOC"
+        assert rows[1]["obstacles"] == 0 and rows[1]["area"] == pytest.approx(result.area[1])
+        features = list(result.features([1]))
+        assert len(features) == 7
+        assert {f[1]["variant"] for f in features} == {1}
+        assert {f[1]["navaid_id"] for f in features} == {1}
+        assert features[0][1]["phi"] == "30.0"
+
+    def test_not_applicable(self):
+        directional, _omni = resolve_records([LOC], {})
+        with pytest.raises(BRAValidationError, match="do not apply"):
+            sweep(directional, OUTPUT_KIND_DIRECTIONAL, {"alpha": (1.0,)})
+
+
+@pytest.mark.unit
+class TestOmniSweep:
+    def test_area_and_counts(self):
+        _directional, omni = resolve_records([NDB], {})
+        x0 = 50_000.0
+        obstacles = Obstacles(x=[x0 + 50, x0 + 1000, x0 + 1000, x0 + 2500], y=[0, 0, 0, 0], top=[1, 1, 100, 300])
+        result = sweep(omni, OUTPUT_KIND_OMNI, {"R": (2000.0, 3000.0)}, obstacles, segments=64)
+        assert result.area == pytest.approx(0.5 * 64 * np.sin(2 * np.pi / 64) * np.array([2000.0, 3000.0]) ** 2)
+        assert result.extent[0] == pytest.approx([x0 - 2000, -2000, x0 + 2000, 2000])
+        assert result.obstacles.tolist() == [3, 4]
+        # Inner cylinder always infringes; the cone (alpha 5°) is ~87.5 m at 1000 m, ~218.7 m at 2500 m
+        assert result.penetrations.tolist() == [2, 3]
+
+    def test_turbine_parameters(self):
+        _directional, omni = resolve_records([NDB, DVOR], {})
+        result = sweep(omni, OUTPUT_KIND_OMNI, {"j": (10_000.0, 12_000.0)})
+        assert [v[2] for v in result.variants] == [3, 3]
+        assert [i[0] for i in result.invalid] == [2, 2]
+        assert "turbine" in result.invalid[0][2]
+        assert result.extent[1][2] == pytest.approx(12_000.0)
+
+    def test_many_variants_single_pass(self):
+        _directional, omni = resolve_records([NDB, DVOR], {})
+        grid = parse_sweep(["R=1000:5000:100", "alpha=0.5:3:0.5"])
+        result = sweep(omni, OUTPUT_KIND_OMNI, grid)
+        assert len(result) == 2 * 41 * 6
+        assert [v[2] for v in result.variants[:246]] == [2] * 246
+
+
+@pytest.mark.unit
+class TestCliSweep:
+    def test_table_and_geometry(self, tmp_path, capsys):
+        navaids = tmp_path / "navaids.csv"
+        navaids.write_text("id,facility,azimuth,a,x,y,site_elev\n1,LOC,90,1000,0,0,10\n2,OMNI_NDB,,,5000,0,0\n")
+        obstacles = tmp_path / "obstacles.csv"
+        obstacles.write_text("id,x,y,ground_elev,height\n1,0,0,10,5\n2,100,100,,\n")
+        table, geometry = tmp_path / "sweep.csv", tmp_path / "sweep.geojson"
+        assert main([str(navaids), "-o", str(table), "--sweep", "phi=20,30", "--sweep", "h=50:70:10",
+                     "--obstacles", str(obstacles), "--sweep-geometry", str(geometry)]) == 0
+        with open(table, newline="") as handle:
+            rows = list(csv.DictReader(handle))
+        assert len(rows) == 6
+        assert list(rows[0])[:6] == ["navaid_id", "facility_key", "kind", "variant", "phi", "h"]
+        assert (rows[0]["obstacles"], rows[0]["penetrations"]) == ("2", "1")
+        features = json.loads(geometry.read_text())["features"]
+        assert len(features) == 6 * 7
+        assert "1 navaids (6 features, 1 skipped)" in capsys.readouterr().err
+
+    def test_invalid_sweep(self, tmp_path, capsys):
+        navaids = tmp_path / "navaids.csv"
+        navaids.write_text("id,facility,x,y,site_elev\n2,OMNI_NDB,5000,0,0\n")
+        assert main([str(navaids), "-o", str(tmp_path / "s.csv"), "--sweep", "nope=1"]) == 1
+        assert "Invalid sweep parameter" in capsys.readouterr().err
@@ -0,0 +1,257 @@
+"""Tests for terrain-aware BRA evaluation (DEM blocks, surface models, penetrations)."""
+
+from math import cos, radians, sin, tan
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from qBRA.exceptions import BRACalculationError
+from qBRA.modules.kernel import directional_columns, directional_rings, directional_row, directional_vertices
+from qBRA.modules.terrain import (
+    BlockCache,
+    GridSpec,
+    array_reader,
+    cell_boxes,
+    evaluate_surface,
+    points_in_polygon,
+    surface_model,
+)
+
+
+def _grid(columns=100, rows=100, nodata=None):
+    # 1 m cells, top-left corner at (0, 100)
+    return GridSpec(0.0, float(rows), 1.0, 1.0, columns, rows, nodata)
+
+
+def _square(x0, y0, x1, y1, z=0.0):
+    return [(x0, y0, z), (x1, y0, z), (x1, y1, z), (x0, y1, z), (x0, y0, z)]
+
+
+def _slope():
+    # Navaid at (50, 5) facing north: ahead line at y=25 (10 m), arc up to y=85 (30 m)
+    params = SimpleNamespace(
+        azimuth=0.0, a=20.0, b=10.0, r=80.0, D=10.0, L=30.0, phi=30.0, site_elev=10.0, H=2.0, h=20.0
+    )
+    vertices = directional_vertices(directional_columns([directional_row(params, 50.0, 5.0)]))[0]
+    return directional_rings(vertices, 8)[3]
+
+
+class _CountingReader:
+    def __init__(self, array):
+        self.array = array
+        self.calls = []
+
+    def __call__(self, col, row, width, height):
+        self.calls.append((col, row, width, height))
+        return self.array[row:row + height, col:col + width]
+
+
+@pytest.mark.unit
+class TestGridSpec:
+    def test_cell_window_clipped_to_grid(self):
+        grid = _grid()
+        assert grid.cell_window(10.2, 20.5, 30.1, 40.0) == (10, 60, 31, 80)
+        assert grid.cell_window(-50, -50, 500, 500) == (0, 0, 100, 100)
+
+    def test_cell_window_outside_grid_is_empty(self):
+        col0, row0, col1, row1 = _grid().cell_window(200, 200, 300, 300)
+        assert col0 == col1 or row0 == row1
+
+    def test_cell_centres(self):
+        xs, ys = _grid().cell_centres(2, 0, 4, 2)
+        assert list(xs) == [2.5, 3.5]
+        assert list(ys) == [99.5, 98.5]
+
+
+@pytest.mark.unit
+class TestBlockCache:
+    def test_window_matches_source(self):
+        dem = np.arange(100 * 100, dtype=np.float32).reshape(100, 100)
+        cache = BlockCache(_grid(), array_reader(dem), block_size=16)
+        np.testing.assert_array_equal(cache.window(5, 7, 40, 33), dem[7:33, 5:40])
+
+    def test_edge_blocks_are_partial(self):
+        dem = np.ones((50, 45))
+        reader = _CountingReader(dem)
+        cache = BlockCache(_grid(45, 50), reader, block_size=32)
+        cache.window(0, 0, 45, 50)
+        assert sorted(reader.calls) == [(0, 0, 32, 32), (0, 32, 32, 18), (32, 0, 13, 32), (32, 32, 13, 18)]
+
+    def test_overlapping_windows_share_blocks(self):
+        reader = _CountingReader(np.zeros((100, 100)))
+        cache = BlockCache(_grid(), reader, block_size=32)
+        cache.window(0, 0, 40, 40)
+        reads = cache.reads
+        cache.window(10, 10, 50, 50)
+        assert cache.reads == reads
+        assert cache.hits == reads
+        assert len(reader.calls) == reads
+
+    def test_lru_eviction(self):
+        reader = _CountingReader(np.zeros((100, 100)))
+        cache = BlockCache(_grid(), reader, block_size=10, max_blocks=2)
+        cache.window(0, 0, 10, 10)
+        cache.window(10, 0, 20, 10)
+        cache.window(20, 0, 30, 10)  # evicts block (0, 0)
+        cache.window(0, 0, 10, 10)
+        assert cache.reads == 4
+
+    def test_nodata_becomes_nan(self):
+        dem = np.full((10, 10), 5.0)
+        dem[3, 4] = -9999.0
+        cache = BlockCache(_grid(10, 10, nodata=-9999.0), array_reader(dem))
+        window = cache.window(0, 0, 10, 10)
+        assert np.isnan(window[3, 4])
+        assert np.nansum(window) == 5.0 * 99
+
+    def test_memmap_source(self, tmp_path):
+        path = tmp_path / "dem.f32"
+        data = np.random.default_rng(0).random((64, 64)).astype(np.float32)
+        data.tofile(path)
+        mm = np.memmap(path, dtype=np.float32, mode="r", shape=(64, 64))
+        cache = BlockCache(_grid(64, 64), array_reader(mm), block_size=16)
+        np.testing.assert_allclose(cache.window(3, 5, 20, 60), data[5:60, 3:20])
+
+    def test_invalid_sizes(self):
+        with pytest.raises(ValueError):
+            BlockCache(_grid(), array_reader(np.zeros((1, 1))), block_size=0)
+
+
+@pytest.mark.unit
+class TestSurfaceModel:
+    def test_flat_polygon(self):
+        model = surface_model([_square(0, 0, 10, 10, z=42.0)])
+        assert model.kind == "plane"
+        assert model.height(np.array(3.0), np.array(4.0)) == pytest.approx(42.0)
+
+    def test_sloping_plane(self):
+        ring = [(0, 0, 0), (100, 0, 10), (100, 50, 10), (0, 50, 0), (0, 0, 0)]
+        model = surface_model([ring])
+        assert model.kind == "plane"
+        assert model.height(np.array(50.0), np.array(25.0)) == pytest.approx(5.0)
+
+    def test_vertical_wall_has_no_model(self):
+        wall = [(0, 0, 0), (10, 0, 0), (10, 0, 50), (0, 0, 50), (0, 0, 0)]
+        assert surface_model([wall]) is None
+
+    def test_cone_mantle_is_radial(self):
+        alpha = radians(1.0)
+        base = 120.0
+
+        def ring(radius):
+            pts = [
+                (radius * sin(radians(a)), radius * cos(radians(a)), base + radius * tan(alpha))
+                for a in range(0, 360, 10)
+            ]
+            return pts + [pts[0]]
+
+        model = surface_model([ring(3000.0), ring(300.0)])
+        assert model.kind == "radial"
+        assert model.height(np.array(1000.0), np.array(0.0)) == pytest.approx(base + 1000.0 * tan(alpha), abs=0.01)
+
+    def test_directional_slope_is_meshed(self):
+        model = surface_model([_slope()])
+        assert model.kind == "mesh"
+        heights = model.height(np.array([50.0, 50.0, 45.0, 200.0]), np.array([25.0, 85.0, 40.0, 0.0]))
+        assert heights[:2] == pytest.approx([10.0, 30.0])
+        assert 10.0 < heights[2] < 30.0
+        assert np.isnan(heights[3])
+
+    def test_irregular_surface_follows_its_triangles(self):
+        ring = [(0, 0, 5), (10, 0, 0), (10, 10, 7), (0, 10, 1), (5, 5, 30), (0, 0, 5)]
+        model = surface_model([ring])
+        assert model.kind == "mesh"
+        assert model.height(np.array(5.0), np.array(5.0)) == pytest.approx(30.0)
+        assert model.height(np.array(9.0), np.array(1.0)) > 0.0
+
+    def test_untriangulable_surface_raises(self):
+        holes = [_square(2, 2, 3, 3, z=1.0), _square(6, 6, 7, 7, z=9.0)]
+        with pytest.raises(BRACalculationError):
+            surface_model([[(0, 0, 0), (10, 0, 5), (10, 10, 0), (0, 10, 5), (0, 0, 0)]] + holes)
+
+
+@pytest.mark.unit
+class TestPointsInPolygon:
+    def test_square_with_hole(self):
+        xs = np.array([0.5, 2.5, 5.0, 11.0])
+        ys = np.array([5.0])
+        mask = points_in_polygon(xs, ys, [_square(0, 0, 10, 10), _square(4, 4, 6, 6)])
+        assert mask.tolist() == [[True, True, False, False]]
+
+
+@pytest.mark.unit
+class TestCellBoxes:
+    def test_runs_are_stacked_into_rectangles(self):
+        hits = np.zeros((5, 6), dtype=bool)
+        hits[0:3, 1:4] = True  # one 3x3 block
+        hits[3, 1:3] = True  # narrower run below it
+        hits[1, 5] = True
+        assert cell_boxes(hits).tolist() == [[1, 0, 4, 3], [5, 1, 6, 2], [1, 3, 3, 4]]
+
+    def test_boxes_cover_exactly_the_hits(self):
+        hits = np.random.default_rng(7).random((40, 30)) > 0.6
+        covered = np.zeros(hits.shape, dtype=int)
+        for c0, r0, c1, r1 in cell_boxes(hits):
+            covered[r0:r1, c0:c1] += 1
+        assert np.array_equal(covered, hits.astype(int))
+
+    def test_empty_and_full(self):
+        assert cell_boxes(np.zeros((3, 3), dtype=bool)).shape == (0, 4)
+        assert cell_boxes(np.ones((3, 4), dtype=bool)).tolist() == [[0, 0, 4, 3]]
+
+
+@pytest.mark.unit
+class TestEvaluateSurface:
+    def test_flat_surface_penetrated_by_hill(self):
+        dem = np.zeros((100, 100))
+        dem[40:50, 20:25] = 15.0  # rows 40..49 → y in (50, 60]
+        dem[45, 22] = 18.0
+        cache = BlockCache(_grid(), array_reader(dem), block_size=32)
+        cells, max_pen, wx, wy, boxes = evaluate_surface(cache, [_square(10, 10, 60, 90, z=10.0)])
+        assert cells == 50
+        assert max_pen == pytest.approx(8.0)
+        assert (wx, wy) == (22.5, 54.5)
+        assert boxes.tolist() == [[20.0, 50.0, 25.0, 60.0]]
+
+    def test_terrain_outside_footprint_ignored(self):
+        dem = np.zeros((100, 100))
+        dem[:, 80:] = 500.0
+        cache = BlockCache(_grid(), array_reader(dem))
+        assert evaluate_surface(cache, [_square(10, 10, 60, 90, z=10.0)]) is None
+
+    def test_sloping_surface(self):
+        # Surface rises 1 m per metre east; flat terrain at 30 m pierces x < 30
+        dem = np.full((100, 100), 30.0)
+        ring = [(0, 0, 0), (100, 0, 100), (100, 100, 100), (0, 100, 0), (0, 0, 0)]
+        cache = BlockCache(_grid(), array_reader(dem), block_size=16)
+        cells, max_pen, _wx, _wy, boxes = evaluate_surface(cache, [ring])
+        assert cells == 30 * 100
+        assert max_pen == pytest.approx(29.5)
+        assert boxes.tolist() == [[0.0, 0.0, 30.0, 100.0]]
+
+    def test_rising_slope_with_terrain_just_below(self):
+        # Terrain rising from the ahead line to the arc, 0.1 m under the slope's vertices
+        ys = 100.0 - (np.arange(100) + 0.5)
+        dem = np.repeat((10.0 + 20.0 * (ys - 25.0) / 60.0 - 0.1)[:, np.newaxis], 100, axis=1)
+        cache = BlockCache(_grid(), array_reader(dem), block_size=32)
+        assert evaluate_surface(cache, [_slope()]) is None
+        dem[39, 50] = 31.0  # cell centre (50.5, 60.5), above the top of the slope
+        cells, max_pen, wx, wy, boxes = evaluate_surface(BlockCache(_grid(), array_reader(dem)), [_slope()])
+        assert (cells, wx, wy) == (1, 50.5, 60.5)
+        assert boxes.tolist() == [[50.0, 60.0, 51.0, 61.0]]
+        assert 1.0 < max_pen < 21.0
+
+    def test_nodata_cells_never_penetrate(self):
+        dem = np.full((20, 20), -9999.0)
+        cache = BlockCache(_grid(20, 20, nodata=-9999.0), array_reader(dem))
+        assert evaluate_surface(cache, [_square(0, 0, 20, 20, z=-10000.0)]) is None
+
+    def test_polygon_outside_dem(self):
+        cache = BlockCache(_grid(), array_reader(np.full((100, 100), 1e6)))
+        assert evaluate_surface(cache, [_square(500, 500, 600, 600)]) is None
+
+    def test_wall_skipped(self):
+        cache = BlockCache(_grid(), array_reader(np.full((100, 100), 1e6)))
+        wall = [(0, 50, 0), (90, 50, 0), (90, 50, 50), (0, 50, 50), (0, 50, 0)]
+        assert evaluate_surface(cache, [wall]) is None
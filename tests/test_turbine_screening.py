@@ -0,0 +1,154 @@
+"""Tests for wind-turbine screening against omni navaid sites."""
+
+from math import radians, tan
+
+import numpy as np
+import pytest
+
+from qBRA.exceptions import BRAValidationError
+from qBRA.modules.turbine_screening import (
+    OmniSites,
+    Turbines,
+    candidate_pairs,
+    elevations,
+    screen_turbines,
+    tip_heights,
+)
+
+CVOR = {"omni_r": 600.0, "omni_alpha": 1.0, "omni_R": 3000.0, "omni_j": 15000.0, "omni_h": 52.0}
+
+
+def _turbines(points, tip, base=0.0):
+    xs = np.array([p[0] for p in points], dtype=float)
+    ys = np.array([p[1] for p in points], dtype=float)
+    n = len(points)
+    return Turbines(xs, ys, np.broadcast_to(np.asarray(base, float), (n,)).copy(),
+                    np.broadcast_to(np.asarray(tip, float), (n,)).copy())
+
+
+@pytest.mark.unit
+class TestCandidatePairs:
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        sx, sy = rng.uniform(-1e5, 1e5, 50), rng.uniform(-1e5, 1e5, 50)
+        tx, ty = rng.uniform(-1e5, 1e5, 2000), rng.uniform(-1e5, 1e5, 2000)
+        radius = 15000.0
+        s_idx, t_idx = candidate_pairs(sx, sy, tx, ty, radius)
+        d = np.hypot(tx[t_idx] - sx[s_idx], ty[t_idx] - sy[s_idx])
+        found = set(zip(s_idx[d <= radius].tolist(), t_idx[d <= radius].tolist()))
+
+        full = np.hypot(tx[None, :] - sx[:, None], ty[None, :] - sy[:, None])
+        expected = set(zip(*[a.tolist() for a in np.nonzero(full <= radius)]))
+        assert found == expected
+
+    def test_no_duplicate_pairs(self):
+        sx, sy = np.array([0.0, 5.0]), np.array([0.0, 5.0])
+        tx, ty = np.array([1.0, 2.0, 3.0]), np.array([1.0, 2.0, 3.0])
+        s_idx, t_idx = candidate_pairs(sx, sy, tx, ty, 10.0)
+        pairs = list(zip(s_idx.tolist(), t_idx.tolist()))
+        assert len(pairs) == len(set(pairs)) == 6
+
+    def test_empty_inputs(self):
+        s_idx, t_idx = candidate_pairs(np.array([]), np.array([]), np.array([1.0]), np.array([1.0]), 10.0)
+        assert len(s_idx) == len(t_idx) == 0
+
+
+@pytest.mark.unit
+class TestScreenTurbines:
+    def test_counts_per_site_and_turbine(self):
+        sites = OmniSites.uniform([0.0, 100000.0], [0.0, 0.0], 100.0, CVOR)
+        turbines = _turbines(
+            [(300.0, 0.0), (2000.0, 0.0), (10000.0, 0.0), (20000.0, 0.0), (95000.0, 0.0)],
+            tip=[10.0, 10.0, 60.0, 200.0, 30.0],
+            base=100.0,
+        )
+        result = screen_turbines(sites, turbines)
+        # site 0: turbines 0 (inside r), 1 (below cone), 2 (above h); site 1: turbine 4
+        assert result.site_within.tolist() == [3, 1]
+        assert result.site_infringing.tolist() == [2, 0]
+        assert result.turbine_within.tolist() == [1, 1, 1, 0, 1]
+        assert result.turbine_infringing.tolist() == [1, 0, 1, 0, 0]
+
+    def test_cone_limit(self):
+        sites = OmniSites.uniform([0.0], [0.0], 0.0, CVOR)
+        cone = 2000.0 * tan(radians(1.0))  # ≈ 34.9 m
+        below = screen_turbines(sites, _turbines([(2000.0, 0.0)], tip=cone - 0.5))
+        above = screen_turbines(sites, _turbines([(2000.0, 0.0)], tip=cone + 0.5))
+        assert below.infringes.tolist() == [False]
+        assert below.clearance[0] == pytest.approx(0.5)
+        assert above.infringes.tolist() == [True]
+
+    def test_h_limit_beyond_cone(self):
+        sites = OmniSites.uniform([0.0], [0.0], 50.0, CVOR)
+        result = screen_turbines(sites, _turbines([(5000.0, 0.0), (5000.0, 10.0)], tip=[51.0, 53.0], base=50.0))
+        assert result.infringes.tolist() == [False, True]
+        assert result.turbine_clearance.tolist() == pytest.approx([1.0, -1.0])
+
+    def test_inside_inner_cylinder_always_infringes(self):
+        sites = OmniSites.uniform([0.0], [0.0], 0.0, CVOR)
+        result = screen_turbines(sites, _turbines([(100.0, 0.0)], tip=1.0))
+        assert result.infringes.tolist() == [True]
+        assert result.turbine_clearance[0] == -np.inf
+
+    def test_turbine_outside_every_j(self):
+        sites = OmniSites.uniform([0.0], [0.0], 0.0, CVOR)
+        result = screen_turbines(sites, _turbines([(15001.0, 0.0)], tip=500.0))
+        assert result.turbine_within.tolist() == [0]
+        assert result.turbine_clearance[0] == np.inf
+
+    def test_lowest_clearance_over_sites(self):
+        sites = OmniSites.uniform([0.0, 8000.0], [0.0, 0.0], [0.0, 20.0], CVOR)
+        result = screen_turbines(sites, _turbines([(4000.0, 0.0)], tip=40.0))
+        assert result.turbine_within.tolist() == [2]
+        assert result.turbine_clearance[0] == pytest.approx(12.0)
+
+    def test_sites_without_turbine_cylinder_rejected(self):
+        sites = OmniSites.uniform([0.0], [0.0], 0.0, dict(CVOR, omni_j=0.0))
+        with pytest.raises(BRAValidationError):
+            screen_turbines(sites, _turbines([(1.0, 0.0)], tip=1.0))
+
+    def test_nationwide_scale(self):
+        rng = np.random.default_rng(7)
+        sites = OmniSites.uniform(rng.uniform(0, 1e6, 300), rng.uniform(0, 1e6, 300), 0.0, CVOR)
+        turbines = _turbines(list(zip(rng.uniform(0, 1e6, 30000), rng.uniform(0, 1e6, 30000))), tip=150.0)
+        result = screen_turbines(sites, turbines)
+        assert result.site_within.sum() == result.turbine_within.sum() == len(result.site_idx)
+
+
+@pytest.mark.unit
+class TestTipHeights:
+    def test_tip_field_is_used_as_given(self):
+        tip = np.array([150.0, 120.0])
+        assert tip_heights(tip, np.array([100.0, 80.0]), None, None).tolist() == [150.0, 120.0]
+
+    def test_hub_plus_rotor_radius_or_half_diameter(self):
+        hub = np.array([100.0, 100.0, 90.0])
+        radius = np.array([60.0, np.nan, np.nan])
+        diameter = np.array([np.nan, 100.0, 120.0])
+        assert tip_heights(None, hub, radius, diameter).tolist() == [160.0, 150.0, 150.0]
+
+    def test_missing_tip_falls_back_per_turbine(self):
+        tip = np.array([200.0, np.nan])
+        hub = np.array([np.nan, 100.0])
+        assert tip_heights(tip, hub, np.array([50.0, 50.0]), None).tolist() == [200.0, 150.0]
+
+    @pytest.mark.parametrize("tip, hub, radius", [
+        (None, np.array([100.0]), None),
+        (np.array([np.nan]), np.array([100.0]), np.array([np.nan])),
+        (None, None, None),
+    ])
+    def test_hub_height_alone_is_rejected(self, tip, hub, radius):
+        with pytest.raises(BRAValidationError, match="tip heights are missing"):
+            tip_heights(tip, hub, radius, None)
+
+
+@pytest.mark.unit
+class TestElevations:
+    def test_known_elevations_pass(self):
+        values = np.array([0.0, 120.5])
+        assert elevations(values, "site", ("site_elev",)) is values
+
+    def test_null_elevation_is_rejected(self):
+        with pytest.raises(BRAValidationError, match="Turbine elevations are missing") as info:
+            elevations(np.array([10.0, np.nan, np.nan]), "turbine", ("ground_elev", "base_elev"))
+        assert "2 turbine(s)" in info.value.details and "ground_elev" in info.value.details
@@ -0,0 +1,144 @@
+"""Tests for viewport-driven BRA materialisation."""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from qBRA.constants import OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI
+from qBRA.modules.batch import resolve_records
+from qBRA.modules.viewport import ViewportEngine, navaid_reach
+from qBRA.services.inventory_service import GEOMETRY_KEY
+
+
+def _omni(navaid_id, x, y, facility="OMNI_NDB"):
+    return {"id": navaid_id, "facility": facility, "site_elev": 0, GEOMETRY_KEY: ("Point", (x, y))}
+
+
+def _inventory(n_per_axis=10, spacing=20_000.0):
+    records = [
+        _omni(i * n_per_axis + j, i * spacing, j * spacing)
+        for i in range(n_per_axis) for j in range(n_per_axis)
+    ]
+    records.append({"id": "loc", "facility": "LOC", "azimuth": 90, "a": 1000, "site_elev": 5,
+                    GEOMETRY_KEY: ("Point", (1000.0, 1000.0))})
+    return resolve_records(records, {})
+
+
+class _CountingBackend:
+    """Kernel backend wrapper counting computed navaids."""
+
+    def __init__(self):
+        from qBRA.workers.process_backend import ProcessPoolBackend
+        self._backend = ProcessPoolBackend(max_workers=1)
+        self.rows = 0
+
+    def compute(self, kind, columns, *args):
+        self.rows += len(columns)
+        return self._backend.compute(kind, columns, *args)
+
+
+@pytest.mark.unit
+class TestViewportEngine:
+    def test_margin_defaults_to_largest_reach(self):
+        directional, omni = _inventory(2)
+        engine = ViewportEngine(directional, omni)
+        assert engine.margin == max(navaid_reach(n[0]) for n in directional + omni)
+        assert navaid_reach(omni[0][0]) == omni[0][0].R
+
+    def test_computes_only_visible_navaids(self):
+        directional, omni = _inventory()
+        backend = _CountingBackend()
+        engine = ViewportEngine(directional, omni, backend=backend, tile_size=10_000, margin=0)
+        update = engine.update((-100, -100, 100, 100))
+        assert update.visible == [(0, 0)] and [tile.key for tile in update.added] == [(0, 0)]
+        assert backend.rows == 2  # navaid at the origin + the LOC
+        kinds = {kind for tile in update.added for _rings, _props, kind in tile.features}
+        assert kinds == {OUTPUT_KIND_DIRECTIONAL, OUTPUT_KIND_OMNI}
+        assert sum(len(tile.features) for tile in update.added) == 7 + 2
+
+    def test_cached_tiles_not_recomputed(self):
+        directional, omni = _inventory()
+        backend = _CountingBackend()
+        engine = ViewportEngine(directional, omni, backend=backend, tile_size=10_000, margin=0)
+        engine.update((0, 0, 50_000, 50_000))
+        rows = backend.rows
+        update = engine.update((0, 0, 50_000, 50_000))
+        assert update.added == [] and backend.rows == rows
+
+    def test_lru_eviction_keeps_visible_tiles(self):
+        directional, omni = _inventory()
+        engine = ViewportEngine(directional, omni, tile_size=10_000, margin=0, max_tiles=4)
+        first = engine.update((0, 0, 30_000, 30_000))
+        assert len(first.visible) == 4 and not first.removed
+        second = engine.update((100_000, 100_000, 130_000, 130_000))
+        assert set(second.removed) == set(first.visible)
+        assert set(engine.cached) == set(second.visible)
+
+    def test_visible_tiles_never_evicted(self):
+        directional, omni = _inventory()
+        engine = ViewportEngine(directional, omni, tile_size=10_000, margin=0, max_tiles=1)
+        update = engine.update((0, 0, 40_000, 40_000))
+        assert not update.removed and len(engine.cached) == len(update.visible) > 1
+
+    def test_too_many_navaids_skipped(self):
+        directional, omni = _inventory()
+        engine = ViewportEngine(directional, omni, max_navaids=10)
+        update = engine.update((0, 0, 200_000, 200_000))
+        assert update.skipped and not update.added and not engine.cached
+
+    def test_clear(self):
+        directional, omni = _inventory(2)
+        engine = ViewportEngine(directional, omni, tile_size=10_000, margin=0)
+        engine.update((0, 0, 1, 1))
+        assert engine.clear() and not engine.cached
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            ViewportEngine([], [], tile_size=0)
+
+
+@pytest.mark.unit
+class TestViewportLayer:
+    def test_show_adds_and_removes_tile_features(self):
+        from qBRA.services import viewport_service
+
+        directional, omni = _inventory()
+        engine = ViewportEngine(directional, omni, tile_size=10_000, margin=0, max_tiles=1)
+        layer = Mock()
+        provider = layer.dataProvider.return_value
+        provider.addFeatures.side_effect = lambda feats: (True, [Mock(id=Mock(return_value=i)) for i in range(len(feats))])
+        with patch.object(viewport_service, "QgsVectorLayer", return_value=layer), \
+                patch.object(viewport_service, "wkb_geometry", side_effect=lambda wkb: bytes(wkb)):
+            view = viewport_service.ViewportLayer(engine, "EPSG:32633")
+            view.show((15_000, 15_000, 25_000, 25_000))
+            added = provider.addFeatures.call_args[0][0]
+            assert len(added) == 2
+            navaid_id, facility, tile, surface_id = added[0].attributes()[:4]
+            assert (navaid_id, facility, tile, surface_id) == ("11", "OMNI_NDB", "2_2", 1)
+            view.show((95_000, 95_000, 105_000, 105_000))
+            provider.deleteFeatures.assert_called_once_with([0, 1])
+            view.clear()
+            assert provider.deleteFeatures.call_count == 2
+
+    def test_layer_records(self):
+        from qgis.core import QgsWkbTypes
+        from qBRA.services.viewport_service import layer_records
+
+        point = Mock()
+        point.x.return_value, point.y.return_value = 1.0, 2.0
+        geometry = Mock()
+        geometry.isEmpty.return_value = False
+        geometry.isMultipart.return_value = False
+        geometry.type.return_value = QgsWkbTypes.PointGeometry
+        geometry.asPoint.return_value = point
+        feature = Mock()
+        feature.id.return_value = 5
+        feature.attributes.return_value = ["LOC", 10]
+        feature.geometry.return_value = geometry
+        field_a, field_b = Mock(), Mock()
+        field_a.name.return_value, field_b.name.return_value = "facility", "site_elev"
+        layer = Mock()
+        layer.fields.return_value = [field_a, field_b]
+        layer.getFeatures.return_value = [feature]
+        assert layer_records(layer) == [
+            {"facility": "LOC", "site_elev": 10, "id": 5, GEOMETRY_KEY: ("Point", (1.0, 2.0))}
+        ]
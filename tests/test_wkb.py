@@ -0,0 +1,131 @@
+"""Tests for the direct WKB encoder."""
+
+import struct
+
+import numpy as np
+import pytest
+
+from qBRA.exceptions import BRAError
+from qBRA.modules.kernel import (
+    DIRECTIONAL_TEMPLATES,
+    directional_columns,
+    directional_vertices,
+    omni_columns,
+    omni_vertices,
+)
+from qBRA.modules.wkb import (
+    WKB_CIRCULARSTRING_Z,
+    WKB_COMPOUNDCURVE_Z,
+    WKB_CURVEPOLYGON_Z,
+    WKB_LINESTRING_Z,
+    WKB_POLYGON_Z,
+    WkbEncoder,
+    decode_polygons,
+)
+
+SQUARE = [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1), (0, 0, 1)]
+
+
+def _header(data, offset):
+    order, code = struct.unpack_from("<BI", data, offset)
+    assert order == 1
+    return code, offset + 5
+
+
+def _points(data, offset):
+    (count,) = struct.unpack_from("<I", data, offset)
+    coords = np.frombuffer(bytes(data), dtype="<f8", count=3 * count, offset=offset + 4)
+    return coords.reshape(-1, 3), offset + 4 + 24 * count
+
+
+def _decode_polygon(data):
+    code, offset = _header(data, 0)
+    assert code == WKB_POLYGON_Z
+    (count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    rings = []
+    for _ in range(count):
+        ring, offset = _points(data, offset)
+        rings.append(ring)
+    assert offset == len(data)
+    return rings
+
+
+@pytest.mark.unit
+class TestWkbEncoder:
+    def test_polygon_z(self):
+        rings = _decode_polygon(WkbEncoder().polygon_z([SQUARE]))
+        assert len(rings) == 1
+        np.testing.assert_array_equal(rings[0], np.array(SQUARE, dtype=float))
+
+    def test_polygon_with_hole(self):
+        hole = [(0.2, 0.2, 1), (0.2, 0.8, 1), (0.8, 0.8, 1), (0.2, 0.2, 1)]
+        rings = _decode_polygon(WkbEncoder().polygon_z([SQUARE, hole]))
+        assert [len(r) for r in rings] == [5, 4]
+
+    def test_curve_polygon_z(self):
+        line = [(10, 0, 5), (0, -1, 0), (-10, 0, 5)]
+        arc = [(-10, 0, 5), (0, 10, 5), (10, 0, 5)]
+        data = WkbEncoder().curve_polygon_z(line, arc)
+        code, offset = _header(data, 0)
+        assert code == WKB_CURVEPOLYGON_Z
+        assert struct.unpack_from("<I", data, offset)[0] == 1
+        code, offset = _header(data, offset + 4)
+        assert code == WKB_COMPOUNDCURVE_Z
+        assert struct.unpack_from("<I", data, offset)[0] == 2
+        code, offset = _header(data, offset + 4)
+        assert code == WKB_LINESTRING_Z
+        decoded_line, offset = _points(data, offset)
+        code, offset = _header(data, offset)
+        assert code == WKB_CIRCULARSTRING_Z
+        decoded_arc, offset = _points(data, offset)
+        assert offset == len(data)
+        np.testing.assert_array_equal(decoded_line, line)
+        np.testing.assert_array_equal(decoded_arc, arc)
+
+    def test_buffer_reused_and_grown(self):
+        encoder = WkbEncoder(capacity=16)
+        first = bytes(encoder.polygon_z([SQUARE]))
+        view = encoder.polygon_z([SQUARE])
+        big = np.zeros((1000, 3))
+        # Growing must not fail while an earlier view is still alive
+        assert len(encoder.polygon_z([big])) == 9 + 4 + 24 * 1000
+        assert bytes(view) == first
+
+    def test_directional_and_omni(self):
+        row = (0.0, 0.0, 0.0, 1000.0, 500.0, 7000.0, 500.0, 2300.0, 30.0, 100.0, 10.0, 70.0)
+        encoder = WkbEncoder()
+        wkbs = encoder.directional(directional_vertices(directional_columns([row]))[0])
+        assert len(wkbs) == len(DIRECTIONAL_TEMPLATES)
+        codes = [_header(w, 0)[0] for w in wkbs]
+        assert codes == [WKB_POLYGON_Z] * 3 + [WKB_CURVEPOLYGON_Z] + [WKB_POLYGON_Z] * 3
+        assert _decode_polygon(wkbs[0])[0][0, 2] == 100.0
+
+        omni = (0.0, 0.0, 0.0, 600.0, 1.0, 3000.0, 15000.0, 52.0, 0.0)
+        wkbs = encoder.omni(omni_vertices(omni_columns([omni]), 16)[0], 16)
+        assert [len(_decode_polygon(w)) for w in wkbs] == [1, 2]
+
+
+@pytest.mark.unit
+class TestDecodePolygons:
+    def test_round_trip(self):
+        hole = [(0.2, 0.2, 1), (0.2, 0.8, 1), (0.8, 0.8, 1), (0.2, 0.2, 1)]
+        polygons = decode_polygons(WkbEncoder().polygon_z([SQUARE, hole]))
+        assert len(polygons) == 1 and len(polygons[0]) == 2
+        np.testing.assert_array_equal(polygons[0][0], np.array(SQUARE, dtype=float))
+        np.testing.assert_array_equal(polygons[0][1], np.array(hole, dtype=float))
+
+    def test_multipolygon_and_dimensions(self):
+        # Big-endian 2D polygon and an EWKB PolygonZM (with SRID) in one MultiPolygon
+        flat = struct.pack(">BII", 0, 3, 1) + struct.pack(">I", 4) + struct.pack(">8d", 0, 0, 1, 0, 0, 1, 0, 0)
+        zm = struct.pack("<BIII", 1, 0xE0000003, 4326, 1) + struct.pack("<I", 4) + struct.pack(
+            "<16d", 0, 0, 5, 9, 1, 0, 5, 9, 0, 1, 5, 9, 0, 0, 5, 9)
+        polygons = decode_polygons(struct.pack("<BII", 1, 6, 2) + flat + zm)
+        assert len(polygons) == 2
+        assert polygons[0][0][:, :2].tolist() == [[0, 0], [1, 0], [0, 1], [0, 0]]
+        assert np.isnan(polygons[0][0][:, 2]).all()
+        assert polygons[1][0][:, 2].tolist() == [5, 5, 5, 5]
+
+    def test_unsupported(self):
+        with pytest.raises(BRAError):
+            decode_polygons(WkbEncoder().curve_polygon_z([(1, 0, 0), (-1, 0, 0)], [(-1, 0, 0), (0, 1, 0), (1, 0, 0)]))